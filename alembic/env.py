@@ -28,10 +28,19 @@ from sqlmodel import SQLModel
 from src.database.models.esprit_base import EspritBase
 from src.database.models.player import Player
 from src.database.models.esprit import Esprit
+from src.database.models.leaderboard_snapshot import LeaderboardSnapshot
+from src.database.models.player_activity import PlayerActivityDaily, AnalyticsCursor
+from src.database.models.transaction_event import TransactionEvent, PARTITION_PREFIX, DEFAULT_PARTITION
 
 # Set the target metadata
 target_metadata = SQLModel.metadata
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep autogenerate away from transaction_event partitions, which the retention job manages"""
+    if type_ == "table" and name and (name.startswith(PARTITION_PREFIX) or name == DEFAULT_PARTITION):
+        return False
+    return True
+
 def get_url():
     """Get database URL from environment"""
     url = os.getenv("DATABASE_URL")
@@ -46,6 +55,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -69,7 +79,8 @@ def run_migrations_online() -> None:
     with connectable.connect() as connection:
         context.configure(
             connection=connection, 
-            target_metadata=target_metadata
+            target_metadata=target_metadata,
+            include_object=include_object
         )
 
         with context.begin_transaction():
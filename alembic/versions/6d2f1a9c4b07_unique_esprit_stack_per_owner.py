@@ -0,0 +1,48 @@
+"""unique esprit stack per owner
+
+Revision ID: 6d2f1a9c4b07
+Revises: [auto_generated]
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d2f1a9c4b07'
+down_revision: Union[str, Sequence[str], None] = '[auto_generated]'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Merge duplicate stacks, then enforce one stack per (owner_id, esprit_base_id)."""
+    # Fold every duplicate into the oldest stack so the constraint can be created
+    op.execute("""
+        WITH ranked AS (
+            SELECT id, owner_id, esprit_base_id,
+                   MIN(id) OVER (PARTITION BY owner_id, esprit_base_id) AS keep_id,
+                   SUM(quantity) OVER (PARTITION BY owner_id, esprit_base_id) AS total_quantity,
+                   MAX(awakening_level) OVER (PARTITION BY owner_id, esprit_base_id) AS best_awakening
+            FROM esprit
+        )
+        UPDATE esprit
+        SET quantity = ranked.total_quantity,
+            awakening_level = ranked.best_awakening
+        FROM ranked
+        WHERE esprit.id = ranked.id AND ranked.id = ranked.keep_id
+    """)
+    op.execute("""
+        DELETE FROM esprit e
+        USING esprit keep
+        WHERE e.owner_id = keep.owner_id
+          AND e.esprit_base_id = keep.esprit_base_id
+          AND e.id > keep.id
+    """)
+    op.create_unique_constraint('uq_esprit_owner_base', 'esprit', ['owner_id', 'esprit_base_id'])
+
+def downgrade() -> None:
+    """Drop the one-stack-per-owner constraint (merged duplicates are not split back)."""
+    op.drop_constraint('uq_esprit_owner_base', 'esprit', type_='unique')
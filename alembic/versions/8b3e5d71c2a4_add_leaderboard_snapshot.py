@@ -0,0 +1,46 @@
+"""add leaderboard snapshot
+
+Revision ID: 8b3e5d71c2a4
+Revises: 6d2f1a9c4b07
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3e5d71c2a4'
+down_revision: Union[str, Sequence[str], None] = '6d2f1a9c4b07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the per-window leaderboard standings table."""
+    op.create_table(
+        'leaderboard_snapshot',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.String(length=16), nullable=False),
+        sa.Column('period_key', sa.String(length=16), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('player_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.BigInteger(), nullable=False),
+        sa.Column('payout_erythl', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('paid_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('period', 'period_key', 'player_id', name='uq_leaderboard_snapshot_player')
+    )
+    
+    op.create_index('ix_leaderboard_snapshot_player_id', 'leaderboard_snapshot', ['player_id'])
+    op.create_index('ix_leaderboard_snapshot_window_rank', 'leaderboard_snapshot', ['period', 'period_key', 'rank'])
+
+
+def downgrade() -> None:
+    """Drop the leaderboard standings table."""
+    op.drop_index('ix_leaderboard_snapshot_window_rank', table_name='leaderboard_snapshot')
+    op.drop_index('ix_leaderboard_snapshot_player_id', table_name='leaderboard_snapshot')
+    op.drop_table('leaderboard_snapshot')
@@ -0,0 +1,44 @@
+"""backfill player power totals
+
+Revision ID: 9d4e7b2c5a18
+Revises: e2b9c4d6a1f0
+Create Date: 2026-10-18 20:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4e7b2c5a18'
+down_revision: Union[str, Sequence[str], None] = 'e2b9c4d6a1f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Recompute every player's raw power totals from their stacks; deltas keep them current from here on."""
+    # Same arithmetic as Esprit.calculate_power: float8 multiplier, truncated per copy, then times quantity
+    op.execute("""
+        WITH totals AS (
+            SELECT e.owner_id,
+                   SUM(trunc(b.base_atk::float8 * (1.0::float8 + e.awakening_level * 0.2::float8))::bigint * e.quantity) AS atk,
+                   SUM(trunc(b.base_def::float8 * (1.0::float8 + e.awakening_level * 0.2::float8))::bigint * e.quantity) AS def,
+                   SUM(trunc(b.base_hp::float8 * (1.0::float8 + e.awakening_level * 0.2::float8))::bigint * e.quantity) AS hp
+            FROM esprit e
+            JOIN esprit_base b ON b.id = e.esprit_base_id
+            GROUP BY e.owner_id
+        )
+        UPDATE player p
+        SET total_attack_power = COALESCE(totals.atk, 0),
+            total_defense_power = COALESCE(totals.def, 0),
+            total_hp = COALESCE(totals.hp, 0)
+        FROM player target
+        LEFT JOIN totals ON totals.owner_id = target.id
+        WHERE p.id = target.id
+    """)
+
+def downgrade() -> None:
+    """Nothing to undo: the totals are derived data."""
+    pass
@@ -0,0 +1,52 @@
+"""add player activity daily
+
+Revision ID: c7e4a2f9d813
+Revises: 8b3e5d71c2a4
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e4a2f9d813'
+down_revision: Union[str, Sequence[str], None] = '8b3e5d71c2a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the per-day activity summaries and the ingest cursor."""
+    op.create_table(
+        'player_activity_daily',
+        sa.Column('player_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('events', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('hourly', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('activity', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('currency', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('fusions', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('player_id', 'day')
+    )
+    op.create_index('ix_player_activity_daily_day', 'player_activity_daily', ['day'])
+    
+    op.create_table(
+        'analytics_cursor',
+        sa.Column('segment', sa.String(length=128), nullable=False),
+        sa.Column('index_offset', sa.BigInteger(), nullable=False),
+        sa.Column('frames', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('segment')
+    )
+
+
+def downgrade() -> None:
+    """Drop the activity summaries and the ingest cursor."""
+    op.drop_table('analytics_cursor')
+    op.drop_index('ix_player_activity_daily_day', table_name='player_activity_daily')
+    op.drop_table('player_activity_daily')
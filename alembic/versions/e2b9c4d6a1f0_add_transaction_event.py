@@ -0,0 +1,56 @@
+"""add transaction event
+
+Revision ID: e2b9c4d6a1f0
+Revises: c7e4a2f9d813
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b9c4d6a1f0'
+down_revision: Union[str, Sequence[str], None] = 'c7e4a2f9d813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Daily partitions created up front; TransactionEventService keeps creating them ahead afterwards
+INITIAL_PARTITION_DAYS = 7
+
+
+def upgrade() -> None:
+    """Create the day-partitioned transaction_event table, its default partition and the next week's partitions."""
+    op.execute("""
+        CREATE TABLE transaction_event (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY,
+            occurred_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            player_id INTEGER NOT NULL,
+            type VARCHAR(40) NOT NULL,
+            details JSONB NOT NULL,
+            metadata JSONB NOT NULL,
+            PRIMARY KEY (id, occurred_at)
+        ) PARTITION BY RANGE (occurred_at)
+    """)
+    op.create_index('ix_transaction_event_player_time', 'transaction_event', ['player_id', 'occurred_at'])
+    op.create_index('ix_transaction_event_type_time', 'transaction_event', ['type', 'occurred_at'])
+    
+    # Catches rows for days nobody created a partition for, so COPY never fails on routing
+    op.execute("CREATE TABLE transaction_event_default PARTITION OF transaction_event DEFAULT")
+    
+    today = datetime.utcnow().date()
+    for offset in range(INITIAL_PARTITION_DAYS):
+        day = today + timedelta(days=offset)
+        op.execute(
+            f"CREATE TABLE transaction_event_p{day:%Y%m%d} PARTITION OF transaction_event "
+            f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+        )
+
+
+def downgrade() -> None:
+    """Drop transaction_event with all attached partitions (detached ones are left alone)."""
+    op.drop_index('ix_transaction_event_type_time', table_name='transaction_event')
+    op.drop_index('ix_transaction_event_player_time', table_name='transaction_event')
+    op.drop_table('transaction_event')
@@ -0,0 +1,32 @@
+"""add esprit collection keyset indexes
+
+Revision ID: f3c8a5e1d927
+Revises: 9d4e7b2c5a18
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8a5e1d927'
+down_revision: Union[str, Sequence[str], None] = '9d4e7b2c5a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Composite indexes behind keyset pagination of a player's collection."""
+    # Tier sorts: read forwards for tier ↓, backwards for tier ↑
+    op.create_index('ix_esprit_owner_tier', 'esprit', ['owner_id', sa.text('tier DESC'), sa.text('id DESC')])
+    # Element sort groups by element with the highest tier first, so the tier is negated
+    op.create_index('ix_esprit_owner_element', 'esprit', ['owner_id', 'element', sa.text('(-tier)'), 'id'])
+
+
+def downgrade() -> None:
+    """Drop the collection keyset indexes."""
+    op.drop_index('ix_esprit_owner_element', table_name='esprit')
+    op.drop_index('ix_esprit_owner_tier', table_name='esprit')
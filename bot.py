@@ -93,6 +93,88 @@ async def on_ready():
             
     except Exception as e:
         logger.error(f"Failed to setup emoji manager: {e}")
+    
+    # Load the Esprit catalog so rolls and captures never hit the database for bases
+    try:
+        from src.utils.esprit_catalog import EspritCatalog
+        from src.utils.loot_sampler import LootSamplers
+        
+        if not EspritCatalog.is_loaded():
+            catalog = await EspritCatalog.load()
+            logger.info(f"Esprit catalog ready: {len(catalog)} bases")
+            LootSamplers.rebuild(catalog)
+    except Exception as e:
+        logger.error(f"Failed to load Esprit catalog: {e}")
+    
+    # Index sprite files once so card generators resolve them with a dict lookup
+    try:
+        from src.utils.sprite_index import SpriteIndex
+        
+        SpriteIndex.load()
+    except Exception as e:
+        logger.error(f"Failed to build sprite index: {e}")
+    
+    # Card/boss renders run in worker processes so a burst of them doesn't hold the GIL
+    try:
+        from src.utils.render_service import RenderService
+        
+        await RenderService.start()
+    except Exception as e:
+        logger.error(f"Failed to start render workers: {e}")
+    
+    # L1 cache in front of Redis, kept coherent across shards via pub/sub
+    try:
+        from src.services.cache_service import CacheService
+        
+        if CacheService.configure_local_cache():
+            await CacheService.start_invalidation_listener()
+    except Exception as e:
+        logger.error(f"Failed to start local cache: {e}")
+    
+    # Sorted-set leaderboards: rebuild from Postgres in the background if Redis lost them
+    try:
+        from src.services.leaderboard_service import LeaderboardService
+        
+        if await LeaderboardService.ensure_built():
+            logger.info("Leaderboards missing in Redis, rebuilding in background")
+    except Exception as e:
+        logger.error(f"Failed to check leaderboards: {e}")
+    
+    # Daily/weekly windows are settled (snapshot + payouts) by a background pass
+    try:
+        from src.services.period_leaderboard_service import PeriodLeaderboardService
+        
+        if PeriodLeaderboardService.start_rollover_loop():
+            logger.info("Period leaderboard rollover started")
+    except Exception as e:
+        logger.error(f"Failed to start leaderboard rollover: {e}")
+    
+    # Transaction log segments are folded into per-day activity summaries in the background
+    try:
+        from src.services.analytics_service import AnalyticsService
+        
+        if AnalyticsService.start_ingest_loop():
+            logger.info("Analytics ingest started")
+    except Exception as e:
+        logger.error(f"Failed to start analytics ingest: {e}")
+    
+    # Daily transaction_event partitions: created ahead, detached past retention
+    try:
+        from src.services.transaction_event_service import TransactionEventService
+        
+        if TransactionEventService.start_maintenance_loop():
+            logger.info("transaction_event partition maintenance started")
+    except Exception as e:
+        logger.error(f"Failed to start transaction_event maintenance: {e}")
+    
+    # Power totals are maintained as deltas; a sampled recompute reports (and fixes) drift
+    try:
+        from src.services.power_service import PowerService
+        
+        if PowerService.start_verifier_loop():
+            logger.info("Power total verifier started")
+    except Exception as e:
+        logger.error(f"Failed to start power verifier: {e}")
 
 def load_cogs():
     """Load all cogs"""
@@ -117,6 +199,17 @@ def initialize_services():
         ConfigManager.load_all()  # ADD THIS
         logger.info(f"ConfigManager loaded: {len(ConfigManager._configs)} configs")
         
+        # Transaction log writer settings
+        from src.utils.transaction_logger import transaction_logger
+        transaction_logger.configure()
+        
+        # Optional bulk COPY of the same records into the partitioned transaction_event table
+        from src.utils.transaction_event_sink import TransactionEventSink
+        event_sink = TransactionEventSink.from_config(transaction_logger.encode_json)
+        if event_sink:
+            transaction_logger.add_sink(event_sink)
+            logger.info("transaction_event sink enabled")
+        
         # Database - ACTUALLY INITIALIZE IT
         from src.utils.database_service import DatabaseService
         DatabaseService.init()  # ADD THIS
@@ -127,6 +220,9 @@ def initialize_services():
         RedisService.init()  # ADD THIS TOO WHY NOT
         if RedisService.is_available():
             logger.info("RedisService connected")
+            
+            from src.services.cache_service import CacheService
+            CacheService.configure_codec()
         else:
             logger.warning("Redis not available - running without cache")
     except Exception as e:
@@ -158,6 +254,13 @@ def main():
     except Exception as e:
         logger.error(f"Fatal error: {e}")
         sys.exit(1)
+    finally:
+        # Drain queued transaction records before the process exits
+        from src.utils.transaction_logger import transaction_logger
+        transaction_logger.close()
+        
+        from src.utils.render_service import RenderService
+        RenderService.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
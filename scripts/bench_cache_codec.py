@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: legacy JSON-in-JSON cache entries vs the binary CacheCodec envelope.
+
+Reports encode/decode time per entry and bytes stored for typical power,
+collection-stats and leaderboard payloads. Runs offline, no Redis needed.
+
+    python scripts/bench_cache_codec.py [--iterations 2000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.utils.cache_codec import (
+    CacheCodec, COMPRESSOR_NONE, COMPRESSOR_ZLIB, COMPRESSOR_ZSTD, COMPRESSOR_LZ4,
+    SERIALIZER_JSON, SERIALIZER_MSGPACK
+)
+
+ELEMENTS = ["Inferno", "Verdant", "Abyssal", "Tempest", "Umbral", "Radiant"]
+TAGS = {"player:1234", "combat:1234"}
+
+
+def power_payload():
+    return {"atk": 184_233, "def": 97_120, "hp": 1_442_870, "total_power": 425_640}
+
+
+def collection_stats_payload():
+    rng = random.Random(7)
+    return {
+        "unique_esprits": 143, "total_quantity": 98_412, "total_power": 9_241_775,
+        "by_element": {e: rng.randint(100, 20_000) for e in ELEMENTS},
+        "by_tier": {str(t): rng.randint(1, 30_000) for t in range(1, 13)},
+        "completion": {"owned": 143, "total": 212, "percent": 67.45},
+        "top_stacks": [
+            {"name": f"Esprit {i}", "tier": rng.randint(1, 12), "element": rng.choice(ELEMENTS),
+             "quantity": rng.randint(1, 5000), "awakening_level": rng.randint(0, 5)}
+            for i in range(40)
+        ],
+        "last_updated": datetime(2026, 1, 1).isoformat()
+    }
+
+
+def leaderboard_payload():
+    rng = random.Random(11)
+    return [
+        {"rank": i + 1, "player_id": 100_000 + i, "username": f"player_{i:04d}",
+         "level": rng.randint(1, 400), "value": 10_000_000 - i * 9_731, "guild": f"Guild {i % 25}"}
+        for i in range(100)
+    ]
+
+
+def legacy_encode(value, ttl, tags, compress_threshold=1024):
+    """The pre-codec CacheService.set format"""
+    serialized = json.dumps(value, default=str)
+    compressed = len(serialized) > compress_threshold
+    entry = {
+        "data": zlib.compress(serialized.encode("utf-8")).decode("latin1") if compressed else value,
+        "tags": list(tags), "version": 1, "created_at": datetime.utcnow().isoformat(),
+        "ttl": ttl, "compressed": compressed
+    }
+    return json.dumps(entry, default=str).encode("utf-8")
+
+
+def timed(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = fn()
+    return (time.perf_counter() - start) / iterations * 1e6, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    
+    payloads = {
+        "power": power_payload(),
+        "collection_stats": collection_stats_payload(),
+        "leaderboard": leaderboard_payload()
+    }
+    
+    variants = [("legacy json+zlib/latin1", None, None)]
+    serializers = [(SERIALIZER_JSON, "json")]
+    if SERIALIZER_MSGPACK in CacheCodec._serializers:
+        serializers.append((SERIALIZER_MSGPACK, "msgpack"))
+    compressors = [(c, n) for c, n in [(COMPRESSOR_NONE, "none"), (COMPRESSOR_ZLIB, "zlib"),
+                                       (COMPRESSOR_ZSTD, "zstd"), (COMPRESSOR_LZ4, "lz4")]
+                   if c in CacheCodec._compressors]
+    for sid, sname in serializers:
+        for cid, cname in compressors:
+            variants.append((f"{sname}+{cname}", sid, cid))
+    
+    print(f"{'payload':<18}{'codec':<26}{'bytes':>8}{'encode us':>12}{'decode us':>12}")
+    print("-" * 76)
+    
+    for payload_name, value in payloads.items():
+        for label, sid, cid in variants:
+            if sid is None:
+                encode = lambda: legacy_encode(value, 1800, TAGS)
+            else:
+                # Force the compressor so every variant is measured, even below the threshold
+                encode = lambda: CacheCodec.encode(
+                    value, 1800, TAGS, 1, compress=cid != COMPRESSOR_NONE,
+                    serializer_id=sid, compressor_id=cid or None
+                )
+            
+            encode_us, raw = timed(encode, args.iterations)
+            decode_us, decoded = timed(lambda: CacheCodec.decode(raw), args.iterations)
+            
+            assert json.dumps(decoded.data, sort_keys=True, default=str) == \
+                json.dumps(value, sort_keys=True, default=str), f"{label} round trip mismatch"
+            
+            print(f"{payload_name:<18}{label:<26}{len(raw):>8}{encode_us:>12.1f}{decode_us:>12.1f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
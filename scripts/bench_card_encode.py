@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: card encoding, the old optimize-PNG save vs ImageEncoder.
+
+Renders --cards Esprit cards and --bosses boss cards once, then encodes every
+image with each strategy and reports ms and KB per card:
+  - legacy png: PNG, optimize=True, compress_level 6 (the previous _encode_png)
+  - encoder png / encoder webp: ImageEncoder with "format" forced to png / auto
+  - encoder palette: the template listed in palette_templates (lossy, shown
+    for reference only)
+Lossless paths are decoded again and compared pixel for pixel with the render.
+Runs offline.
+
+    python scripts/bench_card_encode.py [--cards 60] [--bosses 12]
+"""
+
+import argparse
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+# boss_generator imports "utils.*" the way the cogs do
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from PIL import Image
+
+from src.utils.config_manager import ConfigManager
+from src.utils.image_encoder import HAS_WEBP, ImageEncoder
+from src.utils.stats_generator import ImageGenerator
+from src.utils.boss_generator import UnifiedBossImageGenerator
+from scripts.bench_card_render import card_sequence
+
+
+def legacy_encode(img: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG", optimize=True, compress_level=6)
+    return buffer.getvalue()
+
+
+def run(images, encode, lossless: bool):
+    times, sizes = [], []
+    for img in images:
+        start = time.perf_counter()
+        data = encode(img)
+        times.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(data))
+        if lossless and Image.open(io.BytesIO(data)).convert("RGBA").tobytes() != img.tobytes():
+            sys.exit("Lossless encode changed pixels")
+    return times, sizes
+
+
+def describe(label: str, times, sizes) -> str:
+    p95 = sorted(times)[int(len(times) * 0.95) - 1] if len(times) > 1 else times[0]
+    return (f"  {label:<16} {statistics.mean(times):>8.1f} {p95:>8.1f} "
+            f"{statistics.mean(sizes) / 1024:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=60)
+    parser.add_argument("--bosses", type=int, default=12)
+    args = parser.parse_args()
+    
+    ConfigManager.load_all()
+    base_config = dict(ConfigManager.get("stats_display").get("compression", {}))
+    
+    cards = [ImageGenerator()._render_card_sync(card_data) for card_data in card_sequence(args.cards)]
+    boss_generator = UnifiedBossImageGenerator()
+    bosses = [
+        boss_generator._render_boss_sync({
+            "name": card_data["name"], "element": card_data["element"],
+            "current_hp": card_data["base_hp"] // 2, "max_hp": card_data["base_hp"]
+        })
+        for card_data in card_sequence(args.bosses, seed=11)
+    ]
+    
+    strategies = [
+        ("legacy png", None, True),
+        ("encoder png", {**base_config, "format": "png", "palette_templates": []}, True),
+        ("encoder webp", {**base_config, "format": "auto", "palette_templates": []}, True),
+        ("encoder palette", {**base_config, "palette_templates": ["esprit", "boss"]}, False),
+    ]
+    
+    print(f"WebP available: {HAS_WEBP}")
+    for template, images in (("esprit", cards), ("boss", bosses)):
+        print(f"\n{template} ({len(images)} images, {images[0].width}x{images[0].height})")
+        print(f"  {'':<16} {'mean ms':>8} {'p95 ms':>8} {'KB':>8}")
+        baseline = None
+        for label, config, lossless in strategies:
+            ImageEncoder.reset()
+            if config is None:
+                encode = legacy_encode
+            else:
+                encode = lambda img, config=config: ImageEncoder.encode(img, template, config)
+            times, sizes = run(images, encode, lossless)
+            line = describe(label, times, sizes)
+            if baseline is None:
+                baseline = statistics.mean(times), statistics.mean(sizes)
+            else:
+                line += (f"   {baseline[0] / statistics.mean(times):>5.1f}x faster, "
+                         f"{statistics.mean(sizes) / baseline[1]:>4.0%} of the bytes")
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
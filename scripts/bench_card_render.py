@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-card Esprit rendering with and without the template layer.
+
+Renders the same card sequence with ImageGenerator(use_templates=False) (every
+layer drawn per card: starfield, glow + GaussianBlur, dominant color, sprite
+scaling, content box and frame) and with templates (precomposed background
+plate, memoized sprites/colors, cached glows). Reports wall and CPU ms per
+card. Cards cycle through the sprites in assets/esprits, so the template run
+includes its cold misses. Runs offline; Discord is never contacted.
+
+    python scripts/bench_card_render.py [--cards 120] [--encode]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.utils.config_manager import ConfigManager
+from src.utils.stats_generator import ImageGenerator
+from src.utils.sprite_index import SpriteIndex
+
+
+def card_sequence(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    snapshot = SpriteIndex.load()
+    names = sorted({path.stem for path in snapshot.sprites.values()}) or ["Missing Sprite"]
+    relic_pool = ["Ember Shard", "Tidal Charm", "Gale Feather", None]
+    for i in range(count):
+        slots = rng.randint(0, 3)
+        yield {
+            "name": names[i % len(names)],
+            "element": rng.choice(["Inferno", "Verdant", "Abyssal", "Tempest", "Umbral", "Radiant"]),
+            "tier": rng.randint(1, 12),
+            "awakening_level": rng.randint(0, 5),
+            "base_atk": rng.randint(10, 5000),
+            "base_def": rng.randint(10, 5000),
+            "base_hp": rng.randint(100, 50000),
+            "quantity": rng.randint(1, 500),
+            "equipped_relics": [rng.choice(relic_pool) for _ in range(slots)],
+            "max_relic_slots": slots,
+            "leader_skill": rng.choice(["None", "Boosts ATK of Inferno allies by 15% while the leader stands"])
+        }
+
+
+def run(generator: ImageGenerator, cards, encode: bool):
+    wall, cpu = [], []
+    for card_data in cards:
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        image = generator._render_card_sync(card_data)
+        if encode:
+            generator._encode_image(image)
+        wall.append((time.perf_counter() - wall_start) * 1000)
+        cpu.append((time.process_time() - cpu_start) * 1000)
+    return wall, cpu
+
+
+def describe(label: str, wall, cpu) -> str:
+    p95 = sorted(wall)[int(len(wall) * 0.95) - 1] if len(wall) > 1 else wall[0]
+    return (f"{label:<18} {statistics.mean(wall):>8.2f} {statistics.median(wall):>8.2f} {p95:>8.2f}"
+            f" {statistics.mean(cpu):>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=120)
+    parser.add_argument("--encode", action="store_true", help="Include image encoding in each measurement")
+    args = parser.parse_args()
+    
+    ConfigManager.load_all()
+    cards = list(card_sequence(args.cards))
+    
+    baseline = ImageGenerator(use_templates=False)
+    build_start = time.perf_counter()
+    templated = ImageGenerator(use_templates=True)
+    templated._get_card_template()
+    build_ms = (time.perf_counter() - build_start) * 1000
+    
+    before = run(baseline, cards, args.encode)
+    after = run(templated, cards, args.encode)
+    
+    print(f"{args.cards} cards{' incl. encode' if args.encode else ''}; template build {build_ms:.1f} ms\n")
+    print(f"{'':<18} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'CPU ms':>9}")
+    print(describe("per-card layers", *before))
+    print(describe("templates", *after))
+    print(f"\nspeedup: {statistics.mean(before[0]) / statistics.mean(after[0]):.1f}x wall, "
+          f"{statistics.mean(before[1]) / statistics.mean(after[1]):.1f}x CPU")
+
+
+if __name__ == "__main__":
+    main()
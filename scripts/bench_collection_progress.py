@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-element/per-tier collection progress loops vs the single GROUP BY snapshot.
+
+Seeds a throwaway player with N stacks inside one transaction, runs both
+strategies against it, prints query count and latency, then rolls back.
+Nothing is committed. Needs DATABASE_URL and a populated esprit_base table.
+
+    python scripts/bench_collection_progress.py [--stacks 500] [--iterations 20]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import event, select, func
+
+from src.database.models import Esprit, EspritBase, Player
+from src.services.esprit_service import EspritService
+from src.utils.database_service import DatabaseService
+from src.utils.esprit_catalog import CatalogSnapshot
+from src.utils.game_constants import Elements, Tiers
+
+
+class QueryCounter:
+    """Counts statements executed on an engine"""
+    
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+    
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+async def seed_player(session, stacks: int) -> int:
+    """Insert a bench player owning `stacks` distinct stacks (uncommitted)"""
+    bases = (await session.execute(select(EspritBase).order_by(EspritBase.id))).scalars().all()  # type: ignore
+    if len(bases) < stacks:
+        print(f"⚠️  Only {len(bases)} esprit bases exist; seeding {len(bases)} stacks instead of {stacks}")
+    
+    player = Player(discord_id=random.randint(10**17, 10**18), username="bench_collection")
+    session.add(player)
+    await session.flush()
+    
+    rng = random.Random(42)
+    for base in rng.sample(list(bases), min(stacks, len(bases))):
+        session.add(Esprit(
+            esprit_base_id=base.id, owner_id=player.id, quantity=rng.randint(1, 500),
+            tier=base.base_tier, element=base.element,
+            awakening_level=rng.choice([0, 0, 0, 1, 2, 3, 4, 5])
+        ))
+    await session.flush()
+    return player.id  # type: ignore
+
+
+async def legacy_progress(session, player_id: int) -> None:
+    """The old get_element_progress + get_tier_progress query pattern"""
+    for element in Elements.get_all():
+        by_element = select(EspritBase.id).where(EspritBase.element == element.name)  # type: ignore
+        await session.execute(select(func.count()).select_from(EspritBase).where(EspritBase.element == element.name))  # type: ignore
+        await session.execute(select(func.count()).select_from(Esprit).where(
+            Esprit.owner_id == player_id, Esprit.esprit_base_id.in_(by_element)))  # type: ignore
+        await session.execute(select(func.coalesce(func.sum(Esprit.quantity), 0)).where(
+            Esprit.owner_id == player_id, Esprit.esprit_base_id.in_(by_element)))  # type: ignore
+    
+    for tier_num in Tiers.get_all():
+        by_tier = select(EspritBase.id).where(EspritBase.base_tier == tier_num)  # type: ignore
+        await session.execute(select(func.count()).select_from(EspritBase).where(EspritBase.base_tier == tier_num))  # type: ignore
+        await session.execute(select(func.count()).select_from(Esprit).where(
+            Esprit.owner_id == player_id, Esprit.esprit_base_id.in_(by_tier)))  # type: ignore
+        await session.execute(select(func.coalesce(func.sum(Esprit.quantity), 0)).where(
+            Esprit.owner_id == player_id, Esprit.esprit_base_id.in_(by_tier)))  # type: ignore
+        await session.execute(select(func.count()).select_from(Esprit).where(
+            Esprit.owner_id == player_id, Esprit.awakening_level > 0, Esprit.esprit_base_id.in_(by_tier)))  # type: ignore
+
+
+async def grouped_progress(session, player_id: int, catalog: CatalogSnapshot) -> None:
+    """The new path on a cache miss: one aggregate, totals from the in-memory catalog"""
+    stmt = select(
+        EspritBase.element, EspritBase.base_tier, Esprit.awakening_level,  # type: ignore
+        func.count(Esprit.id), func.coalesce(func.sum(Esprit.quantity), 0)  # type: ignore
+    ).select_from(Esprit).join(EspritBase, Esprit.esprit_base_id == EspritBase.id).where(  # type: ignore
+        Esprit.owner_id == player_id  # type: ignore
+    ).group_by(EspritBase.element, EspritBase.base_tier, Esprit.awakening_level)
+    stats = EspritService._build_collection_stats((await session.execute(stmt)).all())
+    
+    # Same per-view work the service does against the catalog
+    for element in Elements.get_all():
+        stats["by_element"].get(element.name.lower(), {})
+        len(catalog.get_element(element.name))
+    tier_counts = catalog.tier_counts()
+    for tier_num in Tiers.get_all():
+        stats["by_tier"].get(f"tier_{tier_num}", {})
+        tier_counts.get(tier_num, 0)
+
+
+async def measure(counter: QueryCounter, fn, iterations: int):
+    timings = []
+    before = counter.count
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return (counter.count - before) / iterations, timings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stacks", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    
+    DatabaseService.init()
+    counter = QueryCounter(DatabaseService.get_engine())
+    
+    async with DatabaseService.get_session() as session:
+        try:
+            player_id = await seed_player(session, args.stacks)
+            catalog = CatalogSnapshot.build((await session.execute(select(EspritBase))).scalars().all())
+            
+            # Warm up both paths once so plan caching doesn't skew the first sample
+            await legacy_progress(session, player_id)
+            await grouped_progress(session, player_id, catalog)
+            
+            results = {
+                "per-element/per-tier loops": await measure(
+                    counter, lambda: legacy_progress(session, player_id), args.iterations),
+                "single GROUP BY + catalog": await measure(
+                    counter, lambda: grouped_progress(session, player_id, catalog), args.iterations),
+            }
+        finally:
+            await session.rollback()
+    
+    print(f"Player with {args.stacks} stacks, {args.iterations} iterations (seed rolled back)\n")
+    print(f"{'strategy':<30}{'queries':>9}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    print("-" * 69)
+    for label, (queries, timings) in results.items():
+        ordered = sorted(timings)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        print(f"{label:<30}{queries:>9.0f}{statistics.median(ordered):>10.2f}{p95:>10.2f}{statistics.mean(ordered):>10.2f}")
+    print("\nA cached snapshot (the common case) costs 0 queries for both views.")
+    
+    await DatabaseService.get_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
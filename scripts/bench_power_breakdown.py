@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-object power breakdown loop vs the NumPy columnar path.
+
+Builds in-memory collections of 100, 1k and 10k stacks (no database) and
+times, per collection, the old get_power_breakdown loop over (Esprit,
+EspritBase) objects vs summarize_collection over plain row tuples, which
+is what the service now selects. Both paths are checked for identical
+results before timing.
+
+    python scripts/bench_power_breakdown.py [--sizes 100 1000 10000] [--iterations 20]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.database.models import Esprit, EspritBase
+from src.utils.power_columns import HAS_NUMPY, summarize_collection
+
+ELEMENTS = ["Inferno", "Verdant", "Abyssal", "Tempest", "Umbral", "Radiant"]
+
+
+def make_collection(size: int, seed: int = 42):
+    rng = random.Random(seed)
+    pairs = []
+    for i in range(size):
+        tier = rng.randint(1, 12)
+        base = EspritBase(
+            id=i + 1, name=f"Bench {i}", element=rng.choice(ELEMENTS), base_tier=tier,
+            base_atk=rng.randint(10, 5000), base_def=rng.randint(10, 5000), base_hp=rng.randint(100, 50000)
+        )
+        stack = Esprit(
+            id=i + 1, esprit_base_id=base.id, owner_id=1, quantity=rng.randint(1, 500),
+            tier=tier, element=base.element, awakening_level=rng.choice([0, 0, 0, 1, 2, 3, 4, 5])
+        )
+        pairs.append((stack, base))
+    return pairs
+
+
+def to_rows(pairs):
+    """What PowerService.stack_rows_statement returns"""
+    return [
+        (base.base_atk, base.base_def, base.base_hp, stack.awakening_level,
+         stack.quantity, stack.element, stack.tier, base.name)
+        for stack, base in pairs
+    ]
+
+
+def legacy_breakdown(pairs):
+    """The previous get_power_breakdown body, minus the skill bonus step"""
+    power_by_element = {}
+    power_by_tier = {}
+    total_base_power = {"atk": 0, "def": 0, "hp": 0}
+    esprit_contributions = []
+    
+    for esprit, base in pairs:
+        individual_power = esprit.get_individual_power(base)
+        stack_power = esprit.get_stack_total_power(base)
+        
+        element = esprit.element
+        if element not in power_by_element:
+            power_by_element[element] = {"atk": 0, "def": 0, "hp": 0, "count": 0}
+        power_by_element[element]["atk"] += stack_power["atk"]
+        power_by_element[element]["def"] += stack_power["def"]
+        power_by_element[element]["hp"] += stack_power["hp"]
+        power_by_element[element]["count"] += esprit.quantity
+        
+        tier = esprit.tier
+        if tier not in power_by_tier:
+            power_by_tier[tier] = {"atk": 0, "def": 0, "hp": 0, "count": 0}
+        power_by_tier[tier]["atk"] += stack_power["atk"]
+        power_by_tier[tier]["def"] += stack_power["def"]
+        power_by_tier[tier]["hp"] += stack_power["hp"]
+        power_by_tier[tier]["count"] += esprit.quantity
+        
+        total_base_power["atk"] += stack_power["atk"]
+        total_base_power["def"] += stack_power["def"]
+        total_base_power["hp"] += stack_power["hp"]
+        
+        esprit_contributions.append({
+            "name": base.name, "element": esprit.element, "tier": esprit.tier,
+            "awakening": esprit.awakening_level, "quantity": esprit.quantity,
+            "individual_power": individual_power, "stack_power": stack_power,
+            "efficiency": (individual_power["atk"] + individual_power["def"] + individual_power["hp"]) / max(esprit.tier, 1)
+        })
+    
+    esprit_contributions.sort(key=lambda x: sum(x["stack_power"].values()), reverse=True)
+    
+    return {
+        "base_power": total_base_power, "power_by_element": power_by_element,
+        "power_by_tier": power_by_tier, "top_contributors": esprit_contributions[:10],
+        "total_esprits": len(esprit_contributions),
+        "total_quantity": sum(c["quantity"] for c in esprit_contributions),
+        "average_tier": round(sum(c["tier"] * c["quantity"] for c in esprit_contributions) /
+                            max(sum(c["quantity"] for c in esprit_contributions), 1), 2)
+    }
+
+
+def timed(fn, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    
+    print(f"NumPy available: {HAS_NUMPY}\n")
+    print(f"{'stacks':>7}  {'breakdown loop':>15}  {'columnar':>9}  {'speedup':>8}")
+    
+    for size in args.sizes:
+        pairs = make_collection(size)
+        rows = to_rows(pairs)
+        
+        if summarize_collection(rows) != legacy_breakdown(pairs):
+            sys.exit(f"Breakdown mismatch at {size} stacks")
+        
+        loop_ms = timed(lambda: legacy_breakdown(pairs), args.iterations)
+        columnar_ms = timed(lambda: summarize_collection(rows), args.iterations)
+        
+        print(f"{size:>7,}  {loop_ms:>12.2f} ms  {columnar_ms:>6.2f} ms  {loop_ms / columnar_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: a burst of concurrent card renders on threads vs the render worker pool.
+
+Fires --burst Esprit card renders at once (distinct specs, card cache bypassed)
+and measures each path:
+  - threads: asyncio.to_thread(render_encoded_sync), how every render ran before
+  - pool: RenderService.render with --workers spawned worker processes
+Reports burst wall time, cards/s, per-card latency and the worst event-loop
+stall seen by a 5 ms ticker while the burst runs. Runs offline.
+
+    python scripts/bench_render_service.py [--burst 40] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+# boss_generator (loaded by every worker) imports "utils.*" the way the cogs do
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.utils.config_manager import ConfigManager
+from src.utils.render_service import RenderService
+from src.utils.stats_generator import ImageGenerator
+from scripts.bench_card_render import card_sequence
+
+TICK_MS = 5
+
+
+async def loop_stall(stop: asyncio.Event) -> float:
+    """Worst lateness (ms) of a ticker that wants to wake every TICK_MS"""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_MS / 1000)
+        worst = max(worst, (time.perf_counter() - start) * 1000 - TICK_MS)
+    return worst
+
+
+async def burst(render, cards):
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(loop_stall(stop))
+    
+    async def timed(card_data):
+        start = time.perf_counter()
+        data = await render(card_data)
+        return data, (time.perf_counter() - start) * 1000
+    
+    start = time.perf_counter()
+    results = await asyncio.gather(*(timed(card_data) for card_data in cards))
+    wall_ms = (time.perf_counter() - start) * 1000
+    stop.set()
+    stall_ms = await ticker
+    
+    if any(data is None for data, _ in results):
+        sys.exit("A render returned no bytes")
+    return wall_ms, [latency for _, latency in results], stall_ms
+
+
+def describe(label: str, count: int, wall_ms: float, latencies, stall_ms: float) -> str:
+    p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1]
+    return (f"{label:<10} {wall_ms:>9.0f} {count / wall_ms * 1000:>8.1f} {statistics.median(latencies):>8.0f}"
+            f" {p95:>8.0f} {stall_ms:>10.1f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--burst", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    
+    ConfigManager.load_all()
+    ConfigManager.get("global_config")["render_service"] = {
+        "enabled": True, "workers": args.workers, "max_queue": args.burst, "timeout_seconds": 120
+    }
+    cards = list(card_sequence(args.burst))
+    
+    generator = ImageGenerator()
+    generator.render_encoded_sync(cards[0])  # warm the template, fonts and first sprite
+    before = await burst(lambda card_data: asyncio.to_thread(generator.render_encoded_sync, card_data), cards)
+    
+    spawn_start = time.perf_counter()
+    if not await RenderService.start():
+        sys.exit("Render workers failed to start")
+    spawn_ms = (time.perf_counter() - spawn_start) * 1000
+    try:
+        after = await burst(lambda card_data: RenderService.render("esprit", card_data), cards)
+    finally:
+        RenderService.stop()
+    
+    print(f"{args.burst} concurrent cards; {args.workers} workers spawned and preloaded in {spawn_ms:.0f} ms\n")
+    print(f"{'':<10} {'burst ms':>9} {'cards/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'stall ms':>10}")
+    print(describe("threads", args.burst, *before))
+    print(describe("pool", args.burst, *after))
+    print(f"\nthroughput: {before[0] / after[0]:.1f}x, worst loop stall {before[2]:.1f} -> {after[2]:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
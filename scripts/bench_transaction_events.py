@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sustained transaction_event ingest through the COPY sink.
+
+Creates a scratch day-partitioned table shaped like transaction_event.
+Synthetic logger records are pushed through TransactionEventSink in
+writer-sized batches, and the script measures events/second end to end
+(submit -> committed) and for the COPY calls alone. An executemany INSERT
+of the same rows is timed as the baseline. The scratch table is dropped
+afterwards. Needs DATABASE_URL.
+
+    python scripts/bench_transaction_events.py [--events 200000] [--copy-batch 5000] [--insert-sample 20000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncpg
+from dotenv import load_dotenv
+
+from src.utils.transaction_event_sink import TransactionEventSink
+from src.utils.transaction_logger import TransactionType, transaction_logger
+
+TABLE = "transaction_event_bench"
+WRITER_BATCH = 256
+
+
+def make_records(count: int) -> list:
+    """(timestamp, player_id, type, details, metadata) tuples like the logger's ring buffer holds"""
+    rng = random.Random(7)
+    types = [t.value for t in TransactionType]
+    now = time.time()
+    return [
+        (now + i / 1000, rng.randint(1, 50000), rng.choice(types),
+         {"currency": "revies", "amount": rng.randint(1, 5000), "reason": "bench", "tier": rng.randint(1, 18)},
+         {})
+        for i in range(count)
+    ]
+
+
+async def create_table(conn) -> None:
+    today = datetime.utcnow().date()
+    await conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    await conn.execute(f"""
+        CREATE TABLE {TABLE} (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY,
+            occurred_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            player_id INTEGER NOT NULL,
+            type VARCHAR(40) NOT NULL,
+            details JSONB NOT NULL,
+            metadata JSONB NOT NULL,
+            PRIMARY KEY (id, occurred_at)
+        ) PARTITION BY RANGE (occurred_at)
+    """)
+    await conn.execute(f"CREATE INDEX ON {TABLE} (player_id, occurred_at)")
+    await conn.execute(f"CREATE INDEX ON {TABLE} (type, occurred_at)")
+    await conn.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+    for offset in (-1, 0, 1):
+        day = today + timedelta(days=offset)
+        await conn.execute(
+            f"CREATE TABLE {TABLE}_p{day:%Y%m%d} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+        )
+
+
+async def bench_copy(dsn: str, records: list, copy_batch: int) -> dict:
+    sink = TransactionEventSink(dsn, transaction_logger.encode_json, table=TABLE,
+                                capacity=len(records) + 1, batch_size=copy_batch, flush_interval_ms=200)
+    sink.start()
+    
+    start = time.perf_counter()
+    for i in range(0, len(records), WRITER_BATCH):
+        sink.submit(records[i:i + WRITER_BATCH])
+    submitted = time.perf_counter() - start
+    
+    # Stop waiting if COPY makes no progress for 30s (e.g. the database went away)
+    last_inserted, last_progress = 0, time.perf_counter()
+    while (inserted := sink.get_stats()["inserted"]) < len(records):
+        if inserted != last_inserted:
+            last_inserted, last_progress = inserted, time.perf_counter()
+        elif time.perf_counter() - last_progress > 30:
+            break
+        await asyncio.sleep(0.01)
+    total = time.perf_counter() - start
+    stats = sink.get_stats()
+    sink.close()
+    
+    return {"submit_s": submitted, "total_s": total, **stats}
+
+
+async def bench_insert(conn, records: list) -> float:
+    rows = [
+        (datetime.utcfromtimestamp(ts), player_id, kind,
+         transaction_logger.encode_json(details), transaction_logger.encode_json(metadata))
+        for ts, player_id, kind, details, metadata in records
+    ]
+    start = time.perf_counter()
+    await conn.executemany(
+        f"INSERT INTO {TABLE} (occurred_at, player_id, type, details, metadata) VALUES ($1, $2, $3, $4, $5)", rows
+    )
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--copy-batch", type=int, default=5000)
+    parser.add_argument("--insert-sample", type=int, default=20000)
+    args = parser.parse_args()
+    
+    load_dotenv()
+    dsn = os.getenv("DATABASE_URL", "").replace("postgresql+asyncpg://", "postgresql://")
+    if not dsn:
+        sys.exit("DATABASE_URL is not set")
+    
+    records = make_records(args.events)
+    conn = await asyncpg.connect(dsn)
+    try:
+        await create_table(conn)
+        copy = await bench_copy(dsn, records, args.copy_batch)
+        sample = records[:args.insert_sample]
+        insert_s = await bench_insert(conn, sample)
+        stored = await conn.fetchval(f"SELECT count(*) FROM {TABLE}")
+    finally:
+        await conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        await conn.close()
+    
+    print(f"{args.events:,} events, COPY batches of {args.copy_batch:,}, writer batches of {WRITER_BATCH}\n")
+    print(f"{'path':<34}{'events/s':>12}{'seconds':>10}")
+    print("-" * 56)
+    print(f"{'submit() (writer thread cost)':<34}{args.events / copy['submit_s']:>12,.0f}{copy['submit_s']:>10.2f}")
+    print(f"{'COPY sink, end to end':<34}{copy['inserted'] / copy['total_s']:>12,.0f}{copy['total_s']:>10.2f}")
+    print(f"{'COPY calls only':<34}{copy['rows_per_second']:>12,}{'':>10}")
+    print(f"{'executemany INSERT (baseline)':<34}{len(sample) / insert_s:>12,.0f}{insert_s:>10.2f}")
+    print(f"\ninserted {copy['inserted']:,} · batches {copy['batches']} · max COPY {copy['max_copy_ms']}ms · "
+          f"failures {copy['failures']} · rows stored {stored:,}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time spent holding a lock on the transaction capture path.
+
+Simulates services logging inside a critical section, the way
+EspritService.add_to_collection and EchoService.open_echo do while a row
+lock is held. Concurrent tasks contend on a few asyncio locks. The script
+compares the old synchronous FileHandler + ReveJSONEncoder write against
+the ring-buffer logger under each backpressure policy. Logs go to a temp
+directory that is removed afterwards.
+
+    python scripts/bench_transaction_logger.py [--records 20000] [--tasks 64] [--locks 8]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.utils.transaction_logger import ReveJSONEncoder, TransactionType, transaction_logger
+
+
+class LegacyLogger:
+    """The previous implementation: serialize and write inline on the caller"""
+    
+    def __init__(self, log_dir: Path):
+        self.logger = logging.getLogger("bench_transactions_legacy")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        handler = logging.FileHandler(log_dir / "legacy.log", encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self.logger.addHandler(handler)
+    
+    def log_transaction(self, player_id, transaction_type, details, metadata=None):
+        transaction = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "player_id": player_id,
+            "type": transaction_type.value,
+            "details": details,
+            "metadata": metadata or {}
+        }
+        self.logger.info(json.dumps(transaction, cls=ReveJSONEncoder))
+    
+    def close(self):
+        for handler in list(self.logger.handlers):
+            handler.close()
+            self.logger.removeHandler(handler)
+
+
+def capture_details(i: int) -> dict:
+    """Payload shaped like EspritService.add_to_collection's log entry"""
+    return {
+        "esprit_name": f"Bench Esprit {i % 300}", "esprit_base_id": i % 300,
+        "quantity_added": 1, "old_quantity": i % 50, "new_quantity": i % 50 + 1,
+        "tier": i % 18 + 1, "element": "Inferno", "is_new_capture": i % 50 == 0,
+        "capture_rate": Decimal("0.125"), "captured_at": datetime.utcnow()
+    }
+
+
+async def run(log, records: int, tasks: int, locks: int):
+    """Per-capture lock hold times (ms) and total wall time (s)"""
+    row_locks = [asyncio.Lock() for _ in range(locks)]
+    holds = []
+    per_task = records // tasks
+    
+    async def worker(worker_id: int):
+        for n in range(per_task):
+            i = worker_id * per_task + n
+            lock = row_locks[i % locks]
+            async with lock:
+                start = time.perf_counter()
+                log.log_transaction(i, TransactionType.ESPRIT_CAPTURED, capture_details(i))
+                holds.append((time.perf_counter() - start) * 1000)
+            # Yield like a real handler awaiting its next query
+            await asyncio.sleep(0)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(tasks)))
+    return holds, time.perf_counter() - start
+
+
+def percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--tasks", type=int, default=64)
+    parser.add_argument("--locks", type=int, default=8)
+    args = parser.parse_args()
+    
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir = Path(tmp)
+        
+        legacy = LegacyLogger(log_dir)
+        results["sync FileHandler (old)"] = (*await run(legacy, args.records, args.tasks, args.locks), None)
+        legacy.close()
+        
+        for policy in ("drop_oldest", "block", "sample"):
+            transaction_logger.configure(log_dir=log_dir / policy, backpressure=policy)
+            before = transaction_logger.get_stats()
+            holds, wall = await run(transaction_logger, args.records, args.tasks, args.locks)
+            transaction_logger.flush()
+            after = transaction_logger.get_stats()
+            counters = {k: after[k] - before[k] for k in ("queued", "written", "dropped")}
+            results[f"ring buffer ({policy})"] = (holds, wall, counters)
+        
+        transaction_logger.close()
+    
+    print(f"{args.records} records, {args.tasks} tasks over {args.locks} locks\n")
+    print(f"{'strategy':<26}{'p50 us':>9}{'p99 us':>9}{'max us':>10}{'total ms':>10}{'wall s':>8}   counters")
+    print("-" * 100)
+    for label, (holds, wall, counters) in results.items():
+        ordered = sorted(holds)
+        counter_text = " ".join(f"{k}={v}" for k, v in counters.items()) if counters else ""
+        print(
+            f"{label:<26}{statistics.median(ordered) * 1000:>9.1f}{percentile(ordered, 0.99) * 1000:>9.1f}"
+            f"{ordered[-1] * 1000:>10.1f}{sum(ordered):>10.1f}{wall:>8.2f}   {counter_text}"
+        )
+    print("\nHold time is measured between acquiring and releasing the lock around the log call.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
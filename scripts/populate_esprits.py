@@ -14,10 +14,13 @@ sys.path.append(str(Path(__file__).parent.parent))
 from sqlalchemy import select
 from src.database.models import EspritBase
 from src.utils.database_service import DatabaseService
+from src.utils.esprit_catalog import EspritCatalog
+from src.utils.redis_service import RedisService
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 DatabaseService.init()
+RedisService.init()
 
 async def populate_esprits_with_updates():
     """Load Esprit base data from JSON file, UPDATING existing entries."""
@@ -95,6 +98,10 @@ async def populate_esprits_with_updates():
     print(f"❌ Errors: {errors}")
     print("="*59)
     
+    # Rebuild the catalog and bump its version so running bots reload it
+    catalog = await EspritCatalog.reload()
+    print(f"📚 Esprit catalog rebuilt: {len(catalog)} bases (version {catalog.version})")
+    
     # Verify some updated stats
     if updated > 0 or added > 0:
         print("\n📋 Sample Esprit stats from DB:")
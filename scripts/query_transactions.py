@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Query the segmented transaction log through its sidecar indexes.
+
+Only segments whose time window overlaps the range are considered, and
+within them only frames whose index lists the player/type are
+decompressed. Prints matching records as JSONL, oldest first.
+
+    python scripts/query_transactions.py --player 42 --since 2025-01-01 --until 2025-01-07
+    python scripts/query_transactions.py --type echo_opened --since 2025-01-01T12:00 --stats
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.utils.transaction_logger import TransactionType
+from src.utils.transaction_segments import SegmentReader
+
+
+def parse_time(value: str, end_of_day: bool = False) -> datetime:
+    """ISO date or datetime (UTC); a bare date as an upper bound covers the whole day"""
+    parsed = datetime.fromisoformat(value)
+    if end_of_day and len(value) == 10:
+        parsed += timedelta(days=1, microseconds=-1)
+    return parsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--player", type=int, help="Player database id")
+    parser.add_argument("--type", dest="transaction_type",
+                        choices=[t.value for t in TransactionType], metavar="TYPE",
+                        help="Transaction type, e.g. currency_gain")
+    parser.add_argument("--since", help="UTC start, YYYY-MM-DD or ISO datetime")
+    parser.add_argument("--until", help="UTC end (inclusive), YYYY-MM-DD or ISO datetime")
+    parser.add_argument("--dir", default="logs/transactions", help="Segment directory")
+    parser.add_argument("--limit", type=int, default=0, help="Stop after N records")
+    parser.add_argument("--stats", action="store_true", help="Print index hit stats to stderr")
+    args = parser.parse_args()
+    
+    if args.player is None and args.transaction_type is None and not (args.since or args.until):
+        parser.error("give at least one of --player, --type, --since/--until")
+    
+    reader = SegmentReader(Path(args.dir))
+    records = reader.query(
+        player_id=args.player,
+        transaction_type=args.transaction_type,
+        since=parse_time(args.since) if args.since else None,
+        until=parse_time(args.until, end_of_day=True) if args.until else None
+    )
+    
+    for count, record in enumerate(records, start=1):
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if args.limit and count >= args.limit:
+            break
+    
+    if args.stats:
+        stats = reader.stats
+        print(
+            f"segments {stats.segments_read}/{stats.segments_total} · frames {stats.frames_read}/{stats.frames_total} · "
+            f"{stats.bytes_decompressed:,} bytes decompressed · {stats.records} records",
+            file=sys.stderr
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Recompute every player's stored power totals from their collection.
+
+Migration 9d4e7b2c5a18 backfills the totals once when delta-maintained
+power is deployed; run this whenever the verifier reports widespread drift
+afterwards. Players are processed in id order, one locked batch per
+transaction.
+
+    python scripts/rebuild_power_totals.py --batch-size 500
+    python scripts/rebuild_power_totals.py --dry-run
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+from src.database.models import Player
+from src.services.power_service import PowerService
+from src.utils.database_service import DatabaseService
+from src.utils.redis_service import RedisService
+
+
+async def rebuild(batch_size: int, repair: bool) -> None:
+    DatabaseService.init()
+    RedisService.init()
+    
+    last_id, checked, drifted = 0, 0, 0
+    while True:
+        async with DatabaseService.get_session() as session:
+            ids = (await session.execute(
+                select(Player.id).where(Player.id > last_id).order_by(Player.id).limit(batch_size)  # type: ignore
+            )).scalars().all()
+        if not ids:
+            break
+        
+        result = await PowerService.verify_power_totals(repair=repair, player_ids=list(ids))
+        if not result.success or result.data is None:
+            print(f"Batch after id {last_id} failed: {result.error}")
+            sys.exit(1)
+        
+        checked += result.data["checked"]
+        drifted += result.data["drifted"]
+        last_id = ids[-1]
+        print(f"... through id {last_id}: {checked:,} checked, {drifted:,} drifted")
+    
+    action = "repaired" if repair else "would repair"
+    print(f"Done: {checked:,} players checked, {drifted:,} {action}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Report drift without writing")
+    args = parser.parse_args()
+    asyncio.run(rebuild(args.batch_size, not args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
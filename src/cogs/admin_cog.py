@@ -8,6 +8,14 @@ from src.utils.database_service import DatabaseService
 from src.utils.embed_colors import EmbedColors
 from src.utils.redis_service import RedisService
 from src.utils.config_manager import ConfigManager
+from src.utils.esprit_catalog import EspritCatalog
+from src.utils.sprite_index import SpriteIndex
+from src.utils.card_cache import CardCache
+from src.utils.render_service import RenderService
+from src.utils.loot_sampler import LootSamplers
+from src.services.leaderboard_service import LeaderboardService
+from src.services.period_leaderboard_service import PeriodLeaderboardService
+from src.services.power_service import PowerService
 from src.utils.redis_service import ratelimit
 from src.database.models import Player, Esprit, EspritBase
 
@@ -89,6 +97,9 @@ class Admin(commands.Cog):
                
                await session.commit()
                
+               if player_id:
+                   await LeaderboardService.remove(player_id)
+               
                embed = disnake.Embed(
                    title="✅ Reset Complete",
                    description=(
@@ -149,6 +160,73 @@ class Admin(commands.Cog):
        except Exception as e:
            logger.error(f"Admin command error in {inter.application_command.name}: {e}", exc_info=True)
            await inter.edit_original_response(content="❌ Error syncing emojis. Check logs for details.")
+   
+   @admin_sync.sub_command(name="leaderboards", description="Rebuild Redis leaderboards from Postgres")
+   @ratelimit(uses=1, per_seconds=60, command_name="admin_sync_leaderboards")
+   async def sync_leaderboards(
+       self,
+       inter: disnake.ApplicationCommandInteraction,
+       category: str = commands.Param(
+           default=None,
+           choices=list(LeaderboardService.CATEGORIES),
+           description="Single board to rebuild (defaults to all)"
+       )
+   ):
+       """Recovery path for lost or drifted sorted sets"""
+       
+       try:
+           result = await LeaderboardService.rebuild([category] if category else None)
+           if not result.success or result.data is None:
+               await inter.edit_original_response(content=f"❌ Rebuild failed: {result.error}")
+               return
+           
+           lines = [f"**{name}**: {count:,} players" for name, count in result.data.items()]
+           embed = disnake.Embed(
+               title="🏆 Leaderboards Rebuilt",
+               description="\n".join(lines),
+               color=EmbedColors.SUCCESS
+           )
+           await inter.edit_original_response(embed=embed)
+           
+       except Exception as e:
+           logger.error(f"Admin command error in {inter.application_command.name}: {e}", exc_info=True)
+           await inter.edit_original_response(content="❌ Error rebuilding leaderboards. Check logs for details.")
+   
+   @admin.sub_command(name="settle_leaderboard", description="Settle a closed daily/weekly leaderboard window now")
+   @ratelimit(uses=2, per_seconds=60, command_name="admin_settle_leaderboard")
+   async def settle_leaderboard(
+       self,
+       inter: disnake.ApplicationCommandInteraction,
+       period: str = commands.Param(choices=list(PeriodLeaderboardService.PERIODS), description="Window length"),
+       period_key: str = commands.Param(
+           default=None,
+           description="Window to settle, e.g. 2026-10-17 or 2026-W41 (defaults to the previous one)"
+       )
+   ):
+       """Manual settlement or payout retry; safe to repeat"""
+       
+       try:
+           key = period_key or PeriodLeaderboardService.past_period_keys(period, 1)[0]
+           result = await PeriodLeaderboardService.settle(period, key)
+           if not result.success or not result.data:
+               await inter.edit_original_response(content=f"❌ Settlement failed: {result.error}")
+               return
+           
+           data = result.data
+           embed = disnake.Embed(
+               title=f"🏁 {period.title()} {key}: {data['status'].replace('_', ' ')}",
+               color=EmbedColors.SUCCESS if data["status"] == "settled" else EmbedColors.INFO
+           )
+           if data["status"] == "settled":
+               embed.description = (
+                   f"**Ranked:** {data['ranked']:,}\n"
+                   f"**Paid:** {data['paid_players']} players · {data['paid_erythl']:,} erythl"
+               )
+           await inter.edit_original_response(embed=embed)
+           
+       except Exception as e:
+           logger.error(f"Admin command error in {inter.application_command.name}: {e}", exc_info=True)
+           await inter.edit_original_response(content="❌ Error settling leaderboard. Check logs for details.")
 
    @admin.sub_command(name="sync_commands", description="Force sync slash commands with Discord")
    @ratelimit(uses=1, per_seconds=30, command_name="admin_sync_commands")
@@ -516,14 +594,23 @@ class Admin(commands.Cog):
                    ).values(leader_esprit_stack_id=None)
                    await session.execute(leader_clear_stmt)
                
-               # Delete all player-owned instances of this Esprit
+               # Delete all player-owned instances of this Esprit, taking their power off each owner
                delete_instances_stmt = delete(Esprit).where(
                    Esprit.esprit_base_id == esprit_base.id # type: ignore
-               )
-               await session.execute(delete_instances_stmt)
+               ).returning(Esprit.owner_id, Esprit.quantity, Esprit.awakening_level) # type: ignore
+               owners = []
+               for owner_id, owned_quantity, awakening_level in (await session.execute(delete_instances_stmt)).all():
+                   owners.append(await PowerService.apply_power_delta(
+                       session, owner_id, PowerService.stack_delta(esprit_base, awakening_level, -owned_quantity)
+                   ))
                
                # Delete the EspritBase itself
                await session.delete(esprit_base)
+               await session.commit()
+               await LeaderboardService.record(*owners)
+               
+               # Drop it from the in-memory catalog so it can't be rolled again
+               await EspritCatalog.reload()
                
                embed = disnake.Embed(
                    title="💥 Esprit Type Completely Removed",
@@ -628,15 +715,17 @@ class Admin(commands.Cog):
                    )
                
                # DELETE FROM DATABASE
+               await PowerService.apply_power_delta(
+                   session, player.id, PowerService.stack_delta(base, esprit.awakening_level, -esprit.quantity)
+               )
                await session.delete(esprit)
+               await session.commit()
+               await LeaderboardService.record(player)
                
                # Invalidate cache
                if RedisService.is_available() and player.id:
                    await RedisService.invalidate_player_cache(player.id)
                
-               # Recalculate power
-               await player.recalculate_total_power(session)
-               
                embed = disnake.Embed(
                    title="🗑️ Esprit Instance Removed",
                    description=(
@@ -716,6 +805,21 @@ class Admin(commands.Cog):
                from utils.stats_generator import _generator
                _generator.__init__()
                
+               # Cached cards were drawn with the old stats_display config
+               CardCache.reset()
+               
+               # Render workers hold their own copy of the configs - replace them
+               render_workers = await RenderService.restart()
+               
+               # Rebuild the Esprit catalog (swapped in atomically, other processes follow)
+               catalog = await EspritCatalog.reload()
+               
+               # Recompile echo samplers against the new catalog and loot tables
+               sampler_count = LootSamplers.rebuild(catalog)
+               
+               # Rescan sprite folders for the card generators
+               sprites = SpriteIndex.load()
+               
                embed = disnake.Embed(
                    title="🔥 NUCLEAR CONFIG RELOAD COMPLETE",
                    description=f"Obliterated and reloaded ALL configs from disk.\n\n**Before:** {old_count} configs\n**After:** {new_count} configs",
@@ -734,6 +838,24 @@ class Admin(commands.Cog):
                    value="Forced reinitialization with new config",
                    inline=False
                )
+               
+               embed.add_field(
+                   name="📚 Esprit Catalog",
+                   value=f"Rebuilt with {len(catalog)} bases, {sampler_count} echo samplers compiled",
+                   inline=False
+               )
+               
+               embed.add_field(
+                   name="🖼️ Sprite Index",
+                   value=f"Rescanned {len(sprites.sprites)} sprites, {len(sprites.portraits)} portraits",
+                   inline=False
+               )
+               
+               embed.add_field(
+                   name="🏭 Render Workers",
+                   value="Restarted with new config" if render_workers else "Not running - rendering in-process",
+                   inline=False
+               )
                 
            else:
                # Reload specific config
@@ -897,6 +1019,274 @@ class Admin(commands.Cog):
            )
            await inter.edit_original_response(embed=error_embed)
            logger.error(f"Config debug failed: {e}", exc_info=True)
+   
+   @admin.sub_command(name="db_pool", description="Live database connection pool metrics")
+   @ratelimit(uses=5, per_seconds=60, command_name="admin_db_pool")
+   async def db_pool(
+       self,
+       inter: disnake.ApplicationCommandInteraction,
+       reset: bool = commands.Param(default=False, description="Reset latency counters after showing them")
+   ):
+       """Pool occupancy, checkout latency and slow acquisitions"""
+       
+       try:
+           metrics = DatabaseService.get_pool_metrics()
+           config = metrics["config"]
+           
+           embed = disnake.Embed(
+               title="🏊 Database Pool",
+               description=(
+                   f"**pool_size** {config['pool_size']} · **max_overflow** {config['max_overflow']} · "
+                   f"**timeout** {config['pool_timeout']}s · **recycle** {config['pool_recycle']}s\n"
+                   f"**statement cache** {config['statement_cache_size']} · "
+                   f"**slow threshold** {config['slow_acquire_ms']}ms"
+               ),
+               color=EmbedColors.INFO
+           )
+           
+           for name, pool in metrics.items():
+               if name == "config":
+                   continue
+               
+               histogram = " ".join(f"`{label}` {count}" for label, count in pool["wait_histogram"].items() if count)
+               health = ""
+               if "healthy" in pool:
+                   health = " ✅" if pool["healthy"] else f" ⚠️ unhealthy ({pool['failures']} failures)"
+               fallbacks = f"\n**Read fallbacks to primary:** {pool['read_fallbacks']}" if "read_fallbacks" in pool else ""
+               embed.add_field(
+                   name=f"🔌 {name.replace('_', ' ').title()}{health}",
+                   value=(
+                       f"**Checked out:** {pool['checked_out']} (peak {pool['peak_checked_out']})\n"
+                       f"**Idle:** {pool['checked_in']} · **Overflow:** {pool['overflow']}\n"
+                       f"**Acquires:** {pool['acquisitions']} · **Slow:** {pool['slow_acquisitions']}\n"
+                       f"**Wait:** avg {pool['avg_wait_ms']}ms · max {pool['max_wait_ms']}ms\n"
+                       f"**Connects:** {pool['connects']} · **Invalidated:** {pool['invalidations']}\n"
+                       f"**Histogram:** {histogram or 'no data'}{fallbacks}"
+                   ),
+                   inline=False
+               )
+           
+           if reset:
+               DatabaseService.reset_pool_metrics()
+               embed.set_footer(text="Latency counters reset")
+           
+           await inter.edit_original_response(embed=embed)
+           
+       except Exception as e:
+           logger.error(f"Admin command error in {inter.application_command.name}: {e}", exc_info=True)
+           embed = disnake.Embed(
+               title="❌ Pool Metrics Failed",
+               description="An error occurred. Check logs for details.",
+               color=EmbedColors.ERROR
+           )
+           await inter.edit_original_response(embed=embed)
+           
+   @admin.sub_command(name="txlog", description="Transaction log pipeline counters")
+   @ratelimit(uses=5, per_seconds=60, command_name="admin_txlog")
+   async def txlog(
+       self,
+       inter: disnake.ApplicationCommandInteraction,
+       flush: bool = commands.Param(default=False, description="Flush queued records to disk first")
+   ):
+       """Ring buffer depth, throughput and drops for the background transaction writer"""
+       
+       try:
+           flushed = transaction_logger.flush() if flush else None
+           stats = transaction_logger.get_stats()
+           
+           embed = disnake.Embed(
+               title="🧾 Transaction Log",
+               description=(
+                   f"**Policy** {stats['backpressure']} · **Encoder** {stats['encoder']} · "
+                   f"**Writer** {'running' if stats['running'] else 'idle'}"
+               ),
+               color=EmbedColors.WARNING if stats["dropped"] or stats["write_errors"] else EmbedColors.INFO
+           )
+           embed.add_field(
+               name="📥 Buffer",
+               value=(
+                   f"**Depth:** {stats['depth']:,} / {stats['capacity']:,}\n"
+                   f"**Peak:** {stats['max_depth']:,}"
+               ),
+               inline=True
+           )
+           embed.add_field(
+               name="📊 Records",
+               value=(
+                   f"**Queued:** {stats['queued']:,}\n"
+                   f"**Written:** {stats['written']:,} in {stats['batches']:,} batches\n"
+                   f"**Dropped:** {stats['dropped']:,} (sampled out {stats['sampled_out']:,})"
+               ),
+               inline=True
+           )
+           embed.add_field(
+               name="⚠️ Errors",
+               value=f"**Encode:** {stats['encode_errors']} · **Write:** {stats['write_errors']}",
+               inline=False
+           )
+           
+           for name, sink in stats["sinks"].items():
+               error = f"\n**Last error:** {sink['last_error'][:200]}" if sink["last_error"] else ""
+               embed.add_field(
+                   name=f"🗄️ {name}",
+                   value=(
+                       f"**Inserted:** {sink['inserted']:,} in {sink['batches']:,} COPY batches "
+                       f"({sink['rows_per_second']:,} rows/s)\n"
+                       f"**Pending:** {sink['pending']:,} · **Dropped:** {sink['dropped']:,} · "
+                       f"**Failures:** {sink['failures']}{error}"
+                   ),
+                   inline=False
+               )
+           
+           if flushed is not None:
+               embed.set_footer(text="Flushed" if flushed else "Flush timed out")
+           
+           await inter.edit_original_response(embed=embed)
+           
+       except Exception as e:
+           logger.error(f"Admin command error in {inter.application_command.name}: {e}", exc_info=True)
+           embed = disnake.Embed(
+               title="❌ Transaction Log Stats Failed",
+               description="An error occurred. Check logs for details.",
+               color=EmbedColors.ERROR
+           )
+           await inter.edit_original_response(embed=embed)
+
+   @admin.sub_command(name="power_verify", description="Recompute a sample of players' power totals and report drift")
+   @ratelimit(uses=2, per_seconds=60, command_name="admin_power_verify")
+   async def power_verify(
+       self,
+       inter: disnake.ApplicationCommandInteraction,
+       sample_size: int = commands.Param(default=200, ge=1, le=5000, description="Players to recompute"),
+       repair: bool = commands.Param(default=False, description="Overwrite drifted totals with the recomputed ones")
+   ):
+       """Full-scan check of the delta-maintained power columns"""
+       
+       try:
+           result = await PowerService.verify_power_totals(sample_size=sample_size, repair=repair)
+           if not result.success or result.data is None:
+               await inter.edit_original_response(content=f"❌ Verification failed: {result.error}")
+               return
+           
+           report = result.data
+           embed = disnake.Embed(
+               title="⚖️ Power Totals",
+               description=(
+                   f"**Checked:** {report['checked']:,} · **Drifted:** {report['drifted']:,} · "
+                   f"**Repaired:** {report['repaired']:,} · **Max drift:** {report['max_drift']:,}"
+               ),
+               color=EmbedColors.WARNING if report["drifted"] else EmbedColors.SUCCESS
+           )
+           for entry in report["players"][:10]:
+               drift = entry["drift"]
+               embed.add_field(
+                   name=f"Player {entry['player_id']}",
+                   value=f"ATK {drift['atk']:+,} · DEF {drift['def']:+,} · HP {drift['hp']:+,}",
+                   inline=False
+               )
+           
+           await inter.edit_original_response(embed=embed)
+           
+       except Exception as e:
+           logger.error(f"Admin command error in {inter.application_command.name}: {e}", exc_info=True)
+           embed = disnake.Embed(
+               title="❌ Power Verification Failed",
+               description="An error occurred. Check logs for details.",
+               color=EmbedColors.ERROR
+           )
+           await inter.edit_original_response(embed=embed)
+
+   @admin.sub_command(name="render_stats", description="Render worker pool queue depth and latency")
+   @ratelimit(uses=5, per_seconds=60, command_name="admin_render_stats")
+   async def render_stats(self, inter: disnake.ApplicationCommandInteraction):
+       """Worker pool counters, queue depth and render latency, plus the rendered-card cache"""
+       
+       try:
+           stats = RenderService.get_stats()
+           cache = CardCache.snapshot()
+           
+           embed = disnake.Embed(
+               title="🏭 Render Service",
+               description=(
+                   f"**Pool** {'running' if stats['running'] else 'not running (in-process rendering)'} · "
+                   f"**Workers** {stats['workers']}"
+               ),
+               color=EmbedColors.WARNING if stats["rejected"] or stats["timeouts"] or stats["failed"] else EmbedColors.INFO
+           )
+           embed.add_field(
+               name="📥 Queue",
+               value=(
+                   f"**Depth:** {stats['depth']} / {stats['capacity']}\n"
+                   f"**Peak:** {stats['max_depth']}"
+               ),
+               inline=True
+           )
+           embed.add_field(
+               name="📊 Jobs",
+               value=(
+                   f"**Submitted:** {stats['submitted']:,} · **Completed:** {stats['completed']:,}\n"
+                   f"**Rejected:** {stats['rejected']:,} · **Timeouts:** {stats['timeouts']:,}\n"
+                   f"**Failed:** {stats['failed']:,} · **Pool restarts:** {stats['restarts']}"
+               ),
+               inline=True
+           )
+           embed.add_field(
+               name="⏱️ Latency",
+               value=(
+                   f"**Render:** p50 {stats['render_ms']['p50']}ms · p95 {stats['render_ms']['p95']}ms · "
+                   f"max {stats['render_ms']['max']}ms\n"
+                   f"**End to end:** p50 {stats['total_ms']['p50']}ms · p95 {stats['total_ms']['p95']}ms · "
+                   f"max {stats['total_ms']['max']}ms"
+               ),
+               inline=False
+           )
+           embed.add_field(
+               name="🗃️ Card Cache",
+               value=(
+                   f"**Hit rate:** {cache['hit_rate']:.1%} "
+                   f"(memory {cache['memory_hits']:,} · disk {cache['disk_hits']:,} · redis {cache['redis_hits']:,})\n"
+                   f"**Misses:** {cache['misses']:,} · **Entries:** {cache['memory_entries']:,} "
+                   f"({cache['memory_bytes'] / 1024 / 1024:.1f} MB)"
+               ),
+               inline=False
+           )
+           
+           await inter.edit_original_response(embed=embed)
+           
+       except Exception as e:
+           logger.error(f"Admin command error in {inter.application_command.name}: {e}", exc_info=True)
+           embed = disnake.Embed(
+               title="❌ Render Stats Failed",
+               description="An error occurred. Check logs for details.",
+               color=EmbedColors.ERROR
+           )
+           await inter.edit_original_response(embed=embed)
+           
+   @admin.sub_command(name="reload_sprites", description="Rescan sprite and portrait folders for card generation")
+   @ratelimit(uses=5, per_seconds=60, command_name="admin_reload_sprites")
+   async def reload_sprites(self, inter: disnake.ApplicationCommandInteraction):
+       """Rebuild the sprite index now instead of waiting for the mtime check"""
+       
+       try:
+           snapshot = SpriteIndex.load()
+           embed = disnake.Embed(
+               title="🖼️ Sprite Index Rebuilt",
+               description=(
+                   f"**Sprites:** {len(snapshot.sprites):,} ({len(snapshot.sprites_by_name):,} names)\n"
+                   f"**Portraits:** {len(snapshot.portraits):,} ({len(snapshot.portraits_by_name):,} names)"
+               ),
+               color=EmbedColors.SUCCESS
+           )
+           await inter.edit_original_response(embed=embed)
+           
+       except Exception as e:
+           logger.error(f"Admin command error in {inter.application_command.name}: {e}", exc_info=True)
+           embed = disnake.Embed(
+               title="❌ Sprite Reload Failed",
+               description="An error occurred. Check logs for details.",
+               color=EmbedColors.ERROR
+           )
+           await inter.edit_original_response(embed=embed)
            
 def setup(bot):
    bot.add_cog(Admin(bot))
\ No newline at end of file
@@ -1,7 +1,7 @@
 # src/cogs/collection_cog.py
 import disnake
 from disnake.ext import commands
-from typing import Optional, List
+from typing import Optional
 from datetime import datetime
 
 from src.utils.database_service import DatabaseService
@@ -10,6 +10,7 @@ from src.utils.game_constants import Elements, Tiers
 from src.utils.logger import get_logger
 from src.utils.emoji_manager import get_emoji_manager
 from src.database.models import Player, Esprit, EspritBase
+from src.services.esprit_service import EspritService, CollectionPage
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 from utils.stats_generator import ImageGenerator  # JUST THE CLASS
@@ -19,79 +20,82 @@ logger = get_logger(__name__)
 
 
 class SimpleCollectionView(disnake.ui.View):
-    """Dead simple pagination for collection"""
+    """Dead simple pagination for collection - holds one page and its keyset cursors"""
     
-    def __init__(self, esprits: List[tuple], player_name: str, author_id: int):
+    def __init__(self, player_id: int, player_name: str, author_id: int, page: CollectionPage,
+                 sort_mode: str = "tier_desc"):
         super().__init__(timeout=180)
-        self.esprits = esprits
+        self.player_id = player_id
         self.player_name = player_name
         self.author_id = author_id
-        self.current_page = 0
         self.items_per_page = 10
-        self.total_pages = (len(esprits) + self.items_per_page - 1) // self.items_per_page
-        
-        # Sorting state - DEFAULT TO HIGHEST TIER
-        self.sort_mode = "tier_desc"
-        self.original_esprits = esprits.copy()
+        self.sort_mode = sort_mode
         
-        # Initial sort by highest tier
-        self._sort_esprits()
+        self.page = page
+        self.current_page = 0
+        self.total_count = page.total_count or 0
+        self.total_pages = max(1, (self.total_count + self.items_per_page - 1) // self.items_per_page)
+        self.has_prev = False
+        self.has_next = page.has_more
         
         # Update button states
         self._update_buttons()
     
     def _update_buttons(self):
         """Enable/disable buttons based on current page"""
-        self.prev_button.disabled = self.current_page == 0
-        self.next_button.disabled = self.current_page >= self.total_pages - 1
+        self.prev_button.disabled = not self.has_prev
+        self.next_button.disabled = not self.has_next
     
-    def _sort_esprits(self):
-        """Sort esprits based on current sort mode"""
-        if self.sort_mode == "tier_desc":
-            self.esprits = sorted(self.original_esprits, 
-                key=lambda x: (x[1].base_tier, x[1].name), reverse=True)
-        elif self.sort_mode == "tier_asc":
-            self.esprits = sorted(self.original_esprits, 
-                key=lambda x: (x[1].base_tier, x[1].name))
-        elif self.sort_mode == "name_asc":
-            self.esprits = sorted(self.original_esprits, 
-                key=lambda x: x[1].name)
-        elif self.sort_mode == "name_desc":
-            self.esprits = sorted(self.original_esprits, 
-                key=lambda x: x[1].name, reverse=True)
-        elif self.sort_mode == "power_desc":
-            # Calculate total power for sorting
-            def get_power(item):
-                stack, base = item
-                power = stack.get_individual_power(base)
-                return power['atk'] + power['def']
-            self.esprits = sorted(self.original_esprits, 
-                key=get_power, reverse=True)
-        elif self.sort_mode == "atk_desc":
-            # Sort by attack
-            def get_atk(item):
-                stack, base = item
-                power = stack.get_individual_power(base)
-                return power['atk']
-            self.esprits = sorted(self.original_esprits, 
-                key=get_atk, reverse=True)
-        elif self.sort_mode == "def_desc":
-            # Sort by defense
-            def get_def(item):
-                stack, base = item
-                power = stack.get_individual_power(base)
-                return power['def']
-            self.esprits = sorted(self.original_esprits, 
-                key=get_def, reverse=True)
-        elif self.sort_mode == "element":
-            # Sort by element, then by tier within element
-            self.esprits = sorted(self.original_esprits, 
-                key=lambda x: (x[1].element, -x[1].base_tier))
+    async def _load_first_page(self) -> bool:
+        """(Re)load page one for the current sort mode, refreshing the total"""
+        result = await EspritService.get_collection_page(
+            self.player_id, self.sort_mode, per_page=self.items_per_page, with_total=True
+        )
+        if not result.success or result.data is None:
+            return False
         
-        # Reset to first page after sorting
+        self.page = result.data
         self.current_page = 0
-        self.total_pages = (len(self.esprits) + self.items_per_page - 1) // self.items_per_page
+        self.total_count = self.page.total_count or 0
+        self.total_pages = max(1, (self.total_count + self.items_per_page - 1) // self.items_per_page)
+        self.has_prev = False
+        self.has_next = self.page.has_more
+        self._update_buttons()
+        return True
+    
+    async def _load_next_page(self) -> bool:
+        result = await EspritService.get_collection_page(
+            self.player_id, self.sort_mode, after=self.page.last_key, per_page=self.items_per_page
+        )
+        if not result.success or result.data is None:
+            return False
+        if not result.data.rows:
+            # Everything past this page was removed meanwhile
+            return await self._load_first_page()
+        
+        self.page = result.data
+        self.current_page += 1
+        self.has_prev = True
+        self.has_next = self.page.has_more
         self._update_buttons()
+        return True
+    
+    async def _load_prev_page(self) -> bool:
+        result = await EspritService.get_collection_page(
+            self.player_id, self.sort_mode, before=self.page.first_key, per_page=self.items_per_page
+        )
+        if not result.success or result.data is None:
+            return False
+        if len(result.data.rows) < self.items_per_page:
+            # Reached the start early (stacks removed meanwhile); page one is a full page again
+            return await self._load_first_page()
+        
+        self.page = result.data
+        self.current_page = max(0, self.current_page - 1) if self.page.has_more else 0
+        self.has_prev = self.page.has_more
+        self.has_next = True
+        self._update_buttons()
+        return True
     
     async def interaction_check(self, inter: disnake.MessageInteraction) -> bool:
         if inter.author.id != self.author_id:
@@ -106,10 +110,7 @@ class SimpleCollectionView(disnake.ui.View):
             color=EmbedColors.DEFAULT
         )
         
-        # Calculate page slice
-        start = self.current_page * self.items_per_page
-        end = start + self.items_per_page
-        page_items = self.esprits[start:end]
+        page_items = self.page.rows
         
         if not page_items:
             embed.description = "No Esprits found!"
@@ -157,15 +158,15 @@ class SimpleCollectionView(disnake.ui.View):
             "element": "Element"
         }
         embed.set_footer(
-            text=f"Page {self.current_page + 1}/{self.total_pages} | Total: {len(self.esprits)} | Sort: {sort_display.get(self.sort_mode, 'Unknown')}"
+            text=f"Page {self.current_page + 1}/{self.total_pages} | Total: {self.total_count} | Sort: {sort_display.get(self.sort_mode, 'Unknown')}"
         )
         
         return embed
     
     @disnake.ui.button(emoji="◀️", style=disnake.ButtonStyle.secondary, row=0)
     async def prev_button(self, button: disnake.ui.Button, inter: disnake.MessageInteraction):
-        self.current_page -= 1
-        self._update_buttons()
+        if not await self._load_prev_page():
+            return await inter.response.send_message("Couldn't load that page, try again.", ephemeral=True)
         await inter.response.edit_message(embed=self.create_embed(), view=self)
     
     @disnake.ui.button(label="Sort", emoji="🔄", style=disnake.ButtonStyle.primary, row=0)
@@ -225,8 +226,10 @@ class SimpleCollectionView(disnake.ui.View):
         )
         
         async def sort_callback(interaction: disnake.MessageInteraction):
+            previous_mode = self.sort_mode
             self.sort_mode = select.values[0]
-            self._sort_esprits()
+            if not await self._load_first_page():
+                self.sort_mode = previous_mode
             await interaction.response.edit_message(embed=self.create_embed(), view=self)
         
         select.callback = sort_callback
@@ -239,8 +242,8 @@ class SimpleCollectionView(disnake.ui.View):
     
     @disnake.ui.button(emoji="▶️", style=disnake.ButtonStyle.secondary, row=0)
     async def next_button(self, button: disnake.ui.Button, inter: disnake.MessageInteraction):
-        self.current_page += 1
-        self._update_buttons()
+        if not await self._load_next_page():
+            return await inter.response.send_message("Couldn't load that page, try again.", ephemeral=True)
         await inter.response.edit_message(embed=self.create_embed(), view=self)
 
 
@@ -262,42 +265,39 @@ class EspritCog(commands.Cog):
         """View your Esprit collection with sorting and pagination"""
         
         try:
-            async with DatabaseService.get_transaction() as session:
+            async with DatabaseService.get_read_session() as session:
                 # Get player PROPERLY - by discord_id not primary key
                 stmt = select(Player).where(Player.discord_id == inter.author.id) #type: ignore[assignment]
                 result = await session.execute(stmt)
                 player = result.scalar_one_or_none()
-                
-                if not player:
-                    embed = disnake.Embed(
-                        title="Not Registered",
-                        description="Use `/start` to begin your journey!",
-                        color=EmbedColors.ERROR
-                    )
-                    return await inter.edit_original_response(embed=embed)
-                
-                # Get all Esprits with their base info
-                query = select(Esprit, EspritBase).where(
-                    Esprit.owner_id == player.id, #type: ignore[assignment]
-                    Esprit.esprit_base_id == EspritBase.id # type: ignore[assignment]
+            
+            if not player:
+                embed = disnake.Embed(
+                    title="Not Registered",
+                    description="Use `/start` to begin your journey!",
+                    color=EmbedColors.ERROR
                 )
-                
-                result = await session.execute(query)
-                esprits = result.all()
-                
-                if not esprits:
-                    embed = disnake.Embed(
-                        title="Empty Index",
-                        description="You don't have any Esprits yet!\nUse `/quest` to find some!",
-                        color=EmbedColors.WARNING
-                    )
-                    return await inter.edit_original_response(embed=embed)
-                
-                # Create view and send
-                view = SimpleCollectionView(esprits, player.username, inter.author.id) #type: ignore[assignment]
-                embed = view.create_embed()
-                
-                await inter.edit_original_response(embed=embed, view=view)
+                return await inter.edit_original_response(embed=embed)
+            
+            # First page only; the view fetches the others by cursor as they are opened
+            result = await EspritService.get_collection_page(player.id, per_page=10, with_total=True)  # type: ignore
+            if not result.success or result.data is None:
+                raise RuntimeError(result.error)
+            page = result.data
+            
+            if not page.rows:
+                embed = disnake.Embed(
+                    title="Empty Index",
+                    description="You don't have any Esprits yet!\nUse `/quest` to find some!",
+                    color=EmbedColors.WARNING
+                )
+                return await inter.edit_original_response(embed=embed)
+            
+            # Create view and send
+            view = SimpleCollectionView(player.id, player.username, inter.author.id, page) #type: ignore[assignment]
+            embed = view.create_embed()
+            
+            await inter.edit_original_response(embed=embed, view=view)
                 
         except Exception as e:
             logger.error(f"Error in collection command for user {inter.author.id}: {e}", exc_info=True)
@@ -385,9 +385,8 @@ class EspritCog(commands.Cog):
                 # Generate the card using the WORKING generator
                 logger.info(f"Generating card for {base.name} requested by {inter.author.id}")
                 logger.info(f"Card data for {base.name}: equipped_relics={base.equipped_relics}, max_slots={base.get_max_relic_slots()}")
-                card_image = await self.image_generator.render_esprit_card(card_data)
-                card_file = await self.image_generator.to_discord_file(
-                    card_image,
+                card_file = await self.image_generator.card_file(
+                    card_data,
                     f"{base.name.lower().replace(' ', '_')}_card.png"
                 )
                 
@@ -508,9 +507,8 @@ class EspritCog(commands.Cog):
                     "max_relic_slots": base.get_max_relic_slots()
                 }
                 
-                card_image = await self.image_generator.render_esprit_card(card_data)
-                card_file = await self.image_generator.to_discord_file(
-                    card_image,
+                card_file = await self.image_generator.card_file(
+                    card_data,
                     f"{base.name.lower().replace(' ', '_')}_showcase.png"
                 )
                 
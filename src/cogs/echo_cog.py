@@ -0,0 +1,143 @@
+# src/cogs/echo_cog.py
+import disnake
+from disnake.ext import commands
+from sqlalchemy import select
+
+from src.database.models import Player
+from src.services.echo_service import EchoService
+from src.utils.database_service import DatabaseService
+from src.utils.embed_colors import EmbedColors
+from src.utils.logger import get_logger
+from src.utils.redis_service import ratelimit
+
+logger = get_logger(__name__)
+
+ECHO_CHOICES = {
+    "Faded Echo": "faded_echo",
+    "Vivid Echo": "vivid_echo",
+    "Brilliant Echo": "brilliant_echo"
+}
+
+
+class EchoCog(commands.Cog):
+    """Echo opening commands"""
+    
+    def __init__(self, bot):
+        self.bot = bot
+    
+    async def _get_player(self, discord_id: int):
+        async with DatabaseService.get_session() as session:
+            stmt = select(Player).where(Player.discord_id == discord_id)  # type: ignore
+            return (await session.execute(stmt)).scalar_one_or_none()
+    
+    @commands.slash_command(name="echo", description="Open echoes and check drop rates")
+    async def echo(self, inter: disnake.ApplicationCommandInteraction):
+        """Parent command for all echo operations"""
+        pass
+    
+    @echo.sub_command(name="open", description="Open one or more echoes at once")
+    @ratelimit(uses=5, per_seconds=60, command_name="echo_open")
+    async def echo_open(
+        self,
+        inter: disnake.ApplicationCommandInteraction,
+        echo_type: str = commands.Param(choices=ECHO_CHOICES, description="Which echo to open"),
+        amount: int = commands.Param(default=1, ge=1, le=EchoService.MAX_BULK_OPEN, description="How many to open")
+    ):
+        """Open N echoes in a single transaction"""
+        
+        try:
+            player = await self._get_player(inter.author.id)
+            if not player:
+                embed = disnake.Embed(
+                    title="Not Registered",
+                    description="Use `/start` to begin your journey!",
+                    color=EmbedColors.ERROR
+                )
+                return await inter.edit_original_response(embed=embed)
+            
+            result = await EchoService.open_echoes(player.id, echo_type, amount)  # type: ignore
+            if not result.success or not result.data:
+                embed = disnake.Embed(
+                    title="Echo Failed",
+                    description=result.error or "The echo refused to open.",
+                    color=EmbedColors.ERROR
+                )
+                return await inter.edit_original_response(embed=embed)
+            
+            data = result.data
+            lines = []
+            for esprit in data["esprits_received"][:20]:
+                new_tag = " ✨ **NEW**" if esprit["is_new_capture"] else ""
+                lines.append(f"**{esprit['name']}** x{esprit['quantity']} · T{esprit['tier']} {esprit['element']}{new_tag}")
+            
+            hidden = len(data["esprits_received"]) - len(lines)
+            if hidden > 0:
+                lines.append(f"...and {hidden} more")
+            
+            embed = disnake.Embed(
+                title=f"🔮 Opened {data['opened']} {echo_type.replace('_', ' ').title()}{'s' if data['opened'] > 1 else ''}",
+                description="\n".join(lines),
+                color=EmbedColors.SUCCESS
+            )
+            embed.set_footer(text=f"Remaining: {data['remaining_echoes']} · Total opened: {data['total_opened']}")
+            await inter.edit_original_response(embed=embed)
+        
+        except Exception as e:
+            logger.error(f"Echo open error for user {inter.author.id}: {e}", exc_info=True)
+            embed = disnake.Embed(
+                title="Error",
+                description="Something went wrong opening your echoes.",
+                color=EmbedColors.ERROR
+            )
+            await inter.edit_original_response(embed=embed)
+    
+    @echo.sub_command(name="rates", description="See the exact drop rates of an echo at your level")
+    @ratelimit(uses=5, per_seconds=60, command_name="echo_rates")
+    async def echo_rates(
+        self,
+        inter: disnake.ApplicationCommandInteraction,
+        echo_type: str = commands.Param(choices=ECHO_CHOICES, description="Which echo to inspect")
+    ):
+        """Publish drop rates straight from the compiled sampler"""
+        
+        try:
+            player = await self._get_player(inter.author.id)
+            level = player.level if player else 1
+            
+            result = await EchoService.get_drop_rates(echo_type, level)
+            if not result.success or not result.data:
+                embed = disnake.Embed(
+                    title="Rates Unavailable",
+                    description=result.error or "No drop rates configured.",
+                    color=EmbedColors.ERROR
+                )
+                return await inter.edit_original_response(embed=embed)
+            
+            data = result.data
+            tier_lines = [f"Tier {tier}: **{rate:.2%}**" for tier, rate in sorted(data["tier_rates"].items())]
+            top_lines = [
+                f"{row['name']} (T{row['tier']} {row['element']}): {row['probability']:.3%}"
+                for row in data["esprit_rates"][:15]
+            ]
+            
+            embed = disnake.Embed(
+                title=f"📊 {echo_type.replace('_', ' ').title()} Drop Rates",
+                description=f"Level bracket **{data['level_bracket']}**",
+                color=EmbedColors.INFO
+            )
+            embed.add_field(name="By Tier", value="\n".join(tier_lines) or "None", inline=False)
+            embed.add_field(name="Most Likely Esprits", value="\n".join(top_lines) or "None", inline=False)
+            await inter.edit_original_response(embed=embed)
+        
+        except Exception as e:
+            logger.error(f"Echo rates error for user {inter.author.id}: {e}", exc_info=True)
+            embed = disnake.Embed(
+                title="Error",
+                description="Something went wrong loading drop rates.",
+                color=EmbedColors.ERROR
+            )
+            await inter.edit_original_response(embed=embed)
+
+
+def setup(bot):
+    bot.add_cog(EchoCog(bot))
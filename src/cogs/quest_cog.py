@@ -8,6 +8,9 @@ from src.utils.database_service import DatabaseService
 from src.utils.config_manager import ConfigManager
 from src.utils.redis_service import ratelimit
 from src.database.models import Player
+from src.services.leaderboard_service import LeaderboardService
+from src.services.period_leaderboard_service import PeriodLeaderboardService
+from src.services.player_context_service import PlayerContextService
 from src.domain.quest_domain import BossEncounter, PendingCapture, CaptureSystem
 from utils.boss_generator import generate_boss_card
 from utils.stats_generator import generate_esprit_card
@@ -289,12 +292,16 @@ class BossCombatView(disnake.ui.View):
                 return
             
             # Check if boss is defeated
-            if combat_result.is_boss_defeated:
+            defeated = combat_result.is_boss_defeated
+            if defeated:
                 await self._handle_victory(inter, player, session)
-                return
-            
-            # Update combat display
-            await self._update_combat_display_fixed(inter, combat_result)
+            else:
+                # Update combat display
+                await self._update_combat_display_fixed(inter, combat_result)
+        
+        # Committed - the capture changed the player's power total
+        if defeated:
+            await LeaderboardService.record(player)
     
     @disnake.ui.button(label="🏃 Flee", style=disnake.ButtonStyle.danger)
     async def flee_button(self, button: disnake.ui.Button, inter: disnake.MessageInteraction):
@@ -603,9 +610,9 @@ class Quest(commands.Cog):
         
         try:
             async with DatabaseService.get_transaction() as session:
-                # Get player
-                stmt = select(Player).where(Player.discord_id == inter.author.id).with_for_update() # type: ignore
-                player = (await session.execute(stmt)).scalar_one_or_none()
+                # Player, leader and class in one query
+                context = await PlayerContextService.load(session, discord_id=inter.author.id, for_update=True)
+                player = context.player if context else None
                 
                 if not player:
                     embed = disnake.Embed(
@@ -661,6 +668,13 @@ class Quest(commands.Cog):
                     inline=True
                 )
                 
+                if context.has_leader:
+                    embed.add_field(
+                        name="Leader",
+                        value=f"**{context.leader_bonuses.get('leader_name', 'Unknown')}** ({context.leader_bonuses.get('element')})",
+                        inline=True
+                    )
+                
                 # Current area info with progress
                 if player.current_area_id and player.current_area_id in accessible_areas:
                     current_area = accessible_areas[player.current_area_id]
@@ -836,6 +850,8 @@ class Quest(commands.Cog):
     
     async def _execute_selected_quest(self, inter, player: Player, quest_data: Dict[str, Any], area_data: Dict[str, Any]):
         """Execute the selected quest with enhanced feedback"""
+        quest_completed = False
+        
         async with DatabaseService.get_transaction() as session:
             # Get fresh player data
             stmt = select(Player).where(Player.discord_id == inter.user.id).with_for_update()
@@ -872,6 +888,12 @@ class Quest(commands.Cog):
                 await self._handle_boss_quest(inter, refreshed_player, quest_data, area_data, session)
             else:
                 await self._handle_normal_quest(inter, refreshed_player, quest_data, area_data, session)
+                quest_completed = True
+        
+        # Committed - now reflect it on the leaderboards
+        if quest_completed:
+            await LeaderboardService.record(refreshed_player)
+            await PeriodLeaderboardService.add_points(refreshed_player.id, "quest_completed")  # type: ignore
     
     async def _handle_normal_quest(self, inter, player: Player, quest_data: Dict[str, Any], area_data: Dict[str, Any], session):
         """Handle normal quest with enhanced progress tracking"""
@@ -2,11 +2,18 @@ from .esprit_base import EspritBase
 from .player import Player
 from .esprit import Esprit
 from .player_class import PlayerClass, PlayerClassType
+from .leaderboard_snapshot import LeaderboardSnapshot
+from .player_activity import PlayerActivityDaily, AnalyticsCursor
+from .transaction_event import TransactionEvent
 __all__ = [
     "Player",
     "PlayerClass", 
     "PlayerClassType",
     "EspritBase",
-    "Esprit"
+    "Esprit",
+    "LeaderboardSnapshot",
+    "PlayerActivityDaily",
+    "AnalyticsCursor",
+    "TransactionEvent"
 ]
 
@@ -1,15 +1,26 @@
 # src/database/models/esprit.py
 from typing import Any, Optional, Dict, TYPE_CHECKING
 from sqlmodel import SQLModel, Field
-from sqlalchemy import Column, String, BigInteger
+from sqlalchemy import Column, String, BigInteger, UniqueConstraint, Index, text
 from datetime import datetime
 
 if TYPE_CHECKING:
     from src.database.models import EspritBase
 
+# Power formula constants, shared with the columnar path in utils/power_columns
+AWAKENING_BONUS_PER_STAR = 0.2  # +20% per star, applied to base stats
+HP_POWER_DIVISOR = 10           # HP counts a tenth toward power
+
 class Esprit(SQLModel, table=True):
     __tablename__: str = "esprit"  
     """Universal Stack System - Each row represents ALL copies of an Esprit type a player owns"""
+    __table_args__ = (
+        # One stack per (owner, base) - also the conflict target for bulk upserts
+        UniqueConstraint("owner_id", "esprit_base_id", name="uq_esprit_owner_base"),
+        # Keyset pagination of collections (EspritService.fetch_collection_page)
+        Index("ix_esprit_owner_tier", "owner_id", text("tier DESC"), text("id DESC")),
+        Index("ix_esprit_owner_element", "owner_id", "element", text("(-tier)"), "id"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     esprit_base_id: int = Field(foreign_key="esprit_base.id", index=True)
@@ -27,15 +38,11 @@ class Esprit(SQLModel, table=True):
     
     # --- DATA ACCESS METHODS ONLY ---   
     
-    def get_individual_power(self, base: "EspritBase") -> Dict[str, int]:
-        """Calculate power of one copy in this stack using ACTUAL Esprit stats"""
-        # Use the actual stats from EspritBase
-        base_atk = base.base_atk
-        base_def = base.base_def
-        base_hp = base.base_hp
-        
+    @staticmethod
+    def calculate_power(base_atk: int, base_def: int, base_hp: int, awakening_level: int) -> Dict[str, int]:
+        """Power of one copy from raw stats; the single formula behind every power total"""
         # Apply awakening bonus (20% per star, multiplicative)
-        awakening_multiplier = 1.0 + (self.awakening_level * 0.2)
+        awakening_multiplier = 1.0 + (awakening_level * AWAKENING_BONUS_PER_STAR)
         
         # Calculate final stats with awakening
         final_atk = int(base_atk * awakening_multiplier)
@@ -46,9 +53,13 @@ class Esprit(SQLModel, table=True):
             "atk": final_atk,
             "def": final_def,
             "hp": final_hp,
-            "power": final_atk + final_def + (final_hp // 10)
+            "power": final_atk + final_def + (final_hp // HP_POWER_DIVISOR)
         }
     
+    def get_individual_power(self, base: "EspritBase") -> Dict[str, int]:
+        """Calculate power of one copy in this stack using ACTUAL Esprit stats"""
+        return self.calculate_power(base.base_atk, base.base_def, base.base_hp, self.awakening_level)
+    
     def get_stack_total_power(self, base: "EspritBase") -> Dict[str, int]:
         """Calculate total power of entire stack"""
         individual = self.get_individual_power(base)
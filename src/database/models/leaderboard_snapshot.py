@@ -0,0 +1,26 @@
+# src/database/models/leaderboard_snapshot.py
+from typing import Optional
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, BigInteger, Index, UniqueConstraint
+from datetime import datetime
+
+class LeaderboardSnapshot(SQLModel, table=True):
+    """Final standings of one daily/weekly leaderboard window, written once at rollover"""
+    __tablename__: str = "leaderboard_snapshot"
+    __table_args__ = (
+        # One row per player per window - also what makes settlement idempotent
+        UniqueConstraint("period", "period_key", "player_id", name="uq_leaderboard_snapshot_player"),
+        Index("ix_leaderboard_snapshot_window_rank", "period", "period_key", "rank"),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    period: str = Field(max_length=16)       # "daily" | "weekly"
+    period_key: str = Field(max_length=16)   # "2026-10-18" | "2026-W42"
+    rank: int
+    # No foreign key: standings outlive deleted players
+    player_id: int = Field(index=True)
+    score: int = Field(sa_column=Column(BigInteger, nullable=False))
+    payout_erythl: int = Field(default=0)
+    paid_at: Optional[datetime] = Field(default=None)  # Stamped in the transaction that credits the payout
+    
+    created_at: datetime = Field(default_factory=datetime.utcnow)
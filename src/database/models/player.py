@@ -40,6 +40,7 @@ class Player(SQLModel, table=True):
     leader_esprit_stack_id: Optional[int] = Field(default=None, foreign_key="esprit.id")
     
     # --- Combat Power (Sigil) ---
+    # Raw collection sums before skill bonuses, maintained by PowerService deltas
     total_attack_power: int = Field(sa_column=Column(BigInteger), default=0)
     total_defense_power: int = Field(sa_column=Column(BigInteger), default=0)
     total_hp: int = Field(sa_column=Column(BigInteger), default=0)
@@ -278,7 +279,7 @@ class Player(SQLModel, table=True):
     # - set_leader_esprit() → LeadershipService.set_leader_esprit()
     
     # Power calculations moved to EspritService:
-    # - recalculate_total_power() → EspritService.calculate_collection_power()
+    # - recalculate_total_power() → PowerService (totals are kept current by per-change deltas)
     # - invalidate_power_cache() → CacheService.invalidate_player_cache()
     
     # Experience and currency moved to PlayerService:
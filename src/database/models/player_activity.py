@@ -0,0 +1,31 @@
+# src/database/models/player_activity.py
+from typing import Any, Dict, List
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, BigInteger
+from sqlalchemy.dialects.postgresql import JSON
+from datetime import date, datetime
+
+class PlayerActivityDaily(SQLModel, table=True):
+    """One player's aggregated transaction activity for one UTC day"""
+    __tablename__: str = "player_activity_daily"
+    
+    # No foreign key: analytics outlive deleted players
+    player_id: int = Field(primary_key=True)
+    day: date = Field(primary_key=True, index=True)
+    events: int = Field(default=0)
+    hourly: List[int] = Field(default_factory=lambda: [0] * 24, sa_column=Column(JSON))
+    activity: Dict[str, int] = Field(default_factory=dict, sa_column=Column(JSON))
+    currency: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON))
+    fusions: List[Dict[str, Any]] = Field(default_factory=list, sa_column=Column(JSON))
+    
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class AnalyticsCursor(SQLModel, table=True):
+    """How far the analytics ingest has read each transaction log segment"""
+    __tablename__: str = "analytics_cursor"
+    
+    segment: str = Field(primary_key=True, max_length=128)  # sidecar index file name
+    index_offset: int = Field(default=0, sa_column=Column(BigInteger, nullable=False))
+    frames: int = Field(default=0)
+    
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
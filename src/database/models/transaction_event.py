@@ -0,0 +1,28 @@
+# src/database/models/transaction_event.py
+from typing import Any, Dict, Optional
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, BigInteger, DateTime, Identity, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+
+# Daily partitions are named transaction_event_pYYYYMMDD; rows outside them land in the default one
+PARTITION_PREFIX = "transaction_event_p"
+DEFAULT_PARTITION = "transaction_event_default"
+
+class TransactionEvent(SQLModel, table=True):
+    """One TransactionLogger record; range-partitioned by day on occurred_at"""
+    __tablename__: str = "transaction_event"
+    __table_args__ = (
+        Index("ix_transaction_event_player_time", "player_id", "occurred_at"),
+        Index("ix_transaction_event_type_time", "type", "occurred_at"),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+    
+    # The partition key has to be part of the primary key
+    id: Optional[int] = Field(default=None, sa_column=Column(BigInteger, Identity(), primary_key=True))
+    occurred_at: datetime = Field(sa_column=Column(DateTime, primary_key=True))
+    # No foreign key: the audit trail outlives deleted players
+    player_id: int
+    type: str = Field(max_length=40)
+    details: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONB, nullable=False))
+    metadata_: Dict[str, Any] = Field(default_factory=dict, sa_column=Column("metadata", JSONB, nullable=False))
@@ -4,8 +4,10 @@ from dataclasses import dataclass
 from datetime import datetime
 import random
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from src.database.models import Player, Esprit, EspritBase
+from src.services.esprit_service import EspritService
+from src.services.power_service import PowerService
+from src.utils.esprit_catalog import EspritCatalog
 from src.utils.transaction_logger import transaction_logger, TransactionType
 import logging
 
@@ -122,46 +124,42 @@ class BossEncounter:
     
     @staticmethod
     async def _get_complete_esprit_data(esprit_name: str) -> Optional[Dict[str, Any]]:
-        """Get COMPLETE esprit data from database including image_url"""
-        from src.utils.database_service import DatabaseService
-        
+        """Get COMPLETE esprit data from the catalog including image_url"""
         try:
-            async with DatabaseService.get_transaction() as session:
-                # Find the actual esprit in database with exact or partial match
-                stmt = select(EspritBase).where(EspritBase.name.ilike(f"%{esprit_name}%"))
-                esprit_base = (await session.execute(stmt)).scalar_one_or_none()
+            # Find the actual esprit with exact or partial match
+            esprit_base = (await EspritCatalog.get_snapshot()).find(esprit_name)
+            
+            if esprit_base:
+                complete_data = {
+                    "name": esprit_base.name,
+                    "element": esprit_base.element,
+                    "base_hp": getattr(esprit_base, 'base_hp', 150),
+                    "base_atk": esprit_base.base_atk,
+                    "base_def": esprit_base.base_def,
+                    "base_tier": esprit_base.base_tier,
+                    "image_url": esprit_base.image_url,  # CRITICAL for boss images
+                    "portrait_url": getattr(esprit_base, 'portrait_url', None),
+                    "description": getattr(esprit_base, 'description', ''),
+                    "esprit_base_id": esprit_base.id
+                }
                 
-                if esprit_base:
-                    complete_data = {
-                        "name": esprit_base.name,
-                        "element": esprit_base.element,
-                        "base_hp": getattr(esprit_base, 'base_hp', 150),
-                        "base_atk": esprit_base.base_atk,
-                        "base_def": esprit_base.base_def,
-                        "base_tier": esprit_base.base_tier,
-                        "image_url": esprit_base.image_url,  # CRITICAL for boss images
-                        "portrait_url": getattr(esprit_base, 'portrait_url', None),
-                        "description": getattr(esprit_base, 'description', ''),
-                        "esprit_base_id": esprit_base.id
-                    }
-                    
-                    logger.info(f"✅ Found complete esprit data for {esprit_name}: {complete_data['image_url']}")
-                    return complete_data
-                else:
-                    logger.warning(f"❌ Esprit not found in database: {esprit_name}")
-                    # Fallback with reasonable defaults but no image
-                    return {
-                        "name": esprit_name,
-                        "element": "Verdant",
-                        "base_hp": 300,
-                        "base_atk": 75,
-                        "base_def": 35,
-                        "base_tier": 5,
-                        "image_url": None,
-                        "portrait_url": None,
-                        "description": f"A mysterious {esprit_name} guardian.",
-                        "esprit_base_id": None
-                    }
+                logger.info(f"✅ Found complete esprit data for {esprit_name}: {complete_data['image_url']}")
+                return complete_data
+            else:
+                logger.warning(f"❌ Esprit not found in catalog: {esprit_name}")
+                # Fallback with reasonable defaults but no image
+                return {
+                    "name": esprit_name,
+                    "element": "Verdant",
+                    "base_hp": 300,
+                    "base_atk": 75,
+                    "base_def": 35,
+                    "base_tier": 5,
+                    "image_url": None,
+                    "portrait_url": None,
+                    "description": f"A mysterious {esprit_name} guardian.",
+                    "esprit_base_id": None
+                }
         except Exception as e:
             logger.error(f"Failed to get esprit data for {esprit_name}: {e}")
             # Emergency fallback
@@ -193,7 +191,7 @@ class BossEncounter:
             return None
         
         # Calculate damage using player's TOTAL ATTACK POWER from all Esprits
-        power_data = await player.recalculate_total_power(session)
+        power_data = PowerService.total_power(player)
         player_attack = power_data["atk"]  # This includes all Esprit stats + skill bonuses
         
         damage = self._calculate_damage_complete(player_attack)
@@ -304,28 +302,22 @@ class BossEncounter:
         try:
             # Find the boss esprit base using the stored data
             esprit_base_id = self.boss_esprit_data.get("esprit_base_id")
+            catalog = await EspritCatalog.get_snapshot()
             
             if esprit_base_id:
                 # Use stored ID for direct lookup
-                stmt = select(EspritBase).where(EspritBase.id == esprit_base_id)
+                boss_base = catalog.get(esprit_base_id)
             else:
                 # Fallback to name lookup
-                stmt = select(EspritBase).where(EspritBase.name.ilike(self.name))
-            
-            result = await session.execute(stmt)
-            boss_base = result.scalar_one_or_none()
+                boss_base = catalog.get_by_name(self.name)
             
             if not boss_base or not boss_base.id or not player.id:
                 logger.warning(f"❌ Cannot capture boss: missing boss_base ({boss_base}) or player ID ({player.id})")
                 return None
             
             # Create captured esprit using the universal stack system
-            new_esprit = await Esprit.add_to_collection(
-                session=session,
-                owner_id=player.id,
-                base=boss_base,
-                quantity=1
-            )
+            stacks = await EspritService.upsert_stacks(session, player.id, {boss_base.id: 1})
+            new_esprit = await session.get(Esprit, stacks[boss_base.id]["esprit_id"], populate_existing=True)
             
             # Log the boss capture
             if player.id is not None:
@@ -448,9 +440,8 @@ class CaptureSystem:
         """Select an esprit to potentially capture with element affinity"""
         try:
             # Get all esprits that match the capturable tiers
-            stmt = select(EspritBase).where(EspritBase.base_tier.in_(capturable_tiers))
-            result = await session.execute(stmt)
-            potential_esprits = result.scalars().all()
+            catalog = await EspritCatalog.get_snapshot()
+            potential_esprits = catalog.get_tiers(capturable_tiers)
             
             if not potential_esprits:
                 logger.warning(f"No capturable esprits found for tiers: {capturable_tiers}")
@@ -459,7 +450,10 @@ class CaptureSystem:
             # Apply element affinity bias (60% chance to pick matching element)
             area_element = area_data.get("element_affinity")
             if area_element:
-                matching_element = [e for e in potential_esprits if e.element.lower() == area_element.lower()]
+                matching_element = [
+                    base for tier in capturable_tiers
+                    for base in catalog.get_tier_element(tier, area_element)
+                ]
                 if matching_element and random.random() < 0.6:
                     chosen = random.choice(matching_element)
                     logger.debug(f"🎯 Element affinity selection: {chosen.name} ({area_element})")
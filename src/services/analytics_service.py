@@ -0,0 +1,206 @@
+# src/services/analytics_service.py
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import select, func, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.services.base_service import BaseService, ServiceResult
+from src.database.models.player_activity import PlayerActivityDaily, AnalyticsCursor
+from src.utils.activity_aggregator import HAS_NUMPY, aggregate, merge_summary, empty_summary
+from src.utils.database_service import DatabaseService
+from src.utils.transaction_logger import transaction_logger
+from src.utils.transaction_segments import SegmentReader
+from src.utils.config_manager import ConfigManager
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class AnalyticsService(BaseService):
+    """Per-player, per-day activity summaries built incrementally from the transaction log"""
+    
+    # pg_advisory_xact_lock key: one ingest transaction at a time across shards
+    INGEST_LOCK_ID = 0x5245_5645_0001
+    UPSERT_CHUNK_SIZE = 2000
+    
+    _ingest_task: Optional[asyncio.Task] = None
+    
+    @classmethod
+    def _config(cls) -> Dict[str, Any]:
+        return (ConfigManager.get("global_config") or {}).get("analytics", {})
+    
+    @classmethod
+    async def ingest(cls, max_frames: Optional[int] = None) -> ServiceResult[Dict[str, int]]:
+        """Fold log frames written since the last pass into the daily summaries"""
+        async def _operation():
+            if not HAS_NUMPY:
+                raise ValueError("numpy is required for transaction analytics")
+            
+            config = cls._config()
+            budget = max_frames or int(config.get("max_frames_per_pass", 500))
+            fusions_per_day = int(config.get("fusions_per_day", 10))
+            reader = SegmentReader(transaction_logger.segment_dir)
+            
+            async with DatabaseService.get_session() as session:
+                rows = (await session.execute(select(AnalyticsCursor.segment, AnalyticsCursor.index_offset))).all()
+            offsets = {segment: offset for segment, offset in rows}
+            
+            totals = {"segments": 0, "frames": 0, "records": 0, "summaries": 0}
+            for index_path in reader.segments():
+                if budget <= 0:
+                    break
+                # Sidecars only grow, so an unchanged size means nothing new to read
+                if index_path.stat().st_size <= offsets.get(index_path.name, 0):
+                    continue
+                
+                frames, records, summaries = await cls._ingest_segment(reader, index_path, budget, fusions_per_day)
+                if frames:
+                    budget -= frames
+                    totals["segments"] += 1
+                    totals["frames"] += frames
+                    totals["records"] += records
+                    totals["summaries"] += summaries
+            
+            return totals
+        return await cls._safe_execute(_operation, "ingest transaction analytics")
+    
+    @classmethod
+    async def _ingest_segment(cls, reader: SegmentReader, index_path: Path, budget: int,
+                              fusions_per_day: int) -> Tuple[int, int, int]:
+        """Read, aggregate and merge one segment's new frames; cursor and summaries commit together"""
+        now = datetime.utcnow()
+        
+        async with DatabaseService.get_transaction() as session:
+            await session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": cls.INGEST_LOCK_ID})
+            
+            await session.execute(pg_insert(AnalyticsCursor).values(
+                segment=index_path.name, index_offset=0, frames=0, updated_at=now
+            ).on_conflict_do_nothing(index_elements=["segment"]))
+            cursor = (await session.execute(
+                select(AnalyticsCursor).where(AnalyticsCursor.segment == index_path.name)  # type: ignore
+            )).scalar_one()
+            
+            # Decompression and the NumPy pass stay off the event loop
+            offset, frames, records = await asyncio.to_thread(
+                reader.read_new_frames, index_path, cursor.index_offset, budget
+            )
+            if not frames:
+                return 0, 0, 0
+            deltas = await asyncio.to_thread(aggregate, records, fusions_per_day)
+            
+            keys = list(deltas)
+            for start in range(0, len(keys), cls.UPSERT_CHUNK_SIZE):
+                chunk = keys[start:start + cls.UPSERT_CHUNK_SIZE]
+                existing_stmt = select(PlayerActivityDaily).where(
+                    tuple_(PlayerActivityDaily.player_id, PlayerActivityDaily.day).in_(chunk)  # type: ignore
+                )
+                existing = {
+                    (row.player_id, row.day): row
+                    for row in (await session.execute(existing_stmt)).scalars().all()
+                }
+                
+                values = []
+                for key in chunk:
+                    stored = existing.get(key)
+                    merged = merge_summary(
+                        {"events": stored.events, "hourly": stored.hourly, "activity": stored.activity,
+                         "currency": stored.currency, "fusions": stored.fusions} if stored else None,
+                        deltas[key], fusions_per_day
+                    )
+                    values.append({"player_id": key[0], "day": key[1], "updated_at": now, **merged})
+                
+                stmt = pg_insert(PlayerActivityDaily).values(values)
+                await session.execute(stmt.on_conflict_do_update(
+                    index_elements=["player_id", "day"],
+                    set_={column: stmt.excluded[column] for column in
+                          ("events", "hourly", "activity", "currency", "fusions", "updated_at")}
+                ))
+            
+            cursor.index_offset = offset
+            cursor.frames += frames
+            cursor.updated_at = now
+            await session.commit()
+        
+        return frames, len(records), len(deltas)
+    
+    @classmethod
+    async def get_player_activity(cls, player_id: int, days: int = 30) -> ServiceResult[Dict[str, Any]]:
+        """Summaries for the last `days` UTC days folded into one, plus per-day event counts"""
+        async def _operation():
+            cls._validate_player_id(player_id)
+            cls._validate_positive_int(days, "days")
+            since = datetime.utcnow().date() - timedelta(days=days - 1)
+            
+            async with DatabaseService.get_read_session() as session:
+                stmt = select(PlayerActivityDaily).where(
+                    PlayerActivityDaily.player_id == player_id,  # type: ignore
+                    PlayerActivityDaily.day >= since  # type: ignore
+                ).order_by(PlayerActivityDaily.day)  # type: ignore
+                rows = (await session.execute(stmt)).scalars().all()
+            
+            summary = empty_summary()
+            for row in rows:
+                summary = merge_summary(summary, {
+                    "events": row.events, "hourly": row.hourly, "activity": row.activity,
+                    "currency": row.currency, "fusions": row.fusions
+                })
+            
+            return {
+                "days": days,
+                "since": since.isoformat(),
+                "active_days": len(rows),
+                "daily_events": {row.day.isoformat(): row.events for row in rows},
+                **summary
+            }
+        return await cls._safe_execute(_operation, "get player activity")
+    
+    @classmethod
+    async def get_recent_fusions(cls, player_id: int, limit: int = 10) -> ServiceResult[List[Dict[str, Any]]]:
+        """Latest fusion results, newest first, from the days that had any"""
+        async def _operation():
+            cls._validate_player_id(player_id)
+            cls._validate_positive_int(limit, "limit")
+            
+            async with DatabaseService.get_read_session() as session:
+                stmt = select(PlayerActivityDaily.fusions).where(
+                    PlayerActivityDaily.player_id == player_id,  # type: ignore
+                    func.json_array_length(PlayerActivityDaily.fusions) > 0
+                ).order_by(PlayerActivityDaily.day.desc()).limit(limit)  # type: ignore
+                days = (await session.execute(stmt)).scalars().all()
+            
+            fusions: List[Dict[str, Any]] = []
+            for day_fusions in days:
+                fusions.extend(reversed(day_fusions))
+                if len(fusions) >= limit:
+                    break
+            return fusions[:limit]
+        return await cls._safe_execute(_operation, "get recent fusions")
+    
+    @classmethod
+    async def _ingest_loop(cls) -> None:
+        interval = int(cls._config().get("ingest_interval_seconds", 300))
+        while True:
+            result = await cls.ingest()
+            if result.success and result.data and result.data["frames"]:
+                logger.info(f"Analytics ingest: {result.data}")
+            await asyncio.sleep(interval)
+    
+    @classmethod
+    def start_ingest_loop(cls) -> bool:
+        """Start the background ingest task once per process"""
+        if not cls._config().get("enabled", True) or not HAS_NUMPY:
+            return False
+        if cls._ingest_task is None or cls._ingest_task.done():
+            cls._ingest_task = asyncio.create_task(cls._ingest_loop())
+        return True
+    
+    @classmethod
+    async def stop_ingest_loop(cls) -> None:
+        if cls._ingest_task is not None:
+            cls._ingest_task.cancel()
+            try:
+                await cls._ingest_task
+            except asyncio.CancelledError:
+                pass
+            cls._ingest_task = None
@@ -5,6 +5,8 @@ from sqlalchemy.orm.attributes import flag_modified
 
 from src.services.base_service import BaseService, ServiceResult
 from src.services.cache_service import CacheService
+from src.services.power_service import PowerService, POWER_STATS
+from src.services.leaderboard_service import LeaderboardService
 from src.database.models.esprit import Esprit
 from src.database.models.esprit_base import EspritBase
 from src.database.models.player import Player
@@ -117,6 +119,7 @@ class AwakeningService(BaseService):
                 # Store pre-awakening data
                 old_awakening = esprit.awakening_level
                 old_power = esprit.get_individual_power(base)
+                old_stack_power = esprit.get_stack_total_power(base)
                 copies_consumed = awakening_cost["copies_needed"]
                 
                 # Perform awakening
@@ -126,6 +129,10 @@ class AwakeningService(BaseService):
                 
                 # Calculate new power
                 new_power = esprit.get_individual_power(base)
+                new_stack_power = esprit.get_stack_total_power(base)
+                await PowerService.apply_power_delta(session, player_id, {
+                    stat: new_stack_power[stat] - old_stack_power[stat] for stat in POWER_STATS
+                })
                 power_gains = {
                     "atk": new_power["atk"] - old_power["atk"],
                     "def": new_power["def"] - old_power["def"],
@@ -151,6 +158,7 @@ class AwakeningService(BaseService):
                 
                 # Invalidate caches
                 await CacheService.invalidate_player_cache(player_id)
+                await LeaderboardService.record(player)
                 
                 return {
                     "esprit_info": {
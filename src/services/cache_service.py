@@ -1,13 +1,16 @@
 # src/services/cache_service.py
-from typing import Dict, Any, List, Optional, Set, Union, Callable, Awaitable
+from typing import Dict, Any, List, Optional, Sequence, Set, Tuple, Union, Callable, Awaitable
 from datetime import datetime, timedelta
 import asyncio
 import json
 import hashlib
-import zlib
+import time
+import uuid
 from dataclasses import dataclass
 
 from src.utils.redis_service import RedisService
+from src.utils.local_cache import LocalCacheStats, LocalLRUCache
+from src.utils.cache_codec import CacheCodec, DecodedEntry
 from src.services.base_service import BaseService, ServiceResult
 from src.utils.config_manager import ConfigManager
 import logging
@@ -44,7 +47,7 @@ class CacheService(BaseService):
     # Cache key templates with versioning
     PLAYER_POWER_KEY = "player_power:v2:{player_id}"
     LEADER_BONUSES_KEY = "leader_bonuses:v2:{player_id}"
-    COLLECTION_STATS_KEY = "collection_stats:v2:{player_id}"
+    COLLECTION_STATS_KEY = "collection_stats:v3:{player_id}"
     FUSION_RATES_KEY = "fusion_rates:v1:{tier}"
     LEADERBOARD_KEY = "leaderboard:v1:{category}:{period}"
     QUEST_DATA_KEY = "quest_data:v1:{area_id}"
@@ -67,61 +70,293 @@ class CacheService(BaseService):
     TTL_LONG = 3600        # 1 hour - stable data
     TTL_VERY_LONG = 86400  # 24 hours - very stable data
     
-    # Cache compression threshold (bytes)
-    COMPRESSION_THRESHOLD = 1024
+    # Cache compression threshold (bytes of serialized payload)
+    COMPRESSION_THRESHOLD = CacheCodec.compression_threshold
     
     # Internal metrics tracking
     _metrics = CacheMetrics()
     _key_versions: Dict[str, int] = {}
     
+    # Lua: store an entry and register it in its tag sets, one round trip.
+    # KEYS = [cache key, tag key...]; ARGV = [payload, ttl, tag ttl, (channel, message)]
+    # Tag sets only ever have their TTL extended, never shortened.
+    _SET_WITH_TAGS_LUA = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', tonumber(ARGV[2]))
+local tag_ttl = tonumber(ARGV[3])
+for i = 2, #KEYS do
+    redis.call('SADD', KEYS[i], KEYS[1])
+    if redis.call('TTL', KEYS[i]) < tag_ttl then
+        redis.call('EXPIRE', KEYS[i], tag_ttl)
+    end
+end
+if ARGV[4] then
+    redis.call('PUBLISH', ARGV[4], ARGV[5])
+end
+return 1
+"""
+    
+    # Scripts registered through _script(), by name
+    _LUA_SCRIPTS = {"set_with_tags": _SET_WITH_TAGS_LUA}
+    
+    # Keys per UNLINK call and per SCAN page
+    BATCH_SIZE = 500
+    
+    # Tag sets outlive their entries by this many seconds
+    TAG_TTL_PADDING = 300
+    
+    # --- L1: process-local LRU in front of Redis ---
+    # Only rarely-changing keys live in L1 unless a caller opts in with local=True
+    LOCAL_KEY_PREFIXES = ("fusion_rates:", "quest_data:", "shop_data:", "leaderboard:")
+    INVALIDATION_CHANNEL = "cache:invalidate"
+    
+    _local: Optional[LocalLRUCache] = None
+    _local_prefixes: Tuple[str, ...] = LOCAL_KEY_PREFIXES
+    _instance_id: str = uuid.uuid4().hex
+    _listener_task: Optional[asyncio.Task] = None
+    
+    _scripts: Dict[str, Any] = {}
+    _scripts_client: Any = None
+    
+    # single_flight state; declared before the set() classmethod, which shadows the builtin in this body
+    _inflight: Dict[str, "asyncio.Future[Any]"] = {}
+    _background_refreshes: Set["asyncio.Task[Any]"] = set()
+    
+    @classmethod
+    def configure_codec(cls) -> str:
+        """Pick the serializer/compressor for new entries from the `cache` section of global_config"""
+        config = (ConfigManager.get("global_config") or {}).get("cache", {})
+        serializer, compressor = CacheCodec.configure(
+            serializer=config.get("serializer", "msgpack"),
+            compressor=config.get("compressor", "zstd"),
+            compression_threshold=config.get("compression_threshold")
+        )
+        cls.COMPRESSION_THRESHOLD = CacheCodec.compression_threshold
+        logger.info(f"Cache codec: {serializer} + {compressor} above {cls.COMPRESSION_THRESHOLD} bytes")
+        return f"{serializer}+{compressor}"
+    
+    @classmethod
+    def configure_local_cache(cls) -> bool:
+        """(Re)build the L1 tier from the `cache` section of global_config"""
+        config = (ConfigManager.get("global_config") or {}).get("cache", {})
+        
+        if not config.get("local_enabled", False):
+            cls._local = None
+            logger.info("L1 cache disabled")
+            return False
+        
+        cls._local = LocalLRUCache(
+            max_entries=config.get("local_max_entries", 2048),
+            max_ttl=config.get("local_max_ttl", 60)
+        )
+        cls._local_prefixes = tuple(config.get("local_key_prefixes", cls.LOCAL_KEY_PREFIXES))
+        logger.info(f"L1 cache enabled: {cls._local.max_entries} entries, {cls._local.max_ttl}s max TTL")
+        return True
+    
+    @classmethod
+    def _use_local(cls, key: str, local: Optional[bool] = None) -> bool:
+        if cls._local is None or local is False:
+            return False
+        return local is True or key.startswith(cls._local_prefixes)
+    
+    @classmethod
+    def _invalidation_args(cls, keys: Sequence[str] = (), tags: Sequence[str] = (), patterns: Sequence[str] = ()) -> List[str]:
+        """Extra script ARGV that makes the script publish an L1 invalidation"""
+        if cls._local is None:
+            return []
+        message = json.dumps({
+            "origin": cls._instance_id, "keys": list(keys), "tags": list(tags), "patterns": list(patterns)
+        })
+        return [cls.INVALIDATION_CHANNEL, message]
+    
+    @classmethod
+    def _apply_invalidation(cls, keys: Sequence[str] = (), tags: Sequence[str] = (), patterns: Sequence[str] = ()) -> None:
+        """Drop matching entries from this process's L1"""
+        if cls._local is None:
+            return
+        cls._local.delete_many(keys)
+        cls._local.delete_tags(tags)
+        for pattern in patterns:
+            cls._local.delete_pattern(pattern)
+    
+    @classmethod
+    async def start_invalidation_listener(cls) -> bool:
+        """Subscribe to invalidations published by other shards/processes"""
+        if cls._local is None or not RedisService.is_available():
+            return False
+        if cls._listener_task and not cls._listener_task.done():
+            return True
+        
+        cls._listener_task = asyncio.create_task(cls._listen_for_invalidations())
+        return True
+    
+    @classmethod
+    async def stop_invalidation_listener(cls) -> None:
+        if cls._listener_task:
+            cls._listener_task.cancel()
+            cls._listener_task = None
+    
+    @classmethod
+    async def _listen_for_invalidations(cls) -> None:
+        backoff = 1
+        while True:
+            try:
+                client = RedisService.get_client()
+                if not client:
+                    await asyncio.sleep(30)
+                    continue
+                
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(cls.INVALIDATION_CHANNEL)
+                
+                # Anything published while we were disconnected is lost - start clean
+                if cls._local is not None:
+                    cls._local.clear()
+                logger.info(f"Listening for cache invalidations on {cls.INVALIDATION_CHANNEL}")
+                backoff = 1
+                
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message" or cls._local is None:
+                            continue
+                        try:
+                            payload = json.loads(message["data"])
+                        except (TypeError, ValueError):
+                            continue
+                        if payload.get("origin") == cls._instance_id:
+                            continue
+                        cls._apply_invalidation(
+                            payload.get("keys", []), payload.get("tags", []), payload.get("patterns", [])
+                        )
+                finally:
+                    await pubsub.close()
+                    
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener dropped, retrying in {backoff}s: {e}")
+                if cls._local is not None:
+                    cls._local.clear()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+    
+    @classmethod
+    def _script(cls, client, name: str):
+        """Registered Lua script bound to the current client (EVALSHA with automatic reload)"""
+        if cls._scripts_client is not client:
+            cls._scripts = {}
+            cls._scripts_client = client
+        
+        script = cls._scripts.get(name)
+        if script is None:
+            script = client.register_script(cls._LUA_SCRIPTS[name])
+            cls._scripts[name] = script
+        return script
+    
+    @staticmethod
+    def _tag_key(tag: str) -> str:
+        return f"tag:{tag}"
+    
+    @classmethod
+    async def _unlink(cls, client, keys: Sequence[str], tag_keys: Sequence[str] = (), publish_args: Sequence[str] = ()) -> int:
+        """
+        UNLINK keys plus every member of the tag sets, then publish the L1 invalidation.
+        Members are read first and unlinked from the client, so every key a command
+        touches is one it names (scripts may only touch declared KEYS). Tag sets lose
+        just the members read here; one added in between survives for the next invalidation.
+        """
+        tag_members: List[List[Any]] = []
+        if tag_keys:
+            async with client.pipeline(transaction=False) as pipe:
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                tag_members = [list(members) for members in await pipe.execute()]
+        
+        targets = list(dict.fromkeys([*(m for members in tag_members for m in members), *keys]))
+        if not targets and not publish_args:
+            return 0
+        
+        async with client.pipeline(transaction=False) as pipe:
+            unlink_calls = 0
+            for i in range(0, len(targets), cls.BATCH_SIZE):
+                pipe.unlink(*targets[i:i + cls.BATCH_SIZE])
+                unlink_calls += 1
+            for tag_key, members in zip(tag_keys, tag_members):
+                if members:
+                    pipe.srem(tag_key, *members)
+            if publish_args:
+                pipe.publish(*publish_args)
+            results = await pipe.execute()
+        
+        return sum(results[:unlink_calls])
+    
+    @classmethod
+    def _encode_entry(cls, key: str, value: Any, ttl: int, tags: Optional[Set[str]], compress: Optional[bool]) -> bytes:
+        """Serialize a value into the binary cache envelope"""
+        return CacheCodec.encode(value, ttl, tags, cls._get_key_version(key), compress)
+    
+    @classmethod
+    def _remember_local(cls, key: str, entry: DecodedEntry, pttl_ms: Optional[int] = None) -> None:
+        """Copy an L2 hit into L1, expiring no later than the entry's logical expiry or its Redis TTL"""
+        ttl = float(cls._local.max_ttl)  # type: ignore
+        if entry.created_at and entry.ttl:
+            ttl = min(ttl, entry.created_at + entry.ttl - time.time())
+        if pttl_ms is not None and pttl_ms >= 0:
+            ttl = min(ttl, pttl_ms / 1000)
+        cls._local.set(key, entry.data, ttl, entry.tags)  # type: ignore
+    
     @classmethod
     async def get(
         cls, 
         key: str, 
         default: Any = None,
         decompress: bool = True,
-        track_metrics: bool = True
+        track_metrics: bool = True,
+        local: Optional[bool] = None
     ) -> ServiceResult[Any]:
-        """Enhanced get with decompression and metrics"""
+        """Enhanced get: L1 first for eligible keys, then Redis"""
         if not RedisService.is_available():
             return ServiceResult.success_result(default)
         
+        use_local = decompress and cls._use_local(key, local)
+        if use_local:
+            value = cls._local.lookup(key)  # type: ignore
+            if value is not LocalLRUCache._MISSING:
+                return ServiceResult.success_result(value)
+        
         try:
-            client = RedisService.get_client()
+            client = RedisService.get_binary_client()
             if not client:
                 return ServiceResult.success_result(default)
             
-            # Get raw data
-            raw_data = await client.get(key)
+            if use_local:
+                # The Redis TTL bounds how long the L1 copy may live
+                async with client.pipeline(transaction=False) as pipe:
+                    pipe.get(key)
+                    pipe.pttl(key)
+                    raw_data, pttl = await pipe.execute()
+            else:
+                raw_data, pttl = await client.get(key), None
             
             if raw_data is None:
                 if track_metrics:
                     cls._metrics.misses += 1
                 return ServiceResult.success_result(default)
             
+            entry = CacheCodec.decode(raw_data, decompress)
+            
+            # Entries written with stale_ttl outlive their ttl in Redis only for single_flight
+            if not cls._is_fresh(entry):
+                if track_metrics:
+                    cls._metrics.misses += 1
+                return ServiceResult.success_result(default)
+            
             if track_metrics:
                 cls._metrics.hits += 1
             
-            # Try to parse as cache entry with metadata
-            try:
-                entry_data = json.loads(raw_data)
-                if isinstance(entry_data, dict) and "data" in entry_data:
-                    # Enhanced cache entry
-                    if entry_data.get("compressed", False) and decompress:
-                        # Decompress data
-                        compressed_data = entry_data["data"].encode('latin1')
-                        decompressed = zlib.decompress(compressed_data)
-                        data = json.loads(decompressed.decode('utf-8'))
-                    else:
-                        data = entry_data["data"]
-                    
-                    return ServiceResult.success_result(data)
-                else:
-                    # Simple cache entry
-                    return ServiceResult.success_result(entry_data)
-            except json.JSONDecodeError:
-                # Raw string data
-                return ServiceResult.success_result(raw_data)
+            if use_local:
+                cls._remember_local(key, entry, pttl)
+            
+            return ServiceResult.success_result(entry.data)
                 
         except Exception as e:
             logger.warning(f"Cache get failed for key {key}: {e}")
@@ -129,6 +364,58 @@ class CacheService(BaseService):
                 cls._metrics.misses += 1
             return ServiceResult.success_result(default)
     
+    @classmethod
+    async def get_many(cls, keys: List[str], default: Any = None) -> ServiceResult[Dict[str, Any]]:
+        """Fetch several keys: L1 hits are served locally, the rest in a single MGET round trip"""
+        if not keys or not RedisService.is_available():
+            return ServiceResult.success_result({key: default for key in keys})
+        
+        results: Dict[str, Any] = {}
+        remote_keys = []
+        for key in keys:
+            if cls._use_local(key):
+                value = cls._local.lookup(key)  # type: ignore
+                if value is not LocalLRUCache._MISSING:
+                    results[key] = value
+                    continue
+            remote_keys.append(key)
+        
+        if not remote_keys:
+            return ServiceResult.success_result(results)
+        
+        try:
+            client = RedisService.get_binary_client()
+            if not client:
+                results.update({key: default for key in remote_keys})
+                return ServiceResult.success_result(results)
+            
+            local_keys = [key for key in remote_keys if cls._use_local(key)]
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.mget(remote_keys)
+                for key in local_keys:
+                    pipe.pttl(key)
+                raw_values, *pttls = await pipe.execute()
+            remaining = dict(zip(local_keys, pttls))
+            
+            for key, raw_data in zip(remote_keys, raw_values):
+                entry = CacheCodec.decode(raw_data) if raw_data is not None else None
+                if entry is None or not cls._is_fresh(entry):
+                    cls._metrics.misses += 1
+                    results[key] = default
+                else:
+                    cls._metrics.hits += 1
+                    if key in remaining:
+                        cls._remember_local(key, entry, remaining[key])
+                    results[key] = entry.data
+            
+            return ServiceResult.success_result(results)
+            
+        except Exception as e:
+            logger.warning(f"Cache multi get failed for {len(remote_keys)} keys: {e}")
+            cls._metrics.misses += len(remote_keys)
+            results.update({key: default for key in remote_keys})
+            return ServiceResult.success_result(results)
+    
     @classmethod
     async def set(
         cls,
@@ -137,57 +424,39 @@ class CacheService(BaseService):
         ttl: int = TTL_MEDIUM,
         tags: Optional[Set[str]] = None,
         compress: Optional[bool] = None,
-        track_metrics: bool = True
+        track_metrics: bool = True,
+        local: Optional[bool] = None,
+        stale_ttl: int = 0
     ) -> ServiceResult[bool]:
-        """Enhanced set with compression, tagging, and versioning"""
+        """
+        Enhanced set with compression and tagging - entry, tag sets and L1 broadcast in one round trip.
+        With stale_ttl the entry stays in Redis that much longer than ttl so single_flight can serve it stale.
+        """
         if not RedisService.is_available():
             return ServiceResult.success_result(True)
         
         try:
-            client = RedisService.get_client()
+            client = RedisService.get_binary_client()
             if not client:
                 return ServiceResult.success_result(True)
             
-            # Serialize data
-            serialized = json.dumps(value, default=str)
+            payload = cls._encode_entry(key, value, ttl, tags, compress)
+            use_local = cls._use_local(key, local)
+            expire = ttl + max(0, stale_ttl)
             
-            # Auto-compression for large data
-            should_compress = compress if compress is not None else len(serialized) > cls.COMPRESSION_THRESHOLD
+            # Other processes must drop their L1 copy of this key
+            publish_args = cls._invalidation_args(keys=[key]) if use_local else []
             
-            if should_compress:
-                # Compress and encode
-                compressed = zlib.compress(serialized.encode('utf-8'))
-                compressed_str = compressed.decode('latin1')
-                
-                # Create enhanced cache entry
-                cache_entry = {
-                    "data": compressed_str,
-                    "tags": list(tags) if tags else [],
-                    "version": cls._get_key_version(key),
-                    "created_at": datetime.utcnow().isoformat(),
-                    "ttl": ttl,
-                    "compressed": True
-                }
+            if tags or publish_args:
+                tag_keys = [cls._tag_key(tag) for tag in tags] if tags else []
+                await cls._script(client, "set_with_tags")(
+                    keys=[key, *tag_keys], args=[payload, expire, expire + cls.TAG_TTL_PADDING, *publish_args]
+                )
             else:
-                # Create standard cache entry
-                cache_entry = {
-                    "data": value,
-                    "tags": list(tags) if tags else [],
-                    "version": cls._get_key_version(key),
-                    "created_at": datetime.utcnow().isoformat(),
-                    "ttl": ttl,
-                    "compressed": False
-                }
-            
-            # Set in Redis
-            await client.setex(key, ttl, json.dumps(cache_entry, default=str))
+                await client.setex(key, expire, payload)
             
-            # Store tags for grouped operations
-            if tags:
-                for tag in tags:
-                    tag_key = f"tag:{tag}"
-                    client.sadd(tag_key, key)
-                    await client.expire(tag_key, ttl + 300)  # Tag expires after cache
+            if use_local:
+                cls._local.set(key, value, ttl, tags)  # type: ignore
             
             if track_metrics:
                 cls._metrics.sets += 1
@@ -198,32 +467,63 @@ class CacheService(BaseService):
             logger.warning(f"Cache set failed for key {key}: {e}")
             return ServiceResult.error_result("Cache set failed")
     
+    @classmethod
+    async def set_many(
+        cls,
+        entries: Dict[str, Any],
+        ttl: int = TTL_MEDIUM,
+        tags: Optional[Set[str]] = None
+    ) -> ServiceResult[bool]:
+        """Store several entries sharing a TTL and tags in one pipelined round trip"""
+        if not entries or not RedisService.is_available():
+            return ServiceResult.success_result(True)
+        
+        try:
+            client = RedisService.get_binary_client()
+            if not client:
+                return ServiceResult.success_result(True)
+            
+            tag_keys = [cls._tag_key(tag) for tag in tags] if tags else []
+            script = cls._script(client, "set_with_tags") if tag_keys else None
+            local_keys = [key for key in entries if cls._use_local(key)]
+            
+            async with client.pipeline(transaction=False) as pipe:
+                for key, value in entries.items():
+                    payload = cls._encode_entry(key, value, ttl, tags, None)
+                    if script:
+                        await script(keys=[key, *tag_keys], args=[payload, ttl, ttl + cls.TAG_TTL_PADDING], client=pipe)
+                    else:
+                        pipe.setex(key, ttl, payload)
+                if local_keys:
+                    pipe.publish(*cls._invalidation_args(keys=local_keys))
+                await pipe.execute()
+            
+            for key in local_keys:
+                cls._local.set(key, entries[key], ttl, tags)  # type: ignore
+            
+            cls._metrics.sets += len(entries)
+            return ServiceResult.success_result(True)
+            
+        except Exception as e:
+            logger.warning(f"Cache multi set failed for {len(entries)} keys: {e}")
+            return ServiceResult.error_result("Cache set failed")
+    
     @classmethod
     async def delete(cls, key: str, track_metrics: bool = True) -> ServiceResult[bool]:
-        """Delete a cache key and clean up tags"""
+        """Delete a cache key (stale tag set members are harmless and expire with the set)"""
         if not RedisService.is_available():
             return ServiceResult.success_result(True)
         
         try:
-            client = RedisService.get_client()
+            client = RedisService.get_binary_client()
             if not client:
                 return ServiceResult.success_result(True)
             
-            # Get cache entry to find tags
-            cache_data = await client.get(key)
-            if cache_data:
-                try:
-                    entry = json.loads(cache_data)
-                    if isinstance(entry, dict) and "tags" in entry:
-                        # Remove key from tag sets
-                        for tag in entry["tags"]:
-                            tag_key = f"tag:{tag}"
-                            client.srem(tag_key, key)
-                except json.JSONDecodeError:
-                    pass  # Simple cache entry, no tags to clean
-            
-            # Delete the key
-            deleted = await client.delete(key)
+            if cls._local is not None:
+                cls._apply_invalidation(keys=[key])
+                deleted = await cls._unlink(client, [key], publish_args=cls._invalidation_args(keys=[key]))
+            else:
+                deleted = await client.unlink(key)
             
             if track_metrics:
                 cls._metrics.deletes += 1
@@ -236,70 +536,74 @@ class CacheService(BaseService):
     
     @classmethod
     async def delete_pattern(cls, pattern: str) -> ServiceResult[int]:
-        """Delete all keys matching a pattern"""
+        """Delete all keys matching a pattern using incremental SCAN in bounded batches"""
         if not RedisService.is_available():
             return ServiceResult.success_result(0)
         
         try:
-            client = RedisService.get_client()
+            client = RedisService.get_binary_client()
             if not client:
                 return ServiceResult.success_result(0)
             
-            keys = await client.keys(pattern)
-            if keys:
-                # Use pipeline for batch deletion
-                pipe = client.pipeline()
-                for key in keys:
-                    pipe.delete(key)
-                results = await pipe.execute()
-                deleted_count = sum(results)
-                
-                cls._metrics.deletes += deleted_count
-                return ServiceResult.success_result(deleted_count)
+            deleted_count = 0
+            async for keys in RedisService.scan_batches(pattern, cls.BATCH_SIZE):
+                deleted_count += await client.unlink(*keys)
             
-            return ServiceResult.success_result(0)
+            if cls._local is not None:
+                cls._apply_invalidation(patterns=[pattern])
+                await client.publish(*cls._invalidation_args(patterns=[pattern]))
+            
+            cls._metrics.deletes += deleted_count
+            return ServiceResult.success_result(deleted_count)
             
         except Exception as e:
             logger.warning(f"Pattern deletion failed for {pattern}: {e}")
             return ServiceResult.error_result("Pattern deletion failed")
     
     @classmethod
-    async def delete_by_tags(cls, tags: Union[str, List[str]]) -> ServiceResult[int]:
-        """Delete all keys associated with given tags"""
+    async def invalidate(
+        cls,
+        keys: Optional[List[str]] = None,
+        tags: Optional[Union[str, List[str]]] = None
+    ) -> ServiceResult[int]:
+        """Delete explicit keys and every member of the given tags (tag read + pipelined UNLINK)"""
         if not RedisService.is_available():
             return ServiceResult.success_result(0)
         
+        if isinstance(tags, str):
+            tags = [tags]
+        tags = list(tags or [])
+        tag_keys = [cls._tag_key(tag) for tag in tags]
+        keys = list(keys or [])
+        
+        if not tag_keys and not keys:
+            return ServiceResult.success_result(0)
+        
         try:
-            client = RedisService.get_client()
+            client = RedisService.get_binary_client()
             if not client:
                 return ServiceResult.success_result(0)
             
-            if isinstance(tags, str):
-                tags = [tags]
+            cls._apply_invalidation(keys=keys, tags=tags)
+            deleted = await cls._unlink(client, keys, tag_keys, cls._invalidation_args(keys=keys, tags=tags))
             
-            total_deleted = 0
+            cls._metrics.deletes += deleted
+            if tag_keys:
+                cls._metrics.invalidations += 1
             
-            for tag in tags:
-                tag_key = f"tag:{tag}"
-                keys = await client.smembers(tag_key)  # type: ignore
-
-                if keys:
-                    pipe = client.pipeline()
-                    for key in keys:                       # ← now safe to iterate
-                        pipe.delete(key)
-                    pipe.delete(tag_key)
-                    results = await pipe.execute()         # pipe.execute is async
-                    deleted_count = sum(1 for r in results[:-1] if r > 0)
-                    total_deleted += deleted_count
-            
-            cls._metrics.deletes += total_deleted
-            cls._metrics.invalidations += 1
-            
-            return ServiceResult.success_result(total_deleted)
+            return ServiceResult.success_result(deleted)
             
         except Exception as e:
-            logger.warning(f"Tag-based deletion failed for tags {tags}: {e}")
+            logger.warning(f"Cache invalidation failed for keys {keys} tags {tags}: {e}")
+            return ServiceResult.error_result("Cache invalidation failed")
+    
+    @classmethod
+    async def delete_by_tags(cls, tags: Union[str, List[str]]) -> ServiceResult[int]:
+        """Delete all keys associated with given tags"""
+        result = await cls.invalidate(tags=tags)
+        if not result.success:
             return ServiceResult.error_result("Tag deletion failed")
+        return result
     
     @classmethod
     async def invalidate_player_cache(cls, player_id: int) -> ServiceResult[int]:
@@ -321,12 +625,10 @@ class CacheService(BaseService):
     @classmethod
     async def invalidate_player_power(cls, player_id: int) -> ServiceResult[bool]:
         """Invalidate player power cache"""
-        key = cls.PLAYER_POWER_KEY.format(player_id=player_id)
-        result = await cls.delete(key)
-        
-        # Also invalidate by tag
-        tag_result = await cls.delete_by_tags(cls.COMBAT_TAG.format(player_id=player_id))
-        
+        result = await cls.invalidate(
+            keys=[cls.PLAYER_POWER_KEY.format(player_id=player_id)],
+            tags=[cls.COMBAT_TAG.format(player_id=player_id)]
+        )
         return ServiceResult.success_result(result.success)
     
     @classmethod
@@ -338,12 +640,25 @@ class CacheService(BaseService):
     @classmethod
     async def invalidate_collection_stats(cls, player_id: int) -> ServiceResult[bool]:
         """Invalidate collection stats cache"""
-        key = cls.COLLECTION_STATS_KEY.format(player_id=player_id)
-        result = await cls.delete(key)
-        
-        # Also invalidate collection tag
-        tag_result = await cls.delete_by_tags(cls.COLLECTION_TAG.format(player_id=player_id))
-        
+        result = await cls.invalidate(
+            keys=[cls.COLLECTION_STATS_KEY.format(player_id=player_id)],
+            tags=[cls.COLLECTION_TAG.format(player_id=player_id)]
+        )
+        return ServiceResult.success_result(result.success)
+    
+    @classmethod
+    async def invalidate_collection_change(cls, player_id: int) -> ServiceResult[bool]:
+        """Invalidate power and collection caches together after stacks change"""
+        result = await cls.invalidate(
+            keys=[
+                cls.PLAYER_POWER_KEY.format(player_id=player_id),
+                cls.COLLECTION_STATS_KEY.format(player_id=player_id)
+            ],
+            tags=[
+                cls.COMBAT_TAG.format(player_id=player_id),
+                cls.COLLECTION_TAG.format(player_id=player_id)
+            ]
+        )
         return ServiceResult.success_result(result.success)
     
     @classmethod
@@ -464,20 +779,10 @@ class CacheService(BaseService):
             stats_result = await EspritService.get_collection_stats(player_id)
             results["stats_cache"] = stats_result.success
             
-            # Warm leader bonuses (requires player lookup)
-            async with DatabaseService.get_transaction() as session:
-                from src.database.models import Player
-                from sqlalchemy import select
-                
-                player_stmt = select(Player).where(Player.id == player_id)  # type: ignore
-                player = (await session.execute(player_stmt)).scalar_one_or_none()
-                
-                if player:
-                    leader_bonuses = await player.get_leader_bonuses(session)
-                    bonus_result = await cls.cache_leader_bonuses(player_id, leader_bonuses)
-                    results["leader_bonuses_cache"] = bonus_result.success
-                else:
-                    results["leader_bonuses_cache"] = False
+            # Warm leader bonuses: the context load caches them on a miss
+            from src.services.player_context_service import PlayerContextService
+            context_result = await PlayerContextService.get_player_context(player_id=player_id)
+            results["leader_bonuses_cache"] = bool(context_result.success and context_result.data)
             
             return ServiceResult.success_result(results)
             
@@ -558,6 +863,187 @@ class CacheService(BaseService):
             logger.error(f"Atomic cache transaction failed: {e}")
             return ServiceResult.error_result("Atomic transaction failed")
     
+    # --- SINGLE-FLIGHT ---
+    
+    # Cross-process lock held while one worker recomputes a key
+    SINGLE_FLIGHT_LOCK_KEY = "sf_lock:{key}"
+    SINGLE_FLIGHT_LOCK_TTL = 10
+    
+    # Lua: release the lock only if we still own it
+    _RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+    
+    @classmethod
+    async def _get_entry(cls, key: str) -> Optional[DecodedEntry]:
+        """Raw L2 read with envelope metadata (freshness), no L1 and no metrics"""
+        client = RedisService.get_binary_client()
+        if not client:
+            return None
+        try:
+            raw_data = await client.get(key)
+            return CacheCodec.decode(raw_data) if raw_data is not None else None
+        except Exception as e:
+            logger.warning(f"Cache entry read failed for key {key}: {e}")
+            return None
+    
+    @staticmethod
+    def _is_fresh(entry: DecodedEntry) -> bool:
+        # Legacy entries carry no write time: Redis expiry is their only clock
+        if not entry.created_at or not entry.ttl:
+            return True
+        return time.time() < entry.created_at + entry.ttl
+    
+    @classmethod
+    async def single_flight(
+        cls,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int = TTL_MEDIUM,
+        tags: Optional[Set[str]] = None,
+        stale_ttl: int = 0,
+        distributed: bool = False,
+        lock_wait: float = 5.0,
+        local: Optional[bool] = None
+    ) -> Any:
+        """
+        Cached value for key, computing it at most once per process on a miss.
+        
+        Concurrent misses await the same in-flight computation. With stale_ttl, an
+        expired entry is returned immediately while one background refresh runs.
+        With distributed=True a short Redis lock also coalesces across processes:
+        losers poll the cache for up to lock_wait seconds before computing themselves.
+        Exceptions from compute propagate to every waiter; None results are not cached.
+        """
+        if cls._use_local(key, local):
+            value = cls._local.lookup(key)  # type: ignore
+            if value is not LocalLRUCache._MISSING:
+                return value
+        
+        entry = await cls._get_entry(key) if RedisService.is_available() else None
+        if entry is not None:
+            cls._metrics.hits += 1
+            if cls._is_fresh(entry):
+                if cls._use_local(key, local):
+                    cls._remember_local(key, entry)
+                return entry.data
+            
+            # Stale but still within the grace window: serve it (never into L1) and refresh once in the background.
+            # The future is registered before the task exists so concurrent stale hits see it.
+            if key not in cls._inflight:
+                future = cls._claim_flight(key)
+                task = asyncio.create_task(
+                    cls._run_single_flight(key, future, compute, ttl, tags, stale_ttl, distributed, lock_wait, local)
+                )
+                cls._background_refreshes.add(task)
+                task.add_done_callback(lambda done: cls._finish_background_refresh(key, future, done))
+            return entry.data
+        
+        cls._metrics.misses += 1
+        
+        inflight = cls._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        
+        future = cls._claim_flight(key)
+        return await cls._run_single_flight(key, future, compute, ttl, tags, stale_ttl, distributed, lock_wait, local)
+    
+    @classmethod
+    def _claim_flight(cls, key: str) -> "asyncio.Future[Any]":
+        """Register the in-flight future for key; must run with no await since the _inflight check"""
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        cls._inflight[key] = future
+        return future
+    
+    @classmethod
+    def _finish_background_refresh(cls, key: str, future: "asyncio.Future[Any]", task: "asyncio.Task[Any]") -> None:
+        cls._background_refreshes.discard(task)
+        if task.cancelled():
+            # Cancelled before it ever ran: release the claim so the next stale hit can refresh
+            if cls._inflight.get(key) is future:
+                cls._inflight.pop(key, None)
+            future.cancel()
+        elif task.exception() is not None:
+            logger.warning(f"Background cache refresh failed: {task.exception()}")
+    
+    @classmethod
+    async def _run_single_flight(
+        cls,
+        key: str,
+        future: "asyncio.Future[Any]",
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        tags: Optional[Set[str]],
+        stale_ttl: int,
+        distributed: bool,
+        lock_wait: float,
+        local: Optional[bool]
+    ) -> Any:
+        """Own the claimed in-flight future for key: compute, store and wake every waiter"""
+        try:
+            if distributed:
+                value, from_cache = await cls._compute_with_lock(key, compute, lock_wait)
+            else:
+                value, from_cache = await compute(), False
+            
+            if value is not None and not from_cache:
+                await cls.set(key, value, ttl, tags, local=local, stale_ttl=stale_ttl)
+            future.set_result(value)
+            return value
+            
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+            
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited future doesn't log "exception never retrieved"
+            future.exception()
+            raise
+            
+        finally:
+            if cls._inflight.get(key) is future:
+                cls._inflight.pop(key, None)
+    
+    @classmethod
+    async def _compute_with_lock(cls, key: str, compute: Callable[[], Awaitable[Any]], lock_wait: float) -> Tuple[Any, bool]:
+        """Compute under a short Redis lock, or wait for whoever holds it. Returns (value, came_from_cache)"""
+        client = RedisService.get_client()
+        if not client:
+            return await compute(), False
+        
+        lock_key = cls.SINGLE_FLIGHT_LOCK_KEY.format(key=key)
+        token = uuid.uuid4().hex
+        
+        try:
+            acquired = await client.set(lock_key, token, nx=True, ex=cls.SINGLE_FLIGHT_LOCK_TTL)
+        except Exception as e:
+            logger.debug(f"Single-flight lock unavailable for {key}: {e}")
+            return await compute(), False
+        
+        if not acquired:
+            # Another process is computing: poll for its result
+            deadline = time.monotonic() + lock_wait
+            delay = 0.05
+            while time.monotonic() < deadline:
+                await asyncio.sleep(delay)
+                entry = await cls._get_entry(key)
+                if entry is not None and cls._is_fresh(entry):
+                    return entry.data, True
+                delay = min(delay * 2, 0.5)
+            return await compute(), False
+        
+        try:
+            return await compute(), False
+        finally:
+            try:
+                await client.eval(cls._RELEASE_LOCK_LUA, 1, lock_key, token)
+            except Exception as e:
+                logger.debug(f"Single-flight lock release failed for {key}: {e}")
+    
     @classmethod
     async def get_cache_metrics(cls) -> ServiceResult[Dict[str, Any]]:
         """Get comprehensive cache metrics"""
@@ -598,8 +1084,26 @@ class CacheService(BaseService):
                         logger.warning(f"Failed to get Redis metrics: {e}")
                         redis_metrics["error"] = "Failed to retrieve Redis metrics"
             
+            # Per-tier view: L1 is the process-local LRU, L2 is Redis
+            local_metrics = cls._local.snapshot() if cls._local is not None else {}
+            tier_metrics = {
+                "l1": {
+                    "enabled": cls._local is not None,
+                    "hits": local_metrics.get("hits", 0),
+                    "misses": local_metrics.get("misses", 0),
+                    "hit_rate": local_metrics.get("hit_rate", 0.0)
+                },
+                "l2": {
+                    "hits": cls._metrics.hits,
+                    "misses": cls._metrics.misses,
+                    "hit_rate": cls._metrics.hit_rate
+                }
+            }
+            
             return ServiceResult.success_result({
                 "application_metrics": base_metrics,
+                "tier_metrics": tier_metrics,
+                "local_cache": local_metrics,
                 "redis_metrics": redis_metrics,
                 "cache_available": RedisService.is_available(),
                 "timestamp": datetime.utcnow().isoformat()
@@ -728,8 +1232,10 @@ class CacheService(BaseService):
                 if RedisService.is_available():
                     client = RedisService.get_client()
                     if client:
-                        await client.incr(failure_key)
-                        await client.expire(failure_key, failure_window)
+                        async with client.pipeline(transaction=True) as pipe:
+                            pipe.incr(failure_key)
+                            pipe.expire(failure_key, failure_window)
+                            await pipe.execute()
                 
                 logger.error(f"Data fetch failed for {key}: {e}")
                 return ServiceResult.error_result(f"Data fetch failed: {str(e)}")
@@ -755,7 +1261,6 @@ class CacheService(BaseService):
     async def reset_metrics(cls) -> ServiceResult[bool]:
         """Reset cache metrics"""
         cls._metrics = CacheMetrics()
+        if cls._local is not None:
+            cls._local.stats = LocalCacheStats()
         return ServiceResult.success_result(True)
-
-# Import here to avoid circular imports
-from src.utils.database_service import DatabaseService
\ No newline at end of file
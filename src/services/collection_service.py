@@ -10,6 +10,7 @@ from src.database.models.esprit import Esprit
 from src.database.models.esprit_base import EspritBase
 from src.database.models.player import Player
 from src.utils.database_service import DatabaseService
+from src.utils.esprit_catalog import EspritCatalog
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.game_constants import Elements, Tiers, GameConstants
 from src.utils.config_manager import ConfigManager
@@ -45,24 +46,11 @@ class CollectionService(BaseService):
         async def _operation():
             cls._validate_player_id(player_id)
             
-            # Check cache first
-            cached = await CacheService.get_cached_collection_stats(player_id)
-            if cached.success and cached.data:
-                collection_stats = cached.data
-            else:
-                # Calculate fresh stats
-                from src.services.esprit_service import EspritService
-                stats_result = await EspritService.get_collection_stats(player_id)
-                if not stats_result.success:
-                    raise ValueError("Failed to get collection stats")
-                collection_stats = stats_result.data
-            
-            async with DatabaseService.get_transaction() as session:
-                # Get total available Esprits
-                total_available_stmt = select(func.count()).select_from(EspritBase)  # type: ignore
-                total_available_result = await session.execute(total_available_stmt)
-                total_available = total_available_result.scalar() or 0
-                
+            collection_stats = await cls._get_collection_snapshot(player_id)
+            catalog = await EspritCatalog.get_snapshot()
+            total_available = len(catalog)
+            
+            async with DatabaseService.get_read_session() as session:
                 # Get completion percentage
                 unique_owned = collection_stats.get("unique_esprits", 0) if collection_stats else 0
                 completion_percentage = round((unique_owned / max(total_available, 1)) * 100, 2)
@@ -136,10 +124,6 @@ class CollectionService(BaseService):
                     }
                 )
                 
-                # Invalidate cache if data was stale
-                if not cached.success:
-                    await CacheService.invalidate_collection_cache(player_id)
-                
                 return overview
                 
         return await cls._safe_execute(_operation, "get collection overview")
@@ -150,69 +134,55 @@ class CollectionService(BaseService):
         async def _operation():
             cls._validate_player_id(player_id)
             
-            async with DatabaseService.get_transaction() as session:
-                element_progress = {}
+            collection_stats = await cls._get_collection_snapshot(player_id)
+            catalog = await EspritCatalog.get_snapshot()
+            
+            owned_by_element = collection_stats.get("by_element", {})
+            owned_by_element_tier = collection_stats.get("by_element_tier", {})
+            element_progress = {}
+            
+            for element in Elements.get_all():
+                key = element.name.lower()
+                owned = owned_by_element.get(key, {})
+                unique_owned = owned.get("unique", 0)
+                total_available = len(catalog.get_element(element.name))
+                completion_percentage = round((unique_owned / max(total_available, 1)) * 100, 1)
                 
-                for element in Elements.get_all():
-                    # Get total available for this element
-                    total_stmt = select(func.count()).select_from(EspritBase).where(  # type: ignore
-                        EspritBase.element == element.name  # type: ignore
-                    )
-                    total_result = await session.execute(total_stmt)
-                    total_available = total_result.scalar() or 0
-                    
-                    # Get owned for this element - use subquery pattern
-                    owned_stmt = select(func.count()).select_from(Esprit).where(  # type: ignore
-                        Esprit.owner_id == player_id  # type: ignore
-                    ).where(  # type: ignore
-                        Esprit.esprit_base_id.in_(  # type: ignore
-                            select(EspritBase.id).where(EspritBase.element == element.name)  # type: ignore
-                        )
-                    )
-                    owned_result = await session.execute(owned_stmt)
-                    unique_owned = owned_result.scalar() or 0
-                    
-                    # Get total quantity for this element
-                    quantity_stmt = select(func.coalesce(func.sum(Esprit.quantity), 0)).where(  # type: ignore
-                        Esprit.owner_id == player_id  # type: ignore
-                    ).where(  # type: ignore
-                        Esprit.esprit_base_id.in_(  # type: ignore
-                            select(EspritBase.id).where(EspritBase.element == element.name)  # type: ignore
-                        )
-                    )
-                    quantity_result = await session.execute(quantity_stmt)
-                    total_quantity = quantity_result.scalar() or 0
-                    
-                    completion_percentage = round((unique_owned / max(total_available, 1)) * 100, 1)
-                    
-                    element_progress[element.name.lower()] = {
-                        "element_name": element.name,
-                        "emoji": element.emoji,
-                        "color": element.color,
-                        "unique_owned": unique_owned,
-                        "total_quantity": total_quantity,
-                        "total_available": total_available,
-                        "completion_percentage": completion_percentage,
-                        "tier_progress": {},  # Can be enhanced later
-                        "rank": cls._get_element_rank(completion_percentage)
+                tier_progress = {}
+                for tier_key, cell in owned_by_element_tier.get(key, {}).items():
+                    tier_total = len(catalog.get_tier_element(int(tier_key.split("_")[1]), element.name))
+                    tier_progress[tier_key] = {
+                        "unique_owned": cell["unique"],
+                        "total_available": tier_total,
+                        "completion_percentage": round((cell["unique"] / max(tier_total, 1)) * 100, 1)
                     }
                 
-                # Sort by completion percentage
-                sorted_elements = sorted(
-                    element_progress.items(),
-                    key=lambda x: x[1]["completion_percentage"],
-                    reverse=True
-                )
-                
-                progress = ElementProgress(
-                    element_progress=dict(sorted_elements),
-                    strongest_element=sorted_elements[0][0] if sorted_elements else None,
-                    weakest_element=sorted_elements[-1][0] if sorted_elements else None,
-                    overall_element_balance=cls._calculate_element_balance(element_progress)
-                )
-                
-                return progress
-                
+                element_progress[key] = {
+                    "element_name": element.name,
+                    "emoji": element.emoji,
+                    "color": element.color,
+                    "unique_owned": unique_owned,
+                    "total_quantity": owned.get("total", 0),
+                    "total_available": total_available,
+                    "completion_percentage": completion_percentage,
+                    "tier_progress": tier_progress,
+                    "rank": cls._get_element_rank(completion_percentage)
+                }
+            
+            # Sort by completion percentage
+            sorted_elements = sorted(
+                element_progress.items(),
+                key=lambda x: x[1]["completion_percentage"],
+                reverse=True
+            )
+            
+            return ElementProgress(
+                element_progress=dict(sorted_elements),
+                strongest_element=sorted_elements[0][0] if sorted_elements else None,
+                weakest_element=sorted_elements[-1][0] if sorted_elements else None,
+                overall_element_balance=cls._calculate_element_balance(element_progress)
+            )
+            
         return await cls._safe_execute(_operation, "get element progress")
     
     @classmethod
@@ -221,81 +191,47 @@ class CollectionService(BaseService):
         async def _operation():
             cls._validate_player_id(player_id)
             
-            async with DatabaseService.get_transaction() as session:
-                tier_progress = {}
-                
-                for tier_num, tier_data in Tiers.get_all().items():
-                    # Get total available for this tier
-                    total_stmt = select(func.count()).select_from(EspritBase).where(  # type: ignore
-                        EspritBase.base_tier == tier_num  # type: ignore
-                    )
-                    total_result = await session.execute(total_stmt)
-                    total_available = total_result.scalar() or 0
-                    
-                    # Get owned for this tier - use subquery pattern
-                    owned_stmt = select(func.count()).select_from(Esprit).where(  # type: ignore
-                        Esprit.owner_id == player_id  # type: ignore
-                    ).where(  # type: ignore
-                        Esprit.esprit_base_id.in_(  # type: ignore
-                            select(EspritBase.id).where(EspritBase.base_tier == tier_num)  # type: ignore
-                        )
-                    )
-                    owned_result = await session.execute(owned_stmt)
-                    unique_owned = owned_result.scalar() or 0
-                    
-                    # Get total quantity for this tier
-                    quantity_stmt = select(func.coalesce(func.sum(Esprit.quantity), 0)).where(  # type: ignore
-                        Esprit.owner_id == player_id  # type: ignore
-                    ).where(  # type: ignore
-                        Esprit.esprit_base_id.in_(  # type: ignore
-                            select(EspritBase.id).where(EspritBase.base_tier == tier_num)  # type: ignore
-                        )
-                    )
-                    quantity_result = await session.execute(quantity_stmt)
-                    total_quantity = quantity_result.scalar() or 0
-                    
-                    # Get awakened count for this tier
-                    awakened_stmt = select(func.count()).select_from(Esprit).where(  # type: ignore
-                        Esprit.owner_id == player_id  # type: ignore
-                    ).where(  # type: ignore
-                        Esprit.awakening_level > 0  # type: ignore
-                    ).where(  # type: ignore
-                        Esprit.esprit_base_id.in_(  # type: ignore
-                            select(EspritBase.id).where(EspritBase.base_tier == tier_num)  # type: ignore
-                        )
-                    )
-                    awakened_result = await session.execute(awakened_stmt)
-                    awakened_stacks = awakened_result.scalar() or 0
-                    
-                    completion_percentage = round((unique_owned / max(total_available, 1)) * 100, 1)
-                    
-                    tier_progress[f"tier_{tier_num}"] = {
-                        "tier_number": tier_num,
-                        "tier_name": tier_data.name,
-                        "display_name": tier_data.display_name,
-                        "color": tier_data.color,
-                        "unique_owned": unique_owned,
-                        "total_quantity": total_quantity,
-                        "total_available": total_available,
-                        "completion_percentage": completion_percentage,
-                        "awakened_stacks": awakened_stacks,
-                        "awakening_rate": round((awakened_stacks / max(unique_owned, 1)) * 100, 1)
-                    }
-                
-                # Find strongest and weakest tiers
-                sorted_tiers = sorted(
-                    tier_progress.items(),
-                    key=lambda x: x[1]["completion_percentage"],
-                    reverse=True
-                )
-                
-                return {
-                    "tier_progress": tier_progress,
-                    "strongest_tier": sorted_tiers[0][0] if sorted_tiers else None,
-                    "weakest_tier": sorted_tiers[-1][0] if sorted_tiers else None,
-                    "progression_pattern": cls._analyze_progression_pattern(tier_progress)
+            collection_stats = await cls._get_collection_snapshot(player_id)
+            catalog = await EspritCatalog.get_snapshot()
+            
+            owned_by_tier = collection_stats.get("by_tier", {})
+            catalog_tiers = catalog.tier_counts()
+            tier_progress = {}
+            
+            for tier_num, tier_data in Tiers.get_all().items():
+                owned = owned_by_tier.get(f"tier_{tier_num}", {})
+                unique_owned = owned.get("unique", 0)
+                awakened_stacks = owned.get("awakened", 0)
+                total_available = catalog_tiers.get(tier_num, 0)
+                completion_percentage = round((unique_owned / max(total_available, 1)) * 100, 1)
+                
+                tier_progress[f"tier_{tier_num}"] = {
+                    "tier_number": tier_num,
+                    "tier_name": tier_data.name,
+                    "display_name": tier_data.display_name,
+                    "color": tier_data.color,
+                    "unique_owned": unique_owned,
+                    "total_quantity": owned.get("total", 0),
+                    "total_available": total_available,
+                    "completion_percentage": completion_percentage,
+                    "awakened_stacks": awakened_stacks,
+                    "awakening_rate": round((awakened_stacks / max(unique_owned, 1)) * 100, 1)
                 }
-                
+            
+            # Find strongest and weakest tiers
+            sorted_tiers = sorted(
+                tier_progress.items(),
+                key=lambda x: x[1]["completion_percentage"],
+                reverse=True
+            )
+            
+            return {
+                "tier_progress": tier_progress,
+                "strongest_tier": sorted_tiers[0][0] if sorted_tiers else None,
+                "weakest_tier": sorted_tiers[-1][0] if sorted_tiers else None,
+                "progression_pattern": cls._analyze_progression_pattern(tier_progress)
+            }
+            
         return await cls._safe_execute(_operation, "get tier progress")
     
     @classmethod
@@ -312,7 +248,7 @@ class CollectionService(BaseService):
                 limit = max_limit
             cls._validate_positive_int(limit, "limit")
             
-            async with DatabaseService.get_transaction() as session:
+            async with DatabaseService.get_read_session() as session:
                 # Get owned Esprit base IDs
                 owned_stmt = select(Esprit.esprit_base_id).where(Esprit.owner_id == player_id)  # type: ignore
                 owned_results = await session.execute(owned_stmt)
@@ -369,7 +305,7 @@ class CollectionService(BaseService):
             cls._validate_player_id(player_id)
             
             # Get current unique count
-            async with DatabaseService.get_transaction() as session:
+            async with DatabaseService.get_read_session() as session:
                 count_stmt = select(func.count()).select_from(Esprit).where(Esprit.owner_id == player_id)  # type: ignore
                 count_result = await session.execute(count_stmt)
                 unique_count = count_result.scalar() or 0
@@ -423,7 +359,7 @@ class CollectionService(BaseService):
             
             cutoff_date = datetime.utcnow() - timedelta(days=days)
             
-            async with DatabaseService.get_transaction() as session:
+            async with DatabaseService.get_read_session() as session:
                 # Get recent Esprits
                 stmt = (select(Esprit, EspritBase)
                        .where(Esprit.owner_id == player_id)  # type: ignore
@@ -495,7 +431,6 @@ class CollectionService(BaseService):
                     
                     # Invalidate relevant caches
                     await CacheService.invalidate_player_cache(player_id)
-                    await CacheService.invalidate_collection_cache(player_id)
                     
                     return milestone
             
@@ -523,6 +458,15 @@ class CollectionService(BaseService):
             {"target": 1000, "title": "Ultimate Collector", "description": "Collect 1000 unique Esprits", "rewards": {"revies": 500000, "erythl": 1000}}
         ]
     
+    @classmethod
+    async def _get_collection_snapshot(cls, player_id: int) -> Dict[str, Any]:
+        """Cached per-player aggregate shared by the overview, element and tier views"""
+        from src.services.esprit_service import EspritService
+        stats_result = await EspritService.get_collection_stats(player_id)
+        if not stats_result.success:
+            raise ValueError("Failed to get collection stats")
+        return stats_result.data or {}
+    
     @classmethod
     def _calculate_collection_value(cls, collection_stats: Dict[str, Any]) -> int:
         """Calculate estimated collection value using config multipliers"""
@@ -1,11 +1,12 @@
 # src/services/currency_service.py
 from dataclasses import dataclass
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy import select, func
 from datetime import datetime
 
 from src.services.base_service import BaseService, ServiceResult
 from src.services.cache_service import CacheService
+from src.services.leaderboard_service import LeaderboardService
 from src.database.models.player import Player
 from src.utils.database_service import DatabaseService
 from src.utils.transaction_logger import transaction_logger, TransactionType
@@ -61,7 +62,7 @@ class CurrencyService(BaseService):
                 )
                 
                 return balance
-                
+        
         return await cls._safe_execute(_operation, "get currency balance")
     
     @classmethod
@@ -120,6 +121,7 @@ class CurrencyService(BaseService):
                 
                 # Invalidate currency cache
                 await CacheService.invalidate_player_cache(player_id)
+                await LeaderboardService.record(player)
                 
                 transaction = CurrencyTransaction(
                     success=True,
@@ -131,7 +133,7 @@ class CurrencyService(BaseService):
                 )
                 
                 return transaction
-                
+        
         return await cls._safe_execute(_operation, "add currency")
     
     @classmethod
@@ -179,6 +181,7 @@ class CurrencyService(BaseService):
                 
                 # Invalidate currency cache
                 await CacheService.invalidate_player_cache(player_id)
+                await LeaderboardService.record(player)
                 
                 transaction = CurrencyTransaction(
                     success=True,
@@ -190,7 +193,7 @@ class CurrencyService(BaseService):
                 )
                 
                 return transaction
-                
+        
         return await cls._safe_execute(_operation, "spend currency")
     
     @classmethod
@@ -282,6 +285,7 @@ class CurrencyService(BaseService):
                 # Invalidate both players' caches
                 await CacheService.invalidate_player_cache(from_player_id)
                 await CacheService.invalidate_player_cache(to_player_id)
+                await LeaderboardService.record(from_player, to_player)
                 
                 return {
                     "sender": CurrencyTransaction(
@@ -303,7 +307,7 @@ class CurrencyService(BaseService):
                         transaction_id=transfer_id
                     )
                 }
-                
+        
         return await cls._safe_execute(_operation, "transfer currency")
     
     @classmethod
@@ -329,7 +333,7 @@ class CurrencyService(BaseService):
                 for currency, cost in costs.items():
                     if cost <= 0:
                         continue
-                        
+                    
                     balance = getattr(player, currency)
                     can_afford = balance >= cost
                     shortage = max(0, cost - balance)
@@ -349,101 +353,111 @@ class CurrencyService(BaseService):
                     "breakdown": affordability,
                     "total_cost": costs
                 }
-                
+        
         return await cls._safe_execute(_operation, "check affordability")
     
     @classmethod
-    async def batch_currency_operation(cls, operations: List[Dict[str, Any]]) -> ServiceResult[List[CurrencyTransaction]]:
-        """Execute multiple currency operations atomically"""
-        async def _operation():
-            if not operations:
-                raise ValueError("Operations list cannot be empty")
+    async def apply_operations(cls, session, operations: List[Dict[str, Any]]) -> Tuple[List[CurrencyTransaction], List[Player]]:
+        """Apply currency operations inside the caller's transaction; the caller commits"""
+        if not operations:
+            raise ValueError("Operations list cannot be empty")
+        
+        # Validate all operations first
+        for i, op in enumerate(operations):
+            required_fields = ["player_id", "currency", "amount", "reason"]
+            for field in required_fields:
+                if field not in op:
+                    raise ValueError(f"Operation {i} missing required field: {field}")
             
-            # Validate all operations first
-            for i, op in enumerate(operations):
-                required_fields = ["player_id", "currency", "amount", "reason"]
-                for field in required_fields:
-                    if field not in op:
-                        raise ValueError(f"Operation {i} missing required field: {field}")
-                
-                cls._validate_player_id(op["player_id"])
-                cls._validate_currency(op["currency"])
-                
-                if op["amount"] == 0:
-                    raise ValueError(f"Operation {i} has zero amount")
+            cls._validate_player_id(op["player_id"])
+            cls._validate_currency(op["currency"])
             
-            results = []
+            if op["amount"] == 0:
+                raise ValueError(f"Operation {i} has zero amount")
+        
+        results = []
+        
+        # Group operations by player for better locking
+        player_operations = {}
+        for op in operations:
+            player_id = op["player_id"]
+            if player_id not in player_operations:
+                player_operations[player_id] = []
+            player_operations[player_id].append(op)
+        
+        touched_players = []
+        
+        # Process all operations
+        for player_id, player_ops in player_operations.items():
+            stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
+            player = (await session.execute(stmt)).scalar_one()
+            touched_players.append(player)
             
-            # Group operations by player for better locking
-            player_operations = {}
-            for op in operations:
-                player_id = op["player_id"]
-                if player_id not in player_operations:
-                    player_operations[player_id] = []
-                player_operations[player_id].append(op)
+            for op in player_ops:
+                currency = op["currency"]
+                amount = op["amount"]
+                reason = op["reason"]
+                
+                old_balance = getattr(player, currency)
+                
+                # Check if spending operation has sufficient funds
+                if amount < 0 and old_balance < abs(amount):
+                    raise ValueError(f"Insufficient {currency} for player {player_id}")
+                
+                # Apply operation
+                new_balance = old_balance + amount
+                setattr(player, currency, new_balance)
+                
+                # Update earning totals if adding
+                if amount > 0:
+                    if currency == cls.PRIMARY_CURRENCY:
+                        player.total_revies_earned += amount
+                    elif currency == cls.PREMIUM_CURRENCY:
+                        player.total_erythl_earned += amount
+                
+                # Log transaction
+                transaction_type = TransactionType.CURRENCY_GAIN if amount > 0 else TransactionType.CURRENCY_SPEND
+                transaction_logger.log_transaction(
+                    player_id,
+                    transaction_type,
+                    {
+                        "currency": currency,
+                        "amount": abs(amount),
+                        "reason": reason,
+                        "old_balance": old_balance,
+                        "new_balance": new_balance,
+                        "batch_operation": True
+                    }
+                )
+                
+                results.append(CurrencyTransaction(
+                    success=True,
+                    currency=currency,
+                    amount=amount,
+                    old_balance=old_balance,
+                    new_balance=new_balance,
+                    reason=reason
+                ))
             
+            player.update_activity()
+        
+        return results, touched_players
+    
+    @classmethod
+    async def batch_currency_operation(cls, operations: List[Dict[str, Any]]) -> ServiceResult[List[CurrencyTransaction]]:
+        """Execute multiple currency operations atomically"""
+        async def _operation():
             async with DatabaseService.get_transaction() as session:
-                # Process all operations
-                for player_id, player_ops in player_operations.items():
-                    stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
-                    player = (await session.execute(stmt)).scalar_one()
-                    
-                    for op in player_ops:
-                        currency = op["currency"]
-                        amount = op["amount"]
-                        reason = op["reason"]
-                        
-                        old_balance = getattr(player, currency)
-                        
-                        # Check if spending operation has sufficient funds
-                        if amount < 0 and old_balance < abs(amount):
-                            raise ValueError(f"Insufficient {currency} for player {player_id}")
-                        
-                        # Apply operation
-                        new_balance = old_balance + amount
-                        setattr(player, currency, new_balance)
-                        
-                        # Update earning totals if adding
-                        if amount > 0:
-                            if currency == cls.PRIMARY_CURRENCY:
-                                player.total_revies_earned += amount
-                            elif currency == cls.PREMIUM_CURRENCY:
-                                player.total_erythl_earned += amount
-                        
-                        # Log transaction
-                        transaction_type = TransactionType.CURRENCY_GAIN if amount > 0 else TransactionType.CURRENCY_SPEND
-                        transaction_logger.log_transaction(
-                            player_id,
-                            transaction_type,
-                            {
-                                "currency": currency,
-                                "amount": abs(amount),
-                                "reason": reason,
-                                "old_balance": old_balance,
-                                "new_balance": new_balance,
-                                "batch_operation": True
-                            }
-                        )
-                        
-                        results.append(CurrencyTransaction(
-                            success=True,
-                            currency=currency,
-                            amount=amount,
-                            old_balance=old_balance,
-                            new_balance=new_balance,
-                            reason=reason
-                        ))
-                    
-                    player.update_activity()
-                
+                results, touched_players = await cls.apply_operations(session, operations)
                 await session.commit()
                 
                 # Invalidate all affected players' caches
-                for player_id in player_operations.keys():
-                    await CacheService.invalidate_player_cache(player_id)
+                for player in touched_players:
+                    await CacheService.invalidate_player_cache(player.id)
+                await LeaderboardService.record(*touched_players)
                 
                 return results
-                
+        
         return await cls._safe_execute(_operation, "batch currency operations")
     
     @classmethod
@@ -482,7 +496,7 @@ class CurrencyService(BaseService):
                     })
                 
                 return leaderboard
-                
+        
         return await cls._safe_execute(_operation, "get currency leaderboard")
     
     @classmethod
@@ -531,7 +545,7 @@ class CurrencyService(BaseService):
                         "erythl": round((total_erythl_earned - total_erythl) / max(total_erythl_earned, 1) * 100, 2)
                     }
                 }
-                
+        
         return await cls._safe_execute(_operation, "get economy stats")
     
     @classmethod
@@ -567,7 +581,7 @@ class CurrencyService(BaseService):
                 "limit": limit,
                 "currency_filter": currency
             }
-            
+        
         return await cls._safe_execute(_operation, "get transaction history")
     
     # Migration helpers for future "revies" transition
@@ -599,5 +613,5 @@ class CurrencyService(BaseService):
                     "prepare_rollback_plan": True
                 }
             }
-                
+        
         return await cls._safe_execute(_operation, "prepare currency migration")
\ No newline at end of file
@@ -1,19 +1,28 @@
 # src/services/echo_service.py
+from collections import Counter
 from typing import Dict, Any, Optional
 from sqlalchemy import select
 from sqlalchemy.orm.attributes import flag_modified
 from datetime import date, timedelta
 
 from src.services.base_service import BaseService, ServiceResult
+from src.services.cache_service import CacheService
+from src.services.leaderboard_service import LeaderboardService
+from src.services.period_leaderboard_service import PeriodLeaderboardService
 from src.database.models.player import Player
-from src.database.models.esprit_base import EspritBase
 from src.utils.database_service import DatabaseService
+from src.utils.loot_sampler import LootSamplers
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.config_manager import ConfigManager
 
 class EchoService(BaseService):
     """Echo and gacha system management"""
     
+    ECHO_TYPES = ["faded_echo", "vivid_echo", "brilliant_echo"]
+    
+    # Most echoes a single bulk open may consume
+    MAX_BULK_OPEN = 50
+    
     @classmethod
     async def can_claim_daily_echo(cls, player_id: int) -> ServiceResult[Dict[str, Any]]:
         async def _operation():
@@ -84,9 +93,8 @@ class EchoService(BaseService):
             if not echo_type or not isinstance(echo_type, str):
                 raise ValueError("echo_type must be a non-empty string")
             
-            valid_types = ["faded_echo", "vivid_echo", "brilliant_echo"]
-            if echo_type not in valid_types:
-                raise ValueError(f"Invalid echo type. Must be one of: {valid_types}")
+            if echo_type not in cls.ECHO_TYPES:
+                raise ValueError(f"Invalid echo type. Must be one of: {cls.ECHO_TYPES}")
             
             async with DatabaseService.get_transaction() as session:
                 stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
@@ -98,24 +106,10 @@ class EchoService(BaseService):
                 if use_echo_key and player.inventory.get("echo_key", 0) == 0:
                     raise ValueError("No echo keys available")
                 
-                # Get all esprit bases
-                bases_stmt = select(EspritBase)
-                bases_result = await session.execute(bases_stmt)
-                all_bases = list(bases_result.scalars().all())
-                
-                if not all_bases:
-                    raise ValueError("No Esprit bases available")
-                
-                # Use player's echo opening logic
-                echo_result = await player.open_echo(session, echo_type, all_bases)
-                if echo_result is None:
-                    raise ValueError("Echo opening failed")
-                
-                # Handle potential tuple unpacking safely
-                if len(echo_result) >= 3:
-                    _, selected_base, selected_tier = echo_result[0], echo_result[1], echo_result[2]
-                else:
-                    raise ValueError("Invalid echo result format")
+                # Draw from the precompiled sampler for this echo type and player level
+                sampler = await LootSamplers.get(echo_type, player.level)
+                selected_base = sampler.sample()
+                selected_tier = selected_base.base_tier
                 
                 # Consume echo/key
                 if not use_echo_key:
@@ -123,31 +117,32 @@ class EchoService(BaseService):
                 else:
                     player.inventory["echo_key"] -= 1
                 
+                player.total_echoes_opened += 1
                 flag_modified(player, "inventory")
                 
-                # Add esprit to collection
+                # Add esprit to collection in this same transaction
                 from src.services.esprit_service import EspritService
-                add_result = await EspritService.add_to_collection(player_id, selected_base.id, 1)
-                
-                if not add_result.success:
-                    raise ValueError("Failed to add Esprit to collection")
+                stacks = await EspritService.upsert_stacks(session, player_id, {selected_base.id: 1})
+                stack = stacks[selected_base.id]
                 
                 player.update_activity()
                 await session.commit()
                 
+                await CacheService.invalidate_collection_change(player_id)
+                await LeaderboardService.record(player)
+                await PeriodLeaderboardService.add_points(player_id, "echo_opened")
+                
                 transaction_logger.log_transaction(player_id, TransactionType.ITEM_CONSUMED, {
                     "item": echo_type, "quantity": 1, "reason": "echo_opening",
                     "echo_key_used": use_echo_key, "result_esprit": selected_base.name,
-                    "result_tier": selected_tier, "result_element": selected_base.element
+                    "result_tier": selected_tier, "result_element": selected_base.element,
+                    "is_new_capture": stack["is_new"]
                 })
                 
-                # Safely access add_result.data
-                esprit_data = add_result.data if add_result.data else {}
-                
                 return {
                     "echo_type": echo_type, "echo_key_used": use_echo_key,
                     "esprit_received": {
-                        "id": esprit_data.get("esprit_id"), "name": selected_base.name,
+                        "id": stack["esprit_id"], "name": selected_base.name,
                         "tier": selected_tier, "element": selected_base.element,
                         "rarity": selected_base.get_rarity_name(), "description": selected_base.description
                     },
@@ -157,6 +152,72 @@ class EchoService(BaseService):
                 }
         return await cls._safe_execute(_operation, "open echo")
     
+    @classmethod
+    async def open_echoes(cls, player_id: int, echo_type: str, count: int) -> ServiceResult[Dict[str, Any]]:
+        """Open up to MAX_BULK_OPEN echoes of one type under a single player lock and transaction"""
+        async def _operation():
+            cls._validate_player_id(player_id)
+            if echo_type not in cls.ECHO_TYPES:
+                raise ValueError(f"Invalid echo type. Must be one of: {cls.ECHO_TYPES}")
+            if not isinstance(count, int) or count < 1 or count > cls.MAX_BULK_OPEN:
+                raise ValueError(f"count must be between 1 and {cls.MAX_BULK_OPEN}")
+            
+            async with DatabaseService.get_transaction() as session:
+                stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
+                player = (await session.execute(stmt)).scalar_one()
+                
+                owned = (player.inventory or {}).get(echo_type, 0)
+                if owned < count:
+                    raise ValueError(f"Only {owned} {echo_type} in inventory")
+                
+                # All draws in one call, then collapse into one upsert row per Esprit type
+                sampler = await LootSamplers.get(echo_type, player.level)
+                drawn = sampler.sample_many(count)
+                quantities = Counter(base.id for base in drawn)
+                bases = {base.id: base for base in drawn}
+                
+                from src.services.esprit_service import EspritService
+                stacks = await EspritService.upsert_stacks(session, player_id, dict(quantities))
+                
+                player.inventory[echo_type] = owned - count
+                player.total_echoes_opened += count
+                player.update_activity()
+                
+                flag_modified(player, "inventory")
+                await session.commit()
+                
+                results = []
+                for esprit_base_id, quantity in quantities.most_common():
+                    base = bases[esprit_base_id]
+                    stack = stacks[esprit_base_id]
+                    results.append({
+                        "id": stack["esprit_id"], "esprit_base_id": esprit_base_id,
+                        "name": base.name, "tier": base.base_tier, "element": base.element,
+                        "rarity": base.get_rarity_name(), "quantity": quantity,
+                        "total_quantity": stack["total_quantity"], "is_new_capture": stack["is_new"]
+                    })
+                results.sort(key=lambda r: (-r["tier"], -r["quantity"], r["name"]))
+                
+                # One aggregated record for the whole batch
+                transaction_logger.log_echo_opened(player_id, echo_type, {
+                    "count": count, "level_bracket": sampler.bracket,
+                    "esprits": {r["name"]: r["quantity"] for r in results},
+                    "new_captures": [r["name"] for r in results if r["is_new_capture"]],
+                    "remaining_echoes": player.inventory[echo_type]
+                })
+                
+                await CacheService.invalidate_collection_change(player_id)
+                await LeaderboardService.record(player)
+                await PeriodLeaderboardService.add_points(player_id, "echo_opened", times=count)
+                
+                return {
+                    "echo_type": echo_type, "opened": count,
+                    "esprits_received": results,
+                    "remaining_echoes": player.inventory[echo_type],
+                    "total_opened": player.total_echoes_opened
+                }
+        return await cls._safe_execute(_operation, "open echoes")
+    
     @classmethod
     async def get_echo_inventory(cls, player_id: int) -> ServiceResult[Dict[str, Any]]:
         async def _operation():
@@ -183,4 +244,23 @@ class EchoService(BaseService):
                     "total_opened": player.total_echoes_opened,
                     "can_claim_daily": player.last_daily_echo != date.today()
                 }
-        return await cls._safe_execute(_operation, "get echo inventory")
\ No newline at end of file
+        return await cls._safe_execute(_operation, "get echo inventory")
+    
+    @classmethod
+    async def get_drop_rates(cls, echo_type: str, level: int) -> ServiceResult[Dict[str, Any]]:
+        """Exact drop rates for an echo at a player level, straight from the compiled sampler"""
+        async def _operation():
+            if not echo_type or not isinstance(echo_type, str):
+                raise ValueError("echo_type must be a non-empty string")
+            if level < 1:
+                raise ValueError("level must be positive")
+            
+            sampler = await LootSamplers.get(echo_type, level)
+            
+            return {
+                "echo_type": echo_type,
+                "level_bracket": sampler.bracket,
+                "tier_rates": sampler.tier_probabilities(),
+                "esprit_rates": sampler.drop_rates()
+            }
+        return await cls._safe_execute(_operation, "get drop rates")
@@ -1,21 +1,41 @@
 # src/services/esprit_service.py
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
-from sqlalchemy import select, func, and_
+from dataclasses import dataclass, replace
+from sqlalchemy import select, func, and_, literal_column, cast, tuple_, Float
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime
 from sqlalchemy.orm.attributes import flag_modified
 
 from src.services.base_service import BaseService, ServiceResult
 from src.services.cache_service import CacheService
+from src.services.power_service import PowerService
+from src.services.leaderboard_service import LeaderboardService
 from src.database.models.esprit import Esprit
 from src.database.models.esprit_base import EspritBase
 from src.database.models.player import Player
 from src.utils.database_service import DatabaseService
+from src.utils.esprit_catalog import EspritCatalog
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.config_manager import ConfigManager
 
+@dataclass(frozen=True)
+class CollectionPage:
+    """One page of a collection; first_key/last_key are the keyset cursors for its neighbours"""
+    rows: List[tuple]
+    first_key: Optional[tuple]
+    last_key: Optional[tuple]
+    has_more: bool  # rows beyond this page in the direction it was fetched
+    total_count: Optional[int] = None
+
 class EspritService(BaseService):
     """Core Esprit collection and management service"""
     
+    # Sort modes for collection pages, see _collection_sort_keys
+    COLLECTION_SORTS = (
+        "tier_desc", "tier_asc", "element", "quantity_desc", "awakening_desc",
+        "name_asc", "name_desc", "power_desc", "atk_desc", "def_desc"
+    )
+    
     @classmethod
     async def add_to_collection(cls, player_id: int, esprit_base_id: int, quantity: int = 1) -> ServiceResult[Dict[str, Any]]:
         """Add Esprit to player's collection, stacking if already owned"""
@@ -26,9 +46,11 @@ class EspritService(BaseService):
                 raise ValueError("Quantity must be positive")
             
             async with DatabaseService.get_transaction() as session:
-                # Get the EspritBase
-                base_stmt = select(EspritBase).where(EspritBase.id == esprit_base_id)  # type: ignore
-                base = (await session.execute(base_stmt)).scalar_one()
+                # Get the EspritBase (catalog first, database only for bases added since the last load)
+                base = (await EspritCatalog.get_snapshot()).get(esprit_base_id)
+                if base is None:
+                    base_stmt = select(EspritBase).where(EspritBase.id == esprit_base_id)  # type: ignore
+                    base = (await session.execute(base_stmt)).scalar_one()
                 
                 # Check if player already owns this Esprit type
                 existing_stmt = select(Esprit).where(
@@ -65,6 +87,11 @@ class EspritService(BaseService):
                     old_quantity = 0
                     is_new = True
                 
+                awakening_level = existing_stack.awakening_level if existing_stack else 0
+                await PowerService.apply_power_delta(
+                    session, player_id, PowerService.stack_delta(base, awakening_level, quantity)
+                )
+                
                 # Update player statistics
                 player_stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
                 player = (await session.execute(player_stmt)).scalar_one()
@@ -81,8 +108,8 @@ class EspritService(BaseService):
                 })
                 
                 # Invalidate caches
-                await CacheService.invalidate_player_power(player_id)
-                await CacheService.invalidate_collection_stats(player_id)
+                await CacheService.invalidate_collection_change(player_id)
+                await LeaderboardService.record(player)
                 
                 return {
                     "esprit_id": esprit_id, "esprit_name": base.name,
@@ -92,6 +119,65 @@ class EspritService(BaseService):
                 }
         return await cls._safe_execute(_operation, "add to collection")
     
+    @classmethod
+    async def upsert_stacks(cls, session, player_id: int, quantities: Dict[int, int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Add many Esprit types to a collection with one INSERT ... ON CONFLICT statement.
+        Runs inside the caller's transaction: no commit, no logging, no cache invalidation.
+        The owner's power totals get the matching delta in the same transaction; callers
+        record the owner on the leaderboards after they commit.
+        Returns {esprit_base_id: {"esprit_id", "total_quantity", "is_new"}}.
+        """
+        if not quantities:
+            return {}
+        
+        catalog = await EspritCatalog.get_snapshot()
+        now = datetime.utcnow()
+        rows = []
+        bases = {}
+        
+        # Sorted so concurrent upserts always lock stacks in the same order
+        for esprit_base_id in sorted(quantities):
+            quantity = quantities[esprit_base_id]
+            if quantity <= 0:
+                raise ValueError("Quantity must be positive")
+            
+            base = catalog.get(esprit_base_id)
+            if base is None:
+                base_stmt = select(EspritBase).where(EspritBase.id == esprit_base_id)  # type: ignore
+                base = (await session.execute(base_stmt)).scalar_one()
+            bases[esprit_base_id] = base
+            
+            rows.append({
+                "esprit_base_id": esprit_base_id, "owner_id": player_id,
+                "quantity": quantity, "tier": base.base_tier, "element": base.element,
+                "awakening_level": 0, "created_at": now, "last_modified": now
+            })
+        
+        stmt = pg_insert(Esprit).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["owner_id", "esprit_base_id"],
+            set_={
+                "quantity": Esprit.quantity + stmt.excluded.quantity,  # type: ignore
+                "last_modified": stmt.excluded.last_modified
+            }
+        ).returning(
+            Esprit.id, Esprit.esprit_base_id, Esprit.quantity, Esprit.awakening_level,  # type: ignore
+            literal_column("(xmax = 0)").label("inserted")
+        )
+        
+        rows = (await session.execute(stmt)).all()
+        await PowerService.apply_power_delta(session, player_id, PowerService.combine(
+            PowerService.stack_delta(bases[row.esprit_base_id], row.awakening_level, quantities[row.esprit_base_id])
+            for row in rows
+        ))
+        return {
+            row.esprit_base_id: {
+                "esprit_id": row.id, "total_quantity": row.quantity, "is_new": bool(row.inserted)
+            }
+            for row in rows
+        }
+    
     @classmethod
     async def get_player_esprit(cls, player_id: int, esprit_id: int) -> ServiceResult[Dict[str, Any]]:
         """Get detailed information about a specific Esprit owned by player"""
@@ -133,66 +219,141 @@ class EspritService(BaseService):
                 }
         return await cls._safe_execute(_operation, "get player esprit")
     
+    @staticmethod
+    def _copy_stat(base_column, awakening_column):
+        """One copy's awakened stat in SQL; float8 math and trunc keep it identical to Esprit.calculate_power"""
+        multiplier = 1.0 + cast(awakening_column, Float) * 0.2
+        return func.trunc(cast(base_column, Float) * multiplier)
+    
+    @classmethod
+    def _collection_sort_keys(cls, sort_by: str) -> tuple:
+        """(key columns ending in Esprit.id, descending) - every column runs in the one direction"""
+        if sort_by not in cls.COLLECTION_SORTS:
+            raise ValueError(f"Invalid sort_by. Must be one of: {list(cls.COLLECTION_SORTS)}")
+        
+        atk = cls._copy_stat(EspritBase.base_atk, Esprit.awakening_level)
+        defense = cls._copy_stat(EspritBase.base_def, Esprit.awakening_level)
+        keys = {
+            # ix_esprit_owner_tier, ix_esprit_owner_element
+            "tier_desc": ((Esprit.tier, Esprit.id), True),
+            "tier_asc": ((Esprit.tier, Esprit.id), False),
+            "element": ((Esprit.element, -Esprit.tier, Esprit.id), False),
+            "quantity_desc": ((Esprit.quantity, Esprit.id), True),
+            "awakening_desc": ((Esprit.awakening_level, Esprit.id), True),
+            # Keys from the joined base: Postgres top-N sorts the owner's stacks, still no OFFSET
+            "name_asc": ((EspritBase.name, Esprit.id), False),
+            "name_desc": ((EspritBase.name, Esprit.id), True),
+            "power_desc": ((atk + defense, Esprit.id), True),
+            "atk_desc": ((atk, Esprit.id), True),
+            "def_desc": ((defense, Esprit.id), True),
+        }
+        return keys[sort_by]
+    
+    @classmethod
+    async def fetch_collection_page(
+        cls,
+        session,
+        player_id: int,
+        sort_by: str = "tier_desc",
+        *,
+        after: Optional[tuple] = None,
+        before: Optional[tuple] = None,
+        per_page: int = 10,
+        element_filter: Optional[str] = None,
+        tier_filter: Optional[int] = None
+    ) -> "CollectionPage":
+        """
+        One keyset page of (Esprit, EspritBase) rows. `after`/`before` are the
+        last_key/first_key of a page already shown; neither means the first page.
+        """
+        if after is not None and before is not None:
+            raise ValueError("Pass at most one of after or before")
+        
+        columns, descending = cls._collection_sort_keys(sort_by)
+        key = tuple_(*columns)
+        # Walking backwards is the same query with the order flipped, reversed afterwards
+        backwards = before is not None
+        reverse_order = descending != backwards
+        
+        stmt = select(Esprit, EspritBase, *columns).where(
+            Esprit.owner_id == player_id,  # type: ignore
+            Esprit.esprit_base_id == EspritBase.id  # type: ignore
+        )
+        if element_filter:
+            stmt = stmt.where(Esprit.element.ilike(f"%{element_filter}%"))  # type: ignore
+        if tier_filter:
+            stmt = stmt.where(Esprit.tier == tier_filter)  # type: ignore
+        
+        cursor = before if backwards else after
+        if cursor is not None:
+            stmt = stmt.where(key < tuple_(*cursor) if reverse_order else key > tuple_(*cursor))
+        
+        stmt = stmt.order_by(*(column.desc() if reverse_order else column.asc() for column in columns))
+        rows = (await session.execute(stmt.limit(per_page + 1))).all()
+        
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        if backwards:
+            rows.reverse()
+        
+        width = len(columns)
+        return CollectionPage(
+            rows=[(row[0], row[1]) for row in rows],
+            first_key=tuple(rows[0][2:2 + width]) if rows else None,
+            last_key=tuple(rows[-1][2:2 + width]) if rows else None,
+            has_more=has_more
+        )
+    
+    @classmethod
+    async def count_collection(cls, session, player_id: int, element_filter: Optional[str] = None,
+                               tier_filter: Optional[int] = None) -> int:
+        count_stmt = select(func.count(Esprit.id)).where(Esprit.owner_id == player_id)  # type: ignore
+        if element_filter:
+            count_stmt = count_stmt.where(Esprit.element.ilike(f"%{element_filter}%"))  # type: ignore
+        if tier_filter:
+            count_stmt = count_stmt.where(Esprit.tier == tier_filter)  # type: ignore
+        return (await session.execute(count_stmt)).scalar() or 0
+    
+    @classmethod
+    async def get_collection_page(cls, player_id: int, sort_by: str = "tier_desc",
+                                  after: Optional[tuple] = None, before: Optional[tuple] = None,
+                                  per_page: int = 10, with_total: bool = False) -> ServiceResult["CollectionPage"]:
+        """Keyset page of stacks with their bases for collection views"""
+        async def _operation():
+            cls._validate_player_id(player_id)
+            cls._validate_positive_int(per_page, "per_page")
+            
+            async with DatabaseService.get_read_session() as session:
+                page = await cls.fetch_collection_page(
+                    session, player_id, sort_by, after=after, before=before, per_page=per_page
+                )
+                if with_total:
+                    page = replace(page, total_count=await cls.count_collection(session, player_id))
+            return page
+        return await cls._safe_execute(_operation, "get collection page")
+    
     @classmethod
-    async def get_player_collection(cls, player_id: int, page: int = 1, per_page: int = 10, 
+    async def get_player_collection(cls, player_id: int, per_page: int = 10,
                                   element_filter: Optional[str] = None, 
                                   tier_filter: Optional[int] = None,
-                                  sort_by: str = "tier") -> ServiceResult[Dict[str, Any]]:
-        """Get player's Esprit collection with filtering and pagination"""
+                                  sort_by: str = "tier_desc",
+                                  after: Optional[List[Any]] = None,
+                                  before: Optional[List[Any]] = None) -> ServiceResult[Dict[str, Any]]:
+        """Get player's Esprit collection with filtering and keyset pagination"""
         async def _operation():
             cls._validate_player_id(player_id)
             
-            valid_sorts = ["tier", "name", "element", "quantity", "awakening", "power"]
-            if sort_by not in valid_sorts:
-                raise ValueError(f"Invalid sort_by. Must be one of: {valid_sorts}")
-            
-            async with DatabaseService.get_session() as session:
-                stmt = select(Esprit, EspritBase).where(
-                    and_(
-                        Esprit.owner_id == player_id,  # type: ignore
-                        Esprit.esprit_base_id == EspritBase.id  # type: ignore
-                    )
+            async with DatabaseService.get_read_session() as session:
+                page = await cls.fetch_collection_page(
+                    session, player_id, sort_by,
+                    after=tuple(after) if after is not None else None,
+                    before=tuple(before) if before is not None else None,
+                    per_page=per_page, element_filter=element_filter, tier_filter=tier_filter
                 )
-                
-                # Apply filters
-                if element_filter:
-                    stmt = stmt.where(Esprit.element.ilike(f"%{element_filter}%"))  # type: ignore
-                if tier_filter:
-                    stmt = stmt.where(Esprit.tier == tier_filter)  # type: ignore
-                
-                # Apply sorting
-                if sort_by == "tier":
-                    stmt = stmt.order_by(Esprit.tier.desc(), EspritBase.name)
-                elif sort_by == "name":
-                    stmt = stmt.order_by(EspritBase.name)
-                elif sort_by == "element":
-                    stmt = stmt.order_by(Esprit.element, EspritBase.name)
-                elif sort_by == "quantity":
-                    stmt = stmt.order_by(Esprit.quantity.desc(), EspritBase.name)
-                elif sort_by == "awakening":
-                    stmt = stmt.order_by(Esprit.awakening_level.desc(), EspritBase.name)
-                elif sort_by == "power":
-                    # Sort by calculated power (approximate)
-                    stmt = stmt.order_by((EspritBase.base_atk + EspritBase.base_def + EspritBase.base_hp).desc())
-                
-                # Get total count for pagination
-                count_stmt = select(func.count(Esprit.id)).where(Esprit.owner_id == player_id)  # type: ignore
-                
-                if element_filter:
-                    count_stmt = count_stmt.where(Esprit.element.ilike(f"%{element_filter}%"))  # type: ignore
-                if tier_filter:
-                    count_stmt = count_stmt.where(Esprit.tier == tier_filter)  # type: ignore
-                
-                total_count = (await session.execute(count_stmt)).scalar() or 0
-                
-                # Apply pagination
-                offset = (page - 1) * per_page
-                stmt = stmt.offset(offset).limit(per_page)
-                
-                results = (await session.execute(stmt)).all()
+                total_count = await cls.count_collection(session, player_id, element_filter, tier_filter)
                 
                 esprits = []
-                for esprit, base in results:
+                for esprit, base in page.rows:
                     individual_power = esprit.get_individual_power(base)
                     
                     esprits.append({
@@ -205,13 +366,18 @@ class EspritService(BaseService):
                         "created_at": esprit.created_at.isoformat()
                     })
                 
-                total_pages = (total_count + per_page - 1) // per_page
+                # Pass next_cursor back as `after` (or prev_cursor as `before`) for the neighbouring page
+                backwards = before is not None
+                has_next = page.has_more if not backwards else page.last_key is not None
+                has_prev = page.has_more if backwards else after is not None
                 
                 return {
                     "esprits": esprits, "pagination": {
-                        "current_page": page, "per_page": per_page,
-                        "total_count": total_count, "total_pages": total_pages,
-                        "has_next": page < total_pages, "has_prev": page > 1
+                        "per_page": per_page, "total_count": total_count,
+                        "total_pages": (total_count + per_page - 1) // per_page,
+                        "has_next": has_next, "has_prev": has_prev,
+                        "next_cursor": list(page.last_key) if has_next and page.last_key else None,
+                        "prev_cursor": list(page.first_key) if has_prev and page.first_key else None
                     },
                     "filters": {"element": element_filter, "tier": tier_filter, "sort_by": sort_by}
                 }
@@ -233,82 +399,15 @@ class EspritService(BaseService):
                 player_stmt = select(Player).where(Player.id == player_id)  # type: ignore
                 player = (await session.execute(player_stmt)).scalar_one()
                 
-                # Get all player's Esprits with their bases
-                esprits_stmt = select(Esprit, EspritBase).where(
-                    and_(
-                        Esprit.owner_id == player_id,  # type: ignore
-                        Esprit.esprit_base_id == EspritBase.id  # type: ignore
-                    )
-                )
-                esprit_results = (await session.execute(esprits_stmt)).all()
-                
-                power_by_element = {}
-                power_by_tier = {}
-                total_base_power = {"atk": 0, "def": 0, "hp": 0}
-                esprit_contributions = []
-                
-                for esprit, base in esprit_results:
-                    individual_power = esprit.get_individual_power(base)
-                    stack_power = esprit.get_stack_total_power(base)
-                    
-                    # By element
-                    element = esprit.element
-                    if element not in power_by_element:
-                        power_by_element[element] = {"atk": 0, "def": 0, "hp": 0, "count": 0}
-                    
-                    power_by_element[element]["atk"] += stack_power["atk"]
-                    power_by_element[element]["def"] += stack_power["def"]
-                    power_by_element[element]["hp"] += stack_power["hp"]
-                    power_by_element[element]["count"] += esprit.quantity
-                    
-                    # By tier
-                    tier = esprit.tier
-                    if tier not in power_by_tier:
-                        power_by_tier[tier] = {"atk": 0, "def": 0, "hp": 0, "count": 0}
-                    
-                    power_by_tier[tier]["atk"] += stack_power["atk"]
-                    power_by_tier[tier]["def"] += stack_power["def"]
-                    power_by_tier[tier]["hp"] += stack_power["hp"]
-                    power_by_tier[tier]["count"] += esprit.quantity
-                    
-                    # Total base power
-                    total_base_power["atk"] += stack_power["atk"]
-                    total_base_power["def"] += stack_power["def"]
-                    total_base_power["hp"] += stack_power["hp"]
-                    
-                    # Individual contributions
-                    esprit_contributions.append({
-                        "name": base.name, "element": esprit.element, "tier": esprit.tier,
-                        "awakening": esprit.awakening_level, "quantity": esprit.quantity,
-                        "individual_power": individual_power, "stack_power": stack_power,
-                        "efficiency": (individual_power["atk"] + individual_power["def"] + individual_power["hp"]) / max(esprit.tier, 1)
-                    })
-                
-                # Apply skill bonuses
-                skill_bonuses = player.get_skill_bonuses()
-                final_power = {
-                    "atk": int(total_base_power["atk"] * (1 + skill_bonuses["bonus_attack_percent"])),
-                    "def": int(total_base_power["def"] * (1 + skill_bonuses["bonus_defense_percent"])),
-                    "hp": total_base_power["hp"]  # HP not affected by skill bonuses
-                }
-                
-                # Sort contributions by total stack power
-                esprit_contributions.sort(key=lambda x: sum(x["stack_power"].values()), reverse=True)
-                
-                result = {
-                    "total_power": final_power, "base_power": total_base_power,
-                    "skill_bonuses": skill_bonuses, "power_by_element": power_by_element,
-                    "power_by_tier": power_by_tier, "top_contributors": esprit_contributions[:10],
-                    "total_esprits": len(esprit_contributions),
-                    "total_quantity": sum(c["quantity"] for c in esprit_contributions),
-                    "average_tier": round(sum(c["tier"] * c["quantity"] for c in esprit_contributions) / 
-                                        max(sum(c["quantity"] for c in esprit_contributions), 1), 2)
-                }
-                
-                # Cache for 5 minutes
-                await CacheService.cache_player_power(player_id, result)
-                
-                return result
+                # Plain stack tuples, summed column-wise
+                rows = (await session.execute(PowerService.stack_rows_statement(player_id))).all()
+            
+            result = PowerService.build_breakdown(player, rows)
+            
+            # Cache for 5 minutes
+            await CacheService.cache_player_power(player_id, result)
+            
+            return result
         return await cls._safe_execute(_operation, "calculate collection power")
     
     @classmethod
@@ -322,73 +421,73 @@ class EspritService(BaseService):
             if cached.success and cached.data:
                 return cached.data
             
+            # Primary, not a replica: this snapshot is rebuilt right after writes invalidate it
             async with DatabaseService.get_session() as session:
-                # Total unique and quantity
-                total_stmt = select(
-                    func.count(Esprit.id).label('unique_count'),  # type: ignore
-                    func.coalesce(func.sum(Esprit.quantity), 0).label('total_quantity')  # type: ignore
-                ).where(Esprit.owner_id == player_id)  # type: ignore
-                
-                total_result = (await session.execute(total_stmt)).first()
-                unique_count = total_result.unique_count if total_result else 0
-                total_quantity = total_result.total_quantity if total_result else 0
-                
-                # By element
-                element_stmt = select(
-                    Esprit.element,  # type: ignore
-                    func.count().label('unique_count'),  # type: ignore
-                    func.coalesce(func.sum(Esprit.quantity), 0).label('total_quantity')  # type: ignore
-                ).where(Esprit.owner_id == player_id).group_by(Esprit.element)  # type: ignore
-                
-                element_results = (await session.execute(element_stmt)).all()
-                element_stats = {
-                    row.element.lower(): {"unique": row.unique_count, "total": row.total_quantity}
-                    for row in element_results
-                }
-                
-                # By tier
-                tier_stmt = select(
-                    Esprit.tier,  # type: ignore
-                    func.count().label('unique_count'),  # type: ignore
-                    func.coalesce(func.sum(Esprit.quantity), 0).label('total_quantity')  # type: ignore
-                ).where(Esprit.owner_id == player_id).group_by(Esprit.tier).order_by(Esprit.tier)  # type: ignore
-                
-                tier_results = (await session.execute(tier_stmt)).all()
-                tier_stats = {
-                    f"tier_{row.tier}": {"unique": row.unique_count, "total": row.total_quantity}
-                    for row in tier_results
-                }
-                
-                # Awakened stacks
-                awakened_stmt = select(
+                # One aggregate over owned stacks joined to their bases; every view derives from it
+                stmt = select(
+                    EspritBase.element,  # type: ignore
+                    EspritBase.base_tier,  # type: ignore
                     Esprit.awakening_level,  # type: ignore
-                    func.count().label('stack_count'),  # type: ignore
+                    func.count(Esprit.id).label('stack_count'),  # type: ignore
                     func.coalesce(func.sum(Esprit.quantity), 0).label('total_quantity')  # type: ignore
+                ).select_from(Esprit).join(
+                    EspritBase, Esprit.esprit_base_id == EspritBase.id  # type: ignore
                 ).where(
-                    and_(
-                        Esprit.owner_id == player_id,  # type: ignore
-                        Esprit.awakening_level > 0  # type: ignore
-                    )
-                ).group_by(Esprit.awakening_level)
-                
-                awakened_results = (await session.execute(awakened_stmt)).all()
-                awakened_stats = {
-                    f"star_{row.awakening_level}": {"stacks": row.stack_count, "total": row.total_quantity}
-                    for row in awakened_results
-                }
-                
-                result = {
-                    "unique_esprits": unique_count, "total_quantity": total_quantity,
-                    "by_element": element_stats, "by_tier": tier_stats,
-                    "awakened": awakened_stats
-                }
+                    Esprit.owner_id == player_id  # type: ignore
+                ).group_by(EspritBase.element, EspritBase.base_tier, Esprit.awakening_level)
                 
-                # Cache for 15 minutes
-                await CacheService.cache_collection_stats(player_id, result)
-                
-                return result
+                rows = (await session.execute(stmt)).all()
+            
+            result = cls._build_collection_stats(rows)
+            
+            # Cache for 30 minutes; capture, fusion and awakening invalidate it
+            await CacheService.cache_collection_stats(player_id, result)
+            
+            return result
         return await cls._safe_execute(_operation, "get collection stats")
     
+    @staticmethod
+    def _build_collection_stats(rows) -> Dict[str, Any]:
+        """Fold (element, tier, awakening_level, stacks, quantity) rows into the stats snapshot"""
+        unique_count = 0
+        total_quantity = 0
+        element_stats: Dict[str, Dict[str, int]] = {}
+        tier_stats: Dict[int, Dict[str, int]] = {}
+        element_tier_stats: Dict[str, Dict[str, Dict[str, int]]] = {}
+        awakened_stats: Dict[int, Dict[str, int]] = {}
+        
+        for element, tier, awakening_level, stack_count, quantity in rows:
+            element = element.lower()
+            unique_count += stack_count
+            total_quantity += quantity
+            
+            element_entry = element_stats.setdefault(element, {"unique": 0, "total": 0})
+            element_entry["unique"] += stack_count
+            element_entry["total"] += quantity
+            
+            tier_entry = tier_stats.setdefault(tier, {"unique": 0, "total": 0, "awakened": 0})
+            tier_entry["unique"] += stack_count
+            tier_entry["total"] += quantity
+            
+            cell = element_tier_stats.setdefault(element, {}).setdefault(f"tier_{tier}", {"unique": 0, "total": 0})
+            cell["unique"] += stack_count
+            cell["total"] += quantity
+            
+            if awakening_level > 0:
+                tier_entry["awakened"] += stack_count
+                star_entry = awakened_stats.setdefault(awakening_level, {"stacks": 0, "total": 0})
+                star_entry["stacks"] += stack_count
+                star_entry["total"] += quantity
+        
+        return {
+            "unique_esprits": unique_count, "total_quantity": total_quantity,
+            "by_element": element_stats,
+            "by_tier": {f"tier_{tier}": tier_stats[tier] for tier in sorted(tier_stats)},
+            "by_element_tier": element_tier_stats,
+            "awakened": {f"star_{level}": awakened_stats[level] for level in sorted(awakened_stats)},
+            "last_updated": datetime.utcnow().isoformat()
+        }
+    
     @classmethod
     async def remove_from_collection(cls, player_id: int, esprit_id: int, quantity: int) -> ServiceResult[Dict[str, Any]]:
         """Remove Esprit quantity from collection (for fusion, etc.)"""
@@ -420,6 +519,10 @@ class EspritService(BaseService):
                 esprit.quantity -= quantity
                 esprit.last_modified = func.now()
                 
+                await PowerService.apply_power_delta(
+                    session, player_id, PowerService.stack_delta(base, esprit.awakening_level, -quantity)
+                )
+                
                 # If quantity reaches 0, delete the stack
                 stack_deleted = False
                 if esprit.quantity <= 0:
@@ -443,8 +546,8 @@ class EspritService(BaseService):
                 })
                 
                 # Invalidate caches
-                await CacheService.invalidate_player_power(player_id)
-                await CacheService.invalidate_collection_stats(player_id)
+                await CacheService.invalidate_collection_change(player_id)
+                await LeaderboardService.record(player)
                 
                 return {
                     "esprit_name": base.name, "quantity_removed": quantity,
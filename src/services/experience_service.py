@@ -5,6 +5,7 @@ from sqlalchemy.orm.attributes import flag_modified
 
 from src.services.base_service import BaseService, ServiceResult
 from src.services.cache_service import CacheService
+from src.services.leaderboard_service import LeaderboardService
 from src.database.models.player import Player
 from src.utils.database_service import DatabaseService
 from src.utils.transaction_logger import transaction_logger, TransactionType
@@ -80,6 +81,7 @@ class ExperienceService(BaseService):
                 
                 if levels_gained > 0:
                     await CacheService.invalidate_player_power(player_id)
+                    await LeaderboardService.record(player)
                 
                 return {
                     "xp_gained": amount, "source": source, "old_level": old_level, "new_level": player.level,
@@ -174,6 +176,7 @@ class ExperienceService(BaseService):
                 })
                 
                 await CacheService.invalidate_player_power(player_id)
+                await LeaderboardService.record(player)
                 
                 return {
                     "points_restored": points_to_restore, "reset_count": player.skill_reset_count,
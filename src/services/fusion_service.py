@@ -6,11 +6,16 @@ from sqlalchemy.orm.attributes import flag_modified
 import random
 
 from src.services.base_service import BaseService, ServiceResult
+from src.services.analytics_service import AnalyticsService
 from src.services.cache_service import CacheService
+from src.services.leaderboard_service import LeaderboardService
+from src.services.power_service import PowerService
+from src.services.period_leaderboard_service import PeriodLeaderboardService
 from src.database.models.esprit import Esprit
 from src.database.models.esprit_base import EspritBase
 from src.database.models.player import Player
 from src.utils.database_service import DatabaseService
+from src.utils.esprit_catalog import EspritCatalog
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.game_constants import FUSION_CHART, get_fusion_result
 from src.utils.config_manager import ConfigManager
@@ -99,8 +104,7 @@ class FusionService(BaseService):
                     raise ValueError("Cannot fuse - result would exceed maximum tier")
                 
                 # Get possible Esprits for result tier
-                tier_stmt = select(EspritBase).where(EspritBase.base_tier == result_tier)  # type: ignore
-                tier_bases = (await session.execute(tier_stmt)).scalars().all()
+                tier_bases = (await EspritCatalog.get_snapshot()).get_tier(result_tier)
                 
                 possible_results = [
                     {
@@ -242,6 +246,10 @@ class FusionService(BaseService):
                 ]
                 
                 # Consume input Esprits
+                await PowerService.apply_power_delta(session, player_id, PowerService.combine([
+                    PowerService.stack_delta(base1, esprit1.awakening_level, -1),
+                    PowerService.stack_delta(base2, esprit2.awakening_level, -1)
+                ]))
                 esprit1.quantity -= 1
                 esprit2.quantity -= 1
                 
@@ -259,8 +267,7 @@ class FusionService(BaseService):
                 
                 if fusion_successful:
                     # Get all possible Esprits of result tier
-                    tier_stmt = select(EspritBase).where(EspritBase.base_tier == result_tier)  # type: ignore
-                    possible_bases = (await session.execute(tier_stmt)).scalars().all()
+                    possible_bases = (await EspritCatalog.get_snapshot()).get_tier(result_tier)
                     
                     if not possible_bases:
                         raise ValueError(f"No Esprits available for tier {result_tier}")
@@ -271,19 +278,16 @@ class FusionService(BaseService):
                     if result_base.id is None:
                         raise ValueError("Result EspritBase has no id")
                     
-                    # Add result to collection using EspritService logic
+                    # Same transaction as the consumed inputs, so power and stacks move together
                     from src.services.esprit_service import EspritService
-                    add_result = await EspritService.add_to_collection(player_id, result_base.id, 1)
-                    
-                    if not add_result.success or not add_result.data:
-                        raise ValueError("Failed to add result Esprit to collection")
+                    stack = (await EspritService.upsert_stacks(session, player_id, {result_base.id: 1}))[result_base.id]
                     
                     result_data["result_esprit"] = {
-                        "id": add_result.data["esprit_id"], "name": result_base.name,
+                        "id": stack["esprit_id"], "name": result_base.name,
                         "tier": result_base.base_tier, "element": result_base.element,
                         "rarity": result_base.get_rarity_name(), "image_url": result_base.image_url,
                         "element_emoji": result_base.get_element_emoji(), 
-                        "is_new_capture": add_result.data["is_new_capture"]
+                        "is_new_capture": stack["is_new"]
                     }
                 else:
                     # Handle failed fusion - maybe give fragments
@@ -313,8 +317,10 @@ class FusionService(BaseService):
                 })
                 
                 # Invalidate caches
-                await CacheService.invalidate_player_power(player_id)
-                await CacheService.invalidate_collection_stats(player_id)
+                await CacheService.invalidate_collection_change(player_id)
+                await LeaderboardService.record(player)
+                if fusion_successful:
+                    await PeriodLeaderboardService.add_points(player_id, "fusion_success")
                 
                 return result_data
         return await cls._safe_execute(_operation, "execute fusion")
@@ -358,19 +364,20 @@ class FusionService(BaseService):
         async def _operation():
             cls._validate_player_id(player_id)
             
-            # This would require implementing transaction log querying
-            # For now, get from player stats
             async with DatabaseService.get_session() as session:
                 player_stmt = select(Player).where(Player.id == player_id)  # type: ignore
                 player = (await session.execute(player_stmt)).scalar_one()
-                
-                return {
-                    "total_fusions": player.total_fusions,
-                    "successful_fusions": player.successful_fusions,
-                    "success_rate": round((player.successful_fusions / max(player.total_fusions, 1)) * 100, 1),
-                    "last_fusion": player.last_fusion.isoformat() if player.last_fusion else None,
-                    "recent_fusions": []  # TODO: Implement transaction log querying
-                }
+            
+            # Recent results come from the analytics summaries, so they lag the log by one ingest pass
+            recent_result = await AnalyticsService.get_recent_fusions(player_id, limit)
+            
+            return {
+                "total_fusions": player.total_fusions,
+                "successful_fusions": player.successful_fusions,
+                "success_rate": round((player.successful_fusions / max(player.total_fusions, 1)) * 100, 1),
+                "last_fusion": player.last_fusion.isoformat() if player.last_fusion else None,
+                "recent_fusions": recent_result.data if recent_result.success else []
+            }
         return await cls._safe_execute(_operation, "get fusion history")
     
     @classmethod
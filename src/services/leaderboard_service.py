@@ -0,0 +1,284 @@
+# src/services/leaderboard_service.py
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select
+
+from src.services.base_service import BaseService, ServiceResult
+from src.database.models.player import Player
+from src.utils.database_service import DatabaseService
+from src.utils.redis_service import RedisService
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class LeaderboardService(BaseService):
+    """Redis sorted-set leaderboards kept in step with every committed stat change"""
+    
+    # Category -> Player column; the sorted set score is the column value
+    CATEGORIES = {
+        "level": Player.level,
+        "revies": Player.revies,
+        "erythl": Player.erythl,
+        "battles_won": Player.battles_won,
+        "total_fusions": Player.total_fusions,
+        "successful_fusions": Player.successful_fusions,
+        "total_attack_power": Player.total_attack_power
+    }
+    
+    BOARD_KEY = "leaderboard:zset:v1:{category}"
+    # Set only by a full rebuild; until then reads fall back to Postgres
+    READY_KEY = "leaderboard:ready:v1:{category}"
+    REBUILD_SUFFIX = ":rebuild"
+    REBUILD_BATCH_SIZE = 1000
+    # Players written while a rebuild runs; exists only during a rebuild
+    TOUCHED_KEY = "leaderboard:touched:v1"
+    TOUCHED_TTL = 3600
+    
+    # KEYS: one board per category, then TOUCHED_KEY
+    # ARGV: member, score per board, member, ...; an empty score removes the member
+    _UPDATE_LUA = """
+local boards = #KEYS - 1
+local touched = KEYS[#KEYS]
+local tracking = redis.call('EXISTS', touched) == 1
+for i = 1, #ARGV, boards + 1 do
+    local member = ARGV[i]
+    for c = 1, boards do
+        local score = ARGV[i + c]
+        if score == '' then
+            redis.call('ZREM', KEYS[c], member)
+        else
+            redis.call('ZADD', KEYS[c], score, member)
+        end
+    end
+    if tracking then
+        redis.call('SADD', touched, member)
+    end
+end
+return 1
+"""
+    
+    # KEYS: rebuilt side key, live board, TOUCHED_KEY, ready key
+    # Players written during the rebuild take their live score, which is newer than the Postgres read
+    _SWAP_LUA = """
+for _, member in ipairs(redis.call('SMEMBERS', KEYS[3])) do
+    if member ~= '' then
+        local score = redis.call('ZSCORE', KEYS[2], member)
+        if score then
+            redis.call('ZADD', KEYS[1], score, member)
+        else
+            redis.call('ZREM', KEYS[1], member)
+        end
+    end
+end
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('RENAME', KEYS[1], KEYS[2])
+else
+    redis.call('DEL', KEYS[2])
+end
+redis.call('SET', KEYS[4], 1)
+return 1
+"""
+    
+    _rebuild_task: Optional[asyncio.Task] = None
+    _update_script: Any = None
+    _update_client: Any = None
+    
+    @classmethod
+    def _validate_category(cls, category: str) -> None:
+        if category not in cls.CATEGORIES:
+            raise ValueError(f"Invalid category. Must be one of: {list(cls.CATEGORIES)}")
+    
+    @classmethod
+    def _scores(cls, player: Player) -> Dict[str, int]:
+        return {category: int(getattr(player, category) or 0) for category in cls.CATEGORIES}
+    
+    @classmethod
+    async def _update(cls, client, entries: Dict[str, Optional[Dict[str, int]]]) -> None:
+        """ZADD (or ZREM for None) members on every board, noting them for a running rebuild"""
+        if cls._update_client is not client:
+            cls._update_script = client.register_script(cls._UPDATE_LUA)
+            cls._update_client = client
+        
+        keys = [cls.BOARD_KEY.format(category=category) for category in cls.CATEGORIES] + [cls.TOUCHED_KEY]
+        args: List[Any] = []
+        for member, scores in entries.items():
+            args.append(member)
+            args.extend(scores[category] if scores is not None else "" for category in cls.CATEGORIES)
+        await cls._update_script(keys=keys, args=args)
+    
+    @classmethod
+    async def record(cls, *players: Player) -> ServiceResult[int]:
+        """ZADD every category score for freshly committed players in one round trip"""
+        players = tuple(p for p in players if p is not None and p.id is not None)
+        if not players or not RedisService.is_available():
+            return ServiceResult.success_result(0)
+        
+        try:
+            client = RedisService.get_client()
+            if not client:
+                return ServiceResult.success_result(0)
+            
+            await cls._update(client, {str(player.id): cls._scores(player) for player in players})
+            return ServiceResult.success_result(len(players))
+        
+        except Exception as e:
+            # A missed update only skews ranks until the next change or rebuild
+            logger.warning(f"Leaderboard update failed for players {[p.id for p in players]}: {e}")
+            return ServiceResult.success_result(0)
+    
+    @classmethod
+    async def remove(cls, player_id: int) -> ServiceResult[bool]:
+        """Drop a player from every board"""
+        async def _operation():
+            client = RedisService.get_client()
+            if not client:
+                return False
+            await cls._update(client, {str(player_id): None})
+            return True
+        return await cls._safe_execute(_operation, "remove leaderboard entries")
+    
+    @classmethod
+    async def get_page(cls, category: str, limit: int, offset: int = 0) -> ServiceResult[Optional[List[Tuple[int, int]]]]:
+        """(player_id, score) pairs for one page via ZREVRANGE, or None if the board isn't built"""
+        async def _operation():
+            cls._validate_category(category)
+            client = RedisService.get_client()
+            if not client:
+                return None
+            
+            pipe = client.pipeline(transaction=False)
+            pipe.exists(cls.READY_KEY.format(category=category))
+            pipe.zrevrange(cls.BOARD_KEY.format(category=category), offset, offset + limit - 1, withscores=True)
+            ready, rows = await pipe.execute()
+            if not ready:
+                return None
+            
+            return [(int(member), int(score)) for member, score in rows]
+        return await cls._safe_execute(_operation, "get leaderboard page")
+    
+    @classmethod
+    async def get_ranks(cls, player_id: int, categories: Optional[Iterable[str]] = None) -> ServiceResult[Optional[Dict[str, Optional[int]]]]:
+        """1-based rank per category, or None if any board isn't built; tied scores share a rank"""
+        async def _operation():
+            cls._validate_player_id(player_id)
+            wanted = list(categories or cls.CATEGORIES)
+            for category in wanted:
+                cls._validate_category(category)
+            
+            client = RedisService.get_client()
+            if not client:
+                return None
+            
+            pipe = client.pipeline(transaction=False)
+            for category in wanted:
+                pipe.exists(cls.READY_KEY.format(category=category))
+                pipe.zscore(cls.BOARD_KEY.format(category=category), str(player_id))
+            results = await pipe.execute()
+            
+            scores: Dict[str, Optional[float]] = {}
+            for i, category in enumerate(wanted):
+                ready, score = results[2 * i], results[2 * i + 1]
+                if not ready:
+                    return None
+                scores[category] = score
+            
+            # Rank = players with a strictly higher score + 1, as the Postgres count does
+            ranked = [category for category in wanted if scores[category] is not None]
+            pipe = client.pipeline(transaction=False)
+            for category in ranked:
+                pipe.zcount(cls.BOARD_KEY.format(category=category), f"({scores[category]}", "+inf")
+            higher = dict(zip(ranked, await pipe.execute())) if ranked else {}
+            
+            return {category: higher[category] + 1 if category in higher else None for category in wanted}
+        return await cls._safe_execute(_operation, "get leaderboard ranks")
+    
+    @classmethod
+    async def get_size(cls, category: str) -> ServiceResult[int]:
+        """Number of ranked players in a category"""
+        async def _operation():
+            cls._validate_category(category)
+            client = RedisService.get_client()
+            if not client:
+                return 0
+            return await client.zcard(cls.BOARD_KEY.format(category=category))
+        return await cls._safe_execute(_operation, "get leaderboard size")
+    
+    @classmethod
+    async def rebuild(cls, categories: Optional[Iterable[str]] = None) -> ServiceResult[Dict[str, int]]:
+        """Recreate boards from Postgres into side keys, then swap them in atomically
+
+        Players recorded or removed meanwhile are collected in TOUCHED_KEY and keep
+        their live score through the swap, so no concurrent write is lost.
+        """
+        async def _operation():
+            wanted = list(categories or cls.CATEGORIES)
+            for category in wanted:
+                cls._validate_category(category)
+            
+            client = RedisService.get_client()
+            if not client:
+                raise ValueError("Redis is not available")
+            
+            temp_keys = {c: cls.BOARD_KEY.format(category=c) + cls.REBUILD_SUFFIX for c in wanted}
+            pipe = client.pipeline(transaction=False)
+            pipe.unlink(*temp_keys.values())
+            pipe.sadd(cls.TOUCHED_KEY, "")  # placeholder so writers start tracking now
+            pipe.expire(cls.TOUCHED_KEY, cls.TOUCHED_TTL)
+            await pipe.execute()
+            
+            columns = [cls.CATEGORIES[c] for c in wanted]
+            counts = {c: 0 for c in wanted}
+            last_id = 0
+            
+            # Keyset pagination over the primary so the board matches committed state
+            while True:
+                async with DatabaseService.get_session() as session:
+                    stmt = select(Player.id, *columns).where(  # type: ignore
+                        Player.id > last_id  # type: ignore
+                    ).order_by(Player.id).limit(cls.REBUILD_BATCH_SIZE)  # type: ignore
+                    rows = (await session.execute(stmt)).all()
+                
+                if not rows:
+                    break
+                
+                pipe = client.pipeline(transaction=False)
+                for i, category in enumerate(wanted, start=1):
+                    pipe.zadd(temp_keys[category], {str(row[0]): int(row[i] or 0) for row in rows})
+                    counts[category] += len(rows)
+                pipe.expire(cls.TOUCHED_KEY, cls.TOUCHED_TTL)
+                await pipe.execute()
+                last_id = rows[-1][0]
+            
+            for category in wanted:
+                await client.eval(
+                    cls._SWAP_LUA, 4, temp_keys[category], cls.BOARD_KEY.format(category=category),
+                    cls.TOUCHED_KEY, cls.READY_KEY.format(category=category)
+                )
+            await client.unlink(cls.TOUCHED_KEY)
+            
+            logger.info(f"Rebuilt leaderboards from Postgres: {counts}")
+            return counts
+        return await cls._safe_execute(_operation, "rebuild leaderboards")
+    
+    @classmethod
+    async def ensure_built(cls) -> bool:
+        """Start a background rebuild if any board was never built (fresh or flushed Redis)"""
+        client = RedisService.get_client()
+        if not client:
+            return False
+        
+        if cls._rebuild_task is not None and not cls._rebuild_task.done():
+            return True
+        
+        try:
+            pipe = client.pipeline(transaction=False)
+            for category in cls.CATEGORIES:
+                pipe.exists(cls.READY_KEY.format(category=category))
+            missing = [c for c, ready in zip(cls.CATEGORIES, await pipe.execute()) if not ready]
+        except Exception as e:
+            logger.warning(f"Could not check leaderboard state: {e}")
+            return False
+        
+        if missing:
+            cls._rebuild_task = asyncio.create_task(cls.rebuild(missing))
+        return bool(missing)
@@ -68,20 +68,15 @@ class LeadershipService(BaseService):
             if cached.success and cached.data:
                 return cached.data
             
+            from src.services.player_context_service import PlayerContextService
+            
+            # Player and leader rows in one query; bonuses are cached by the load
             async with DatabaseService.get_session() as session:
-                stmt = select(Player).where(Player.id == player_id) # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                if not player.leader_esprit_stack_id:
-                    return {
-                        "has_leader": False, "bonuses": {}, "element": None,
-                        "description": "No leader Esprit set"
-                    }
-                
-                bonuses = await cls._calculate_leader_bonuses(player, session)
-                await CacheService.cache_leader_bonuses(player_id, bonuses)
-                
-                return {"has_leader": True, **bonuses}
+                context = await PlayerContextService.load(session, player_id=player_id)
+            if context is None:
+                raise ValueError(f"Player {player_id} not found")
+            
+            return {"has_leader": context.has_leader, **context.leader_bonuses}
         return await cls._safe_execute(_operation, "get leader bonuses")
     
     @classmethod
@@ -152,8 +147,11 @@ class LeadershipService(BaseService):
             }
         
         leader_esprit, leader_base = leader_result
-        
-        # Calculate element-based bonuses
+        return cls.leader_bonuses_for(leader_esprit, leader_base)
+    
+    @staticmethod
+    def leader_bonuses_for(leader_esprit: Esprit, leader_base: EspritBase) -> Dict[str, Any]:
+        """Bonuses for an already-loaded leader stack and its base (no I/O)"""
         element = Elements.from_string(leader_esprit.element)
         bonuses = {}
         
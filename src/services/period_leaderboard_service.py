@@ -0,0 +1,353 @@
+# src/services/period_leaderboard_service.py
+import asyncio
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.services.base_service import BaseService, ServiceResult
+from src.database.models.player import Player
+from src.database.models.leaderboard_snapshot import LeaderboardSnapshot
+from src.utils.database_service import DatabaseService
+from src.utils.redis_service import RedisService
+from src.utils.config_manager import ConfigManager
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class PeriodLeaderboardService(BaseService):
+    """Daily/weekly point leaderboards: one sorted set per window, settled into Postgres at rollover"""
+    
+    PERIODS = ("daily", "weekly")
+    
+    BOARD_KEY = "leaderboard:window:v1:{period}:{period_key}"
+    SETTLED_KEY = "leaderboard:window:settled:v1:{period}:{period_key}"
+    SETTLE_LOCK_KEY = "leaderboard:window:lock:v1:{period}:{period_key}"
+    SETTLE_LOCK_TTL = 300
+    
+    # Windows stay readable after rollover ("yesterday", "last week") until they expire
+    RETENTION_SECONDS = {"daily": 8 * 86400, "weekly": 5 * 7 * 86400}
+    # How many past windows each rollover pass checks, to catch up after downtime
+    LOOKBACK = {"daily": 7, "weekly": 4}
+    
+    _rollover_task: Optional[asyncio.Task] = None
+    
+    @classmethod
+    def _config(cls) -> Dict[str, Any]:
+        return (ConfigManager.get("global_config") or {}).get("ranked_periods", {})
+    
+    @classmethod
+    def _validate_period(cls, period: str) -> None:
+        if period not in cls.PERIODS:
+            raise ValueError(f"Invalid period. Must be one of: {list(cls.PERIODS)}")
+    
+    @staticmethod
+    def period_key(period: str, when: Optional[datetime] = None) -> str:
+        """UTC day ("2026-10-18") or ISO week ("2026-W42") containing `when`"""
+        when = when or datetime.utcnow()
+        if period == "weekly":
+            iso_year, iso_week, _ = when.isocalendar()
+            return f"{iso_year}-W{iso_week:02d}"
+        return when.date().isoformat()
+    
+    @classmethod
+    def past_period_keys(cls, period: str, count: int, when: Optional[datetime] = None) -> List[str]:
+        """Keys of the `count` windows before the current one, most recent first"""
+        when = when or datetime.utcnow()
+        step = timedelta(days=7 if period == "weekly" else 1)
+        return [cls.period_key(period, when - step * i) for i in range(1, count + 1)]
+    
+    # --- SCORING ---
+    
+    @classmethod
+    async def add_points(cls, player_id: int, source: str, times: int = 1) -> ServiceResult[int]:
+        """ZINCRBY the player in every current window; called right after the earning commit"""
+        config = cls._config()
+        points = int(config.get("point_sources", {}).get(source, 0)) * times
+        if points <= 0 or not config.get("enabled", True) or not RedisService.is_available():
+            return ServiceResult.success_result(0)
+        
+        try:
+            client = RedisService.get_client()
+            if not client:
+                return ServiceResult.success_result(0)
+            
+            pipe = client.pipeline(transaction=True)
+            for period in cls.PERIODS:
+                key = cls.BOARD_KEY.format(period=period, period_key=cls.period_key(period))
+                pipe.zincrby(key, points, str(player_id))
+                pipe.expire(key, cls.RETENTION_SECONDS[period])
+            await pipe.execute()
+            return ServiceResult.success_result(points)
+        
+        except Exception as e:
+            logger.warning(f"Failed to add {points} {source} points for player {player_id}: {e}")
+            return ServiceResult.success_result(0)
+    
+    # --- READS ---
+    
+    @classmethod
+    async def get_page(cls, period: str, limit: int = 10, offset: int = 0,
+                       period_key: Optional[str] = None) -> ServiceResult[List[Dict[str, Any]]]:
+        """One page of a window's standings"""
+        async def _operation():
+            cls._validate_period(period)
+            cls._validate_positive_int(limit, "limit")
+            cls._validate_non_negative_int(offset, "offset")
+            
+            client = RedisService.get_client()
+            if not client:
+                raise ValueError("Leaderboards are temporarily unavailable")
+            
+            key = period_key or cls.period_key(period)
+            rows = await client.zrevrange(
+                cls.BOARD_KEY.format(period=period, period_key=key), offset, offset + limit - 1, withscores=True
+            )
+            if not rows:
+                return []
+            
+            player_ids = [int(member) for member, _ in rows]
+            async with DatabaseService.get_read_session() as session:
+                stmt = select(Player.id, Player.discord_id, Player.username, Player.level).where(  # type: ignore
+                    Player.id.in_(player_ids)  # type: ignore
+                )
+                profiles = {row[0]: row for row in (await session.execute(stmt)).all()}
+            
+            return [
+                {
+                    "rank": rank,
+                    "player_id": player_id,
+                    "discord_id": profiles[player_id][1],
+                    "username": profiles[player_id][2],
+                    "level": profiles[player_id][3],
+                    "points": int(score)
+                }
+                for rank, (player_id, (_, score)) in enumerate(zip(player_ids, rows), start=offset + 1)
+                if player_id in profiles
+            ]
+        return await cls._safe_execute(_operation, "get period leaderboard")
+    
+    @classmethod
+    async def get_rank(cls, player_id: int, period: str,
+                       period_key: Optional[str] = None) -> ServiceResult[Optional[Dict[str, int]]]:
+        """Player's 1-based rank and points in a window, or None if unranked"""
+        async def _operation():
+            cls._validate_player_id(player_id)
+            cls._validate_period(period)
+            
+            client = RedisService.get_client()
+            if not client:
+                return None
+            
+            key = cls.BOARD_KEY.format(period=period, period_key=period_key or cls.period_key(period))
+            pipe = client.pipeline(transaction=False)
+            pipe.zrevrank(key, str(player_id))
+            pipe.zscore(key, str(player_id))
+            pipe.zcard(key)
+            rank, score, size = await pipe.execute()
+            if rank is None:
+                return None
+            return {"rank": rank + 1, "points": int(score), "ranked_players": size}
+        return await cls._safe_execute(_operation, "get period rank")
+    
+    # --- SETTLEMENT ---
+    
+    @classmethod
+    def payout_brackets(cls, period: str) -> List[Tuple[int, int, int]]:
+        """(first_rank, last_rank, erythl) from economy.erythl_sources "{period}_rank_*" entries"""
+        sources = (ConfigManager.get("global_config") or {}).get("economy", {}).get("erythl_sources", {})
+        pattern = re.compile(rf"^{period}_rank_(\d+)(?:_(\d+))?$")
+        
+        brackets = []
+        for name, amount in sources.items():
+            match = pattern.match(name)
+            if match and amount > 0:
+                first = int(match.group(1))
+                brackets.append((first, int(match.group(2) or first), int(amount)))
+        return sorted(brackets)
+    
+    @classmethod
+    def compute_payouts(cls, period: str, ranked_count: int) -> Dict[int, int]:
+        """rank -> erythl for the first `ranked_count` ranks"""
+        payouts = {}
+        for first, last, amount in cls.payout_brackets(period):
+            for rank in range(first, min(last, ranked_count) + 1):
+                payouts[rank] = amount
+        return payouts
+    
+    @classmethod
+    async def settle(cls, period: str, period_key: str) -> ServiceResult[Dict[str, Any]]:
+        """Snapshot a closed window's top N to Postgres and pay its brackets in one batch"""
+        async def _operation():
+            cls._validate_period(period)
+            if period_key >= cls.period_key(period):
+                raise ValueError(f"{period} window {period_key} has not closed yet")
+            
+            client = RedisService.get_client()
+            if not client:
+                raise ValueError("Redis is not available")
+            
+            settled_key = cls.SETTLED_KEY.format(period=period, period_key=period_key)
+            if await client.exists(settled_key):
+                return {"status": "already_settled", "period": period, "period_key": period_key}
+            
+            # One shard settles; the others skip until the lock expires
+            lock_key = cls.SETTLE_LOCK_KEY.format(period=period, period_key=period_key)
+            if not await client.set(lock_key, "1", nx=True, ex=cls.SETTLE_LOCK_TTL):
+                return {"status": "in_progress", "period": period, "period_key": period_key}
+            
+            try:
+                snapshotted = await cls._write_snapshot(client, period, period_key)
+                paid_players, paid_erythl = await cls._pay_pending(period, period_key)
+                
+                await client.set(settled_key, "1", ex=cls.RETENTION_SECONDS[period])
+                logger.info(
+                    f"Settled {period} leaderboard {period_key}: {snapshotted} ranked, "
+                    f"{paid_players} paid {paid_erythl} erythl"
+                )
+                return {
+                    "status": "settled", "period": period, "period_key": period_key,
+                    "ranked": snapshotted, "paid_players": paid_players, "paid_erythl": paid_erythl
+                }
+            finally:
+                await client.delete(lock_key)
+        return await cls._safe_execute(_operation, "settle period leaderboard")
+    
+    @classmethod
+    async def _write_snapshot(cls, client, period: str, period_key: str) -> int:
+        """Insert the top N standings once; a re-run after a partial settlement inserts nothing"""
+        snapshot_size = int(cls._config().get("snapshot_size", 1000))
+        rows = await client.zrevrange(
+            cls.BOARD_KEY.format(period=period, period_key=period_key), 0, snapshot_size - 1, withscores=True
+        )
+        if not rows:
+            return 0
+        
+        standings = [(int(member), int(score)) for member, score in rows]
+        
+        async with DatabaseService.get_transaction() as session:
+            # Deleted players keep their rank in the snapshot but get no payout
+            existing_stmt = select(Player.id).where(Player.id.in_([pid for pid, _ in standings]))  # type: ignore
+            existing = {row[0] for row in (await session.execute(existing_stmt)).all()}
+            payouts = cls.compute_payouts(period, len(standings))
+            
+            now = datetime.utcnow()
+            values = [
+                {
+                    "period": period, "period_key": period_key, "rank": rank,
+                    "player_id": player_id, "score": score,
+                    "payout_erythl": payouts.get(rank, 0) if player_id in existing else 0,
+                    "created_at": now
+                }
+                for rank, (player_id, score) in enumerate(standings, start=1)
+            ]
+            stmt = pg_insert(LeaderboardSnapshot).values(values).on_conflict_do_nothing(
+                constraint="uq_leaderboard_snapshot_player"
+            )
+            await session.execute(stmt)
+            await session.commit()
+        
+        return len(values)
+    
+    @classmethod
+    async def _pay_pending(cls, period: str, period_key: str) -> Tuple[int, int]:
+        """Claim every unpaid bracket row of a window and credit it in the same transaction"""
+        from src.services.cache_service import CacheService
+        from src.services.currency_service import CurrencyService
+        from src.services.leaderboard_service import LeaderboardService
+        
+        async with DatabaseService.get_transaction() as session:
+            # Stamping paid_at is the claim: a concurrent pass finds no rows, and a failed credit rolls it back
+            stmt = (
+                update(LeaderboardSnapshot)
+                .where(
+                    LeaderboardSnapshot.period == period,  # type: ignore
+                    LeaderboardSnapshot.period_key == period_key,  # type: ignore
+                    LeaderboardSnapshot.payout_erythl > 0,  # type: ignore
+                    LeaderboardSnapshot.paid_at.is_(None)  # type: ignore
+                )
+                .values(paid_at=func.now())
+                .returning(LeaderboardSnapshot.player_id, LeaderboardSnapshot.rank, LeaderboardSnapshot.payout_erythl)  # type: ignore
+            )
+            claimed = sorted((await session.execute(stmt)).all(), key=lambda row: row[1])
+            if not claimed:
+                return 0, 0
+            
+            operations = [
+                {
+                    "player_id": player_id,
+                    "currency": "erythl",
+                    "amount": payout,
+                    "reason": f"{period.title()} leaderboard rank #{rank} ({period_key})"
+                }
+                for player_id, rank, payout in claimed
+            ]
+            _, touched_players = await CurrencyService.apply_operations(session, operations)
+            await session.commit()
+        
+        for player in touched_players:
+            await CacheService.invalidate_player_cache(player.id)
+        await LeaderboardService.record(*touched_players)
+        
+        return len(claimed), sum(payout for _, _, payout in claimed)
+    
+    # --- ROLLOVER ---
+    
+    @classmethod
+    async def run_rollover(cls) -> List[Dict[str, Any]]:
+        """Settle every recently closed window that isn't settled yet"""
+        client = RedisService.get_client()
+        if not client:
+            return []
+        
+        pending: List[Tuple[str, str]] = []
+        pipe = client.pipeline(transaction=False)
+        for period in cls.PERIODS:
+            for period_key in cls.past_period_keys(period, cls.LOOKBACK[period]):
+                pending.append((period, period_key))
+                pipe.exists(cls.SETTLED_KEY.format(period=period, period_key=period_key))
+        settled_flags = await pipe.execute()
+        
+        results = []
+        # Oldest first so payouts land in window order after downtime
+        for (period, period_key), settled in reversed(list(zip(pending, settled_flags))):
+            if settled:
+                continue
+            result = await cls.settle(period, period_key)
+            if result.success:
+                results.append(result.data)
+            else:
+                logger.error(f"Rollover of {period} {period_key} failed: {result.error}")
+        return results
+    
+    @classmethod
+    async def _rollover_loop(cls) -> None:
+        interval = int(cls._config().get("rollover_check_seconds", 60))
+        while True:
+            try:
+                await cls.run_rollover()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Leaderboard rollover pass failed: {e}", exc_info=True)
+            await asyncio.sleep(interval)
+    
+    @classmethod
+    def start_rollover_loop(cls) -> bool:
+        """Start the background settlement task once per process"""
+        if not cls._config().get("enabled", True):
+            return False
+        if cls._rollover_task is None or cls._rollover_task.done():
+            cls._rollover_task = asyncio.create_task(cls._rollover_loop())
+        return True
+    
+    @classmethod
+    async def stop_rollover_loop(cls) -> None:
+        if cls._rollover_task is not None:
+            cls._rollover_task.cancel()
+            try:
+                await cls._rollover_task
+            except asyncio.CancelledError:
+                pass
+            cls._rollover_task = None
@@ -0,0 +1,125 @@
+# src/services/player_context_service.py
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.services.base_service import BaseService, ServiceResult
+from src.services.cache_service import CacheService
+from src.services.leadership_service import LeadershipService
+from src.services.player_class_service import PlayerClassService
+from src.database.models.player import Player
+from src.database.models.player_class import PlayerClass
+from src.database.models.esprit import Esprit
+from src.database.models.esprit_base import EspritBase
+from src.utils.database_service import DatabaseService
+
+_NO_LEADER = {"bonuses": {}, "element": None, "description": "No leader Esprit set"}
+
+@dataclass(frozen=True)
+class PlayerContext:
+    """Everything a command usually needs about a player, loaded together"""
+    player: Player
+    leader_esprit: Optional[Esprit]
+    leader_base: Optional[EspritBase]
+    player_class: Optional[PlayerClass]
+    leader_bonuses: Mapping[str, Any]
+    class_bonuses: Mapping[str, float]
+    cached_power: Optional[Mapping[str, Any]]
+    
+    @property
+    def player_id(self) -> int:
+        return self.player.id  # type: ignore
+    
+    @property
+    def has_leader(self) -> bool:
+        return self.leader_esprit is not None
+    
+    @property
+    def power(self) -> Dict[str, int]:
+        """atk/def/hp from the power cache, else the totals stored on the player row"""
+        if self.cached_power:
+            # EspritService caches a breakdown, PowerService the bare totals
+            totals = self.cached_power.get("total_power", self.cached_power)
+            if all(stat in totals for stat in ("atk", "def", "hp")):
+                return {"atk": totals["atk"], "def": totals["def"], "hp": totals["hp"]}
+        return {
+            "atk": self.player.total_attack_power,
+            "def": self.player.total_defense_power,
+            "hp": self.player.total_hp
+        }
+
+class PlayerContextService(BaseService):
+    """One joined query plus one MGET instead of a session per lookup"""
+    
+    @classmethod
+    async def load(
+        cls,
+        session: AsyncSession,
+        *,
+        player_id: Optional[int] = None,
+        discord_id: Optional[int] = None,
+        for_update: bool = False
+    ) -> Optional[PlayerContext]:
+        """
+        Player, leader stack + base and class row in one round trip on `session`,
+        then cached power and leader bonuses in one MGET. With for_update only the
+        player row is locked and stays attached to `session` for writes.
+        """
+        if (player_id is None) == (discord_id is None):
+            raise ValueError("Pass exactly one of player_id or discord_id")
+        
+        stmt = (
+            select(Player, Esprit, EspritBase, PlayerClass)
+            .outerjoin(Esprit, Esprit.id == Player.leader_esprit_stack_id)  # type: ignore
+            .outerjoin(EspritBase, EspritBase.id == Esprit.esprit_base_id)  # type: ignore
+            .outerjoin(PlayerClass, PlayerClass.player_id == Player.id)  # type: ignore
+        )
+        if player_id is not None:
+            stmt = stmt.where(Player.id == player_id)  # type: ignore
+        else:
+            stmt = stmt.where(Player.discord_id == discord_id)  # type: ignore
+        if for_update:
+            # Postgres refuses FOR UPDATE on the nullable side of an outer join
+            stmt = stmt.with_for_update(of=Player)  # type: ignore
+        
+        row = (await session.execute(stmt)).first()
+        if row is None:
+            return None
+        player, leader_esprit, leader_base, player_class = row
+        
+        power_key = CacheService.PLAYER_POWER_KEY.format(player_id=player.id)
+        leader_key = CacheService.LEADER_BONUSES_KEY.format(player_id=player.id)
+        cached = (await CacheService.get_many([power_key, leader_key])).data or {}
+        
+        leader_bonuses = cached.get(leader_key)
+        if not leader_bonuses:
+            if leader_esprit is not None and leader_base is not None:
+                leader_bonuses = LeadershipService.leader_bonuses_for(leader_esprit, leader_base)
+                await CacheService.cache_leader_bonuses(player.id, leader_bonuses)
+            else:
+                leader_bonuses = _NO_LEADER
+        
+        cached_power = cached.get(power_key)
+        return PlayerContext(
+            player=player,
+            leader_esprit=leader_esprit,
+            leader_base=leader_base,
+            player_class=player_class,
+            leader_bonuses=MappingProxyType(dict(leader_bonuses)),
+            class_bonuses=MappingProxyType(PlayerClassService._calculate_class_bonuses(player.level, player_class)),
+            cached_power=MappingProxyType(dict(cached_power)) if cached_power else None
+        )
+    
+    @classmethod
+    async def get_player_context(
+        cls,
+        player_id: Optional[int] = None,
+        discord_id: Optional[int] = None
+    ) -> ServiceResult[Optional[PlayerContext]]:
+        """Detached snapshot; the primary is used because a miss writes leader bonuses back to the cache"""
+        async def _operation():
+            async with DatabaseService.get_session() as session:
+                return await cls.load(session, player_id=player_id, discord_id=discord_id)
+        return await cls._safe_execute(_operation, "load player context")
@@ -6,6 +6,7 @@ from datetime import date, datetime, timedelta
 
 from src.services.base_service import BaseService, ServiceResult
 from src.database.models.player import Player
+from src.services.player_context_service import PlayerContextService
 from src.utils.database_service import DatabaseService
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.config_manager import ConfigManager
@@ -199,8 +200,10 @@ class PlayerService(BaseService):
         """
         async def _operation():
             async with DatabaseService.get_session() as session:
-                stmt = select(Player).where(Player.id == player_id) # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
+                context = await PlayerContextService.load(session, player_id=player_id)
+                if context is None:
+                    raise ValueError(f"Player {player_id} not found")
+                player = context.player
                 
                 if player.energy >= player.max_energy:
                     return ResourceRegenerationResult(
@@ -221,7 +224,7 @@ class PlayerService(BaseService):
                 
                 if apply_bonuses:
                     # Apply leader bonuses
-                    leader_bonuses = await player.get_leader_bonuses(session)
+                    leader_bonuses = context.leader_bonuses
                     energy_regen_bonus = leader_bonuses.get("bonuses", {}).get("energy_regen_bonus", 0)
                     if energy_regen_bonus > 0:
                         bonuses_applied["leader_energy_regen"] = energy_regen_bonus
@@ -285,8 +288,10 @@ class PlayerService(BaseService):
         """
         async def _operation():
             async with DatabaseService.get_session() as session:
-                stmt = select(Player).where(Player.id == player_id) # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
+                context = await PlayerContextService.load(session, player_id=player_id)
+                if context is None:
+                    raise ValueError(f"Player {player_id} not found")
+                player = context.player
                 
                 if player.stamina >= player.max_stamina:
                     return ResourceRegenerationResult(
@@ -307,7 +312,7 @@ class PlayerService(BaseService):
                 
                 if apply_bonuses:
                     # Apply leader bonuses
-                    leader_bonuses = await player.get_leader_bonuses(session)
+                    leader_bonuses = context.leader_bonuses
                     stamina_regen_bonus = leader_bonuses.get("bonuses", {}).get("stamina_regen_bonus", 0)
                     if stamina_regen_bonus > 0:
                         bonuses_applied["leader_stamina_regen"] = stamina_regen_bonus
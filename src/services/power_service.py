@@ -1,107 +1,244 @@
 # src/services/power_service.py
-from typing import Dict, Any
-from sqlalchemy import select
+import asyncio
+from typing import Dict, Any, Iterable, List, Optional
+from sqlalchemy import select, update, func, text
 
 from src.services.base_service import BaseService, ServiceResult
-from src.services.cache_service import CacheService
+from src.services.leaderboard_service import LeaderboardService
 from src.database.models.player import Player
 from src.database.models.esprit import Esprit
 from src.database.models.esprit_base import EspritBase
 from src.utils.database_service import DatabaseService
+from src.utils.config_manager import ConfigManager
+from src.utils.power_columns import summarize_collection
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+POWER_STATS = ("atk", "def", "hp")
 
 class PowerService(BaseService):
-    """Combat power calculation and analysis"""
+    """
+    Combat power calculation and analysis.
+
+    player.total_attack_power / total_defense_power / total_hp hold the raw
+    collection sums (before skill bonuses). Every change to a stack applies
+    its +/- delta to them in the same transaction, so reading power never
+    scans a collection; the verifier recomputes a sample to catch drift.
+    """
+    
+    # pg_advisory_xact_lock key: one verifier pass at a time across shards
+    VERIFY_LOCK_ID = 0x5245_5645_0003
+    
+    _verify_task: Optional[asyncio.Task] = None
+    
+    @classmethod
+    def _config(cls) -> Dict[str, Any]:
+        return (ConfigManager.get("global_config") or {}).get("power_verifier", {})
+    
+    # --- deltas ---
+    
+    @staticmethod
+    def stack_delta(base: EspritBase, awakening_level: int, quantity: int) -> Dict[str, int]:
+        """Power `quantity` copies at `awakening_level` add to the totals (negative to remove)"""
+        one = Esprit.calculate_power(base.base_atk, base.base_def, base.base_hp, awakening_level)
+        return {stat: one[stat] * quantity for stat in POWER_STATS}
+    
+    @staticmethod
+    def combine(deltas: Iterable[Dict[str, int]]) -> Dict[str, int]:
+        total = {stat: 0 for stat in POWER_STATS}
+        for delta in deltas:
+            for stat in POWER_STATS:
+                total[stat] += delta.get(stat, 0)
+        return total
+    
+    @classmethod
+    async def apply_power_delta(cls, session, player_id: int, delta: Dict[str, int]) -> Optional[Player]:
+        """
+        Add a delta to the stored totals inside the caller's transaction (no commit).
+        Returns the refreshed player (None for an empty delta); callers pass it to
+        LeaderboardService.record after committing.
+        """
+        if not any(delta.get(stat, 0) for stat in POWER_STATS):
+            return None
+        result = await session.execute(
+            update(Player).where(Player.id == player_id).values(  # type: ignore
+                total_attack_power=Player.total_attack_power + delta.get("atk", 0),
+                total_defense_power=Player.total_defense_power + delta.get("def", 0),
+                total_hp=Player.total_hp + delta.get("hp", 0)
+            ).returning(Player)
+        )
+        return result.scalar_one_or_none()
+    
+    @staticmethod
+    def total_power(player: Player) -> Dict[str, int]:
+        """Combat totals with skill bonuses, straight from the maintained columns"""
+        skill_bonuses = player.get_skill_bonuses()
+        return {
+            "atk": int(player.total_attack_power * (1 + skill_bonuses["bonus_attack_percent"])),
+            "def": int(player.total_defense_power * (1 + skill_bonuses["bonus_defense_percent"])),
+            "hp": player.total_hp
+        }
+    
+    # --- full recomputation (repair / verification only) ---
+    
+    @classmethod
+    async def _collection_totals(cls, session, player_ids: List[int]) -> Dict[int, Dict[str, int]]:
+        """Raw power sums per owner, recomputed from every stack"""
+        stmt = select(
+            Esprit.owner_id, Esprit.quantity, Esprit.awakening_level,  # type: ignore
+            EspritBase.base_atk, EspritBase.base_def, EspritBase.base_hp  # type: ignore
+        ).join(EspritBase, Esprit.esprit_base_id == EspritBase.id).where(Esprit.owner_id.in_(player_ids))  # type: ignore
+        
+        totals = {player_id: {stat: 0 for stat in POWER_STATS} for player_id in player_ids}
+        for owner_id, quantity, awakening_level, base_atk, base_def, base_hp in (await session.execute(stmt)).all():
+            one = Esprit.calculate_power(base_atk, base_def, base_hp, awakening_level)
+            for stat in POWER_STATS:
+                totals[owner_id][stat] += one[stat] * quantity
+        return totals
+    
+    @staticmethod
+    def _stored_totals(player: Player) -> Dict[str, int]:
+        return {"atk": player.total_attack_power, "def": player.total_defense_power, "hp": player.total_hp}
+    
+    @staticmethod
+    def _store_totals(player: Player, totals: Dict[str, int]) -> None:
+        player.total_attack_power = totals["atk"]
+        player.total_defense_power = totals["def"]
+        player.total_hp = totals["hp"]
     
     @classmethod
     async def recalculate_total_power(cls, player_id: int) -> ServiceResult[Dict[str, int]]:
+        """Rebuild one player's stored totals from a full collection scan"""
         async def _operation():
-            cached = await CacheService.get_cached_player_power(player_id)
-            if cached.success and cached.data:
-                return cached.data
-            
             async with DatabaseService.get_transaction() as session:
                 player_stmt = select(Player).where(Player.id == player_id).with_for_update() # type: ignore
                 player = (await session.execute(player_stmt)).scalar_one()
                 
-                power_data = await player.recalculate_total_power(session)
-                
-                player.total_attack_power = power_data["atk"]
-                player.total_defense_power = power_data["def"]
-                player.total_hp = power_data["hp"]
+                totals = (await cls._collection_totals(session, [player_id]))[player_id]
+                cls._store_totals(player, totals)
                 player.update_activity()
                 await session.commit()
+                await LeaderboardService.record(player)
                 
-                await CacheService.cache_player_power(player_id, power_data)
-                return power_data
+                return totals
         return await cls._safe_execute(_operation, "recalculate total power")
     
     @classmethod
-    async def get_power_breakdown(cls, player_id: int) -> ServiceResult[Dict[str, Any]]:
+    async def verify_power_totals(cls, sample_size: Optional[int] = None, repair: Optional[bool] = None,
+                                  player_ids: Optional[List[int]] = None) -> ServiceResult[Dict[str, Any]]:
+        """Recompute a random sample (or the given players) and report, optionally fix, drift from the stored totals"""
         async def _operation():
-            async with DatabaseService.get_session() as session:
-                player_stmt = select(Player).where(Player.id == player_id) # type: ignore
-                player = (await session.execute(player_stmt)).scalar_one()
-                
-                esprits_stmt = select(Esprit, EspritBase).where(
-                    Esprit.owner_id == player_id, # type: ignore
-                    Esprit.esprit_base_id == EspritBase.id # type: ignore
-                )
-                esprit_results = (await session.execute(esprits_stmt)).all()
-                
-                power_by_element = {}
-                power_by_tier = {}
-                total_base_power = {"atk": 0, "def": 0, "hp": 0}
-                esprit_contributions = []
+            config = cls._config()
+            size = sample_size or int(config.get("sample_size", 200))
+            fix = bool(config.get("repair", False)) if repair is None else repair
+            cls._validate_positive_int(size, "sample_size")
+            
+            async with DatabaseService.get_transaction() as session:
+                await session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": cls.VERIFY_LOCK_ID})
                 
-                for esprit, base in esprit_results:
-                    individual_power = esprit.get_individual_power(base)
-                    stack_power = esprit.get_stack_total_power(base)
-                    
-                    element = esprit.element
-                    if element not in power_by_element:
-                        power_by_element[element] = {"atk": 0, "def": 0, "hp": 0, "count": 0}
-                    
-                    power_by_element[element]["atk"] += stack_power["atk"]
-                    power_by_element[element]["def"] += stack_power["def"]
-                    power_by_element[element]["hp"] += stack_power["hp"]
-                    power_by_element[element]["count"] += esprit.quantity
-                    
-                    tier = esprit.tier
-                    if tier not in power_by_tier:
-                        power_by_tier[tier] = {"atk": 0, "def": 0, "hp": 0, "count": 0}
-                    
-                    power_by_tier[tier]["atk"] += stack_power["atk"]
-                    power_by_tier[tier]["def"] += stack_power["def"]
-                    power_by_tier[tier]["hp"] += stack_power["hp"]
-                    power_by_tier[tier]["count"] += esprit.quantity
-                    
-                    total_base_power["atk"] += stack_power["atk"]
-                    total_base_power["def"] += stack_power["def"]
-                    total_base_power["hp"] += stack_power["hp"]
-                    
-                    esprit_contributions.append({
-                        "name": base.name, "element": esprit.element, "tier": esprit.tier,
-                        "awakening": esprit.awakening_level, "quantity": esprit.quantity,
-                        "individual_power": individual_power, "stack_power": stack_power,
-                        "efficiency": (individual_power["atk"] + individual_power["def"] + individual_power["hp"]) / max(esprit.tier, 1)
-                    })
+                sample_ids = player_ids or (await session.execute(
+                    select(Player.id).order_by(func.random()).limit(size)  # type: ignore
+                )).scalars().all()
+                if not sample_ids:
+                    return {"checked": 0, "drifted": 0, "repaired": 0, "max_drift": 0, "players": []}
                 
-                skill_bonuses = player.get_skill_bonuses()
-                final_power = {
-                    "atk": int(total_base_power["atk"] * (1 + skill_bonuses["bonus_attack_percent"])),
-                    "def": int(total_base_power["def"] * (1 + skill_bonuses["bonus_defense_percent"])),
-                    "hp": total_base_power["hp"]
-                }
+                # Row locks make every pending delta for these players land before or after this read
+                players = (await session.execute(
+                    select(Player).where(Player.id.in_(sample_ids)).order_by(Player.id).with_for_update()  # type: ignore
+                )).scalars().all()
+                totals = await cls._collection_totals(session, [player.id for player in players])
                 
-                esprit_contributions.sort(key=lambda x: sum(x["stack_power"].values()), reverse=True)
+                drifted, repaired = [], []
+                for player in players:
+                    stored = cls._stored_totals(player)
+                    expected = totals[player.id]
+                    if stored != expected:
+                        drifted.append({
+                            "player_id": player.id, "stored": stored, "expected": expected,
+                            "drift": {stat: stored[stat] - expected[stat] for stat in POWER_STATS}
+                        })
+                        if fix:
+                            cls._store_totals(player, expected)
+                            repaired.append(player)
                 
-                return {
-                    "total_power": final_power, "base_power": total_base_power,
-                    "skill_bonuses": skill_bonuses, "power_by_element": power_by_element,
-                    "power_by_tier": power_by_tier, "top_contributors": esprit_contributions[:10],
-                    "total_esprits": len(esprit_contributions),
-                    "total_quantity": sum(c["quantity"] for c in esprit_contributions),
-                    "average_tier": round(sum(c["tier"] * c["quantity"] for c in esprit_contributions) / 
-                                        max(sum(c["quantity"] for c in esprit_contributions), 1), 2)
-                }
-        return await cls._safe_execute(_operation, "get power breakdown")
\ No newline at end of file
+                await session.commit()
+            
+            for player in repaired:
+                await LeaderboardService.record(player)
+            
+            max_drift = max((abs(value) for entry in drifted for value in entry["drift"].values()), default=0)
+            if drifted:
+                logger.warning(
+                    f"Power drift in {len(drifted)}/{len(players)} sampled players "
+                    f"(max {max_drift}){', repaired' if fix else ''}: {[entry['player_id'] for entry in drifted[:20]]}"
+                )
+            return {
+                "checked": len(players), "drifted": len(drifted), "repaired": len(repaired),
+                "max_drift": max_drift, "players": drifted
+            }
+        return await cls._safe_execute(_operation, "verify power totals")
+    
+    # --- breakdowns ---
+    
+    @staticmethod
+    def stack_rows_statement(player_id: int):
+        """Plain (base_atk, base_def, base_hp, awakening_level, quantity, element, tier, name) rows"""
+        return select(
+            EspritBase.base_atk, EspritBase.base_def, EspritBase.base_hp,  # type: ignore
+            Esprit.awakening_level, Esprit.quantity, Esprit.element, Esprit.tier, EspritBase.name  # type: ignore
+        ).join(EspritBase, Esprit.esprit_base_id == EspritBase.id).where(Esprit.owner_id == player_id)  # type: ignore
+    
+    @staticmethod
+    def build_breakdown(player: Player, rows) -> Dict[str, Any]:
+        """Columnar summary of the stack rows plus skill-adjusted totals"""
+        summary = summarize_collection(rows)
+        skill_bonuses = player.get_skill_bonuses()
+        base_power = summary.pop("base_power")
+        return {
+            "total_power": {
+                "atk": int(base_power["atk"] * (1 + skill_bonuses["bonus_attack_percent"])),
+                "def": int(base_power["def"] * (1 + skill_bonuses["bonus_defense_percent"])),
+                "hp": base_power["hp"]
+            },
+            "base_power": base_power,
+            "skill_bonuses": skill_bonuses,
+            **summary
+        }
+    
+    @classmethod
+    async def get_power_breakdown(cls, player_id: int) -> ServiceResult[Dict[str, Any]]:
+        async def _operation():
+            async with DatabaseService.get_read_session() as session:
+                player_stmt = select(Player).where(Player.id == player_id) # type: ignore
+                player = (await session.execute(player_stmt)).scalar_one()
+                rows = (await session.execute(cls.stack_rows_statement(player_id))).all()
+            
+            return cls.build_breakdown(player, rows)
+        return await cls._safe_execute(_operation, "get power breakdown")
+    
+    @classmethod
+    async def _verify_loop(cls) -> None:
+        interval = int(cls._config().get("interval_seconds", 3600))
+        while True:
+            await asyncio.sleep(interval)
+            await cls.verify_power_totals()
+    
+    @classmethod
+    def start_verifier_loop(cls) -> bool:
+        """Start the periodic drift check once per process"""
+        if not cls._config().get("enabled", True):
+            return False
+        if cls._verify_task is None or cls._verify_task.done():
+            cls._verify_task = asyncio.create_task(cls._verify_loop())
+        return True
+    
+    @classmethod
+    async def stop_verifier_loop(cls) -> None:
+        if cls._verify_task is not None:
+            cls._verify_task.cancel()
+            try:
+                await cls._verify_task
+            except asyncio.CancelledError:
+                pass
+            cls._verify_task = None
@@ -5,6 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.orm.attributes import flag_modified
 
 from src.services.base_service import BaseService, ServiceResult
+from src.services.period_leaderboard_service import PeriodLeaderboardService
 from src.database.models.player import Player
 from src.utils.database_service import DatabaseService
 from src.utils.transaction_logger import transaction_logger, TransactionType
@@ -81,6 +82,8 @@ class ProgressionService(BaseService):
                     }
                 )
 
+                await PeriodLeaderboardService.add_points(player_id, "quest_completed")
+
                 return {
                     "revies_gained": revies, "erythl_gained": erythl, "xp_gained": xp,
                     "levels_gained": levels_gained, "new_level": player.level,
@@ -6,6 +6,7 @@ import random
 
 from src.services.base_service import BaseService, ServiceResult
 from src.database.models.player import Player
+from src.services.player_context_service import PlayerContextService
 from src.utils.database_service import DatabaseService
 from src.utils.game_constants import GameConstants
 from src.utils.config_manager import ConfigManager
@@ -72,35 +73,37 @@ class QuestService(BaseService):
             if apply_bonuses:
                 # Get player and apply bonuses
                 async with DatabaseService.get_session() as session:
-                    stmt = select(Player).where(Player.id == player_id) # type: ignore
-                    player = (await session.execute(stmt)).scalar_one()
-                    
-                    # Apply leader bonuses
-                    leader_bonuses = await player.get_leader_bonuses(session)
-                    element_bonuses = leader_bonuses.get("bonuses", {})
-                    
-                    capture_bonus = element_bonuses.get("capture_bonus", 0)
-                    if capture_bonus > 0:
-                        bonuses_applied["leader_capture_bonus"] = capture_bonus
-                        final_chance *= (1 + capture_bonus)
-                    
-                    # Apply element affinity bonus
-                    area_element = area_data.get("element_affinity")
-                    leader_element = leader_bonuses.get("element")
-                    if area_element and leader_element and area_element.lower() == leader_element.lower():
-                        element_affinity_bonus = 0.2  # 20% bonus for matching element
-                        bonuses_applied["element_affinity"] = element_affinity_bonus
-                        final_chance *= (1 + element_affinity_bonus)
-                    
-                    # Apply level-based bonus (higher level = slightly better capture)
-                    level_bonus = min(player.level * 0.001, 0.1)  # Max 10% bonus at level 100
-                    if level_bonus > 0:
-                        bonuses_applied["level_bonus"] = level_bonus
-                        final_chance *= (1 + level_bonus)
-                    
-                    # Apply skill-based bonuses (if any skills affect capture in the future)
-                    skill_bonuses = player.get_skill_bonuses()
-                    # Placeholder for potential capture-affecting skills
+                    context = await PlayerContextService.load(session, player_id=player_id)
+                if context is None:
+                    raise ValueError(f"Player {player_id} not found")
+                player = context.player
+                
+                # Apply leader bonuses
+                leader_bonuses = context.leader_bonuses
+                element_bonuses = leader_bonuses.get("bonuses", {})
+                
+                capture_bonus = element_bonuses.get("capture_bonus", 0)
+                if capture_bonus > 0:
+                    bonuses_applied["leader_capture_bonus"] = capture_bonus
+                    final_chance *= (1 + capture_bonus)
+                
+                # Apply element affinity bonus
+                area_element = area_data.get("element_affinity")
+                leader_element = leader_bonuses.get("element")
+                if area_element and leader_element and area_element.lower() == leader_element.lower():
+                    element_affinity_bonus = 0.2  # 20% bonus for matching element
+                    bonuses_applied["element_affinity"] = element_affinity_bonus
+                    final_chance *= (1 + element_affinity_bonus)
+                
+                # Apply level-based bonus (higher level = slightly better capture)
+                level_bonus = min(player.level * 0.001, 0.1)  # Max 10% bonus at level 100
+                if level_bonus > 0:
+                    bonuses_applied["level_bonus"] = level_bonus
+                    final_chance *= (1 + level_bonus)
+                
+                # Apply skill-based bonuses (if any skills affect capture in the future)
+                skill_bonuses = player.get_skill_bonuses()
+                # Placeholder for potential capture-affecting skills
             
             # Cap the final chance (never 100% unless guaranteed)
             final_chance = min(final_chance, 0.95)
@@ -5,7 +5,10 @@ from datetime import datetime, timedelta
 from sqlalchemy import select, func, desc, asc
 
 from src.services.base_service import BaseService, ServiceResult
+from src.services.analytics_service import AnalyticsService
 from src.services.cache_service import CacheService
+from src.services.leaderboard_service import LeaderboardService
+from src.services.period_leaderboard_service import PeriodLeaderboardService
 from src.utils.database_service import DatabaseService
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.config_manager import ConfigManager
@@ -35,68 +38,103 @@ class PlayerStats:
 class StatisticsService(BaseService):
     """Player statistics, analytics, metrics, and behavioral tracking service"""
     
+    # Rows kept in the shared cached leaderboard per category
+    LEADERBOARD_CACHE_SIZE = 100
+    
     @classmethod
     async def get_leaderboard(cls, category: str = "level", limit: int = 10, offset: int = 0) -> ServiceResult[List[Dict[str, Any]]]:
         """Get player leaderboard for specified category"""
         async def _operation():
-            valid_categories = ["level", "revies", "erythl", "battles_won", "total_fusions", "successful_fusions"]
+            valid_categories = list(LeaderboardService.CATEGORIES)
             if category not in valid_categories:
                 raise ValueError(f"Invalid category. Must be one of: {valid_categories}")
             
             cls._validate_positive_int(limit, "limit")
             cls._validate_non_negative_int(offset, "offset")
             
-            # Check cache first
-            cache_result = await CacheService.get_cached_leaderboard(category, "global")
-            if cache_result.success and cache_result.data:
-                cached_data = cache_result.data[offset:offset + limit]
-                return cached_data
+            # Sorted set page first: O(log N + limit) in Redis, then one primary-key lookup for names
+            page = await LeaderboardService.get_page(category, limit, offset)
+            if page.success and page.data is not None:
+                return await cls._hydrate_leaderboard(category, page.data, offset)
             
-            async with DatabaseService.get_session() as session:
-                # Map category to proper column
-                if category == "level":
-                    order_column = Player.level
-                elif category == "revies":
-                    order_column = Player.revies
-                elif category == "erythl":
-                    order_column = Player.erythl
-                elif category == "battles_won":
-                    order_column = Player.battles_won
-                elif category == "total_fusions":
-                    order_column = Player.total_fusions
-                elif category == "successful_fusions":
-                    order_column = Player.successful_fusions
-                
-                stmt = select(
-                    Player.id,          # type: ignore
-                    Player.discord_id,  # type: ignore
-                    Player.username,    # type: ignore
-                    Player.level,       # type: ignore
-                    order_column        # type: ignore
-                ).order_by(
-                    desc(order_column),   # type: ignore
-                    desc(Player.level)    # type: ignore
-                ).limit(limit).offset(offset)
-                
-                results = (await session.execute(stmt)).all()
-                
-                leaderboard = []
-                for i, row in enumerate(results, start=offset + 1):
-                    leaderboard.append({
-                        "rank": i,
-                        "player_id": row[0],      # Player.id
-                        "discord_id": row[1],     # Player.discord_id
-                        "username": row[2],       # Player.username
-                        "level": row[3],          # Player.level
-                        category: row[4]          # order_column value
-                    })
-                
-                # Cache the result
-                await CacheService.cache_leaderboard(category, "global", leaderboard)
-                return leaderboard
+            # Board not built yet (or Redis down): fall back to Postgres
+            order_column = LeaderboardService.CATEGORIES[category]
+            
+            async def _fetch(fetch_limit: int, fetch_offset: int) -> List[Dict[str, Any]]:
+                async with DatabaseService.get_read_session() as session:
+                    stmt = select(
+                        Player.id,          # type: ignore
+                        Player.discord_id,  # type: ignore
+                        Player.username,    # type: ignore
+                        Player.level,       # type: ignore
+                        order_column        # type: ignore
+                    ).order_by(
+                        desc(order_column),   # type: ignore
+                        desc(Player.level)    # type: ignore
+                    ).limit(fetch_limit).offset(fetch_offset)
+                    
+                    results = (await session.execute(stmt)).all()
+                    
+                    return [
+                        {
+                            "rank": i,
+                            "player_id": row[0],      # Player.id
+                            "discord_id": row[1],     # Player.discord_id
+                            "username": row[2],       # Player.username
+                            "level": row[3],          # Player.level
+                            category: row[4]          # order_column value
+                        }
+                        for i, row in enumerate(results, start=fetch_offset + 1)
+                    ]
+            
+            # Pages beyond the cached head go straight to the database
+            if offset + limit > cls.LEADERBOARD_CACHE_SIZE:
+                return await _fetch(limit, offset)
+            
+            # One shared top-N per category; concurrent misses wait on a single query and an
+            # expired board is served stale for a minute while one refresh runs
+            leaderboard = await CacheService.single_flight(
+                CacheService.LEADERBOARD_KEY.format(category=category, period="global"),
+                lambda: _fetch(cls.LEADERBOARD_CACHE_SIZE, 0),
+                ttl=CacheService.TTL_SHORT,
+                tags={CacheService.GLOBAL_TAG},
+                stale_ttl=60,
+                distributed=True
+            )
+            return (leaderboard or [])[offset:offset + limit]
                 
         return await cls._safe_execute(_operation, "get leaderboard")
     
+    @classmethod
+    async def _hydrate_leaderboard(cls, category: str, page: List[Any], offset: int) -> List[Dict[str, Any]]:
+        """Attach names and levels to (player_id, score) pairs from the sorted set"""
+        if not page:
+            return []
+        
+        async with DatabaseService.get_read_session() as session:
+            stmt = select(
+                Player.id,          # type: ignore
+                Player.discord_id,  # type: ignore
+                Player.username,    # type: ignore
+                Player.level        # type: ignore
+            ).where(Player.id.in_([player_id for player_id, _ in page]))  # type: ignore
+            profiles = {row[0]: row for row in (await session.execute(stmt)).all()}
+        
+        entries = []
+        for rank, (player_id, score) in enumerate(page, start=offset + 1):
+            profile = profiles.get(player_id)
+            if profile is None:
+                continue  # Deleted since it was ranked; the next rebuild drops it
+            entries.append({
+                "rank": rank,
+                "player_id": player_id,
+                "discord_id": profile[1],
+                "username": profile[2],
+                "level": profile[3],
+                category: score
+            })
+        return entries
+    
     @classmethod
     async def record_battle_result(cls, player_id: int, won: bool, battle_type: str, 
                                  experience_gained: int = 0) -> ServiceResult[Dict[str, Any]]:
@@ -132,6 +170,9 @@ class StatisticsService(BaseService):
                 
                 # Invalidate relevant caches
                 await CacheService.invalidate_player_cache(player_id)
+                await LeaderboardService.record(player)
+                if won:
+                    await PeriodLeaderboardService.add_points(player_id, "battle_won")
                 
                 win_rate = (player.battles_won / player.total_battles * 100) if player.total_battles > 0 else 0
                 
@@ -183,6 +224,9 @@ class StatisticsService(BaseService):
                 
                 # Invalidate relevant caches
                 await CacheService.invalidate_player_cache(player_id)
+                await LeaderboardService.record(player)
+                if success:
+                    await PeriodLeaderboardService.add_points(player_id, "fusion_success")
                 
                 success_rate = (player.successful_fusions / player.total_fusions * 100) if player.total_fusions > 0 else 0
                 
@@ -257,7 +301,7 @@ class StatisticsService(BaseService):
     async def get_global_statistics(cls) -> ServiceResult[Dict[str, Any]]:
         """Get server-wide global statistics for analytics"""
         async def _operation():
-            async with DatabaseService.get_session() as session:
+            async with DatabaseService.get_read_session() as session:
                 # Get total player count
                 total_players_stmt = select(func.count()).select_from(Player)  # type: ignore
                 total_players = (await session.execute(total_players_stmt)).scalar() or 0
@@ -322,35 +366,24 @@ class StatisticsService(BaseService):
             rankings = {}
             categories = ["level", "revies", "erythl", "battles_won", "total_fusions"]
             
-            async with DatabaseService.get_session() as session:
+            # Ranks from the sorted sets (ties share a rank, as below)
+            ranked = await LeaderboardService.get_ranks(player_id, categories)
+            if ranked.success and ranked.data is not None and None not in ranked.data.values():
+                return ranked.data
+            
+            # Boards not built or player not ranked yet: count from Postgres
+            async with DatabaseService.get_read_session() as session:
                 # Get player data
                 player_stmt = select(Player).where(Player.id == player_id)  # type: ignore
                 player = (await session.execute(player_stmt)).scalar_one()
                 
                 for category in categories:
-                    player_value = getattr(player, category)
+                    column = LeaderboardService.CATEGORIES[category]
                     
                     # Count players with higher values
-                    if category == "level":
-                        rank_stmt = select(func.count()).select_from(Player).where(
-                            Player.level > player_value  # type: ignore
-                        )
-                    elif category == "revies":
-                        rank_stmt = select(func.count()).select_from(Player).where(
-                            Player.revies > player_value  # type: ignore
-                        )
-                    elif category == "erythl":
-                        rank_stmt = select(func.count()).select_from(Player).where(
-                            Player.erythl > player_value  # type: ignore
-                        )
-                    elif category == "battles_won":
-                        rank_stmt = select(func.count()).select_from(Player).where(
-                            Player.battles_won > player_value  # type: ignore
-                        )
-                    elif category == "total_fusions":
-                        rank_stmt = select(func.count()).select_from(Player).where(
-                            Player.total_fusions > player_value  # type: ignore
-                        )
+                    rank_stmt = select(func.count()).select_from(Player).where(
+                        column > getattr(player, category)  # type: ignore
+                    )
                     
                     higher_count = (await session.execute(rank_stmt)).scalar() or 0
                     rankings[category] = higher_count + 1  # Rank is 1-based
@@ -435,26 +468,44 @@ class StatisticsService(BaseService):
             cls._validate_player_id(player_id)
             cls._validate_positive_int(days, "days")
             
-            # Get recent activity patterns from transaction logs
-            # This would analyze transaction_logger data for patterns
-            # For now, return basic analytics structure
+            # Pre-aggregated daily summaries; see AnalyticsService.ingest
+            activity_result = await AnalyticsService.get_player_activity(player_id, days)
+            if not activity_result.success:
+                raise ValueError(activity_result.error or "Activity summaries unavailable")
+            activity = activity_result.data
+            
+            hourly = activity["hourly"]
+            counts = activity["activity"]
+            preferred = sorted(
+                (kind for kind in counts if kind != "other"), key=lambda kind: counts[kind], reverse=True
+            )
+            
+            spending = {currency: moves["sinks"] for currency, moves in activity["currency"].items() if moves["sinks"]}
+            income = {currency: moves["sources"] for currency, moves in activity["currency"].items() if moves["sources"]}
+            earned = sum(income.get("revies", {}).values())
+            spent = sum(spending.get("revies", {}).values())
             
             return {
                 "analysis_period_days": days,
+                "active_days": activity["active_days"],
+                "total_events": activity["events"],
                 "activity_patterns": {
-                    "most_active_hour": None,
-                    "preferred_activities": [],
-                    "engagement_score": 0
+                    "most_active_hour": hourly.index(max(hourly)) if activity["events"] else None,
+                    "activity_by_hour": hourly,
+                    "preferred_activities": preferred[:3],
+                    "engagement_score": round(activity["active_days"] / days * 100)
                 },
                 "progression_metrics": {
-                    "fusion_frequency": 0,
-                    "battle_frequency": 0,
-                    "echo_frequency": 0
+                    "fusion_frequency": round(counts.get("fusion", 0) / days, 2),
+                    "battle_frequency": round(counts.get("battle", 0) / days, 2),
+                    "echo_frequency": round(counts.get("echo", 0) / days, 2)
                 },
                 "economic_behavior": {
-                    "spending_patterns": {},
-                    "resource_management": "conservative"  # or "aggressive"
-                }
+                    "spending_patterns": spending,
+                    "income_sources": income,
+                    "resource_management": "aggressive" if earned and spent >= earned * 0.8 else "conservative"
+                },
+                "daily_events": activity["daily_events"]
             }
                 
         return await cls._safe_execute(_operation, "get behavioral analytics")
\ No newline at end of file
@@ -0,0 +1,189 @@
+# src/services/transaction_event_service.py
+import asyncio
+from datetime import datetime, timedelta, date
+from typing import Dict, Any, Iterable, List, Optional
+from sqlalchemy import select, text
+
+from src.services.base_service import BaseService, ServiceResult
+from src.database.models.transaction_event import TransactionEvent, PARTITION_PREFIX, DEFAULT_PARTITION
+from src.utils.database_service import DatabaseService
+from src.utils.config_manager import ConfigManager
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class TransactionEventService(BaseService):
+    """Daily partition upkeep, retention and audit queries for the transaction_event table"""
+    
+    # pg_advisory_xact_lock key so only one shard runs partition DDL at a time
+    MAINTENANCE_LOCK_ID = 0x5245_5645_0002
+    # Rows per DELETE when pruning the default partition, so no single statement runs long
+    DEFAULT_PRUNE_BATCH = 10000
+    
+    _maintenance_task: Optional[asyncio.Task] = None
+    
+    @classmethod
+    def _config(cls) -> Dict[str, Any]:
+        return (ConfigManager.get("global_config") or {}).get("transaction_events", {})
+    
+    @staticmethod
+    def partition_name(day: date) -> str:
+        return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+    
+    @classmethod
+    async def _attached_partitions(cls, session) -> Dict[str, date]:
+        """Attached daily partitions by name -> day (the default partition is skipped)"""
+        rows = (await session.execute(text("""
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = 'transaction_event'
+        """))).scalars().all()
+        
+        partitions = {}
+        for name in rows:
+            if name.startswith(PARTITION_PREFIX):
+                try:
+                    partitions[name] = datetime.strptime(name[len(PARTITION_PREFIX):], "%Y%m%d").date()
+                except ValueError:
+                    continue
+        return partitions
+    
+    @classmethod
+    async def _create_partition(cls, session, name: str, day: date) -> None:
+        """Create one day's partition, first moving any rows for that day out of the default partition"""
+        bounds = {"start": datetime.combine(day, datetime.min.time()),
+                  "end": datetime.combine(day + timedelta(days=1), datetime.min.time())}
+        create = (
+            f"CREATE TABLE {name} PARTITION OF transaction_event "
+            f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+        )
+        
+        stranded = (await session.execute(text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE occurred_at >= :start AND occurred_at < :end)"
+        ), bounds)).scalar()
+        if not stranded:
+            await session.execute(text(create))
+            return
+        
+        # Postgres refuses a partition whose range overlaps rows in the default one (e.g. after the loop was down):
+        # detach the default, create the day, move that day's rows across and attach the default again
+        await session.execute(text(f"ALTER TABLE transaction_event DETACH PARTITION {DEFAULT_PARTITION}"))
+        await session.execute(text(create))
+        moved = await session.execute(text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE occurred_at >= :start AND occurred_at < :end "
+            f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+        ), bounds)
+        await session.execute(text(f"ALTER TABLE transaction_event ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+        logger.info(f"Moved {moved.rowcount} rows from {DEFAULT_PARTITION} into {name}")
+    
+    @classmethod
+    async def run_maintenance(cls) -> ServiceResult[Dict[str, Any]]:
+        """Create upcoming daily partitions, detach (optionally drop) ones past retention and prune the default one"""
+        async def _operation():
+            config = cls._config()
+            premake_days = int(config.get("premake_days", 3))
+            retention_days = int(config.get("retention_days", 90))
+            drop_detached = bool(config.get("drop_detached", False))
+            today = datetime.utcnow().date()
+            
+            created, detached, dropped = [], [], []
+            async with DatabaseService.get_transaction() as session:
+                await session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": cls.MAINTENANCE_LOCK_ID})
+                attached = await cls._attached_partitions(session)
+                
+                for offset in range(premake_days + 1):
+                    day = today + timedelta(days=offset)
+                    name = cls.partition_name(day)
+                    if name in attached:
+                        continue
+                    await cls._create_partition(session, name, day)
+                    created.append(name)
+                
+                cutoff = today - timedelta(days=retention_days)
+                for name, day in sorted(attached.items(), key=lambda item: item[1]):
+                    if day >= cutoff:
+                        continue
+                    await session.execute(text(f"ALTER TABLE transaction_event DETACH PARTITION {name}"))
+                    detached.append(name)
+                    if drop_detached:
+                        await session.execute(text(f"DROP TABLE {name}"))
+                        dropped.append(name)
+                
+                await session.commit()
+            
+            # Rows that landed in the default partition are never detached with a day, so delete them by age
+            pruned = 0
+            while True:
+                async with DatabaseService.get_transaction() as session:
+                    result = await session.execute(text(
+                        f"DELETE FROM {DEFAULT_PARTITION} WHERE ctid IN ("
+                        f"SELECT ctid FROM {DEFAULT_PARTITION} WHERE occurred_at < :cutoff LIMIT :batch)"
+                    ), {"cutoff": datetime.combine(cutoff, datetime.min.time()), "batch": cls.DEFAULT_PRUNE_BATCH})
+                    await session.commit()
+                pruned += result.rowcount or 0
+                if (result.rowcount or 0) < cls.DEFAULT_PRUNE_BATCH:
+                    break
+            
+            if created or detached or pruned:
+                logger.info(
+                    f"transaction_event partitions: created {created}, detached {detached}, dropped {dropped}, "
+                    f"pruned {pruned} rows from {DEFAULT_PARTITION}"
+                )
+            return {"created": created, "detached": detached, "dropped": dropped, "pruned_default": pruned}
+        return await cls._safe_execute(_operation, "maintain transaction_event partitions")
+    
+    @classmethod
+    async def get_player_events(cls, player_id: int, since: Optional[datetime] = None,
+                                until: Optional[datetime] = None, types: Optional[Iterable[str]] = None,
+                                limit: int = 100) -> ServiceResult[List[Dict[str, Any]]]:
+        """A player's events newest first; the time bounds prune partitions"""
+        async def _operation():
+            cls._validate_player_id(player_id)
+            cls._validate_positive_int(limit, "limit")
+            
+            stmt = select(TransactionEvent).where(TransactionEvent.player_id == player_id)  # type: ignore
+            if since:
+                stmt = stmt.where(TransactionEvent.occurred_at >= since)  # type: ignore
+            if until:
+                stmt = stmt.where(TransactionEvent.occurred_at < until)  # type: ignore
+            if types:
+                stmt = stmt.where(TransactionEvent.type.in_(list(types)))  # type: ignore
+            stmt = stmt.order_by(TransactionEvent.occurred_at.desc()).limit(limit)  # type: ignore
+            
+            async with DatabaseService.get_read_session() as session:
+                events = (await session.execute(stmt)).scalars().all()
+            
+            return [
+                {"id": event.id, "occurred_at": event.occurred_at.isoformat(), "type": event.type,
+                 "details": event.details, "metadata": event.metadata_}
+                for event in events
+            ]
+        return await cls._safe_execute(_operation, "get player events")
+    
+    @classmethod
+    async def _maintenance_loop(cls) -> None:
+        interval = int(cls._config().get("maintenance_interval_seconds", 3600))
+        while True:
+            await cls.run_maintenance()
+            await asyncio.sleep(interval)
+    
+    @classmethod
+    def start_maintenance_loop(cls) -> bool:
+        """Start partition upkeep once per process when the sink is enabled"""
+        if not cls._config().get("enabled", False):
+            return False
+        if cls._maintenance_task is None or cls._maintenance_task.done():
+            cls._maintenance_task = asyncio.create_task(cls._maintenance_loop())
+        return True
+    
+    @classmethod
+    async def stop_maintenance_loop(cls) -> None:
+        if cls._maintenance_task is not None:
+            cls._maintenance_task.cancel()
+            try:
+                await cls._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            cls._maintenance_task = None
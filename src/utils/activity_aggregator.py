@@ -0,0 +1,184 @@
+# src/utils/activity_aggregator.py
+"""
+Columnar aggregation of decoded transaction records into per-player,
+per-UTC-day activity summaries.
+
+A batch of records is split into NumPy columns (player, day, hour, kind and
+a separate currency-movement table). Every count and sum is then done with
+np.unique / np.bincount over those columns, with no per-record Python
+arithmetic. A summary is a plain dict that stays small no matter how many
+events it covers:
+
+    {"events": 41, "hourly": [24 ints], "activity": {"fusion": 3, ...},
+     "currency": {"revies": {"sources": {"quest": 900}, "sinks": {...}}},
+     "fusions": [last few fusion results]}
+
+merge_summary() folds a new batch into a stored summary, so aggregates are
+built incrementally.
+"""
+
+import re
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np  # type: ignore
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    np = None  # type: ignore
+
+ACTIVITY_KINDS = ("fusion", "battle", "quest", "echo", "capture", "awakening", "level_up", "other")
+_KIND_INDEX = {kind: i for i, kind in enumerate(ACTIVITY_KINDS)}
+_TYPE_KINDS = {
+    "fusion_attempted": "fusion",
+    "esprit_fused": "fusion",
+    "echo_opened": "echo",
+    "esprit_captured": "capture",
+    "esprit_awakened": "awakening",
+    "level_up": "level_up"
+}
+_CURRENCY_DIRECTIONS = {"currency_gain": 0, "currency_spend": 1}
+_DIRECTION_NAMES = ("sources", "sinks")
+_AMOUNT_FIELDS = ("amount", "cost", "income")
+_EPOCH = date(1970, 1, 1)
+
+DaySummaries = Dict[Tuple[int, date], Dict[str, Any]]
+
+
+def empty_summary() -> Dict[str, Any]:
+    return {"events": 0, "hourly": [0] * 24, "activity": {}, "currency": {}, "fusions": []}
+
+
+def _kind(record: Dict[str, Any]) -> int:
+    transaction_type = record.get("type")
+    if transaction_type == "quest_completed":
+        # StatisticsService.record_battle_result logs battles as quest completions
+        return _KIND_INDEX["battle" if "battle_type" in (record.get("details") or {}) else "quest"]
+    return _KIND_INDEX[_TYPE_KINDS.get(transaction_type, "other")]
+
+
+def _source_label(details: Dict[str, Any]) -> str:
+    """Group free-form reasons ("Transfer to player 12: gift") into stable buckets"""
+    label = str(details.get("source") or details.get("action") or details.get("reason") or "unknown")
+    label = re.sub(r"\d+", "#", label.split(":", 1)[0]).strip().lower()
+    return label[:48] or "unknown"
+
+
+def _currency_move(record: Dict[str, Any]) -> Optional[Tuple[str, int, str, int]]:
+    direction = _CURRENCY_DIRECTIONS.get(record.get("type"))
+    details = record.get("details") or {}
+    # ExperienceService logs XP gains as currency_gain
+    if direction is None or "xp_gained" in details:
+        return None
+    
+    for field in _AMOUNT_FIELDS:
+        amount = details.get(field)
+        if isinstance(amount, (int, float)) and not isinstance(amount, bool):
+            return str(details.get("currency") or "revies"), direction, _source_label(details), abs(int(amount))
+    return None
+
+
+def _fusion_entry(record: Dict[str, Any]) -> Dict[str, Any]:
+    details = record.get("details") or {}
+    result = details.get("result") or {}
+    return {
+        "timestamp": record.get("timestamp"),
+        "success": bool(details.get("successful", details.get("success", False))),
+        "cost": details.get("fusion_cost"),
+        "fragments_used": details.get("fragments_used", 0),
+        "materials": [m.get("name") if isinstance(m, dict) else m
+                      for m in (details.get("esprit1"), details.get("esprit2")) if m is not None],
+        "result": result.get("name") if isinstance(result, dict) else result,
+        "result_tier": result.get("tier") if isinstance(result, dict) else details.get("tier")
+    }
+
+
+def aggregate(records: List[Dict[str, Any]], fusions_per_day: int = 10) -> DaySummaries:
+    """Summaries keyed by (player_id, UTC day) for one batch of decoded records"""
+    if not HAS_NUMPY:
+        raise RuntimeError("numpy is required to aggregate transaction analytics")
+    
+    records = [r for r in records if isinstance(r.get("player_id"), int) and r.get("timestamp")]
+    if not records:
+        return {}
+    
+    # --- columns ---
+    player = np.fromiter((r["player_id"] for r in records), dtype=np.int64, count=len(records))
+    stamps = np.array([r["timestamp"] for r in records], dtype="datetime64[s]")
+    days = stamps.astype("datetime64[D]")
+    day = days.astype(np.int64)
+    hour = ((stamps - days).astype(np.int64) // 3600).clip(0, 23)
+    kind = np.fromiter((_kind(r) for r in records), dtype=np.int64, count=len(records))
+    
+    groups, inverse = np.unique(np.stack([player, day], axis=1), axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    n = len(groups)
+    k = len(ACTIVITY_KINDS)
+    
+    events = np.bincount(inverse, minlength=n)
+    hourly = np.bincount(inverse * 24 + hour, minlength=n * 24).reshape(n, 24)
+    activity = np.bincount(inverse * k + kind, minlength=n * k).reshape(n, k)
+    
+    summaries: DaySummaries = {}
+    keys = [(int(p), _EPOCH + timedelta(days=int(d))) for p, d in groups]
+    for g, key in enumerate(keys):
+        summaries[key] = {
+            "events": int(events[g]),
+            "hourly": hourly[g].tolist(),
+            "activity": {ACTIVITY_KINDS[i]: int(c) for i, c in enumerate(activity[g]) if c},
+            "currency": {},
+            "fusions": []
+        }
+    
+    # --- currency sources / sinks ---
+    moves = [(i, move) for i, move in ((i, _currency_move(r)) for i, r in enumerate(records)) if move]
+    if moves:
+        currencies = sorted({m[0] for _, m in moves})
+        labels = sorted({m[2] for _, m in moves})
+        currency_index = {c: i for i, c in enumerate(currencies)}
+        label_index = {l: i for i, l in enumerate(labels)}
+        
+        columns = np.array([
+            (inverse[i], currency_index[c], direction, label_index[l]) for i, (c, direction, l, _) in moves
+        ], dtype=np.int64)
+        amounts = np.array([m[3] for _, m in moves], dtype=np.float64)
+        
+        move_groups, move_inverse = np.unique(columns, axis=0, return_inverse=True)
+        totals = np.bincount(move_inverse.reshape(-1), weights=amounts, minlength=len(move_groups))
+        
+        for (g, c, direction, l), total in zip(move_groups.tolist(), totals.tolist()):
+            bucket = summaries[keys[g]]["currency"].setdefault(currencies[c], {"sources": {}, "sinks": {}})
+            bucket[_DIRECTION_NAMES[direction]][labels[l]] = int(round(total))
+    
+    # --- recent fusion results (tiny, kept verbatim) ---
+    fusion_kind = _KIND_INDEX["fusion"]
+    for i in np.flatnonzero(kind == fusion_kind).tolist():
+        fusions = summaries[keys[inverse[i]]]["fusions"]
+        fusions.append(_fusion_entry(records[i]))
+        if len(fusions) > fusions_per_day:
+            del fusions[0]
+    
+    return summaries
+
+
+def merge_summary(existing: Optional[Dict[str, Any]], delta: Dict[str, Any],
+                  fusions_per_day: int = 10) -> Dict[str, Any]:
+    """Fold a batch summary into a stored one"""
+    merged = empty_summary()
+    for summary in (existing or {}, delta):
+        if not summary:
+            continue
+        merged["events"] += summary.get("events", 0)
+        merged["hourly"] = [a + b for a, b in zip(merged["hourly"], summary.get("hourly") or [0] * 24)]
+        for kind, count in (summary.get("activity") or {}).items():
+            merged["activity"][kind] = merged["activity"].get(kind, 0) + count
+        for currency, directions in (summary.get("currency") or {}).items():
+            bucket = merged["currency"].setdefault(currency, {"sources": {}, "sinks": {}})
+            for direction in _DIRECTION_NAMES:
+                for label, amount in (directions.get(direction) or {}).items():
+                    bucket[direction][label] = bucket[direction].get(label, 0) + amount
+        merged["fusions"].extend(summary.get("fusions") or [])
+    
+    merged["fusions"] = merged["fusions"][-fusions_per_day:]
+    return merged
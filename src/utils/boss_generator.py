@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import asyncio
-import io
 import os
 from typing import Tuple, Optional, Dict, Any, Union
 from pathlib import Path
@@ -11,6 +10,10 @@ import disnake
 from PIL import Image, ImageDraw, ImageFont
 
 from src.utils.logger import get_logger
+from src.utils.sprite_index import SpriteIndex
+from src.utils.card_cache import CardCache
+from src.utils.image_encoder import ImageEncoder
+from src.utils.render_service import RenderService
 from utils.stats_generator import ImageConfig, ImageGenerator  # ✨ Use existing sophisticated system
 
 logger = get_logger(__name__)
@@ -178,9 +181,9 @@ class UnifiedBossImageGenerator:
             if not sprite and sprite_path:
                 sprite = self._load_sprite_from_url(sprite_path, esprit_name)
             
-            # Priority 3: Use main generator's sophisticated sprite finding
+            # Priority 3: Look the name up in the shared sprite index
             if not sprite:
-                sprite = self._use_main_generator_sprite_search(esprit_name)
+                sprite = self._find_indexed_sprite(esprit_name, boss_data.get("tier", boss_data.get("base_tier")))
             
             if not sprite:
                 logger.warning(f"No sprite found for boss: {esprit_name}")
@@ -222,21 +225,20 @@ class UnifiedBossImageGenerator:
             logger.error(f"Failed to load sprite from URL {url_path}: {e}")
             return None
     
-    def _use_main_generator_sprite_search(self, esprit_name: str) -> Optional[Image.Image]:
-        """Use main generator's sophisticated sprite finding as fallback"""
+    def _find_indexed_sprite(self, esprit_name: str, tier: Optional[int] = None) -> Optional[Image.Image]:
+        """Sprite from the shared asset index, same lookup the main generator uses"""
         try:
-            # Use main generator's _get_sprite_path method
-            sprite_path = self.main_generator._get_sprite_path(esprit_name)
+            sprite_path = SpriteIndex.find_sprite(esprit_name, tier)
             
-            if sprite_path and sprite_path.exists():
+            if sprite_path is not None:
                 sprite = Image.open(sprite_path).convert("RGBA")
-                logger.info(f"✅ Found sprite via main generator: {sprite_path}")
+                logger.info(f"✅ Found sprite via sprite index: {sprite_path}")
                 return sprite
             
             return None
             
         except Exception as e:
-            logger.error(f"Main generator sprite search failed: {e}")
+            logger.error(f"Sprite index lookup failed: {e}")
             return None
     
     def _scale_sprite_for_boss(self, sprite: Image.Image) -> Image.Image:
@@ -449,43 +451,33 @@ class UnifiedBossImageGenerator:
     async def to_discord_file(self, img: Image.Image, filename: str = "boss_card.png") -> Optional[disnake.File]:
         """Convert to Discord file using main generator's sophisticated compression"""
         try:
-            return await asyncio.to_thread(self._save_with_compression, img, filename)
+            data = await asyncio.to_thread(self._encode_image, img)
+            return CardCache.to_file(data, filename)
         except Exception as e:
             logger.error(f"Failed to create Discord file for {filename}: {e}")
             return None
     
-    def _save_with_compression(self, img: Image.Image, filename: str) -> disnake.File:
-        """Save with sophisticated compression using main generator techniques"""
-        # Use main generator's compression settings
-        compression_config = self.config.get("compression", {})
-        max_size_mb = compression_config.get("max_size_mb", 8.0)
-        
-        buffer = io.BytesIO()
-        
-        # High-quality PNG with optimization
-        save_kwargs = {
-            "format": "PNG",
-            "optimize": True,
-            "compress_level": compression_config.get("compress_level", 6)
-        }
-        
-        img.save(buffer, **save_kwargs)
-        buffer.seek(0)
-        
-        # Check size and resize if needed
-        size_mb = len(buffer.getvalue()) / (1024 * 1024)
-        if size_mb > max_size_mb:
-            resize_factor = compression_config.get("resize_factor", 0.8)
-            new_width = int(img.width * resize_factor)
-            new_height = int(img.height * resize_factor)
-            
-            resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            buffer = io.BytesIO()
-            resized_img.save(buffer, **save_kwargs)
-            buffer.seek(0)
-        
-        return disnake.File(buffer, filename=filename)
+    def _encode_image(self, img: Image.Image) -> Optional[bytes]:
+        """Encoded boss card under Discord's size limit, using the main generator's compression settings"""
+        return ImageEncoder.encode(img, "boss", self.config.get("compression", {}))
+    
+    def render_encoded_sync(self, boss_data: Dict[str, Any]) -> Optional[bytes]:
+        """Render and encode in one call - what the render workers run"""
+        return self._encode_image(self._render_boss_sync(boss_data))
+    
+    async def card_file(self, boss_data: Dict[str, Any], filename: str = "boss_card.png") -> Optional[disnake.File]:
+        """Cached boss card as a Discord file; a cache miss renders in the worker pool (or a thread without one)"""
+        key = CardCache.make_key("boss", boss_data)
+        data = await CardCache.get(key)
+        if data is None:
+            if RenderService.is_running():
+                data = await RenderService.render("boss", boss_data)
+            else:
+                data = await asyncio.to_thread(self.render_encoded_sync, boss_data)
+            if data is None:
+                return None
+            await CardCache.put(key, data)
+        return CardCache.to_file(data, filename)
 
 
 # Singleton instance using unified system
@@ -499,8 +491,7 @@ async def generate_boss_card(
     """Generate ULTIMATE boss encounter card with unified sophisticated system"""
     try:
         logger.info(f"🎯 ULTIMATE boss card generation request: {boss_data.get('name', 'Unknown')}")
-        card = await _unified_boss_generator.render_boss_card(boss_data)
-        result = await _unified_boss_generator.to_discord_file(card, filename)
+        result = await _unified_boss_generator.card_file(boss_data, filename)
         logger.info(f"📸 ULTIMATE boss card generation {'✅ SUCCESS' if result else '❌ FAILED'}")
         return result
     except Exception as e:
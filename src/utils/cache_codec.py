@@ -0,0 +1,202 @@
+# src/utils/cache_codec.py
+"""
+Binary envelope for CacheService entries.
+
+Layout (big-endian, 20 byte fixed header):
+
+    0   3s  magic          b"\\x00RV" - a NUL never starts a JSON/UTF-8 entry
+    3   B   header version
+    4   B   serializer id  (1 = json, 2 = msgpack)
+    5   B   compressor id  (0 = none, 1 = zlib, 2 = zstd, 3 = lz4)
+    6   H   tags length    bytes of the tag block that follows the header
+    8   I   ttl            seconds
+    12  I   key version
+    16  I   created_at     unix seconds
+    20  ... tag block (UTF-8, \\x1f separated) then payload
+
+Serializers and compressors are pluggable by id. msgpack, zstandard and lz4
+are optional: without them the codec falls back to json / zlib.
+Entries written by the old JSON-in-JSON format are still readable.
+"""
+
+import json
+import struct
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# Optional fast paths
+try:
+    import msgpack  # type: ignore
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+    msgpack = None  # type: ignore
+
+try:
+    import zstandard  # type: ignore
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+    zstandard = None  # type: ignore
+
+try:
+    import lz4.frame as lz4_frame  # type: ignore
+    HAS_LZ4 = True
+except ImportError:
+    HAS_LZ4 = False
+    lz4_frame = None  # type: ignore
+
+MAGIC = b"\x00RV"
+HEADER_VERSION = 1
+HEADER = struct.Struct(">3sBBBHIII")
+TAG_SEPARATOR = "\x1f"
+
+SERIALIZER_JSON = 1
+SERIALIZER_MSGPACK = 2
+
+COMPRESSOR_NONE = 0
+COMPRESSOR_ZLIB = 1
+COMPRESSOR_ZSTD = 2
+COMPRESSOR_LZ4 = 3
+
+
+@dataclass
+class DecodedEntry:
+    """A cache entry read back from Redis"""
+    data: Any
+    tags: List[str] = field(default_factory=list)
+    ttl: int = 0
+    version: int = 0
+    created_at: int = 0
+    legacy: bool = False
+
+
+class CacheCodec:
+    """Pluggable serializer/compressor registry plus the envelope format"""
+    
+    # id -> (name, dumps, loads)
+    _serializers: Dict[int, Tuple[str, Callable[[Any], bytes], Callable[[bytes], Any]]] = {}
+    # id -> (name, compress, decompress)
+    _compressors: Dict[int, Tuple[str, Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {}
+    
+    serializer_id: int = SERIALIZER_JSON
+    compressor_id: int = COMPRESSOR_ZLIB
+    compression_threshold: int = 1024
+    
+    @classmethod
+    def register_serializer(cls, serializer_id: int, name: str,
+                            dumps: Callable[[Any], bytes], loads: Callable[[bytes], Any]) -> None:
+        cls._serializers[serializer_id] = (name, dumps, loads)
+    
+    @classmethod
+    def register_compressor(cls, compressor_id: int, name: str,
+                            compress: Callable[[bytes], bytes], decompress: Callable[[bytes], bytes]) -> None:
+        cls._compressors[compressor_id] = (name, compress, decompress)
+    
+    @classmethod
+    def configure(cls, serializer: str = "msgpack", compressor: str = "zstd",
+                  compression_threshold: Optional[int] = None) -> Tuple[str, str]:
+        """Pick the write-side codecs by name, falling back to what is installed"""
+        by_name = {name: sid for sid, (name, _, _) in cls._serializers.items()}
+        cls.serializer_id = by_name.get(serializer, SERIALIZER_MSGPACK if HAS_MSGPACK else SERIALIZER_JSON)
+        
+        by_name = {name: cid for cid, (name, _, _) in cls._compressors.items()}
+        cls.compressor_id = by_name.get(compressor, COMPRESSOR_ZLIB)
+        
+        if compression_threshold is not None:
+            cls.compression_threshold = compression_threshold
+        
+        return cls._serializers[cls.serializer_id][0], cls._compressors[cls.compressor_id][0]
+    
+    @classmethod
+    def encode(cls, value: Any, ttl: int, tags: Optional[Any] = None, version: int = 1,
+               compress: Optional[bool] = None,
+               serializer_id: Optional[int] = None, compressor_id: Optional[int] = None) -> bytes:
+        """Serialize a value into the binary envelope"""
+        serializer_id = serializer_id or cls.serializer_id
+        payload = cls._serializers[serializer_id][1](value)
+        
+        should_compress = compress if compress is not None else len(payload) > cls.compression_threshold
+        compressor_id = (compressor_id or cls.compressor_id) if should_compress else COMPRESSOR_NONE
+        if compressor_id != COMPRESSOR_NONE:
+            payload = cls._compressors[compressor_id][1](payload)
+        
+        tag_block = TAG_SEPARATOR.join(sorted(tags)).encode("utf-8") if tags else b""
+        header = HEADER.pack(
+            MAGIC, HEADER_VERSION, serializer_id, compressor_id,
+            len(tag_block), max(0, int(ttl)), version & 0xFFFFFFFF, int(time.time())
+        )
+        return header + tag_block + payload
+    
+    @classmethod
+    def decode(cls, raw: Union[bytes, str], decompress: bool = True) -> DecodedEntry:
+        """Read an entry in either the binary envelope or the legacy JSON format"""
+        if isinstance(raw, bytes) and raw[:3] == MAGIC and len(raw) >= HEADER.size:
+            _, _, serializer_id, compressor_id, tags_len, ttl, version, created_at = HEADER.unpack_from(raw)
+            start = HEADER.size
+            tags = raw[start:start + tags_len].decode("utf-8").split(TAG_SEPARATOR) if tags_len else []
+            payload = raw[start + tags_len:]
+            
+            if compressor_id != COMPRESSOR_NONE:
+                if not decompress:
+                    return DecodedEntry(payload, tags, ttl, version, created_at)
+                payload = cls._compressors[compressor_id][2](payload)
+            
+            data = cls._serializers[serializer_id][2](payload)
+            return DecodedEntry(data, tags, ttl, version, created_at)
+        
+        return cls._decode_legacy(raw, decompress)
+    
+    @staticmethod
+    def _decode_legacy(raw: Union[bytes, str], decompress: bool) -> DecodedEntry:
+        """Old format: JSON envelope, zlib bytes smuggled through latin1"""
+        text = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+        try:
+            entry_data = json.loads(text)
+        except json.JSONDecodeError:
+            # Raw string data
+            return DecodedEntry(text, legacy=True)
+        
+        if isinstance(entry_data, dict) and "data" in entry_data:
+            tags = entry_data.get("tags") or []
+            data = entry_data["data"]
+            if entry_data.get("compressed", False) and decompress:
+                data = json.loads(zlib.decompress(data.encode("latin1")).decode("utf-8"))
+            return DecodedEntry(data, tags, entry_data.get("ttl", 0), entry_data.get("version", 0), legacy=True)
+        
+        # Simple cache entry
+        return DecodedEntry(entry_data, legacy=True)
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(payload: bytes) -> Any:
+    return json.loads(payload)
+
+
+CacheCodec.register_serializer(SERIALIZER_JSON, "json", _json_dumps, _json_loads)
+CacheCodec.register_compressor(COMPRESSOR_NONE, "none", lambda b: b, lambda b: b)
+CacheCodec.register_compressor(COMPRESSOR_ZLIB, "zlib", lambda b: zlib.compress(b, 6), zlib.decompress)
+
+if HAS_MSGPACK:
+    CacheCodec.register_serializer(
+        SERIALIZER_MSGPACK, "msgpack",
+        lambda value: msgpack.packb(value, default=str, use_bin_type=True),
+        lambda payload: msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    )
+    CacheCodec.serializer_id = SERIALIZER_MSGPACK
+
+if HAS_ZSTD:
+    _zstd_compressor = zstandard.ZstdCompressor(level=3)
+    _zstd_decompressor = zstandard.ZstdDecompressor()
+    CacheCodec.register_compressor(
+        COMPRESSOR_ZSTD, "zstd", _zstd_compressor.compress, _zstd_decompressor.decompress
+    )
+    CacheCodec.compressor_id = COMPRESSOR_ZSTD
+
+if HAS_LZ4:
+    CacheCodec.register_compressor(COMPRESSOR_LZ4, "lz4", lz4_frame.compress, lz4_frame.decompress)
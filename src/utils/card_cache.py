@@ -0,0 +1,286 @@
+# src/utils/card_cache.py
+"""
+Rendered-card cache: encoded image bytes keyed by a hash of everything a card
+is drawn from.
+
+The key is SHA-256 over the card kind, TEMPLATE_VERSION, a fingerprint of the
+stats_display config and the card's input dict (name, tier, awakening, stats,
+relics, leader skill, boss HP, ...). Identical inputs always map to the same
+bytes, so a hit skips Pillow entirely and hands disnake a BytesIO.
+
+Lookups go memory -> disk -> Redis:
+  - memory: LRU bounded by total bytes, per process
+  - disk: content-addressed files under `disk_path`, shared by every shard on
+    the host and surviving restarts; pruned oldest-first past `disk_max_mb`
+  - Redis (optional): shared across hosts with a TTL
+A lower-tier hit is copied into the tiers above it.
+
+Bump TEMPLATE_VERSION whenever drawing code or assets change in a way the
+inputs don't capture; old entries then simply stop being hit.
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+import disnake
+
+from src.utils.config_manager import ConfigManager
+from src.utils.redis_service import RedisService
+from src.utils.image_encoder import with_extension
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TEMPLATE_VERSION = 3
+
+REDIS_KEY_PREFIX = "card_png:"
+
+
+@dataclass
+class CardCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    
+    @property
+    def hit_rate(self) -> float:
+        hits = self.memory_hits + self.disk_hits + self.redis_hits
+        total = hits + self.misses
+        return (hits / total) if total > 0 else 0.0
+
+
+class CardCache:
+    """Process-wide rendered-card cache shared by every card generator"""
+    
+    _memory: "OrderedDict[str, bytes]" = OrderedDict()
+    _memory_bytes: int = 0
+    _fingerprint: Optional[str] = None
+    _writes_since_prune: int = 0
+    stats = CardCacheStats()
+    
+    # Prune the disk store once every this many writes
+    PRUNE_EVERY = 200
+    
+    @classmethod
+    def _config(cls) -> Dict[str, Any]:
+        return (ConfigManager.get("global_config") or {}).get("card_cache", {})
+    
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return bool(cls._config().get("enabled", True))
+    
+    @classmethod
+    def _template_fingerprint(cls) -> str:
+        """TEMPLATE_VERSION plus a hash of the stats_display config the generators draw with"""
+        if cls._fingerprint is None:
+            display_config = json.dumps(ConfigManager.get("stats_display") or {}, sort_keys=True, default=str)
+            cls._fingerprint = f"v{TEMPLATE_VERSION}:{hashlib.sha256(display_config.encode()).hexdigest()[:16]}"
+        return cls._fingerprint
+    
+    @classmethod
+    def make_key(cls, kind: str, card_data: Mapping[str, Any]) -> str:
+        """Content hash of a card's inputs; dict order never matters"""
+        payload = json.dumps(
+            {"kind": kind, "template": cls._template_fingerprint(), "data": card_data},
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    # --- memory tier ---
+    
+    @classmethod
+    def _remember(cls, key: str, data: bytes) -> None:
+        max_bytes = int(cls._config().get("memory_max_mb", 64) * 1024 * 1024)
+        if len(data) > max_bytes:
+            return
+        
+        previous = cls._memory.pop(key, None)
+        if previous is not None:
+            cls._memory_bytes -= len(previous)
+        cls._memory[key] = data
+        cls._memory_bytes += len(data)
+        
+        while cls._memory_bytes > max_bytes:
+            _, evicted = cls._memory.popitem(last=False)
+            cls._memory_bytes -= len(evicted)
+            cls.stats.evictions += 1
+    
+    # --- disk tier ---
+    
+    @classmethod
+    def _disk_path(cls, key: str) -> Path:
+        root = Path(cls._config().get("disk_path", "data/cache/cards"))
+        return root / key[:2] / f"{key}.img"
+    
+    @staticmethod
+    def _read_file(path: Path) -> Optional[bytes]:
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        # Touch so pruning treats it as recently used
+        os.utime(path)
+        return data
+    
+    @staticmethod
+    def _write_file(path: Path, data: bytes) -> None:
+        """Write via a temp file + rename so readers never see a partial image"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+    
+    @classmethod
+    def prune_disk(cls) -> int:
+        """Delete least recently used files until the store fits disk_max_mb; returns files removed"""
+        root = Path(cls._config().get("disk_path", "data/cache/cards"))
+        max_bytes = int(cls._config().get("disk_max_mb", 1024) * 1024 * 1024)
+        if not root.is_dir():
+            return 0
+        
+        files = []
+        total = 0
+        for entry in root.glob("*/*"):
+            if entry.suffix == ".tmp":
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+        
+        removed = 0
+        for _, size, entry in sorted(files):
+            if total <= max_bytes:
+                break
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        
+        if removed:
+            logger.info(f"Card cache pruned {removed} files from disk")
+        return removed
+    
+    # --- public API ---
+    
+    @classmethod
+    async def get(cls, key: str) -> Optional[bytes]:
+        """Encoded card for a key, or None; lower-tier hits are promoted"""
+        if not cls.is_enabled():
+            return None
+        
+        data = cls._memory.get(key)
+        if data is not None:
+            cls._memory.move_to_end(key)
+            cls.stats.memory_hits += 1
+            return data
+        
+        try:
+            data = await asyncio.to_thread(cls._read_file, cls._disk_path(key))
+        except OSError as e:
+            logger.warning(f"Card cache disk read failed for {key}: {e}")
+            data = None
+        if data is not None:
+            cls.stats.disk_hits += 1
+            cls._remember(key, data)
+            return data
+        
+        config = cls._config()
+        if config.get("redis_enabled", False):
+            client = RedisService.get_binary_client()
+            if client is not None:
+                try:
+                    data = await client.get(REDIS_KEY_PREFIX + key)
+                except Exception as e:
+                    logger.warning(f"Card cache Redis read failed for {key}: {e}")
+                    data = None
+                if data is not None:
+                    cls.stats.redis_hits += 1
+                    cls._remember(key, data)
+                    await cls._store_disk(key, data)
+                    return data
+        
+        cls.stats.misses += 1
+        return None
+    
+    @classmethod
+    async def put(cls, key: str, data: bytes) -> None:
+        """Store freshly rendered bytes in every enabled tier; failures only cost future hits"""
+        if not cls.is_enabled() or not data:
+            return
+        
+        cls.stats.stores += 1
+        cls._remember(key, data)
+        await cls._store_disk(key, data)
+        
+        config = cls._config()
+        if config.get("redis_enabled", False):
+            client = RedisService.get_binary_client()
+            if client is not None:
+                try:
+                    await client.set(REDIS_KEY_PREFIX + key, data, ex=int(config.get("redis_ttl_seconds", 86400)))
+                except Exception as e:
+                    logger.warning(f"Card cache Redis write failed for {key}: {e}")
+    
+    @classmethod
+    async def _store_disk(cls, key: str, data: bytes) -> None:
+        try:
+            await asyncio.to_thread(cls._write_file, cls._disk_path(key), data)
+        except OSError as e:
+            logger.warning(f"Card cache disk write failed for {key}: {e}")
+            return
+        
+        cls._writes_since_prune += 1
+        if cls._writes_since_prune >= cls.PRUNE_EVERY:
+            cls._writes_since_prune = 0
+            await asyncio.to_thread(cls.prune_disk)
+    
+    @staticmethod
+    def to_file(data: bytes, filename: str) -> disnake.File:
+        """disnake.File over cached bytes, no Pillow involved; the extension follows the actual format"""
+        return disnake.File(io.BytesIO(data), filename=with_extension(filename, data))
+    
+    @classmethod
+    def reset(cls) -> None:
+        """Drop the memory tier and recompute the template fingerprint (after a config reload)"""
+        cls._memory.clear()
+        cls._memory_bytes = 0
+        cls._fingerprint = None
+    
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        """Counters and occupancy for metrics"""
+        return {
+            "memory_hits": cls.stats.memory_hits,
+            "disk_hits": cls.stats.disk_hits,
+            "redis_hits": cls.stats.redis_hits,
+            "misses": cls.stats.misses,
+            "hit_rate": cls.stats.hit_rate,
+            "stores": cls.stats.stores,
+            "evictions": cls.stats.evictions,
+            "memory_entries": len(cls._memory),
+            "memory_bytes": cls._memory_bytes
+        }
@@ -1,25 +1,153 @@
 # src/utils/database_service.py
 from sqlmodel import SQLModel
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
 )
-from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.exc import DBAPIError, IntegrityError, InterfaceError, OperationalError
+import asyncio
+import bisect
 import os
-from typing import Optional
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
+from src.utils.config_manager import ConfigManager
 from src.utils.logger import get_logger
 
 load_dotenv()
 logger = get_logger(__name__)
 
+# Pool defaults, overridable from the "database" section of global_config
+DEFAULT_POOL_CONFIG: Dict[str, Any] = {
+    "pool_size": 10,
+    "max_overflow": 10,
+    "pool_timeout": 30,
+    "pool_recycle": 1800,
+    "pool_pre_ping": True,
+    # asyncpg's own statement cache and SQLAlchemy's prepared statement cache (0 disables both, for pgbouncer)
+    "statement_cache_size": 500,
+    "prepared_statement_cache_size": 500,
+    "command_timeout": 30,
+    "slow_acquire_ms": 100,
+    # Read replicas (DATABASE_REPLICA_URLS, comma separated)
+    "replica_connect_timeout": 5,
+    "replica_retry_seconds": 30,
+}
+
+# Any error while checking out a replica connection means it is unreachable;
+# mid-query only connection-level errors count (not a bad statement)
+REPLICA_CONNECT_FAILURES = (DBAPIError, OSError, asyncio.TimeoutError)
+REPLICA_QUERY_FAILURES = (OperationalError, InterfaceError, OSError, asyncio.TimeoutError)
+
+# Checkout latency histogram bucket upper bounds (ms); the last bucket is everything above
+ACQUIRE_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+@dataclass
+class PoolMetrics:
+    """Connection checkout counters for one engine"""
+    acquisitions: int = 0
+    slow_acquisitions: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    connects: int = 0
+    invalidations: int = 0
+    peak_checked_out: int = 0
+    histogram: List[int] = field(default_factory=lambda: [0] * (len(ACQUIRE_BUCKETS_MS) + 1))
+
+    def record(self, wait_ms: float) -> None:
+        self.acquisitions += 1
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self.histogram[bisect.bisect_left(ACQUIRE_BUCKETS_MS, wait_ms)] += 1
+
+    @property
+    def avg_wait_ms(self) -> float:
+        return self.total_wait_ms / self.acquisitions if self.acquisitions else 0.0
+
+    def histogram_labels(self) -> Dict[str, int]:
+        labels = [f"<={bound}ms" for bound in ACQUIRE_BUCKETS_MS] + [f">{ACQUIRE_BUCKETS_MS[-1]}ms"]
+        return dict(zip(labels, self.histogram))
+
+
+@dataclass
+class ReplicaState:
+    """One read replica engine plus its health"""
+    name: str
+    engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+    metrics: PoolMetrics = field(default_factory=PoolMetrics)
+    unhealthy_until: float = 0.0
+    failures: int = 0
+    last_error: Optional[str] = None
+
+    @property
+    def healthy(self) -> bool:
+        return self.unhealthy_until <= time.monotonic()
+
+
 class DatabaseService:
     _engine: Optional[AsyncEngine] = None
     _session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+    _pool_config: Dict[str, Any] = dict(DEFAULT_POOL_CONFIG)
+    _pool_metrics: PoolMetrics = PoolMetrics()
+    _replicas: List[ReplicaState] = []
+    _replica_cursor: int = 0
+    _read_fallbacks: int = 0
+
+    @classmethod
+    def _load_pool_config(cls) -> Dict[str, Any]:
+        config = dict(DEFAULT_POOL_CONFIG)
+        config.update((ConfigManager.get("global_config") or {}).get("database", {}))
+        return config
+
+    @classmethod
+    def _create_engine(cls, database_url: str, config: Dict[str, Any], metrics: PoolMetrics,
+                       connect_timeout: Optional[float] = None) -> AsyncEngine:
+        """Build an engine with the tuned pool and wire pool events into metrics"""
+        connect_args = {
+            "statement_cache_size": config["statement_cache_size"],
+            "prepared_statement_cache_size": config["prepared_statement_cache_size"],
+            "command_timeout": config["command_timeout"],
+        }
+        if connect_timeout is not None:
+            connect_args["timeout"] = connect_timeout
+
+        engine = create_async_engine(
+            database_url,
+            echo=False,
+            future=True,
+            pool_size=config["pool_size"],
+            max_overflow=config["max_overflow"],
+            pool_timeout=config["pool_timeout"],
+            pool_recycle=config["pool_recycle"],
+            pool_pre_ping=config["pool_pre_ping"],
+            connect_args=connect_args,
+        )
+
+        pool = engine.sync_engine.pool
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            metrics.connects += 1
+
+        @event.listens_for(engine.sync_engine, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            checked_out = pool.checkedout()  # type: ignore[attr-defined]
+            if checked_out > metrics.peak_checked_out:
+                metrics.peak_checked_out = checked_out
+
+        @event.listens_for(engine.sync_engine, "invalidate")
+        def _on_invalidate(dbapi_connection, connection_record, exception):
+            metrics.invalidations += 1
+
+        return engine
 
     @classmethod
     def init(cls):
@@ -28,11 +156,9 @@ class DatabaseService:
             logger.error("DATABASE_URL not found in environment.")
             raise ValueError("Missing DATABASE_URL")
 
-        cls._engine = create_async_engine(
-            database_url,
-            echo=False,
-            future=True,
-        )
+        cls._pool_config = cls._load_pool_config()
+        cls._pool_metrics = PoolMetrics()
+        cls._engine = cls._create_engine(database_url, cls._pool_config, cls._pool_metrics)
 
         cls._session_factory = async_sessionmaker(
             cls._engine,
@@ -40,7 +166,28 @@ class DatabaseService:
             expire_on_commit=False,
         )
 
-        logger.info("DatabaseService initialized.")
+        cls._replicas = []
+        cls._replica_cursor = 0
+        cls._read_fallbacks = 0
+        replica_urls = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+        for index, replica_url in enumerate(replica_urls, start=1):
+            metrics = PoolMetrics()
+            engine = cls._create_engine(
+                replica_url, cls._pool_config, metrics, cls._pool_config["replica_connect_timeout"]
+            )
+            cls._replicas.append(ReplicaState(
+                name=f"replica_{index}",
+                engine=engine,
+                session_factory=async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+                metrics=metrics,
+            ))
+
+        logger.info(
+            f"DatabaseService initialized (pool_size={cls._pool_config['pool_size']}, "
+            f"max_overflow={cls._pool_config['max_overflow']}, "
+            f"statement_cache_size={cls._pool_config['statement_cache_size']}, "
+            f"replicas={len(cls._replicas)})."
+        )
 
     @classmethod
     def get_engine(cls) -> AsyncEngine:
@@ -54,6 +201,18 @@ class DatabaseService:
             raise RuntimeError("DatabaseService not initialized.")
         return cls._session_factory
 
+    @classmethod
+    async def _acquire(cls, session: AsyncSession, engine: AsyncEngine, metrics: PoolMetrics, label: str) -> None:
+        """Check out the session's connection up front so pool wait time is measured"""
+        start = time.perf_counter()
+        await session.connection()
+        wait_ms = (time.perf_counter() - start) * 1000
+        metrics.record(wait_ms)
+
+        if wait_ms >= cls._pool_config["slow_acquire_ms"]:
+            metrics.slow_acquisitions += 1
+            logger.warning(f"Slow {label} connection acquire: {wait_ms:.1f}ms ({engine.pool.status()})")
+
     @classmethod
     @asynccontextmanager
     async def get_session(cls):
@@ -61,6 +220,7 @@ class DatabaseService:
         session_factory = cls.get_session_factory()
         async with session_factory() as session:
             try:
+                await cls._acquire(session, cls.get_engine(), cls._pool_metrics, "primary")
                 yield session
             except Exception:
                 await session.rollback()
@@ -72,9 +232,126 @@ class DatabaseService:
     @asynccontextmanager
     async def get_transaction(cls):
         """Context manager for database transactions."""
-        async with cls.get_session() as session:
-            async with session.begin():
-                yield session
+        session_factory = cls.get_session_factory()
+        async with session_factory() as session:
+            try:
+                async with session.begin():
+                    # Acquire inside begin(): session.connection() would otherwise autobegin first
+                    await cls._acquire(session, cls.get_engine(), cls._pool_metrics, "primary")
+                    yield session
+            except Exception:
+                await session.rollback()
+                raise
+            finally:
+                await session.close()
+
+    @classmethod
+    def _mark_replica_unhealthy(cls, replica: ReplicaState, error: BaseException) -> None:
+        replica.failures += 1
+        replica.last_error = f"{type(error).__name__}: {error}"
+        replica.unhealthy_until = time.monotonic() + cls._pool_config["replica_retry_seconds"]
+        logger.warning(
+            f"Read replica {replica.name} ({replica.engine.url.host}) marked unhealthy for "
+            f"{cls._pool_config['replica_retry_seconds']}s: {replica.last_error}"
+        )
+
+    @classmethod
+    async def _open_replica_session(cls):
+        """Round-robin over healthy replicas; returns (replica, session) or (None, None)"""
+        count = len(cls._replicas)
+        for _ in range(count):
+            replica = cls._replicas[cls._replica_cursor % count]
+            cls._replica_cursor += 1
+            # An unhealthy replica gets one probe once its retry window has passed
+            if not replica.healthy:
+                continue
+
+            session = replica.session_factory()
+            try:
+                await cls._acquire(session, replica.engine, replica.metrics, replica.name)
+                return replica, session
+            except REPLICA_CONNECT_FAILURES as e:
+                await session.close()
+                cls._mark_replica_unhealthy(replica, e)
+
+        return None, None
+
+    @classmethod
+    @asynccontextmanager
+    async def get_read_session(cls):
+        """Context manager for read-only sessions: a healthy replica, else the primary."""
+        replica, session = await cls._open_replica_session()
+
+        if session is None:
+            if cls._replicas:
+                cls._read_fallbacks += 1
+            async with cls.get_session() as primary_session:
+                yield primary_session
+            return
+
+        try:
+            yield session
+        except REPLICA_QUERY_FAILURES as e:
+            # Too late to retry this read, but steer the next ones away
+            cls._mark_replica_unhealthy(replica, e)
+            await session.rollback()
+            raise
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    @classmethod
+    def _engine_pool_metrics(cls, engine: AsyncEngine, metrics: PoolMetrics) -> Dict[str, Any]:
+        pool = engine.pool
+        return {
+            "pool_size": pool.size(),  # type: ignore[attr-defined]
+            "checked_out": pool.checkedout(),  # type: ignore[attr-defined]
+            "checked_in": pool.checkedin(),  # type: ignore[attr-defined]
+            "overflow": pool.overflow(),  # type: ignore[attr-defined]
+            "peak_checked_out": metrics.peak_checked_out,
+            "acquisitions": metrics.acquisitions,
+            "slow_acquisitions": metrics.slow_acquisitions,
+            "avg_wait_ms": round(metrics.avg_wait_ms, 2),
+            "max_wait_ms": round(metrics.max_wait_ms, 2),
+            "connects": metrics.connects,
+            "invalidations": metrics.invalidations,
+            "wait_histogram": metrics.histogram_labels(),
+        }
+
+    @classmethod
+    def get_pool_metrics(cls) -> Dict[str, Any]:
+        """Live pool occupancy plus checkout latency stats"""
+        metrics = {
+            "config": dict(cls._pool_config),
+            "primary": cls._engine_pool_metrics(cls.get_engine(), cls._pool_metrics),
+        }
+        if cls._replicas:
+            metrics["primary"]["read_fallbacks"] = cls._read_fallbacks
+
+        for replica in cls._replicas:
+            replica_metrics = cls._engine_pool_metrics(replica.engine, replica.metrics)
+            replica_metrics.update({
+                "healthy": replica.healthy,
+                "failures": replica.failures,
+                "last_error": replica.last_error,
+            })
+            metrics[replica.name] = replica_metrics
+        return metrics
+
+    @classmethod
+    def reset_pool_metrics(cls) -> None:
+        """Zero the latency counters (the pool itself is untouched)"""
+        fresh = PoolMetrics()
+        for metrics in [cls._pool_metrics] + [replica.metrics for replica in cls._replicas]:
+            metrics.acquisitions = fresh.acquisitions
+            metrics.slow_acquisitions = fresh.slow_acquisitions
+            metrics.total_wait_ms = fresh.total_wait_ms
+            metrics.max_wait_ms = fresh.max_wait_ms
+            metrics.peak_checked_out = fresh.peak_checked_out
+            metrics.histogram = list(fresh.histogram)
+        cls._read_fallbacks = 0
 
     @classmethod
     async def create_all_tables(cls):
@@ -92,4 +369,4 @@ class DatabaseService:
             return verify_model_relationships()
         except Exception as e:
             logger.error(f"Model integrity check failed: {e}")
-            return False
\ No newline at end of file
+            return False
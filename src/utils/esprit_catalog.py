@@ -0,0 +1,206 @@
+# src/utils/esprit_catalog.py
+"""
+In-process catalog of every EspritBase row.
+
+The catalog is loaded from the database once at startup and served from memory
+afterwards, so gacha rolls, captures, fusions and searches never need a
+`select(EspritBase)` round trip. Each load builds a brand new immutable
+snapshot and swaps it in with a single assignment, so readers always see a
+consistent set of indexes.
+
+Entries are detached ORM instances: treat them as read-only. Code that needs
+to modify an EspritBase row must select it inside its own transaction.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import select
+
+from src.database.models.esprit_base import EspritBase
+from src.utils.database_service import DatabaseService
+from src.utils.redis_service import RedisService
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_EMPTY: Tuple[EspritBase, ...] = ()
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Immutable view of all EspritBase rows with prebuilt indexes"""
+    bases: Tuple[EspritBase, ...]
+    by_id: Mapping[int, EspritBase]
+    by_name: Mapping[str, EspritBase]
+    by_tier: Mapping[int, Tuple[EspritBase, ...]]
+    by_element: Mapping[str, Tuple[EspritBase, ...]]
+    by_tier_element: Mapping[Tuple[int, str], Tuple[EspritBase, ...]]
+    version: str = ""
+    loaded_at: datetime = field(default_factory=datetime.utcnow)
+    
+    @classmethod
+    def build(cls, bases: Iterable[EspritBase], version: str = "") -> "CatalogSnapshot":
+        """Build every index in one pass over the rows"""
+        ordered = sorted(bases, key=lambda b: (b.base_tier, b.name.lower()))
+        
+        by_id: Dict[int, EspritBase] = {}
+        by_name: Dict[str, EspritBase] = {}
+        by_tier: Dict[int, List[EspritBase]] = {}
+        by_element: Dict[str, List[EspritBase]] = {}
+        by_tier_element: Dict[Tuple[int, str], List[EspritBase]] = {}
+        
+        for base in ordered:
+            element = base.element.lower()
+            if base.id is not None:
+                by_id[base.id] = base
+            by_name[base.name.lower()] = base
+            by_tier.setdefault(base.base_tier, []).append(base)
+            by_element.setdefault(element, []).append(base)
+            by_tier_element.setdefault((base.base_tier, element), []).append(base)
+        
+        return cls(
+            bases=tuple(ordered),
+            by_id=MappingProxyType(by_id),
+            by_name=MappingProxyType(by_name),
+            by_tier=MappingProxyType({k: tuple(v) for k, v in by_tier.items()}),
+            by_element=MappingProxyType({k: tuple(v) for k, v in by_element.items()}),
+            by_tier_element=MappingProxyType({k: tuple(v) for k, v in by_tier_element.items()}),
+            version=version
+        )
+    
+    def __len__(self) -> int:
+        return len(self.bases)
+    
+    # --- LOOKUPS ---
+    
+    def get(self, esprit_base_id: Optional[int]) -> Optional[EspritBase]:
+        """Get base by primary key"""
+        if esprit_base_id is None:
+            return None
+        return self.by_id.get(esprit_base_id)
+    
+    def get_by_name(self, name: str) -> Optional[EspritBase]:
+        """Get base by exact name (case-insensitive)"""
+        return self.by_name.get(name.lower()) if name else None
+    
+    def search(self, query: str) -> List[EspritBase]:
+        """Get all bases whose name contains the query (case-insensitive)"""
+        needle = query.lower()
+        return [base for base in self.bases if needle in base.name.lower()]
+    
+    def find(self, name: str) -> Optional[EspritBase]:
+        """Exact name match first, then the first partial match"""
+        exact = self.get_by_name(name)
+        if exact is not None:
+            return exact
+        matches = self.search(name) if name else []
+        return matches[0] if matches else None
+    
+    def get_tier(self, tier: int) -> Tuple[EspritBase, ...]:
+        """Get all bases of a tier"""
+        return self.by_tier.get(tier, _EMPTY)
+    
+    def get_element(self, element: str) -> Tuple[EspritBase, ...]:
+        """Get all bases of an element (case-insensitive)"""
+        return self.by_element.get(element.lower(), _EMPTY)
+    
+    def get_tier_element(self, tier: int, element: str) -> Tuple[EspritBase, ...]:
+        """Get all bases of a tier and element"""
+        return self.by_tier_element.get((tier, element.lower()), _EMPTY)
+    
+    def get_tiers(self, tiers: Iterable[int]) -> List[EspritBase]:
+        """Get all bases in any of the given tiers"""
+        result: List[EspritBase] = []
+        for tier in sorted(set(tiers)):
+            result.extend(self.get_tier(tier))
+        return result
+    
+    def tier_counts(self) -> Dict[int, int]:
+        """Number of bases per tier"""
+        return {tier: len(bases) for tier, bases in self.by_tier.items()}
+    
+    def element_counts(self) -> Dict[str, int]:
+        """Number of bases per element (lowercase keys)"""
+        return {element: len(bases) for element, bases in self.by_element.items()}
+
+
+class EspritCatalog:
+    """Process-wide holder for the current CatalogSnapshot"""
+    
+    # Redis key bumped whenever any process rebuilds the catalog from the database
+    VERSION_KEY = "esprit_catalog:version"
+    
+    # How often (seconds) a running bot checks whether another process rebuilt the catalog
+    VERSION_CHECK_INTERVAL = 60
+    
+    _snapshot: Optional[CatalogSnapshot] = None
+    _lock: Optional[asyncio.Lock] = None
+    _last_version_check: float = 0.0
+    
+    @classmethod
+    def _get_lock(cls) -> asyncio.Lock:
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        return cls._lock
+    
+    @classmethod
+    def is_loaded(cls) -> bool:
+        """Check if a snapshot has been built"""
+        return cls._snapshot is not None
+    
+    @classmethod
+    async def load(cls, publish: bool = False) -> CatalogSnapshot:
+        """
+        Rebuild the catalog from the database and swap it in atomically.
+        With publish=True, other processes are told to rebuild on their next version check.
+        """
+        async with cls._get_lock():
+            async with DatabaseService.get_session() as session:
+                bases = (await session.execute(select(EspritBase))).scalars().all()
+                session.expunge_all()
+            
+            version = str(time.time_ns())
+            if publish:
+                await RedisService.set(cls.VERSION_KEY, version)
+            else:
+                version = await RedisService.get(cls.VERSION_KEY) or version
+            
+            snapshot = CatalogSnapshot.build(bases, version)
+            cls._snapshot = snapshot
+            cls._last_version_check = time.monotonic()
+        
+        logger.info(f"EspritCatalog loaded: {len(snapshot)} bases across {len(snapshot.by_tier)} tiers")
+        return snapshot
+    
+    @classmethod
+    async def reload(cls) -> CatalogSnapshot:
+        """Rebuild the catalog and notify every other process"""
+        return await cls.load(publish=True)
+    
+    @classmethod
+    async def get_snapshot(cls) -> CatalogSnapshot:
+        """Get the current snapshot, loading it on first use"""
+        snapshot = cls._snapshot
+        if snapshot is None:
+            return await cls.load()
+        
+        if time.monotonic() - cls._last_version_check >= cls.VERSION_CHECK_INTERVAL:
+            cls._last_version_check = time.monotonic()
+            remote_version = await RedisService.get(cls.VERSION_KEY)
+            if remote_version and remote_version != snapshot.version:
+                logger.info("EspritCatalog version changed in another process - rebuilding")
+                return await cls.load()
+        
+        return snapshot
+    
+    @classmethod
+    def get_loaded_snapshot(cls) -> CatalogSnapshot:
+        """Get the current snapshot from synchronous code"""
+        if cls._snapshot is None:
+            raise RuntimeError("EspritCatalog not loaded.")
+        return cls._snapshot
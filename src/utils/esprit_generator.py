@@ -15,6 +15,8 @@ from src.utils.config_manager import ConfigManager
 from src.utils.logger import get_logger
 from src.utils.game_constants import Tiers, Elements
 from src.utils.embed_colors import EmbedColors
+from src.utils.sprite_index import SpriteIndex
+from src.utils.image_encoder import ImageEncoder, with_extension
 
 logger = get_logger(__name__)
 
@@ -164,60 +166,17 @@ class EspritDisplay:
         draw.text((x, y), text, font=font, fill=fill)
 
     def _find_sprite_path(self, esprit_data: Dict[str, Any]) -> Optional[Path]:
-        """Find esprit sprite using project asset structure"""
-        esprit_name = esprit_data.get("name", "").lower()
+        """Find esprit sprite in the shared asset index"""
+        esprit_name = esprit_data.get("name", "")
         tier = esprit_data.get("tier", esprit_data.get("base_tier", 1))
         
         if not esprit_name:
             return None
-
-        # Get tier folder
-        tier_info = self.tier_data.get(tier)
-        if not tier_info:
-            logger.warning(f"Unknown tier {tier} for esprit {esprit_name}")
-            return None
-
-        tier_folder = tier_info["folder"]
-        
-        # Name variations to try
-        name_variants = [
-            esprit_name.replace(" ", "_"),
-            esprit_name.replace(" ", "-"),
-            esprit_name.replace(" ", ""),
-            esprit_name,
-            esprit_name.replace("'", "").replace(".", "")
-        ]
-        
-        # File extensions to try
-        extensions = [".png", ".jpg", ".jpeg", ".webp"]
         
-        # Try tier-specific folder first
-        tier_path = SPRITES_PATH / tier_folder
-        if tier_path.exists():
-            for variant in name_variants:
-                for ext in extensions:
-                    sprite_path = tier_path / f"{variant}{ext}"
-                    if sprite_path.exists():
-                        logger.debug(f"Found sprite: {sprite_path}")
-                        return sprite_path
-        
-        # Try all tier folders as fallback
-        for folder in ["common", "uncommon", "rare", "epic", "mythic", "divine",
-                      "legendary", "ethereal", "genesis", "empyrean", "void", "singularity"]:
-            if folder == tier_folder:
-                continue  # Already tried
-                
-            folder_path = SPRITES_PATH / folder
-            if folder_path.exists():
-                for variant in name_variants:
-                    for ext in extensions:
-                        sprite_path = folder_path / f"{variant}{ext}"
-                        if sprite_path.exists():
-                            logger.debug(f"Found sprite in fallback folder: {sprite_path}")
-                            return sprite_path
-        
-        logger.warning(f"No sprite found for {esprit_name} (tier {tier})")
-        return None
+        sprite_path = SpriteIndex.find_sprite(esprit_name, tier)
+        if sprite_path is None:
+            logger.warning(f"No sprite found for {esprit_name} (tier {tier})")
+        return sprite_path
 
     def _load_sprite(self, sprite_path: Path) -> Optional[Image.Image]:
         """Load and scale sprite for card"""
@@ -302,37 +261,13 @@ class EspritDisplay:
         
         return card
 
-    def _save_sync(self, img: Image.Image, filename: str) -> disnake.File:
-        """Save image to Discord file with compression"""
-        buffer = io.BytesIO()
-        
-        # Use PNG for quality, with optimization
-        save_kwargs = {
-            "format": "PNG",
-            "optimize": True,
-            "compress_level": 6
-        }
-        
-        img.save(buffer, **save_kwargs)
-        buffer.seek(0)
-        
-        # Check file size (Discord 8MB limit)
-        size_mb = len(buffer.getvalue()) / (1024 * 1024)
-        if size_mb > 7.5:  # Leave some margin
-            # Resize if too large
-            scale_factor = 0.8
-            new_width = int(img.width * scale_factor)
-            new_height = int(img.height * scale_factor)
-            
-            resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            buffer = io.BytesIO()
-            resized_img.save(buffer, **save_kwargs)
-            buffer.seek(0)
-            
-            logger.info(f"Compressed {filename}: {size_mb:.1f}MB → {len(buffer.getvalue()) / (1024 * 1024):.1f}MB")
-        
-        return disnake.File(buffer, filename=filename)
+    def _save_sync(self, img: Image.Image, filename: str) -> Optional[disnake.File]:
+        """Encode with the shared card encoder and wrap as a Discord file"""
+        compression_config = (ConfigManager.get("stats_display") or {}).get("compression", {})
+        data = ImageEncoder.encode(img, "esprit_display", compression_config)
+        if data is None:
+            return None
+        return disnake.File(io.BytesIO(data), filename=with_extension(filename, data))
 
 
 # Singleton instance
@@ -0,0 +1,217 @@
+# src/utils/image_encoder.py
+"""
+Single-pass, size-aware encoding for rendered cards.
+
+Each format has a ladder of settings ordered fastest -> smallest:
+  - WEBP (lossless): method 0, 2, 4
+  - PNG: compress_level 1, 6, 9 (9 also runs the optimize pass)
+Lossless WebP is used whenever Pillow was built with it ("format": "auto").
+It encodes a card in a fraction of the time PNG's optimize pass takes, and
+the result is smaller as well.
+
+For every (template, settings) pair the encoder keeps a running average of
+bytes per pixel. Before encoding it predicts the size at each rung and picks
+the fastest rung expected to land under `target_kb`, or under the Discord
+limit when no target is set. If even the smallest rung is predicted over the
+limit, it downscales before the first attempt instead of after a failed
+one. A rung is never encoded twice for the same image.
+
+Templates listed in `palette_templates` are quantized to `palette_colors`
+and written as palette PNGs. This is lossy and only suits flat artwork:
+glows, gradients and photo backgrounds band.
+"""
+
+import io
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from PIL import Image, features
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+HAS_WEBP = features.check("webp")
+
+# Fastest -> smallest; the effort value is the WebP method or the PNG compress_level
+LADDERS = {
+    "WEBP": (0, 2, 4),
+    "PNG": (1, 6, 9)
+}
+
+# Weight of the newest encode in the bytes-per-pixel average
+EWMA_WEIGHT = 0.2
+
+# Aim this far under the hard limit when downscaling on a prediction
+RESIZE_MARGIN = 0.95
+
+# Downscale attempts after every rung came out over the limit
+MAX_RESIZES = 3
+
+
+@dataclass(frozen=True)
+class EncodeParams:
+    format: str
+    effort: int
+    palette: bool = False
+    
+    def save_kwargs(self) -> Dict[str, Any]:
+        if self.format == "WEBP":
+            # For lossless WebP "quality" is compression effort, not fidelity
+            return {"format": "WEBP", "lossless": True, "method": self.effort, "quality": 50}
+        return {"format": "PNG", "compress_level": self.effort, "optimize": self.effort >= 9}
+
+
+@dataclass
+class TemplateStats:
+    encodes: int = 0
+    total_bytes: int = 0
+    total_ms: float = 0.0
+    resized: int = 0
+    over_limit: int = 0
+
+
+def extension_for(data: bytes) -> str:
+    """File extension matching encoded bytes (".png" for anything unrecognised)"""
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return ".webp"
+    return ".png"
+
+
+def with_extension(filename: str, data: bytes) -> str:
+    """filename with its extension swapped to match the encoded bytes"""
+    stem, dot, _ = filename.rpartition(".")
+    return f"{stem if dot else filename}{extension_for(data)}"
+
+
+class ImageEncoder:
+    """Process-wide encoder; size estimates are learned per template as cards are encoded"""
+    
+    _bytes_per_pixel: Dict[Tuple[str, EncodeParams], float] = {}
+    _stats: Dict[str, TemplateStats] = {}
+    _lock = threading.Lock()
+    
+    @classmethod
+    def resolve_format(cls, compression_config: Mapping[str, Any]) -> str:
+        requested = str(compression_config.get("format", "auto")).upper()
+        if requested in ("AUTO", "WEBP"):
+            return "WEBP" if HAS_WEBP else "PNG"
+        return "PNG"
+    
+    @classmethod
+    def ladder(cls, template: str, compression_config: Mapping[str, Any]) -> List[EncodeParams]:
+        """Settings this template may be encoded with, fastest first"""
+        if template in compression_config.get("palette_templates", []):
+            return [EncodeParams("PNG", level, palette=True) for level in LADDERS["PNG"]]
+        fmt = cls.resolve_format(compression_config)
+        return [EncodeParams(fmt, effort) for effort in LADDERS[fmt]]
+    
+    @classmethod
+    def predict(cls, template: str, params: EncodeParams, pixels: int) -> Optional[int]:
+        """Expected size in bytes, or None before this template has been encoded with these settings"""
+        ratio = cls._bytes_per_pixel.get((template, params))
+        return int(ratio * pixels) if ratio is not None else None
+    
+    @classmethod
+    def _record(cls, template: str, params: EncodeParams, pixels: int, size: int, elapsed_ms: float) -> None:
+        ratio = size / max(pixels, 1)
+        with cls._lock:
+            key = (template, params)
+            previous = cls._bytes_per_pixel.get(key)
+            cls._bytes_per_pixel[key] = ratio if previous is None else previous + EWMA_WEIGHT * (ratio - previous)
+            stats = cls._stats.setdefault(template, TemplateStats())
+            stats.encodes += 1
+            stats.total_bytes += size
+            stats.total_ms += elapsed_ms
+    
+    @classmethod
+    def _save(cls, template: str, img: Image.Image, params: EncodeParams, colors: int) -> bytes:
+        start = time.perf_counter()
+        source = img.quantize(colors, method=Image.Quantize.FASTOCTREE) if params.palette else img
+        buffer = io.BytesIO()
+        source.save(buffer, **params.save_kwargs())
+        data = buffer.getvalue()
+        cls._record(template, params, img.width * img.height, len(data), (time.perf_counter() - start) * 1000)
+        return data
+    
+    @classmethod
+    def _choose(cls, template: str, ladder: List[EncodeParams], pixels: int, target: int) -> Tuple[int, Optional[int]]:
+        """Index of the fastest rung predicted under target, plus its prediction"""
+        for index, params in enumerate(ladder):
+            predicted = cls.predict(template, params, pixels)
+            if predicted is None or predicted <= target:
+                return index, predicted
+        return len(ladder) - 1, cls.predict(template, ladder[-1], pixels)
+    
+    @staticmethod
+    def _resized(img: Image.Image, factor: float) -> Image.Image:
+        size = (max(1, int(img.width * factor)), max(1, int(img.height * factor)))
+        return img.resize(size, Image.Resampling.LANCZOS)
+    
+    @classmethod
+    def _count_resize(cls, template: str) -> None:
+        with cls._lock:
+            cls._stats.setdefault(template, TemplateStats()).resized += 1
+    
+    @classmethod
+    def encode(cls, img: Image.Image, template: str, compression_config: Mapping[str, Any]) -> Optional[bytes]:
+        """Encoded card under the Discord size limit, or None if even a downscaled encode won't fit"""
+        max_bytes = int(compression_config.get("max_size_mb", 8.0) * 1024 * 1024)
+        target = min(int(compression_config.get("target_kb", 0) * 1024) or max_bytes, max_bytes)
+        colors = int(compression_config.get("palette_colors", 256))
+        ladder = cls.ladder(template, compression_config)
+        
+        index, predicted = cls._choose(template, ladder, img.width * img.height, target)
+        if predicted is not None and predicted > max_bytes:
+            # Known to be too big at full size: downscale before the first encode, not after it fails
+            img = cls._resized(img, math.sqrt(max_bytes / predicted) * RESIZE_MARGIN)
+            cls._count_resize(template)
+            index, _ = cls._choose(template, ladder, img.width * img.height, target)
+        
+        # Over the hard limit, step down the ladder; every attempt uses settings not yet tried
+        for params in ladder[index:]:
+            data = cls._save(template, img, params, colors)
+            if len(data) <= max_bytes:
+                return data
+        
+        # Downscaled images compress worse per pixel, so one shrink may not be enough
+        factor = float(compression_config.get("resize_factor", 0.8))
+        for _ in range(MAX_RESIZES):
+            img = cls._resized(img, min(factor, math.sqrt(max_bytes / len(data)) * RESIZE_MARGIN))
+            cls._count_resize(template)
+            data = cls._save(template, img, ladder[-1], colors)
+            if len(data) <= max_bytes:
+                return data
+        
+        with cls._lock:
+            cls._stats[template].over_limit += 1
+        logger.error(f"Could not encode {template} card below {max_bytes // 1024}KB")
+        return None
+    
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        """Per-template encode counts, average bytes and ms, and the learned size estimates"""
+        with cls._lock:
+            return {
+                template: {
+                    "encodes": stats.encodes,
+                    "avg_bytes": stats.total_bytes // max(stats.encodes, 1),
+                    "avg_ms": round(stats.total_ms / max(stats.encodes, 1), 2),
+                    "resized": stats.resized,
+                    "over_limit": stats.over_limit,
+                    "bytes_per_pixel": {
+                        f"{params.format.lower()}:{params.effort}{':palette' if params.palette else ''}": round(ratio, 4)
+                        for (name, params), ratio in cls._bytes_per_pixel.items() if name == template
+                    }
+                }
+                for template, stats in cls._stats.items()
+            }
+    
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._bytes_per_pixel.clear()
+            cls._stats.clear()
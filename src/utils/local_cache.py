@@ -0,0 +1,169 @@
+# src/utils/local_cache.py
+"""
+Process-local LRU cache with per-entry TTL and tag tracking.
+
+Used as the L1 tier in front of Redis by CacheService. Everything here is
+synchronous and lock-free: the bot runs on a single event loop, so no two
+coroutines can touch the OrderedDict at the same time.
+
+Containers are stored as pickled snapshots and every hit unpickles a fresh
+copy, so a caller mutating its result can't change what the next caller
+sees. Immutable scalars are stored as they are.
+"""
+
+import fnmatch
+import pickle
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional, Set
+
+
+@dataclass
+class LocalCacheStats:
+    """L1 counters"""
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return (self.hits / total) if total > 0 else 0.0
+
+
+# Stored as-is; anything else is snapshotted with pickle
+_IMMUTABLE = (str, bytes, int, float, bool, type(None))
+
+
+@dataclass
+class _LocalEntry:
+    value: Any
+    expires_at: float
+    tags: Set[str] = field(default_factory=set)
+    pickled: bool = False
+
+
+class LocalLRUCache:
+    """Size-bounded LRU with per-entry TTL"""
+    
+    _MISSING = object()
+    
+    def __init__(self, max_entries: int = 2048, max_ttl: int = 60):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self.stats = LocalCacheStats()
+        self._entries: "OrderedDict[str, _LocalEntry]" = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.expires_at > time.monotonic()
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a live entry and mark it most recently used"""
+        value = self.lookup(key)
+        return default if value is self._MISSING else value
+    
+    def lookup(self, key: str) -> Any:
+        """Like get, but returns LocalLRUCache._MISSING on a miss so None can be cached"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return self._MISSING
+        
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return self._MISSING
+        
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return pickle.loads(entry.value) if entry.pickled else entry.value
+    
+    def set(self, key: str, value: Any, ttl: float, tags: Optional[Iterable[str]] = None) -> None:
+        """Store a snapshot of an entry; its TTL is capped at max_ttl to bound staleness"""
+        if key in self._entries:
+            self._remove(key)
+        
+        ttl = min(ttl, self.max_ttl)
+        if ttl <= 0:
+            return
+        
+        pickled = not isinstance(value, _IMMUTABLE)
+        if pickled:
+            try:
+                value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                # Can't snapshot it, so don't share it
+                return
+        
+        tag_set = set(tags) if tags else set()
+        self._entries[key] = _LocalEntry(value, time.monotonic() + ttl, tag_set, pickled)
+        for tag in tag_set:
+            self._tag_index.setdefault(tag, set()).add(key)
+        self.stats.sets += 1
+        
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats.evictions += 1
+    
+    def delete(self, key: str) -> bool:
+        if key not in self._entries:
+            return False
+        self._remove(key)
+        self.stats.invalidations += 1
+        return True
+    
+    def delete_many(self, keys: Iterable[str]) -> int:
+        return sum(1 for key in keys if self.delete(key))
+    
+    def delete_tags(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying any of the tags"""
+        keys = set()
+        for tag in tags:
+            keys.update(self._tag_index.get(tag, ()))
+        return self.delete_many(keys)
+    
+    def delete_pattern(self, pattern: str) -> int:
+        """Drop every entry whose key matches a Redis-style glob"""
+        return self.delete_many([key for key in self._entries if fnmatch.fnmatchcase(key, pattern)])
+    
+    def clear(self) -> None:
+        self.stats.invalidations += len(self._entries)
+        self._entries.clear()
+        self._tag_index.clear()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters and occupancy for metrics"""
+        return {
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "hit_rate": self.stats.hit_rate,
+            "sets": self.stats.sets,
+            "evictions": self.stats.evictions,
+            "expirations": self.stats.expirations,
+            "invalidations": self.stats.invalidations,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "max_ttl": self.max_ttl
+        }
+    
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
@@ -0,0 +1,245 @@
+# src/utils/loot_sampler.py
+"""
+Precompiled weighted samplers for the echo brackets in loot_tables.json.
+
+Each (echo type, level bracket) is compiled once into a two-level alias table
+(Vose's method): the first level picks a tier, the second picks an Esprit from
+that tier's prebuilt candidate array weighted by element preference. Both
+draws are O(1), so opening N echoes costs N table lookups and no JSON walking.
+
+Samplers are rebuilt automatically whenever the EspritCatalog snapshot or the
+loot_tables config object changes.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.database.models.esprit_base import EspritBase
+from src.utils.config_manager import ConfigManager
+from src.utils.esprit_catalog import CatalogSnapshot, EspritCatalog
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AliasTable:
+    """Vose's alias method: O(n) build, O(1) weighted draw"""
+    
+    __slots__ = ("size", "prob", "alias", "weights")
+    
+    def __init__(self, weights: Sequence[float]):
+        total = float(sum(weights))
+        if not weights or total <= 0:
+            raise ValueError("AliasTable requires at least one positive weight")
+        
+        n = len(weights)
+        self.size = n
+        self.weights = tuple(w / total for w in weights)
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+        
+        scaled = [w * n for w in self.weights]
+        small = [i for i, w in enumerate(scaled) if w < 1.0]
+        large = [i for i, w in enumerate(scaled) if w >= 1.0]
+        
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+        
+        # Leftovers are 1.0 up to floating point error
+        for i in large + small:
+            self.prob[i] = 1.0
+    
+    def draw(self, rng: random.Random) -> int:
+        """Draw one index"""
+        u = rng.random() * self.size
+        i = int(u)
+        return i if (u - i) < self.prob[i] else self.alias[i]
+    
+    def draw_many(self, count: int, rng: random.Random) -> List[int]:
+        """Draw `count` indexes in one pass"""
+        size, prob, alias, rand = self.size, self.prob, self.alias, rng.random
+        result = []
+        for _ in range(count):
+            u = rand() * size
+            i = int(u)
+            result.append(i if (u - i) < prob[i] else alias[i])
+        return result
+
+
+@dataclass(frozen=True)
+class TierPool:
+    """Candidate array for one tier with its element-weighted alias table"""
+    tier: int
+    tier_probability: float
+    candidates: Tuple[EspritBase, ...]
+    table: AliasTable
+
+
+class BracketSampler:
+    """Compiled sampler for one (echo type, level bracket)"""
+    
+    def __init__(self, echo_type: str, bracket: str, min_level: int, max_level: int,
+                 pools: List[TierPool]):
+        self.echo_type = echo_type
+        self.bracket = bracket
+        self.min_level = min_level
+        self.max_level = max_level
+        self.pools = tuple(pools)
+        self.tier_table = AliasTable([pool.tier_probability for pool in pools])
+    
+    def sample(self, rng: Optional[random.Random] = None) -> EspritBase:
+        """Draw one Esprit"""
+        rng = rng or _rng
+        pool = self.pools[self.tier_table.draw(rng)]
+        return pool.candidates[pool.table.draw(rng)]
+    
+    def sample_many(self, count: int, rng: Optional[random.Random] = None) -> List[EspritBase]:
+        """Draw `count` Esprits in one call"""
+        rng = rng or _rng
+        pools = self.pools
+        return [
+            pools[t].candidates[pools[t].table.draw(rng)]
+            for t in self.tier_table.draw_many(count, rng)
+        ]
+    
+    def tier_probabilities(self) -> Dict[int, float]:
+        """Exact chance of each tier"""
+        return {pool.tier: pool.tier_probability for pool in self.pools}
+    
+    def probabilities(self) -> Dict[int, float]:
+        """Exact chance of each Esprit, keyed by esprit_base_id"""
+        rates: Dict[int, float] = {}
+        for pool in self.pools:
+            for base, weight in zip(pool.candidates, pool.table.weights):
+                if base.id is not None:
+                    rates[base.id] = rates.get(base.id, 0.0) + pool.tier_probability * weight
+        return rates
+    
+    def drop_rates(self) -> List[Dict[str, Any]]:
+        """Per-Esprit drop rates ready for display, highest first"""
+        rows = []
+        for pool in self.pools:
+            for base, weight in zip(pool.candidates, pool.table.weights):
+                rows.append({
+                    "esprit_base_id": base.id, "name": base.name,
+                    "tier": base.base_tier, "element": base.element,
+                    "probability": pool.tier_probability * weight
+                })
+        rows.sort(key=lambda row: (-row["probability"], row["name"]))
+        return rows
+
+
+# Shared RNG for all samplers
+_rng = random.Random()
+
+
+class LootSamplers:
+    """Registry of compiled echo samplers"""
+    
+    _samplers: Dict[str, List[BracketSampler]] = {}
+    # The exact catalog snapshot and loot_tables dict the samplers were built from
+    _compiled_for: Tuple[Optional[CatalogSnapshot], Optional[Dict[str, Any]]] = (None, None)
+    
+    @staticmethod
+    def _parse_bracket(bracket: str) -> Tuple[int, int]:
+        """'26-50' -> (26, 50)"""
+        low, _, high = bracket.partition("-")
+        return int(low), int(high or low)
+    
+    @classmethod
+    def compile(cls, catalog: CatalogSnapshot, loot_tables: Dict[str, Any]) -> Dict[str, List[BracketSampler]]:
+        """Compile every echo bracket against the given catalog"""
+        compiled: Dict[str, List[BracketSampler]] = {}
+        
+        for echo_type, echo_config in loot_tables.items():
+            if not isinstance(echo_config, dict):
+                continue
+            
+            max_tier = echo_config.get("max_tier", 12)
+            brackets = []
+            
+            for bracket, bracket_config in (echo_config.get("level_brackets") or {}).items():
+                try:
+                    min_level, max_level = cls._parse_bracket(bracket)
+                except ValueError:
+                    logger.warning(f"Skipping malformed level bracket '{bracket}' in {echo_type}")
+                    continue
+                
+                element_pref = {k.lower(): float(v) for k, v in (bracket_config.get("element_preference") or {}).items()}
+                tier_weights = {int(k): float(v) for k, v in (bracket_config.get("tier_weights") or {}).items()}
+                
+                # Build per-tier pools; tiers without candidates are dropped and the rest renormalized
+                raw_pools = []
+                for tier, tier_weight in sorted(tier_weights.items()):
+                    if tier_weight <= 0 or tier > max_tier:
+                        continue
+                    
+                    candidates = []
+                    weights = []
+                    for base in catalog.get_tier(tier):
+                        weight = element_pref.get(base.element.lower(), 1.0)
+                        if weight > 0:
+                            candidates.append(base)
+                            weights.append(weight)
+                    
+                    if candidates:
+                        raw_pools.append((tier, tier_weight, tuple(candidates), AliasTable(weights)))
+                
+                if not raw_pools:
+                    logger.warning(f"No candidates for {echo_type} bracket {bracket}")
+                    continue
+                
+                total = sum(weight for _, weight, _, _ in raw_pools)
+                pools = [
+                    TierPool(tier=tier, tier_probability=weight / total, candidates=candidates, table=table)
+                    for tier, weight, candidates, table in raw_pools
+                ]
+                brackets.append(BracketSampler(echo_type, bracket, min_level, max_level, pools))
+            
+            if brackets:
+                brackets.sort(key=lambda b: b.min_level)
+                compiled[echo_type] = brackets
+        
+        return compiled
+    
+    @classmethod
+    def rebuild(cls, catalog: CatalogSnapshot) -> int:
+        """Recompile all samplers from the current loot_tables config"""
+        # Remember the raw config object (None included) so get() can compare identities
+        loot_tables = ConfigManager.get("loot_tables")
+        cls._samplers = cls.compile(catalog, loot_tables or {})
+        cls._compiled_for = (catalog, loot_tables)
+        
+        count = sum(len(brackets) for brackets in cls._samplers.values())
+        logger.info(f"Compiled {count} echo bracket samplers for {len(cls._samplers)} echo types")
+        return count
+    
+    @classmethod
+    async def get(cls, echo_type: str, level: int) -> BracketSampler:
+        """Get the sampler for an echo type at a player level"""
+        catalog = await EspritCatalog.get_snapshot()
+        loot_tables = ConfigManager.get("loot_tables")
+        
+        compiled_catalog, compiled_tables = cls._compiled_for
+        if compiled_catalog is not catalog or compiled_tables is not loot_tables:
+            cls.rebuild(catalog)
+        
+        brackets = cls._samplers.get(echo_type)
+        if not brackets:
+            raise ValueError(f"No loot table configured for {echo_type}")
+        
+        for sampler in brackets:
+            if sampler.min_level <= level <= sampler.max_level:
+                return sampler
+        
+        # Outside every bracket: clamp to the nearest end
+        return brackets[0] if level < brackets[0].min_level else brackets[-1]
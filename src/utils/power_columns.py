@@ -0,0 +1,147 @@
+# src/utils/power_columns.py
+"""
+Columnar stack power for whole collections.
+
+Callers pull plain row tuples instead of ORM objects:
+
+    (base_atk, base_def, base_hp, awakening_level, quantity, element, tier, name)
+
+Per-copy and per-stack power, the per-element and per-tier sums and the
+top contributors are all computed over NumPy arrays in one pass. The
+vector path uses Esprit.calculate_power's constants and the same
+arithmetic (float64 multiplier, truncation toward zero), so results match
+the object loop value for value. Without NumPy the plain loop calls
+Esprit.calculate_power itself.
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+from src.database.models.esprit import AWAKENING_BONUS_PER_STAR, HP_POWER_DIVISOR, Esprit
+
+try:
+    import numpy as np  # type: ignore
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    np = None  # type: ignore
+
+STACK_FIELDS = ("base_atk", "base_def", "base_hp", "awakening_level", "quantity", "element", "tier", "name")
+_STATS = ("atk", "def", "hp", "power")
+
+StackRow = Tuple[int, int, int, int, int, str, int, str]
+
+
+def individual_power_columns(rows: Sequence[StackRow]) -> Dict[str, Any]:
+    """Per-copy atk/def/hp/power for every row, as int64 arrays (lists without NumPy)"""
+    if not HAS_NUMPY:
+        powers = [Esprit.calculate_power(r[0], r[1], r[2], r[3]) for r in rows]
+        return {stat: [p[stat] for p in powers] for stat in _STATS}
+    
+    if not rows:
+        return {stat: np.zeros(0, dtype=np.int64) for stat in _STATS}
+    
+    stats = np.array([r[:4] for r in rows], dtype=np.int64)
+    multiplier = 1.0 + stats[:, 3] * AWAKENING_BONUS_PER_STAR
+    atk, defense, hp = (stats[:, :3] * multiplier[:, None]).astype(np.int64).T
+    return {"atk": atk, "def": defense, "hp": hp, "power": atk + defense + hp // HP_POWER_DIVISOR}
+
+
+def _group_sums(keys: List[Any], values: Dict[str, Any], quantity) -> Dict[Any, Dict[str, int]]:
+    """{key: {atk, def, hp, count}} in first-seen key order"""
+    uniques, first_index, inverse = np.unique(np.asarray(keys), return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    sums = {
+        stat: np.bincount(inverse, weights=values[stat], minlength=len(uniques)).round().astype(np.int64)
+        for stat in ("atk", "def", "hp")
+    }
+    counts = np.bincount(inverse, weights=quantity, minlength=len(uniques)).round().astype(np.int64)
+    
+    groups = {}
+    for g in np.argsort(first_index, kind="stable").tolist():
+        key = uniques[g].item()
+        groups[key] = {
+            "atk": int(sums["atk"][g]), "def": int(sums["def"][g]), "hp": int(sums["hp"][g]),
+            "count": int(counts[g])
+        }
+    return groups
+
+
+def summarize_collection(rows: Sequence[StackRow], top_n: int = 10) -> Dict[str, Any]:
+    """
+    base_power, power_by_element, power_by_tier, top_contributors, total_esprits,
+    total_quantity and average_tier for a collection - the same shape (and
+    ordering) the per-object loop in PowerService/EspritService produces.
+    """
+    if not HAS_NUMPY:
+        return _summarize_loop(rows, top_n)
+    
+    n = len(rows)
+    if not n:
+        return {
+            "base_power": {"atk": 0, "def": 0, "hp": 0}, "power_by_element": {}, "power_by_tier": {},
+            "top_contributors": [], "total_esprits": 0, "total_quantity": 0, "average_tier": 0.0
+        }
+    
+    individual = individual_power_columns(rows)
+    meta = np.array([(r[4], r[6]) for r in rows], dtype=np.int64)
+    quantity, tier = meta[:, 0], meta[:, 1]
+    elements = [r[5] for r in rows]
+    stack = {stat: individual[stat] * quantity for stat in _STATS}
+    
+    # Python's sort(reverse=True) keeps ties in input order; a stable argsort on the negated key does too
+    sort_key = stack["atk"] + stack["def"] + stack["hp"] + stack["power"]
+    top = np.argsort(-sort_key, kind="stable")[:top_n].tolist()
+    efficiency = (individual["atk"] + individual["def"] + individual["hp"]) / np.maximum(tier, 1)
+    
+    total_quantity = int(quantity.sum())
+    return {
+        "base_power": {stat: int(stack[stat].sum()) for stat in ("atk", "def", "hp")},
+        "power_by_element": _group_sums(elements, stack, quantity),
+        "power_by_tier": _group_sums(tier.tolist(), stack, quantity),
+        "top_contributors": [
+            {
+                "name": rows[i][7], "element": rows[i][5], "tier": rows[i][6],
+                "awakening": rows[i][3], "quantity": rows[i][4],
+                "individual_power": {stat: int(individual[stat][i]) for stat in _STATS},
+                "stack_power": {stat: int(stack[stat][i]) for stat in _STATS},
+                "efficiency": float(efficiency[i])
+            }
+            for i in top
+        ],
+        "total_esprits": n,
+        "total_quantity": total_quantity,
+        "average_tier": round(int((tier * quantity).sum()) / max(total_quantity, 1), 2)
+    }
+
+
+def _summarize_loop(rows: Sequence[StackRow], top_n: int) -> Dict[str, Any]:
+    base_power = {"atk": 0, "def": 0, "hp": 0}
+    by_element: Dict[Any, Dict[str, int]] = {}
+    by_tier: Dict[Any, Dict[str, int]] = {}
+    contributions = []
+    
+    for base_atk, base_def, base_hp, awakening_level, quantity, element, tier, name in rows:
+        individual = Esprit.calculate_power(base_atk, base_def, base_hp, awakening_level)
+        stack = {stat: individual[stat] * quantity for stat in _STATS}
+        for groups, key in ((by_element, element), (by_tier, tier)):
+            group = groups.setdefault(key, {"atk": 0, "def": 0, "hp": 0, "count": 0})
+            for stat in ("atk", "def", "hp"):
+                group[stat] += stack[stat]
+            group["count"] += quantity
+        for stat in ("atk", "def", "hp"):
+            base_power[stat] += stack[stat]
+        contributions.append({
+            "name": name, "element": element, "tier": tier, "awakening": awakening_level, "quantity": quantity,
+            "individual_power": individual, "stack_power": stack,
+            "efficiency": (individual["atk"] + individual["def"] + individual["hp"]) / max(tier, 1)
+        })
+    
+    total_quantity = sum(c["quantity"] for c in contributions)
+    weighted_tier = sum(c["tier"] * c["quantity"] for c in contributions)
+    contributions.sort(key=lambda c: sum(c["stack_power"].values()), reverse=True)
+    return {
+        "base_power": base_power, "power_by_element": by_element, "power_by_tier": by_tier,
+        "top_contributors": contributions[:top_n], "total_esprits": len(contributions),
+        "total_quantity": total_quantity,
+        "average_tier": round(weighted_tier / max(total_quantity, 1), 2)
+    }
@@ -1,7 +1,7 @@
 # src/utils/redis_service.py
 import redis.asyncio as redis
 from redis.exceptions import RedisError, ConnectionError as RedisConnectionError
-from typing import Optional, Dict, Any, Callable, Tuple
+from typing import Optional, Dict, Any, Callable, Tuple, List, AsyncIterator, Iterable
 import json
 import time
 import functools
@@ -22,7 +22,11 @@ class RedisService:
     """Redis cache service with graceful degradation"""
     
     _client: Optional[redis.Redis] = None
+    _binary_client: Optional[redis.Redis] = None
     _available: bool = False
+    
+    # Keys requested per SCAN call and deleted per UNLINK - keeps every command short
+    SCAN_BATCH_SIZE = 500
 
     @classmethod
     def init(cls, redis_url: Optional[str] = None) -> None:
@@ -35,6 +39,8 @@ class RedisService:
                 return
 
             cls._client = redis.from_url(redis_url, decode_responses=True)
+            # Raw bytes connection for binary cache envelopes
+            cls._binary_client = redis.from_url(redis_url, decode_responses=False)
             cls._available = True
             logger.info("RedisService initialized successfully")
             
@@ -52,6 +58,11 @@ class RedisService:
         """Get Redis client if available"""
         return cls._client if cls.is_available() else None
 
+    @classmethod
+    def get_binary_client(cls) -> Optional[redis.Redis]:
+        """Get the non-decoding Redis client (values come back as bytes)"""
+        return cls._binary_client if cls.is_available() else None
+
     @classmethod
     async def ping(cls) -> bool:
         """Test Redis connectivity"""
@@ -149,8 +160,42 @@ class RedisService:
             return None
 
     @classmethod
-    async def delete_pattern(cls, pattern: str) -> int:
-        """Delete all keys matching pattern"""
+    async def delete_many(cls, keys: Iterable[str]) -> int:
+        """Delete several keys in a single UNLINK round trip"""
+        if not cls.is_available():
+            return 0
+        
+        keys = list(keys)
+        if not keys:
+            return 0
+        
+        try:
+            client = cls.get_client()
+            return await client.unlink(*keys) if client else 0
+            
+        except Exception as e:
+            logger.debug(f"Redis multi delete failed for {len(keys)} keys: {e}")
+            return 0
+
+    @classmethod
+    async def scan_batches(cls, pattern: str, batch_size: Optional[int] = None) -> AsyncIterator[List[str]]:
+        """Yield keys matching pattern in bounded batches using incremental SCAN (never KEYS)"""
+        client = cls.get_client()
+        if not client:
+            return
+        
+        count = batch_size or cls.SCAN_BATCH_SIZE
+        cursor = 0
+        while True:
+            cursor, keys = await client.scan(cursor=cursor, match=pattern, count=count)
+            if keys:
+                yield keys
+            if cursor == 0:
+                break
+
+    @classmethod
+    async def delete_pattern(cls, pattern: str, batch_size: Optional[int] = None) -> int:
+        """Delete all keys matching pattern, one SCAN page at a time"""
         if not cls.is_available():
             return 0
             
@@ -158,11 +203,11 @@ class RedisService:
             client = cls.get_client()
             if not client:
                 return 0
-                
-            keys = await client.keys(pattern)
-            if keys:
-                return await client.delete(*keys)
-            return 0
+            
+            deleted = 0
+            async for keys in cls.scan_batches(pattern, batch_size):
+                deleted += await client.unlink(*keys)
+            return deleted
             
         except Exception as e:
             logger.debug(f"Redis pattern delete failed for {pattern}: {e}")
@@ -205,16 +250,21 @@ class RedisService:
             f"collection_stats:{player_id}"
         ]
         
-        success = True
-        for key in cache_keys:
-            if not await cls.delete(key):
-                success = False
-        
-        return success
+        try:
+            client = cls.get_client()
+            if client:
+                await client.unlink(*cache_keys)
+            return True
+            
+        except Exception as e:
+            logger.debug(f"Redis player invalidation failed for {player_id}: {e}")
+            return False
 
     @classmethod
     async def close(cls) -> None:
         """Cleanup Redis connection"""
+        if cls._binary_client:
+            await cls._binary_client.close()
         if cls._client:
             await cls._client.close()
             cls._available = False
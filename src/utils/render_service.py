@@ -0,0 +1,268 @@
+# src/utils/render_service.py
+"""
+Card rendering in a pool of long-lived worker processes.
+
+Pillow drops the GIL inside its C calls, but the Python-level drawing in
+_render_card_sync / _render_boss_sync holds it, so renders pushed through
+asyncio.to_thread run one at a time and compete with the event loop. The
+RenderService runs them in a ProcessPoolExecutor instead.
+
+Each worker is spawned (never forked from the running bot). It loads the
+configs and the SpriteIndex, builds its own generators and warms the card
+template once, and then serves jobs for its whole life. A job is a compact
+spec: the card kind plus the same input dict the card cache keys on. The
+worker returns the encoded bytes, so no Image object ever crosses the
+process boundary.
+
+Admission is bounded. At most `workers + max_queue` jobs are in the pool at
+once; past that, render() gives up immediately instead of growing a backlog.
+Every job has a timeout. A timed-out job that is already running keeps its
+worker busy until it finishes, because a running process can't be cancelled;
+it stays counted in the depth until then. `max_jobs_per_worker` recycles
+workers, and restart() replaces the whole pool (used after a config reload).
+
+While the pool isn't running (disabled, not started yet, or being replaced)
+the generators render in-process on a thread as before.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from src.utils.config_manager import ConfigManager
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Latency percentiles are taken over this many most recent jobs
+LATENCY_WINDOW = 1000
+
+
+# --- worker side ---
+
+_worker_generators: Dict[str, Any] = {}
+
+
+def _init_worker() -> None:
+    """Runs once per worker process: configs, sprite index, generators and the card template"""
+    # Ctrl+C is the parent's to handle; it shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    
+    ConfigManager.load_all()
+    
+    from src.utils.sprite_index import SpriteIndex
+    from src.utils.stats_generator import ImageGenerator
+    from src.utils.boss_generator import UnifiedBossImageGenerator
+    
+    SpriteIndex.load()
+    esprit_generator = ImageGenerator()
+    esprit_generator._get_card_template()
+    _worker_generators["esprit"] = esprit_generator
+    _worker_generators["boss"] = UnifiedBossImageGenerator()
+
+
+def _render_job(kind: str, spec: Dict[str, Any]) -> Tuple[Optional[bytes], float]:
+    """Encoded card for one spec plus the ms spent rendering and encoding it"""
+    start = time.perf_counter()
+    data = _worker_generators[kind].render_encoded_sync(spec)
+    return data, (time.perf_counter() - start) * 1000
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+# --- parent side ---
+
+@dataclass
+class RenderStats:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    timeouts: int = 0
+    rejected: int = 0
+    restarts: int = 0
+    max_depth: int = 0
+
+
+def _percentiles(samples: Deque[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    return {
+        "p50": round(ordered[len(ordered) // 2], 1),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+        "max": round(ordered[-1], 1)
+    }
+
+
+class RenderService:
+    """Process-wide handle on the render worker pool"""
+    
+    _executor: Optional[ProcessPoolExecutor] = None
+    _workers: int = 0
+    _capacity: int = 0
+    _depth: int = 0
+    _render_ms: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+    _total_ms: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+    stats = RenderStats()
+    
+    @classmethod
+    def _config(cls) -> Dict[str, Any]:
+        return (ConfigManager.get("global_config") or {}).get("render_service", {})
+    
+    @classmethod
+    def is_running(cls) -> bool:
+        return cls._executor is not None
+    
+    @classmethod
+    async def start(cls) -> bool:
+        """Spawn the pool and wait until every worker has preloaded; False if disabled"""
+        config = cls._config()
+        if cls._executor is not None:
+            return True
+        if not config.get("enabled", False):
+            return False
+        
+        workers = int(config.get("workers", 0)) or max(1, min(4, (os.cpu_count() or 2) - 1))
+        max_queue = int(config.get("max_queue", 16))
+        
+        pool_kwargs: Dict[str, Any] = {}
+        max_jobs = int(config.get("max_jobs_per_worker", 0))
+        if max_jobs > 0 and sys.version_info >= (3, 11):
+            pool_kwargs["max_tasks_per_child"] = max_jobs
+        
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            **pool_kwargs
+        )
+        
+        # One ping per worker makes the pool spawn (and preload) all of them now, not on the first burst
+        loop = asyncio.get_running_loop()
+        try:
+            pids = await asyncio.wait_for(
+                asyncio.gather(*(loop.run_in_executor(executor, _ping) for _ in range(workers))),
+                float(config.get("startup_timeout_seconds", 60))
+            )
+        except Exception as e:
+            logger.error(f"Render workers failed to start: {e}")
+            executor.shutdown(wait=False, cancel_futures=True)
+            return False
+        
+        cls._executor = executor
+        cls._workers = workers
+        cls._capacity = workers + max_queue
+        logger.info(f"RenderService started: {len(set(pids))} workers, queue {max_queue}")
+        return True
+    
+    @classmethod
+    def stop(cls) -> None:
+        """Shut the pool down; queued jobs are dropped and callers fall back to in-process rendering"""
+        executor, cls._executor = cls._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            logger.info("RenderService stopped")
+    
+    @classmethod
+    async def restart(cls) -> bool:
+        """Replace the pool with fresh workers; jobs already running on the old one still finish"""
+        old, cls._executor = cls._executor, None
+        started = await cls.start()
+        if old is not None:
+            old.shutdown(wait=False)
+            cls.stats.restarts += 1
+        return started
+    
+    @classmethod
+    def _release(cls, _: Future) -> None:
+        cls._depth -= 1
+    
+    @classmethod
+    async def render(cls, kind: str, spec: Dict[str, Any]) -> Optional[bytes]:
+        """Encoded card from a worker, or None if the job was rejected, timed out or failed"""
+        executor = cls._executor
+        if executor is None:
+            return None
+        
+        if cls._depth >= cls._capacity:
+            cls.stats.rejected += 1
+            logger.warning(f"Render queue full ({cls._depth}/{cls._capacity}) - rejected {kind} '{spec.get('name')}'")
+            return None
+        
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            future = executor.submit(_render_job, kind, spec)
+        except (RuntimeError, BrokenProcessPool) as e:
+            cls.stats.failed += 1
+            logger.error(f"Render pool unavailable: {e}")
+            await cls._replace_broken(executor)
+            return None
+        
+        # Depth drops when the worker is actually done, not when the caller stops waiting
+        cls._depth += 1
+        cls.stats.submitted += 1
+        cls.stats.max_depth = max(cls.stats.max_depth, cls._depth)
+        future.add_done_callback(lambda done: loop.call_soon_threadsafe(cls._release, done))
+        
+        timeout = float(cls._config().get("timeout_seconds", 15))
+        try:
+            data, render_ms = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            cls.stats.timeouts += 1
+            logger.warning(f"Render of {kind} '{spec.get('name')}' timed out after {timeout}s")
+            return None
+        except BrokenProcessPool as e:
+            cls.stats.failed += 1
+            logger.error(f"Render worker died: {e}")
+            await cls._replace_broken(executor)
+            return None
+        except Exception as e:
+            cls.stats.failed += 1
+            logger.error(f"Render of {kind} '{spec.get('name')}' failed: {e}")
+            return None
+        
+        cls.stats.completed += 1
+        cls._render_ms.append(render_ms)
+        cls._total_ms.append((time.perf_counter() - start) * 1000)
+        return data
+    
+    @classmethod
+    async def _replace_broken(cls, executor: ProcessPoolExecutor) -> None:
+        """Swap in a new pool once, however many callers saw the old one break"""
+        if cls._executor is not executor:
+            return
+        cls._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+        cls.stats.restarts += 1
+        await cls.start()
+    
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """Pool counters, queue depth and latency percentiles for monitoring"""
+        return {
+            "running": cls._executor is not None,
+            "workers": cls._workers,
+            "depth": cls._depth,
+            "capacity": cls._capacity,
+            "max_depth": cls.stats.max_depth,
+            "submitted": cls.stats.submitted,
+            "completed": cls.stats.completed,
+            "failed": cls.stats.failed,
+            "timeouts": cls.stats.timeouts,
+            "rejected": cls.stats.rejected,
+            "restarts": cls.stats.restarts,
+            # Time inside the worker vs end to end (queue wait + IPC + render)
+            "render_ms": _percentiles(cls._render_ms),
+            "total_ms": _percentiles(cls._total_ms)
+        }
@@ -0,0 +1,202 @@
+# src/utils/sprite_index.py
+"""
+In-process index of every sprite and portrait file under assets/.
+
+assets/esprits/<tier folder>/ and assets/portraits/<tier folder>/ are walked
+once and every file is keyed by a canonical name: lowercase with everything
+but letters and digits removed. "Blaze Blob", "blaze_blob" and "Blaze-Blob"
+therefore all resolve to the same file. A card generator then finds its
+sprite with one dict lookup instead of probing folder x variant x extension
+combinations with Path.exists().
+
+Like EspritCatalog, each build produces a new immutable snapshot that is
+swapped in with a single assignment. Readers compare the directory mtimes at
+most every MTIME_CHECK_INTERVAL seconds, so sprites added, renamed or removed
+on disk are picked up without a restart. /admin reload_sprites forces a
+rebuild.
+"""
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+from src.utils.game_constants import Tiers
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ASSETS_BASE = Path("assets")
+SPRITES_PATH = ASSETS_BASE / "esprits"
+PORTRAITS_PATH = ASSETS_BASE / "portraits"
+
+# Folder order doubles as the fallback search order when a sprite isn't in its own tier's folder
+TIER_FOLDERS = (
+    "common", "uncommon", "rare", "epic", "mythic", "divine",
+    "legendary", "ethereal", "genesis", "empyrean", "void", "singularity"
+)
+
+# When several files share a key, the earlier extension wins
+EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".gif")
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_PORTRAIT_SUFFIX = "portrait"
+
+
+def canonical_name(name: str) -> str:
+    """Lowercase letters and digits only, the key every sprite is indexed under"""
+    return _NON_ALNUM.sub("", name.lower()) if name else ""
+
+
+def _tier_folder(tier: Optional[int]) -> Optional[str]:
+    tier_info = Tiers.get(tier) if tier else None
+    return tier_info.name.lower() if tier_info else None
+
+
+def _scan(root: Path, strip_suffix: str = "") -> Tuple[Dict[Tuple[str, str], Path], Dict[str, float]]:
+    """{(canonical name, folder): path} for one asset root plus the mtimes of every directory read"""
+    files: Dict[Tuple[str, str], Path] = {}
+    mtimes: Dict[str, float] = {}
+    
+    try:
+        mtimes[str(root)] = root.stat().st_mtime
+    except FileNotFoundError:
+        return files, mtimes
+    
+    # Known tier folders in order, then anything else alphabetically
+    folders = sorted(
+        (entry for entry in os.scandir(root) if entry.is_dir()),
+        key=lambda entry: (TIER_FOLDERS.index(entry.name) if entry.name in TIER_FOLDERS else len(TIER_FOLDERS), entry.name)
+    )
+    for folder in folders:
+        mtimes[folder.path] = folder.stat().st_mtime
+        candidates = []
+        for entry in os.scandir(folder.path):
+            stem, ext = os.path.splitext(entry.name)
+            ext = ext.lower()
+            if ext not in EXTENSIONS or not entry.is_file():
+                continue
+            key = canonical_name(stem)
+            if strip_suffix and key.endswith(strip_suffix) and len(key) > len(strip_suffix):
+                key = key[:-len(strip_suffix)]
+            candidates.append((EXTENSIONS.index(ext), entry.name, key, Path(entry.path)))
+        
+        for _, _, key, path in sorted(candidates):
+            files.setdefault((key, folder.name), path)
+    
+    return files, mtimes
+
+
+@dataclass(frozen=True)
+class SpriteSnapshot:
+    """Immutable sprite/portrait lookup tables for one scan of the asset folders"""
+    sprites: Mapping[Tuple[str, str], Path]
+    portraits: Mapping[Tuple[str, str], Path]
+    sprites_by_name: Mapping[str, Path]
+    portraits_by_name: Mapping[str, Path]
+    mtimes: Mapping[str, float]
+    built_at: datetime = field(default_factory=datetime.utcnow)
+    
+    @classmethod
+    def build(cls) -> "SpriteSnapshot":
+        sprites, sprite_mtimes = _scan(SPRITES_PATH)
+        portraits, portrait_mtimes = _scan(PORTRAITS_PATH, strip_suffix=_PORTRAIT_SUFFIX)
+        
+        # Name-only fallback: the first folder in scan order (tier order) wins
+        sprites_by_name: Dict[str, Path] = {}
+        for (key, _), path in sprites.items():
+            sprites_by_name.setdefault(key, path)
+        portraits_by_name: Dict[str, Path] = {}
+        for (key, _), path in portraits.items():
+            portraits_by_name.setdefault(key, path)
+        
+        return cls(
+            sprites=MappingProxyType(sprites),
+            portraits=MappingProxyType(portraits),
+            sprites_by_name=MappingProxyType(sprites_by_name),
+            portraits_by_name=MappingProxyType(portraits_by_name),
+            mtimes=MappingProxyType({**sprite_mtimes, **portrait_mtimes})
+        )
+    
+    def is_stale(self) -> bool:
+        """True if any scanned directory changed or a missing root appeared"""
+        for root in (SPRITES_PATH, PORTRAITS_PATH):
+            if str(root) not in self.mtimes and root.is_dir():
+                return True
+        for path, mtime in self.mtimes.items():
+            try:
+                if os.stat(path).st_mtime != mtime:
+                    return True
+            except FileNotFoundError:
+                return True
+        return False
+    
+    def find_sprite(self, name: str, tier: Optional[int] = None) -> Optional[Path]:
+        """Sprite in the tier's own folder first, then in any folder"""
+        key = canonical_name(name)
+        folder = _tier_folder(tier)
+        if folder is not None:
+            path = self.sprites.get((key, folder))
+            if path is not None:
+                return path
+        return self.sprites_by_name.get(key)
+    
+    def find_portrait(self, name: str, tier: Optional[int] = None) -> Optional[Path]:
+        """Portrait (files named <name>_portrait) in the tier's folder first, then in any folder"""
+        key = canonical_name(name)
+        folder = _tier_folder(tier)
+        if folder is not None:
+            path = self.portraits.get((key, folder))
+            if path is not None:
+                return path
+        return self.portraits_by_name.get(key)
+
+
+class SpriteIndex:
+    """Process-wide holder for the current SpriteSnapshot"""
+    
+    # How often (seconds) readers compare directory mtimes against the snapshot
+    MTIME_CHECK_INTERVAL = 30
+    
+    _snapshot: Optional[SpriteSnapshot] = None
+    _lock = threading.Lock()
+    _last_mtime_check: float = 0.0
+    
+    @classmethod
+    def load(cls) -> SpriteSnapshot:
+        """Rescan the asset folders and swap the new snapshot in"""
+        with cls._lock:
+            snapshot = SpriteSnapshot.build()
+            cls._snapshot = snapshot
+            cls._last_mtime_check = time.monotonic()
+        
+        logger.info(f"SpriteIndex built: {len(snapshot.sprites)} sprites, {len(snapshot.portraits)} portraits")
+        return snapshot
+    
+    @classmethod
+    def get_snapshot(cls) -> SpriteSnapshot:
+        """Current snapshot, built on first use and rebuilt when the folders changed"""
+        snapshot = cls._snapshot
+        if snapshot is None:
+            return cls.load()
+        
+        if time.monotonic() - cls._last_mtime_check >= cls.MTIME_CHECK_INTERVAL:
+            cls._last_mtime_check = time.monotonic()
+            if snapshot.is_stale():
+                logger.info("Sprite folders changed on disk - rebuilding SpriteIndex")
+                return cls.load()
+        
+        return snapshot
+    
+    @classmethod
+    def find_sprite(cls, name: str, tier: Optional[int] = None) -> Optional[Path]:
+        return cls.get_snapshot().find_sprite(name, tier)
+    
+    @classmethod
+    def find_portrait(cls, name: str, tier: Optional[int] = None) -> Optional[Path]:
+        return cls.get_snapshot().find_portrait(name, tier)
@@ -2,18 +2,23 @@
 from __future__ import annotations
 
 import asyncio
-import io
 import os
 from typing import Tuple, Optional, Dict, Any, List
 from pathlib import Path
 import random
+import threading
+from collections import OrderedDict
 
 import disnake
 from PIL import Image, ImageDraw, ImageFilter, ImageFont
 
 from src.utils.logger import get_logger
-from src.utils.game_constants import Tiers, Elements
+from src.utils.game_constants import Elements
 from src.utils.config_manager import ConfigManager
+from src.utils.sprite_index import SpriteIndex
+from src.utils.card_cache import CardCache
+from src.utils.image_encoder import ImageEncoder
+from src.utils.render_service import RenderService
 
 # Optional dependencies for advanced features
 try:
@@ -188,11 +193,54 @@ SPRITES_PATH = ASSETS_BASE / "esprits"
 class ImageGenerator:
     """Professional-grade card generator that ACTUALLY respects configuration"""
     
-    def __init__(self):
+    # Scaled sprites (with their dominant color) and blurred glows kept per generator
+    SPRITE_CACHE_SIZE = 256
+    GLOW_CACHE_SIZE = 64
+    
+    def __init__(self, use_templates: bool = True):
         self.config = ImageConfig()
+        self.use_templates = use_templates
         self._load_fonts()
+        
+        # Render threads share these; every cached image is read-only once stored
+        self._cache_lock = threading.Lock()
+        self._sprite_cache: "OrderedDict[str, Tuple[Image.Image, Tuple[int, int, int]]]" = OrderedDict()
+        self._glow_cache: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+        self._card_template: Optional[Image.Image] = None
+        
         logger.info("ImageGenerator initialized with WORKING configuration")
     
+    def _cache_get(self, cache: OrderedDict, key: Any) -> Any:
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+    
+    def _cache_put(self, cache: OrderedDict, key: Any, value: Any, limit: int) -> None:
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > limit:
+                cache.popitem(last=False)
+    
+    def _get_card_template(self) -> Image.Image:
+        """
+        Starfield with the content box and card frame already drawn - nothing in it
+        varies per card or tier. Built on first render, after configs are loaded.
+        """
+        template = self._card_template
+        if template is None:
+            with self._cache_lock:
+                if self._card_template is None:
+                    card = self._create_enhanced_starry_background((self.config.CARD_WIDTH, self.config.CARD_HEIGHT))
+                    draw = ImageDraw.Draw(card)
+                    self._draw_content_box(draw, self._calculate_content_box_area(self.config.get_content_start_y() - 20))
+                    self._draw_card_frame(draw)
+                    self._card_template = card
+                template = self._card_template
+        return template
+    
     def _load_fonts(self):
         """Load fonts with comprehensive fallbacks"""
         font_config = self.config.get("fonts", {})
@@ -330,56 +378,14 @@ class ImageGenerator:
                     )
     
     def _get_sprite_path(self, esprit_name: str, tier: Optional[int] = None) -> Optional[Path]:
-        """Intelligent sprite discovery with extensive search patterns"""
+        """Sprite from the shared asset index, tier folder first"""
         if not esprit_name:
             return None
         
-        # Enhanced name variations
-        name_variants = [
-            esprit_name.lower().replace(" ", "_"),
-            esprit_name.lower().replace(" ", "-"),
-            esprit_name.lower().replace(" ", ""),
-            esprit_name.lower(),
-            esprit_name.replace(" ", "_"),
-            esprit_name.replace(" ", "-"),
-            esprit_name.replace(" ", ""),
-            esprit_name.lower().replace("'", "").replace(".", ""),
-            esprit_name.lower().replace("-", "_").replace("'", "")
-        ]
-        
-        # Tier-based folder structure
-        tier_folders = [
-            "common", "uncommon", "rare", "epic", "mythic", "divine",
-            "legendary", "ethereal", "genesis", "empyrean", "void", "singularity"
-        ]
-        
-        # Priority search: tier folder first
-        search_folders = []
-        if tier:
-            tier_info = Tiers.get(tier)
-            if tier_info and tier_info.name.lower() in tier_folders:
-                search_folders.append(tier_info.name.lower())
-        
-        # Add remaining folders
-        search_folders.extend([f for f in tier_folders if f not in search_folders])
-        
-        # Search with multiple file extensions
-        extensions = [".png", ".jpg", ".jpeg", ".webp", ".gif"]
-        
-        for folder in search_folders:
-            folder_path = SPRITES_PATH / folder
-            if not folder_path.exists():
-                continue
-                
-            for variant in name_variants:
-                for ext in extensions:
-                    sprite_path = folder_path / f"{variant}{ext}"
-                    if sprite_path.exists():
-                        logger.debug(f"Found sprite: {sprite_path}")
-                        return sprite_path
-        
-        logger.warning(f"No sprite found for: {esprit_name}")
-        return None
+        sprite_path = SpriteIndex.find_sprite(esprit_name, tier)
+        if sprite_path is None:
+            logger.warning(f"No sprite found for: {esprit_name}")
+        return sprite_path
     
     def _load_and_scale_sprite(self, sprite_path: Path) -> Optional[Image.Image]:
         """Advanced sprite scaling with quality preservation"""
@@ -623,6 +629,40 @@ class ImageGenerator:
         # Apply tier-appropriate blur
         return glow.filter(ImageFilter.GaussianBlur(radius=blur_radius))
     
+    def _load_card_sprite(self, name: str, tier: int) -> Tuple[Image.Image, Tuple[int, int, int]]:
+        """Scaled sprite (or placeholder) and its glow color; real sprites are memoized by path"""
+        sprite_path = self._get_sprite_path(name, tier)
+        cache_key = str(sprite_path) if sprite_path else None
+        
+        if cache_key and self.use_templates:
+            cached = self._cache_get(self._sprite_cache, cache_key)
+            if cached is not None:
+                return cached
+        
+        sprite = self._load_and_scale_sprite(sprite_path) if sprite_path else None
+        if not sprite:
+            sprite = self._create_professional_placeholder(name)
+            return sprite, self._extract_advanced_dominant_color(sprite)
+        
+        entry = (sprite, self._extract_advanced_dominant_color(sprite))
+        if cache_key and self.use_templates:
+            self._cache_put(self._sprite_cache, cache_key, entry, self.SPRITE_CACHE_SIZE)
+        return entry
+    
+    def _get_glow(self, size: Tuple[int, int], color: Tuple[int, int, int], tier: int) -> Image.Image:
+        """Blurred glow, shared by every tier with the same effect settings"""
+        if not self.use_templates:
+            return self._create_tier_appropriate_glow(size, color, tier)
+        
+        # Dominant colors are already quantized, so the key space stays small
+        tier_effects = self.config.get_tier_effects(tier)
+        key = (size, color, tier_effects.get("glow_intensity", 1.0), tier_effects.get("glow_radius", 15))
+        glow = self._cache_get(self._glow_cache, key)
+        if glow is None:
+            glow = self._create_tier_appropriate_glow(size, color, tier)
+            self._cache_put(self._glow_cache, key, glow, self.GLOW_CACHE_SIZE)
+        return glow
+    
     def _render_name_and_stars(
         self, 
         draw: ImageDraw.ImageDraw, 
@@ -882,7 +922,7 @@ class ImageGenerator:
             
             draw.rectangle([x1, y1, x2, y2], outline=border_color, width=border_width)
     
-    def _add_card_closure(self, draw: ImageDraw.ImageDraw, content_end_y: int) -> None:
+    def _add_card_closure(self, draw: ImageDraw.ImageDraw, content_end_y: int, frame: bool = True) -> None:
         """Add card closure elements"""
         closure_config = self.config.get("card_closure", {})
         
@@ -898,7 +938,12 @@ class ImageGenerator:
             
             self._draw_enhanced_divider(draw, divider_y)
         
-        # Card frame
+        if frame:
+            self._draw_card_frame(draw)
+    
+    def _draw_card_frame(self, draw: ImageDraw.ImageDraw) -> None:
+        """Card frame with its optional inner highlight"""
+        closure_config = self.config.get("card_closure", {})
         frame_config = closure_config.get("card_frame", {})
         if frame_config.get("enabled", True):
             border_color_list = frame_config.get("border_color", None)
@@ -930,8 +975,11 @@ class ImageGenerator:
     
     def _render_card_sync(self, card_data: Dict[str, Any]) -> Image.Image:
         """Synchronous rendering with ACTUAL tier-appropriate effects"""
-        # Create enhanced background
-        card = self._create_enhanced_starry_background((self.config.CARD_WIDTH, self.config.CARD_HEIGHT))
+        # Background, content box and frame come precomposed; without templates they are drawn per card
+        if self.use_templates:
+            card = self._get_card_template().copy()
+        else:
+            card = self._create_enhanced_starry_background((self.config.CARD_WIDTH, self.config.CARD_HEIGHT))
         
         # Extract card data
         name = card_data.get("name", "Unknown")
@@ -951,32 +999,16 @@ class ImageGenerator:
         }
         
         # Load sprite
-        sprite_path = self._get_sprite_path(name, tier)
-        if sprite_path:
-            sprite = self._load_and_scale_sprite(sprite_path)
-        else:
-            sprite = self._create_professional_placeholder(name)
-        
-        if not sprite:
-            sprite = self._create_professional_placeholder(name)
+        sprite, dominant_color = self._load_card_sprite(name, tier)
         
         # Create ACTUAL tier-appropriate glow
-        dominant_color = self._extract_advanced_dominant_color(sprite)
         logger.info(f"Card {name}: Using glow color {dominant_color} with tier {tier} effects")
         
         sprite_area_height = self.config.get_sprite_area_height()
-        glow = self._create_tier_appropriate_glow(
-            (self.config.CARD_WIDTH, sprite_area_height), 
-            dominant_color, 
-            tier
-        )
-        
-        # Position glow on card
-        glow_positioned = Image.new("RGBA", (self.config.CARD_WIDTH, self.config.CARD_HEIGHT), (0, 0, 0, 0))
-        glow_positioned.paste(glow, (0, 0))
+        glow = self._get_glow((self.config.CARD_WIDTH, sprite_area_height), dominant_color, tier)
         
-        # Apply glow to card
-        card = Image.alpha_composite(card, glow_positioned)
+        # Apply glow to card (in place, over the sprite area only)
+        card.alpha_composite(glow, (0, 0))
         
         # Position and paste sprite
         sprite_x = (self.config.CARD_WIDTH - sprite.width) // 2
@@ -988,8 +1020,9 @@ class ImageGenerator:
         content_start_y = self.config.get_content_start_y() - 20
         
         # Content box
-        content_box_coords = self._calculate_content_box_area(content_start_y)
-        self._draw_content_box(draw, content_box_coords)
+        if not self.use_templates:
+            content_box_coords = self._calculate_content_box_area(content_start_y)
+            self._draw_content_box(draw, content_box_coords)
         
         y = content_start_y
         
@@ -1014,59 +1047,41 @@ class ImageGenerator:
         final_y = self._render_leader_skill(draw, y, leader_skill) 
         
         # Card closure
-        self._add_card_closure(draw, final_y)
+        self._add_card_closure(draw, final_y, frame=not self.use_templates)
         
         return card
     
+    def _encode_image(self, img: Image.Image) -> Optional[bytes]:
+        """Encoded card under Discord's size limit (lossless WebP when available), or None"""
+        return ImageEncoder.encode(img, "esprit", self.config.get("compression", {}))
+    
     async def to_discord_file(self, img: Image.Image, filename: str = "card.png") -> Optional[disnake.File]:
         """Convert to Discord file with WORKING compression"""
-        compression_config = self.config.get("compression", {})
-        max_size_mb = compression_config.get("max_size_mb", 8.0)
-        quality_levels = compression_config.get("quality_levels", [95, 85, 75, 65])
-        
         try:
-            # Progressive compression
-            for quality in quality_levels:
-                buffer = io.BytesIO()
-                
-                save_kwargs = {
-                    "format": "PNG",
-                    "optimize": True,
-                    "compress_level": compression_config.get("compress_level", 6)
-                }
-                
-                img.save(buffer, **save_kwargs)
-                buffer.seek(0)
-                
-                # Check file size
-                size_mb = len(buffer.getvalue()) / (1024 * 1024)
-                
-                if size_mb <= max_size_mb:
-                    return disnake.File(buffer, filename=filename)
-                
-                # If still too big, try resizing
-                if quality == quality_levels[-1]:
-                    resize_factor = compression_config.get("resize_factor", 0.8)
-                    new_width = int(img.width * resize_factor)
-                    new_height = int(img.height * resize_factor)
-                    
-                    resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                    
-                    buffer = io.BytesIO()
-                    resized_img.save(buffer, **save_kwargs)
-                    buffer.seek(0)
-                    
-                    final_size_mb = len(buffer.getvalue()) / (1024 * 1024)
-                    
-                    if final_size_mb <= max_size_mb:
-                        return disnake.File(buffer, filename=filename)
-            
-            logger.error("Could not compress image below Discord limit")
-            return None
+            data = await asyncio.to_thread(self._encode_image, img)
+            return CardCache.to_file(data, filename) if data else None
             
         except Exception as e:
             logger.error(f"Failed to create Discord file: {e}")
             return None
+    
+    def render_encoded_sync(self, card_data: Dict[str, Any]) -> Optional[bytes]:
+        """Render and encode in one call - what the render workers run"""
+        return self._encode_image(self._render_card_sync(card_data))
+    
+    async def card_file(self, card_data: Dict[str, Any], filename: str = "card.png") -> Optional[disnake.File]:
+        """Cached card as a Discord file; a cache miss renders in the worker pool (or a thread without one)"""
+        key = CardCache.make_key("esprit", card_data)
+        data = await CardCache.get(key)
+        if data is None:
+            if RenderService.is_running():
+                data = await RenderService.render("esprit", card_data)
+            else:
+                data = await asyncio.to_thread(self.render_encoded_sync, card_data)
+            if data is None:
+                return None
+            await CardCache.put(key, data)
+        return CardCache.to_file(data, filename)
 
 
 # Singleton instance
@@ -1079,8 +1094,7 @@ async def generate_esprit_card(
 ) -> Optional[disnake.File]:
     """Generate a card and return as Discord file"""
     try:
-        card = await _generator.render_esprit_card(card_data)
-        return await _generator.to_discord_file(card, filename)
+        return await _generator.card_file(card_data, filename)
     except Exception as e:
         logger.error(f"Card generation failed: {e}")
         return None
\ No newline at end of file
@@ -0,0 +1,239 @@
+# src/utils/transaction_event_sink.py
+"""
+Optional second destination for TransactionLogger: bulk COPY into the
+day-partitioned transaction_event table.
+
+The logger's writer thread hands every drained batch to submit(), which
+only converts records to row tuples and appends them to a bounded buffer.
+A dedicated thread runs its own event loop and its own asyncpg connection,
+so neither the bot's loop nor its connection pool is ever involved. It
+flushes with copy_records_to_table once `batch_size` rows are waiting or
+`flush_interval_ms` has passed. Failed batches go back to the front of the
+buffer and are retried with backoff. When the buffer overflows, the oldest
+rows are dropped and counted.
+
+A batch Postgres rejects as data (DataError) is split in halves and each
+half copied again, down to single rows, so only the offending rows are
+quarantined: logged, counted and kept in a short list for get_stats().
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import asyncpg
+
+from src.utils.config_manager import ConfigManager
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class TransactionEventSink:
+    """Buffers transaction records and COPYs them into Postgres off the request path"""
+    
+    COLUMNS = ("occurred_at", "player_id", "type", "details", "metadata")
+    MAX_BACKOFF_SECONDS = 30.0
+    # Most recent rejected rows kept for inspection
+    QUARANTINE_SIZE = 20
+    
+    def __init__(self, dsn: str, encode: Callable[[Any], str], table: str = "transaction_event",
+                 capacity: int = 100000, batch_size: int = 5000, flush_interval_ms: int = 1000):
+        self.dsn = dsn
+        self.table = table
+        self.capacity = max(1, capacity)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.01, flush_interval_ms / 1000)
+        self._encode = encode
+        
+        self._cond = threading.Condition()
+        self._rows: deque = deque()
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+        
+        self._submitted = 0
+        self._inserted = 0
+        self._dropped = 0
+        self._quarantined = 0
+        self._quarantine: deque = deque(maxlen=self.QUARANTINE_SIZE)
+        self._batches = 0
+        self._failures = 0
+        self._last_error: Optional[str] = None
+        self._copy_seconds = 0.0
+        self._max_copy_ms = 0.0
+    
+    @classmethod
+    def from_config(cls, encode: Callable[[Any], str]) -> Optional["TransactionEventSink"]:
+        """Build from the `transaction_events` section of global_config, or None if disabled"""
+        config = (ConfigManager.get("global_config") or {}).get("transaction_events", {})
+        if not config.get("enabled", False):
+            return None
+        
+        database_url = os.getenv("DATABASE_URL")
+        if not database_url:
+            logger.error("DATABASE_URL not set; transaction_event sink disabled")
+            return None
+        
+        return cls(
+            dsn=database_url.replace("postgresql+asyncpg://", "postgresql://"),
+            encode=encode,
+            capacity=config.get("buffer_capacity", 100000),
+            batch_size=config.get("copy_batch_size", 5000),
+            flush_interval_ms=config.get("flush_interval_ms", 1000)
+        )
+    
+    # --- producer side (logger writer thread) ---
+    
+    def _jsonb(self, value: Any) -> str:
+        # jsonb rejects NUL even escaped; one such row would otherwise sink its whole batch
+        return self._encode(value).replace("\\u0000", "")
+    
+    def submit(self, records: List[tuple]) -> None:
+        """Queue (timestamp, player_id, type, details, metadata) records as COPY rows"""
+        rows = [
+            (datetime.utcfromtimestamp(timestamp), player_id, transaction_type,
+             self._jsonb(details), self._jsonb(metadata))
+            for timestamp, player_id, transaction_type, details, metadata in records
+            if player_id is not None
+        ]
+        
+        with self._cond:
+            self._rows.extend(rows)
+            self._submitted += len(rows)
+            overflow = len(self._rows) - self.capacity
+            for _ in range(max(0, overflow)):
+                self._rows.popleft()
+            if overflow > 0:
+                self._dropped += overflow
+            if len(self._rows) >= self.batch_size:
+                self._cond.notify()
+    
+    # --- lifecycle ---
+    
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._closing = False
+        self._thread = threading.Thread(
+            target=lambda: asyncio.run(self._run()), name="transaction-event-copy", daemon=True
+        )
+        self._thread.start()
+    
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush what is buffered (one attempt) and stop the COPY thread"""
+        if self._thread is None:
+            return
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self._thread = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "submitted": self._submitted,
+                "inserted": self._inserted,
+                "dropped": self._dropped,
+                "quarantined": self._quarantined,
+                "quarantine": [(row[0].isoformat(), row[1], row[2], str(error)) for row, error in self._quarantine],
+                "pending": len(self._rows),
+                "batches": self._batches,
+                "failures": self._failures,
+                "last_error": self._last_error,
+                "rows_per_second": round(self._inserted / self._copy_seconds) if self._copy_seconds else 0,
+                "max_copy_ms": round(self._max_copy_ms, 1),
+                "running": self._thread is not None and self._thread.is_alive()
+            }
+    
+    # --- COPY thread ---
+    
+    def _take(self) -> tuple:
+        """Block (this thread only) until a batch is due; returns (rows, closing)"""
+        with self._cond:
+            self._cond.wait_for(lambda: len(self._rows) >= self.batch_size or self._closing, self.flush_interval)
+            count = min(len(self._rows), self.batch_size)
+            return [self._rows.popleft() for _ in range(count)], self._closing
+    
+    def _requeue(self, rows: List[tuple]) -> None:
+        with self._cond:
+            self._rows.extendleft(reversed(rows))
+            overflow = len(self._rows) - self.capacity
+            for _ in range(max(0, overflow)):
+                self._rows.popleft()
+            if overflow > 0:
+                self._dropped += overflow
+    
+    async def _copy(self, conn: asyncpg.Connection, pending: List[List[tuple]]) -> None:
+        """COPY the chunks on the `pending` stack, bisecting around DataErrors
+        
+        A chunk leaves the stack only once it is in Postgres or quarantined, so
+        after any other error the stack holds exactly the rows still to write.
+        """
+        while pending:
+            rows = pending[-1]
+            try:
+                await conn.copy_records_to_table(self.table, records=rows, columns=self.COLUMNS)
+                pending.pop()
+                with self._cond:
+                    self._inserted += len(rows)
+            except asyncpg.DataError as e:
+                pending.pop()
+                if len(rows) > 1:
+                    middle = len(rows) // 2
+                    pending.extend((rows[middle:], rows[:middle]))
+                    continue
+                # A row Postgres will never accept would block the queue forever
+                with self._cond:
+                    self._quarantined += 1
+                    self._quarantine.append((rows[0], e))
+                    self._last_error = f"{type(e).__name__}: {e}"
+                logger.error(f"Quarantined transaction event {rows[0][:3]} Postgres rejected: {e}")
+    
+    async def _run(self) -> None:
+        conn: Optional[asyncpg.Connection] = None
+        backoff = 1.0
+        
+        while True:
+            rows, closing = self._take()
+            if not rows:
+                if closing:
+                    break
+                continue
+            
+            pending = [rows]
+            try:
+                if conn is None or conn.is_closed():
+                    conn = await asyncpg.connect(self.dsn)
+                
+                start = time.perf_counter()
+                await self._copy(conn, pending)
+                elapsed = time.perf_counter() - start
+                
+                with self._cond:
+                    self._batches += 1
+                    self._copy_seconds += elapsed
+                    self._max_copy_ms = max(self._max_copy_ms, elapsed * 1000)
+                backoff = 1.0
+            
+            except Exception as e:
+                with self._cond:
+                    self._failures += 1
+                    self._last_error = f"{type(e).__name__}: {e}"
+                # Chunks already copied before the failure are not retried
+                rows = [row for chunk in reversed(pending) for row in chunk]
+                logger.warning(f"transaction_event COPY of {len(rows)} rows failed, retrying in {backoff:.0f}s: {e}")
+                if conn is not None:
+                    conn.terminate()
+                    conn = None
+                if closing:
+                    break
+                self._requeue(rows)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.MAX_BACKOFF_SECONDS)
+        
+        if conn is not None:
+            await conn.close()
@@ -1,12 +1,53 @@
 # src/utils/transaction_logger.py
+"""
+Structured JSONL log of every game state change.
+
+Callers only append to a bounded in-memory ring buffer. A daemon writer
+thread drains it once `batch_size` records are waiting or
+`flush_interval_ms` has passed, serializes the records (orjson when
+installed) and writes them as compressed frames of at most `batch_size`
+records to rotating segments under logs/transactions/ (see
+transaction_segments for the format and the query side). When the buffer
+is full the `backpressure` policy decides what gives:
+
+    block        wait up to `block_timeout_ms` for room, then drop the record;
+                 for offline scripts only - a caller on a running event
+                 loop (the bot) gets drop_oldest instead of stalling the loop
+    drop_oldest  evict the oldest queued record
+    sample       past `sample_threshold` of capacity keep 1 in 1/`sample_rate`
+                 new records, evicting the oldest if still full
+
+Settings live in the `transaction_log` section of global_config.
+"""
+
+import asyncio
+import atexit
 import json
 import logging
+import os
+import random
+import threading
+import time
+from collections import deque
 from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from enum import Enum
 
+# Optional fast path
+try:
+    import orjson  # type: ignore
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+    orjson = None  # type: ignore
+
+from src.utils.config_manager import ConfigManager
+from src.utils.transaction_segments import SegmentWriter
+
+logger = logging.getLogger(__name__)
+
 class ReveJSONEncoder(json.JSONEncoder):
     """Custom JSON encoder for Reve transaction logging"""
     
@@ -33,6 +74,8 @@ class TransactionType(Enum):
     ITEM_CONSUMED = "item_consumed"
     ESPRIT_CAPTURED = "esprit_captured"
     ESPRIT_FUSED = "esprit_fused"
+    FUSION_ATTEMPTED = "fusion_attempted"
+    ESPRIT_CONSUMED = "esprit_consumed"
     ESPRIT_AWAKENED = "esprit_awakened"
     ECHO_OPENED = "echo_opened"
     QUEST_COMPLETED = "quest_completed"
@@ -61,12 +104,39 @@ class TransactionType(Enum):
     NOTIFICATION_UPDATED = "notification_updated"
     DISPLAY_SYNC = "display_sync"
     REWARD_DISTRIBUTED = "reward_distributed"
+    DAILY_REWARD = "daily_reward"
     CLASS_SELECTED = "class_selected"
     CLASS_BONUS_APPLIED = "class_bonus_applied"
 
+def _orjson_default(obj):
+    """orjson hook mirroring ReveJSONEncoder for the types orjson doesn't know"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return ReveJSONEncoder().default(obj)
+
+# (timestamp, player_id, type, details, metadata)
+Record = Tuple[float, int, str, Dict[str, Any], Dict[str, Any]]
+
 class TransactionLogger:
     """Handles structured logging of all game state changes"""
     
+    BACKPRESSURE_POLICIES = ("block", "drop_oldest", "sample")
+    
+    DEFAULTS = {
+        "capacity": 10000,
+        "batch_size": 256,
+        "flush_interval_ms": 200,
+        "backpressure": "drop_oldest",
+        "block_timeout_ms": 50,
+        "sample_rate": 0.1,
+        "sample_threshold": 0.8,
+        "encoder": "orjson",
+        "segment_max_bytes": 64 * 1024 * 1024,
+        "rotate_interval_seconds": 3600,
+        "compression_level": 3,
+        "codec": "zstd"
+    }
+    
     _instance = None
     
     def __new__(cls):
@@ -78,28 +148,295 @@ class TransactionLogger:
     def __init__(self):
         if self._initialized:
             return
-            
+        
         # Create logs directory
         self.log_dir = Path("logs")
         self.log_dir.mkdir(exist_ok=True)
         
-        # Set up transaction logger
-        self.logger = logging.getLogger("transactions")
-        self.logger.setLevel(logging.INFO)
+        self._cond = threading.Condition()
+        self._buffer: deque = deque()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_pid: Optional[int] = None
+        self._closing = False
+        self._flush_requests = 0
+        # Owned by the writer thread; rebuilt there when the config changes
+        self._segments: Optional[SegmentWriter] = None
+        self._current_segment: Optional[str] = None
+        # Extra destinations fed every drained batch from the writer thread (see transaction_event_sink)
+        self._sinks: List[Any] = []
         
-        # File handler for transactions
-        transaction_handler = logging.FileHandler(
-            self.log_dir / "transactions.log",
-            encoding="utf-8"
-        )
-        transaction_handler.setFormatter(
-            logging.Formatter("%(message)s")  # Just the JSON
+        # Counters; `_settled` counts queued records that were written, failed or evicted
+        self._queued = 0
+        self._written = 0
+        self._dropped = 0
+        self._sampled_out = 0
+        self._batches = 0
+        self._encode_errors = 0
+        self._write_errors = 0
+        self._settled = 0
+        self._max_depth = 0
+        self._bytes_compressed = 0
+        
+        self._apply_config(self.DEFAULTS)
+        self._initialized = True
+    
+    # --- configuration / lifecycle ---
+    
+    def _apply_config(self, config: Dict[str, Any]) -> None:
+        settings = {**self.DEFAULTS, **config}
+        policy = settings["backpressure"]
+        if policy not in self.BACKPRESSURE_POLICIES:
+            logger.warning(f"Unknown transaction log backpressure '{policy}', using drop_oldest")
+            policy = "drop_oldest"
+        
+        self.capacity = max(1, int(settings["capacity"]))
+        self.batch_size = max(1, min(int(settings["batch_size"]), self.capacity))
+        self.flush_interval = max(0.001, settings["flush_interval_ms"] / 1000)
+        self.backpressure = policy
+        self.block_timeout = max(0.0, settings["block_timeout_ms"] / 1000)
+        self.sample_rate = min(1.0, max(0.0, float(settings["sample_rate"])))
+        self.sample_depth = int(self.capacity * min(1.0, max(0.0, float(settings["sample_threshold"]))))
+        self.encoder = "orjson" if settings["encoder"] == "orjson" and HAS_ORJSON else "json"
+        self.segment_settings = {
+            "max_segment_bytes": int(settings["segment_max_bytes"]),
+            "rotate_interval_seconds": int(settings["rotate_interval_seconds"]),
+            "compression_level": int(settings["compression_level"]),
+            "codec": settings["codec"]
+        }
+        self._segments_stale = True
+    
+    def configure(self, log_dir: Optional[Path] = None, **overrides) -> Dict[str, Any]:
+        """Apply the `transaction_log` section of global_config (plus overrides)"""
+        config = dict((ConfigManager.get("global_config") or {}).get("transaction_log", {}))
+        config.update(overrides)
+        
+        with self._cond:
+            self._apply_config(config)
+            if log_dir is not None:
+                self.log_dir = Path(log_dir)
+                self.log_dir.mkdir(parents=True, exist_ok=True)
+            self._cond.notify_all()
+        
+        logger.info(
+            f"Transaction log: {self.backpressure}, capacity {self.capacity}, "
+            f"batch {self.batch_size}, flush {self.flush_interval * 1000:.0f}ms, {self.encoder}"
         )
+        return self.get_stats()
+    
+    @property
+    def segment_dir(self) -> Path:
+        return self.log_dir / "transactions"
+    
+    def add_sink(self, sink: Any) -> None:
+        """Also hand every drained batch to `sink.submit(records)`; the sink owns its own I/O"""
+        with self._cond:
+            self._sinks.append(sink)
+        sink.start()
+    
+    def _ensure_writer(self) -> None:
+        # Also restarts after a fork, where the parent's thread does not exist
+        if self._writer is not None and self._writer_pid == os.getpid():
+            return
+        with self._cond:
+            if self._writer is not None and self._writer_pid == os.getpid():
+                return
+            self._closing = False
+            self._writer_pid = os.getpid()
+            self._writer = threading.Thread(target=self._run, name="transaction-log-writer", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is on disk"""
+        if self._writer is None:
+            return True
+        with self._cond:
+            target = self._queued
+            self._flush_requests += 1
+            self._cond.notify_all()
+            try:
+                return self._cond.wait_for(lambda: self._settled >= target, timeout)
+            finally:
+                self._flush_requests -= 1
+    
+    def close(self, timeout: float = 5.0) -> None:
+        """Drain the buffer and stop the writer thread"""
+        writer = self._writer
+        if writer is None or self._writer_pid != os.getpid():
+            return
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        writer.join(timeout)
+        self._writer = None
         
-        self.logger.addHandler(transaction_handler)
-        self.logger.propagate = False  # Don't propagate to root logger
+        for sink in self._sinks:
+            sink.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Pipeline counters for monitoring"""
+        with self._cond:
+            return {
+                "queued": self._queued,
+                "written": self._written,
+                "dropped": self._dropped,
+                "sampled_out": self._sampled_out,
+                "depth": len(self._buffer),
+                "max_depth": self._max_depth,
+                "capacity": self.capacity,
+                "batches": self._batches,
+                "encode_errors": self._encode_errors,
+                "write_errors": self._write_errors,
+                "bytes_compressed": self._bytes_compressed,
+                "current_segment": self._current_segment,
+                "sinks": {type(sink).__name__: sink.get_stats() for sink in self._sinks},
+                "backpressure": self.backpressure,
+                "encoder": self.encoder,
+                "running": self._writer is not None and self._writer.is_alive()
+            }
+    
+    # --- capture path ---
+    
+    @staticmethod
+    def _on_event_loop() -> bool:
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
+    
+    def _enqueue(self, record: Record) -> bool:
+        """Append one record under the backpressure policy; never touches disk"""
+        self._ensure_writer()
+        with self._cond:
+            depth = len(self._buffer)
+            
+            if self.backpressure == "sample" and depth >= self.sample_depth and random.random() >= self.sample_rate:
+                self._sampled_out += 1
+                self._dropped += 1
+                return False
+            
+            if depth >= self.capacity:
+                if self.backpressure == "block" and not self._on_event_loop():
+                    self._cond.notify_all()
+                    if not self._cond.wait_for(lambda: len(self._buffer) < self.capacity, self.block_timeout):
+                        self._dropped += 1
+                        return False
+                else:
+                    self._buffer.popleft()
+                    self._dropped += 1
+                    self._settled += 1
+            
+            self._buffer.append(record)
+            self._queued += 1
+            depth = len(self._buffer)
+            if depth > self._max_depth:
+                self._max_depth = depth
+            if depth >= self.batch_size:
+                self._cond.notify_all()
+        return True
+    
+    # --- writer thread ---
+    
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: len(self._buffer) >= self.batch_size or self._closing or (self._flush_requests and self._buffer),
+                    self.flush_interval
+                )
+                batch = list(self._buffer)
+                self._buffer.clear()
+                closing = self._closing
+                # Wake producers blocked on a full buffer
+                self._cond.notify_all()
+            
+            if batch:
+                written = self._write_batch(batch)
+                for sink in self._sinks:
+                    try:
+                        sink.submit(batch)
+                    except Exception as e:
+                        logger.error(f"Transaction sink {type(sink).__name__} rejected {len(batch)} records: {e}")
+                with self._cond:
+                    self._written += written
+                    self._batches += 1
+                    self._settled += len(batch)
+                    self._cond.notify_all()
+            elif closing:
+                if self._segments is not None:
+                    self._segments.close()
+                    self._segments = None
+                return
+    
+    def dumps(self, value: Any) -> bytes:
+        """Serialize with the configured encoder; the stdlib ReveJSONEncoder covers what orjson can't"""
+        if self.encoder == "orjson":
+            try:
+                return orjson.dumps(value, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+            except (TypeError, orjson.JSONEncodeError):
+                pass  # e.g. ints past 64 bits; the stdlib encoder copes
+        return json.dumps(value, cls=ReveJSONEncoder).encode("utf-8")
+    
+    def encode_json(self, value: Any) -> str:
+        """dumps() as text, never raising - for sinks that need one JSON document per field"""
+        try:
+            return self.dumps(value).decode("utf-8")
+        except Exception as e:
+            self._encode_errors += 1
+            return json.dumps({"encode_error": str(e)})
+    
+    def _encode(self, record: Record) -> bytes:
+        timestamp, player_id, transaction_type, details, metadata = record
+        transaction = {
+            "timestamp": datetime.utcfromtimestamp(timestamp).isoformat(),
+            "player_id": player_id,
+            "type": transaction_type,
+            "details": details,
+            "metadata": metadata
+        }
         
-        self._initialized = True
+        try:
+            return self.dumps(transaction)
+        except Exception as e:
+            # Fallback: keep a trace of the event without its payload
+            self._encode_errors += 1
+            logger.error(f"Transaction logging failed for player {player_id}: {e}")
+            return json.dumps({
+                "timestamp": transaction["timestamp"], "player_id": player_id,
+                "type": transaction_type, "details": {}, "metadata": {"encode_error": str(e)}
+            }).encode("utf-8")
+    
+    def _write_batch(self, batch: List[Record]) -> int:
+        try:
+            if self._segments_stale or self._segments is None:
+                # Config changed (or first batch): start a fresh segment with the new settings
+                if self._segments is not None:
+                    self._segments.close()
+                self._segments = SegmentWriter(self.segment_dir, **self.segment_settings)
+                self._segments_stale = False
+            
+            # A backlog is split so each indexed frame stays small enough to be selective
+            for start in range(0, len(batch), self.batch_size):
+                chunk = batch[start:start + self.batch_size]
+                timestamps = [record[0] for record in chunk]
+                self._bytes_compressed += self._segments.write_frame(
+                    [self._encode(record) for record in chunk],
+                    player_ids=(record[1] for record in chunk),
+                    types=(record[2] for record in chunk),
+                    first_ts=datetime.utcfromtimestamp(min(timestamps)).isoformat(),
+                    last_ts=datetime.utcfromtimestamp(max(timestamps)).isoformat(),
+                    now=time.time()
+                )
+            segment = self._segments.current_segment
+            self._current_segment = segment.name if segment else None
+            return len(batch)
+        except OSError as e:
+            self._write_errors += 1
+            logger.error(f"Could not write {len(batch)} transactions: {e}")
+            return 0
+    
+    # --- public API ---
     
     def log_transaction(
         self,
@@ -109,7 +446,7 @@ class TransactionLogger:
         metadata: Optional[Dict[str, Any]] = None
     ):
         """
-        Log a transaction with structured data.
+        Queue a transaction for the background writer.
         
         Args:
             player_id: The player's database ID
@@ -117,21 +454,8 @@ class TransactionLogger:
             details: Transaction-specific details (can contain Decimals, datetimes, etc.)
             metadata: Additional context (command used, etc.)
         """
-        transaction = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "player_id": player_id,
-            "type": transaction_type.value,
-            "details": details,
-            "metadata": metadata or {}
-        }
-        
-        try:
-            # Use custom encoder to handle Decimal and other types
-            self.logger.info(json.dumps(transaction, cls=ReveJSONEncoder))
-        except Exception as e:
-            # Fallback: log without JSON serialization
-            self.logger.error(f"Transaction logging failed for player {player_id}: {e}")
-            self.logger.info(f"Transaction: {transaction_type.value} - Player: {player_id}")
+        # Shallow copies so a caller reusing its dict can't change what gets written
+        self._enqueue((time.time(), player_id, transaction_type.value, dict(details), dict(metadata or {})))
     
     def log_currency_change(
         self,
@@ -289,20 +613,8 @@ class TransactionLogger:
         if transaction_type:
             self.log_transaction(player_id, transaction_type, details)
         else:
-            # Fallback for unmapped actions
-            transaction = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "player_id": player_id,
-                "type": action,  # Use original action string
-                "details": details,
-                "metadata": {"legacy": True}
-            }
-            
-            try:
-                self.logger.info(json.dumps(transaction, cls=ReveJSONEncoder))
-            except Exception as e:
-                self.logger.error(f"Legacy transaction logging failed for player {player_id}: {e}")
-                self.logger.info(f"Transaction: {action} - Player: {player_id}")
+            # Fallback for unmapped actions, keeping the original action string
+            self._enqueue((time.time(), player_id, action, dict(details), {"legacy": True}))
 
 # Global instance
-transaction_logger = TransactionLogger()
\ No newline at end of file
+transaction_logger = TransactionLogger()
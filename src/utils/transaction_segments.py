@@ -0,0 +1,281 @@
+# src/utils/transaction_segments.py
+"""
+Rotating, compressed segment files for the transaction log.
+
+Each writer batch becomes one independent compressed frame appended to the
+open segment, so any frame can be read back on its own:
+
+    transactions-20250101T1400-<pid>-000.jsonl.zst    frames of JSONL
+    transactions-20250101T1400-<pid>-000.idx          sidecar index (JSONL)
+
+The sidecar's first line is a header (codec, window start, interval); every
+following line describes one frame: byte offset and length in the segment,
+record count, first/last timestamp, and the player ids and transaction
+types it contains. Readers pick frames from the sidecar and only
+decompress those. Segments roll when the time window changes or the
+segment passes `max_segment_bytes`. zstandard is optional; without it
+frames are zlib-compressed and the segment suffix is .jsonl.zz.
+"""
+
+import json
+import os
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Optional fast path
+try:
+    import zstandard  # type: ignore
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+    zstandard = None  # type: ignore
+
+SEGMENT_PREFIX = "transactions-"
+INDEX_SUFFIX = ".idx"
+CODEC_SUFFIXES = {"zstd": ".jsonl.zst", "zlib": ".jsonl.zz"}
+WINDOW_FORMAT = "%Y%m%dT%H%M"
+
+
+def _compressor(codec: str, level: int):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress
+    return lambda data: zlib.compress(data, min(level, 9))
+
+
+def _decompressor(codec: str):
+    if codec == "zstd":
+        if not HAS_ZSTD:
+            raise RuntimeError("zstandard is required to read .jsonl.zst segments")
+        return zstandard.ZstdDecompressor().decompress
+    return zlib.decompress
+
+
+class SegmentWriter:
+    """Appends compressed frames to the current segment and its sidecar index"""
+    
+    def __init__(self, directory: Path, max_segment_bytes: int = 64 * 1024 * 1024,
+                 rotate_interval_seconds: int = 3600, compression_level: int = 3,
+                 codec: Optional[str] = None):
+        self.directory = Path(directory)
+        self.max_segment_bytes = max(1, max_segment_bytes)
+        self.rotate_interval = max(1, rotate_interval_seconds)
+        self.compression_level = compression_level
+        self.codec = codec if codec in CODEC_SUFFIXES and (codec != "zstd" or HAS_ZSTD) else (
+            "zstd" if HAS_ZSTD else "zlib"
+        )
+        self._compress = _compressor(self.codec, compression_level)
+        
+        self._segment = None
+        self._index = None
+        self._segment_path: Optional[Path] = None
+        self._window: Optional[int] = None
+        self._size = 0
+        self.segments_opened = 0
+    
+    @property
+    def current_segment(self) -> Optional[Path]:
+        return self._segment_path
+    
+    def _open(self, window: int) -> None:
+        self.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        
+        started = datetime.utcfromtimestamp(window * self.rotate_interval)
+        stem_prefix = f"{SEGMENT_PREFIX}{started.strftime(WINDOW_FORMAT)}-{os.getpid()}-"
+        suffix = CODEC_SUFFIXES[self.codec]
+        # Size rolls within one window get the next sequence number
+        seq = 0
+        while (self.directory / f"{stem_prefix}{seq:03d}{suffix}").exists():
+            seq += 1
+        stem = f"{stem_prefix}{seq:03d}"
+        
+        self._segment_path = self.directory / f"{stem}{suffix}"
+        self._segment = open(self._segment_path, "ab")
+        self._index = open(self.directory / f"{stem}{INDEX_SUFFIX}", "ab")
+        self._index.write(json.dumps({
+            "format": 1, "codec": self.codec, "segment": self._segment_path.name,
+            "started": started.isoformat(), "interval": self.rotate_interval
+        }).encode("utf-8") + b"\n")
+        self._index.flush()
+        self._window = window
+        self._size = 0
+        self.segments_opened += 1
+    
+    def write_frame(self, lines: List[bytes], player_ids: Iterable[int], types: Iterable[str],
+                    first_ts: str, last_ts: str, now: float) -> int:
+        """Compress one batch of JSONL lines into a frame; returns compressed bytes written"""
+        window = int(now // self.rotate_interval)
+        if self._segment is None or window != self._window or self._size >= self.max_segment_bytes:
+            self._open(window)
+        
+        frame = self._compress(b"\n".join(lines) + b"\n")
+        offset = self._size
+        self._segment.write(frame)
+        self._segment.flush()
+        self._size += len(frame)
+        
+        # Data first: an index line never points past the end of the segment
+        self._index.write(json.dumps({
+            "offset": offset, "length": len(frame), "count": len(lines),
+            "first": first_ts, "last": last_ts,
+            "players": sorted({p for p in player_ids if p is not None}), "types": sorted(set(types))
+        }).encode("utf-8") + b"\n")
+        self._index.flush()
+        return len(frame)
+    
+    def close(self) -> None:
+        for handle in (self._segment, self._index):
+            if handle is not None:
+                handle.close()
+        self._segment = None
+        self._index = None
+        self._segment_path = None
+
+
+@dataclass
+class QueryStats:
+    """How much of the log a query had to touch"""
+    segments_total: int = 0
+    segments_read: int = 0
+    frames_total: int = 0
+    frames_read: int = 0
+    bytes_decompressed: int = 0
+    records: int = 0
+    
+    def to_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+@dataclass
+class SegmentReader:
+    """Queries segments through their sidecar indexes"""
+    directory: Path
+    stats: QueryStats = field(default_factory=QueryStats)
+    
+    def __post_init__(self):
+        self.directory = Path(self.directory)
+    
+    def segments(self) -> List[Path]:
+        """Sidecar paths in chronological order"""
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob(f"{SEGMENT_PREFIX}*{INDEX_SUFFIX}"))
+    
+    @staticmethod
+    def _read_index(index_path: Path) -> tuple:
+        header, frames = None, []
+        with open(index_path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn last line from a crash mid-write
+                if header is None:
+                    header = entry
+                else:
+                    frames.append(entry)
+        return header, frames
+    
+    def read_new_frames(self, index_path: Path, index_offset: int = 0,
+                        max_frames: Optional[int] = None) -> Tuple[int, int, List[Dict[str, Any]]]:
+        """
+        Records from the frames indexed after byte `index_offset` of a sidecar.
+        
+        Returns (new index offset, frames read, records) so a consumer can
+        persist the offset and resume there; a torn trailing index line is
+        left for the next call.
+        """
+        with open(index_path, "rb") as f:
+            header_line = f.readline()
+            header = json.loads(header_line)
+            f.seek(max(index_offset, len(header_line)))
+            
+            frames = []
+            offset = f.tell()
+            for line in f:
+                if not line.endswith(b"\n") or (max_frames is not None and len(frames) >= max_frames):
+                    break
+                frames.append(json.loads(line))
+                offset += len(line)
+        
+        records: List[Dict[str, Any]] = []
+        if frames:
+            decompress = _decompressor(header["codec"])
+            with open(index_path.parent / header["segment"], "rb") as f:
+                for frame in frames:
+                    f.seek(frame["offset"])
+                    data = decompress(f.read(frame["length"]))
+                    self.stats.frames_read += 1
+                    self.stats.bytes_decompressed += len(data)
+                    records.extend(json.loads(line) for line in data.splitlines())
+        
+        self.stats.records += len(records)
+        return offset, len(frames), records
+    
+    def query(self, player_id: Optional[int] = None, transaction_type: Optional[str] = None,
+              since: Optional[datetime] = None, until: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Yield matching records oldest first, decompressing only frames the index selects"""
+        since_iso = since.isoformat() if since else None
+        until_iso = until.isoformat() if until else None
+        
+        for index_path in self.segments():
+            self.stats.segments_total += 1
+            
+            # Window bounds come from the file name, so segments that closed before `since` are never opened.
+            # There is no such shortcut for `until`: a batch flushed just after a window change holds records
+            # from before it, so the frames' own first timestamps decide that below.
+            try:
+                window = index_path.name[len(SEGMENT_PREFIX):].split("-", 1)[0]
+                started = datetime.strptime(window, WINDOW_FORMAT)
+            except ValueError:
+                continue
+            
+            if since:
+                with open(index_path, "rb") as f:
+                    first_line = f.readline()
+                try:
+                    interval = json.loads(first_line)["interval"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if started + timedelta(seconds=interval) <= since:
+                    continue
+            
+            header, frames = self._read_index(index_path)
+            if not header:
+                continue
+            self.stats.frames_total += len(frames)
+            
+            selected = [
+                frame for frame in frames
+                if (player_id is None or player_id in frame["players"])
+                and (transaction_type is None or transaction_type in frame["types"])
+                and (since_iso is None or frame["last"] >= since_iso)
+                and (until_iso is None or frame["first"] <= until_iso)
+            ]
+            if not selected:
+                continue
+            
+            self.stats.segments_read += 1
+            decompress = _decompressor(header["codec"])
+            with open(index_path.parent / header["segment"], "rb") as f:
+                for frame in selected:
+                    f.seek(frame["offset"])
+                    data = decompress(f.read(frame["length"]))
+                    self.stats.frames_read += 1
+                    self.stats.bytes_decompressed += len(data)
+                    
+                    for line in data.splitlines():
+                        record = json.loads(line)
+                        if player_id is not None and record.get("player_id") != player_id:
+                            continue
+                        if transaction_type is not None and record.get("type") != transaction_type:
+                            continue
+                        if since_iso and record["timestamp"] < since_iso:
+                            continue
+                        if until_iso and record["timestamp"] > until_iso:
+                            continue
+                        self.stats.records += 1
+                        yield record